@@ -0,0 +1,75 @@
+import asyncio
+
+## This module merges concurrent requests into micro-batches. Callers await submit(item); the first item of a batch starts a short timer (window), and the batch is handed to the handler when the timer fires or max_batch items are waiting, whichever comes first. The handler runs in an executor (a process pool in the service), so the event loop keeps accepting requests while a batch is being processed, and the next batch fills up in the meantime. Each caller gets back the result at its own position in the batch. A handler reports a failed item by returning an exception instance in its place; an exception raised by the handler fails every item of the batch.
+
+
+class MicroBatcher:
+    def __init__(self, handler, executor=None, window=0.005, max_batch=256, name='batch', metrics=None):
+        """
+        Args:
+            handler (callable): Picklable function taking a list of items and returning a list of results in the
+                same order (an Exception instance in place of a result fails that item only)
+            executor (Executor or None): Where the handler runs (None = the event loop's default thread pool)
+            window (float): Seconds to wait for more items after the first item of a batch
+            max_batch (int): Items that close a batch early
+            name (str): Name under which the batch sizes are recorded
+            metrics (ServiceMetrics or None): Receives the size of every batch
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1.")
+        self.handler = handler
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self.name = name
+        self.metrics = metrics
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    async def submit(self, item):
+        # Queue one item and wait for its result
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        # Close the current batch and start processing it
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        if self.metrics is not None:
+            self.metrics.record_batch(self.name, len(batch))
+        items = [item for item, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, self.handler, items)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if future.done():  # the caller may have been cancelled
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def drain(self):
+        # Process what is queued and wait for the batches in flight
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
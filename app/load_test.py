@@ -0,0 +1,87 @@
+import json
+import time
+import asyncio
+import argparse
+import numpy as np
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+
+## This script load-tests a running service (python -m app.server). A fixed number of concurrent clients send requests back to back for a given duration, using synthetic headlines from benchmarks/generator.py, and the script reports the client-side p50/p99 latency and throughput together with the server's own /metrics (latency inside the service and the micro-batch sizes the load produced).
+## Example: python -m app.load_test --endpoint score --concurrency 64 --duration 20
+
+
+def _payloads(endpoint, ticker, headlines_per_request, n=200, seed=0):
+    # Request bodies cycled through by the clients
+    from benchmarks.generator import make_news
+    news = make_news(n * headlines_per_request, seed=seed, start='2019-01-02', days=600, tickers=[ticker])
+    bodies = []
+    for i in range(n):
+        part = news.iloc[i * headlines_per_request:(i + 1) * headlines_per_request]
+        body = {'headlines': part['headline'].tolist()}
+        if endpoint == 'correlation':
+            body.update(ticker=ticker, dates=part['date'].tolist())
+        bodies.append(json.dumps(body))
+    return bodies
+
+
+async def _client(http, url, bodies, offset, deadline, latencies, errors):
+    # One client: send the next request as soon as the previous one has answered
+    i = offset
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            await http.fetch(url, method='POST', body=bodies[i % len(bodies)])
+            latencies.append(time.perf_counter() - start)
+        except (HTTPClientError, OSError):
+            errors.append(time.perf_counter() - start)
+        i += 1
+
+
+async def run_load_test(base_url, endpoint='score', concurrency=32, duration=10.0, headlines_per_request=1,
+                        ticker='AAPL'):
+    """
+    Run concurrent clients against a service for a fixed duration.
+    Args:
+        base_url (str): Service address, e.g. 'http://127.0.0.1:8888'
+        endpoint (str): 'score' or 'correlation'
+        concurrency (int): Clients sending requests in parallel
+        duration (float): Seconds to run
+        headlines_per_request (int): Headlines in each request body
+        ticker (str): Ticker for the correlation endpoint (must be loaded by the server)
+    Returns:
+        dict: Client-side requests, errors, throughput and latency percentiles, plus the server metrics
+    """
+    bodies = _payloads(endpoint, ticker, headlines_per_request)
+    http = AsyncHTTPClient(max_clients=concurrency)
+    latencies, errors = [], []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*[_client(http, f"{base_url}/{endpoint}", bodies, i, deadline, latencies, errors)
+                           for i in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    report = {'endpoint': endpoint, 'concurrency': concurrency, 'requests': len(latencies), 'errors': len(errors),
+              'throughput_rps': len(latencies) / elapsed}
+    if latencies:
+        p50, p99 = np.percentile(np.asarray(latencies) * 1000.0, [50, 99])
+        report.update(p50_ms=float(p50), p99_ms=float(p99))
+    response = await http.fetch(f"{base_url}/metrics")
+    report['server'] = json.loads(response.body)
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load-test a local scoring/correlation service.")
+    parser.add_argument('--url', default='http://127.0.0.1:8888')
+    parser.add_argument('--endpoint', default='score', choices=['score', 'correlation'])
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--headlines', type=int, default=None,
+                        help="Headlines per request (default: 1 for score, 300 for correlation)")
+    parser.add_argument('--ticker', default='AAPL')
+    args = parser.parse_args()
+    headlines = args.headlines or (1 if args.endpoint == 'score' else 300)
+    report = asyncio.run(run_load_test(args.url, args.endpoint, args.concurrency, args.duration, headlines,
+                                       args.ticker))
+    server = report.pop('server')
+    print(json.dumps(report, indent=2))
+    print("Server metrics:")
+    print(json.dumps(server, indent=2))
@@ -0,0 +1,93 @@
+import time
+import numpy as np
+
+## This module keeps the service's latency and throughput metrics. Each endpoint records the latency of every request in a fixed-size ring buffer (the most recent `window` requests), so percentiles are computed over recent traffic with bounded memory and recording costs one array store. Throughput is the number of requests completed in the last `rate_window` seconds, from a ring of completion times. Micro-batch sizes are tracked the same way, which shows how much batching the current load produces.
+
+
+class _Ring:
+    # Fixed-size buffer of the most recent values
+    def __init__(self, size):
+        self.values = np.zeros(size)
+        self.total = 0
+
+    def add(self, value):
+        self.values[self.total % len(self.values)] = value
+        self.total += 1
+
+    def recent(self):
+        return self.values[:min(self.total, len(self.values))]
+
+
+class EndpointMetrics:
+    def __init__(self, window=10000):
+        self.latencies = _Ring(window)   # seconds
+        self.finished = _Ring(window)    # monotonic completion times
+        self.errors = 0
+
+    def record(self, seconds, error=False):
+        self.latencies.add(seconds)
+        self.finished.add(time.monotonic())
+        if error:
+            self.errors += 1
+
+    def snapshot(self, rate_window=10.0):
+        """
+        Returns:
+            dict: requests, errors, p50/p99/mean/max latency in milliseconds (over the recent requests) and
+                throughput in requests per second (over the last rate_window seconds)
+        """
+        latencies = self.latencies.recent() * 1000.0
+        recent = self.finished.recent()
+        now = time.monotonic()
+        in_window = recent[recent >= now - rate_window]
+        # Use the time actually covered when the service has been up for less than rate_window
+        span = min(rate_window, now - in_window.min()) if len(in_window) else rate_window
+        out = {'requests': self.latencies.total, 'errors': self.errors,
+               'throughput_rps': float(len(in_window) / span) if span > 0 else 0.0}
+        if len(latencies):
+            p50, p99 = np.percentile(latencies, [50, 99])
+            out.update(p50_ms=float(p50), p99_ms=float(p99), mean_ms=float(latencies.mean()),
+                       max_ms=float(latencies.max()))
+        return out
+
+
+class ServiceMetrics:
+    def __init__(self, window=10000, rate_window=10.0):
+        """
+        Args:
+            window (int): Requests (and batches) kept per endpoint for the percentiles
+            rate_window (float): Seconds over which throughput is measured
+        """
+        self.window = window
+        self.rate_window = rate_window
+        self.endpoints = {}
+        self.batch_sizes = {}
+        self.started = time.monotonic()
+
+    def record(self, endpoint, seconds, error=False):
+        # Latency of one request
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = EndpointMetrics(self.window)
+        self.endpoints[endpoint].record(seconds, error)
+
+    def record_batch(self, name, size):
+        # Number of requests merged into one micro-batch
+        if name not in self.batch_sizes:
+            self.batch_sizes[name] = _Ring(self.window)
+        self.batch_sizes[name].add(size)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: uptime, per-endpoint latency/throughput and per-batcher batch counts and sizes
+        """
+        batches = {}
+        for name, ring in self.batch_sizes.items():
+            sizes = ring.recent()
+            batches[name] = {'batches': ring.total, 'mean_size': float(sizes.mean()) if len(sizes) else 0.0,
+                             'max_size': int(sizes.max()) if len(sizes) else 0}
+        return {
+            'uptime_s': time.monotonic() - self.started,
+            'endpoints': {name: m.snapshot(self.rate_window) for name, m in self.endpoints.items()},
+            'batches': batches,
+        }
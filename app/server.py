@@ -0,0 +1,130 @@
+import json
+import math
+import asyncio
+import argparse
+import tornado.web
+from app.service import AnalysisService
+from app.workers import SCORER_BUILDERS
+
+## This module serves an AnalysisService over HTTP with Tornado on the asyncio event loop. The service process starts once and keeps the warmed scorers and the price histories in memory, so a client pays only for its own request instead of the interpreter, pandas and NLTK start-up per job.
+##   POST /score        {"headlines": [...], "scorer": "vader"}                       -> {"scores": [...]}
+##   POST /correlation  {"ticker": "AAPL", "headlines": [...], "dates": [...],
+##                       "horizons": [1, 5], "intraday": true, "scorer": "vader"}     -> {"results": [...]}
+##   GET  /metrics      p50/p99 latency, throughput and micro-batch sizes per endpoint
+##   GET  /health       loaded tickers and scorers
+## Run it with: python -m app.server --tickers AAPL TSLA --workers 2
+
+
+def _clean(value):
+    # NaN is not valid JSON; send null instead
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _clean(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clean(item) for item in value]
+    return value
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, service):
+        self.service = service
+
+    def body(self):
+        try:
+            return json.loads(self.request.body or b'{}')
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="Request body is not valid JSON.")
+
+    def reply(self, payload):
+        self.set_header('Content-Type', 'application/json')
+        self.finish(json.dumps(_clean(payload)))
+
+    def write_error(self, status_code, **kwargs):
+        self.set_header('Content-Type', 'application/json')
+        self.finish(json.dumps({'error': self._reason}))
+
+    async def call(self, coroutine):
+        # Await a service call, turning bad input into 400 and unknown tickers into 404
+        try:
+            return await coroutine
+        except KeyError as exc:
+            raise tornado.web.HTTPError(404, reason=str(exc.args[0]) if exc.args else "Not found.")
+        except (ValueError, TypeError) as exc:
+            raise tornado.web.HTTPError(400, reason=str(exc))
+
+
+class ScoreHandler(BaseHandler):
+    async def post(self):
+        body = self.body()
+        if not isinstance(body.get('headlines'), list):
+            raise tornado.web.HTTPError(400, reason="'headlines' must be a list of strings.")
+        scores = await self.call(self.service.score(body['headlines'], body.get('scorer')))
+        self.reply({'scores': scores})
+
+
+class CorrelationHandler(BaseHandler):
+    async def post(self):
+        body = self.body()
+        if not isinstance(body.get('headlines'), list) or not isinstance(body.get('dates'), list):
+            raise tornado.web.HTTPError(400, reason="'headlines' and 'dates' must be lists.")
+        results = await self.call(self.service.correlate(
+            body.get('ticker'), body['headlines'], body['dates'], body.get('horizons', [1, 5]),
+            body.get('intraday', True), body.get('scorer')))
+        self.reply({'results': results})
+
+
+class MetricsHandler(BaseHandler):
+    def get(self):
+        self.reply(self.service.metrics.snapshot())
+
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        self.reply({'status': 'ok', 'scorers': list(self.service.scorers), 'tickers': sorted(self.service.prices)})
+
+
+def make_app(service):
+    # Tornado application routing the endpoints to one service
+    args = {'service': service}
+    return tornado.web.Application([
+        (r'/score', ScoreHandler, args),
+        (r'/correlation', CorrelationHandler, args),
+        (r'/metrics', MetricsHandler, args),
+        (r'/health', HealthHandler, args),
+    ])
+
+
+async def serve(service, port=8888, address='127.0.0.1'):
+    # Start the service and the HTTP server, and run until cancelled
+    await service.start()
+    server = make_app(service).listen(port, address=address)
+    print(f"Listening on http://{address}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        server.stop()
+        await service.close()
+
+
+if __name__ == '__main__':
+    from scripts.utils import load_price_panel
+    parser = argparse.ArgumentParser(description="Serve headline scoring and sentiment/return correlation over HTTP.")
+    parser.add_argument('--base-dir', default="../data")
+    parser.add_argument('--tickers', nargs='*', default=None, help="Price histories to preload (default: all)")
+    parser.add_argument('--scorers', nargs='+', default=['vader'], choices=sorted(SCORER_BUILDERS))
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes (0 = in-process thread)")
+    parser.add_argument('--window-ms', type=float, default=5.0, help="Micro-batching window")
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--port', type=int, default=8888)
+    parser.add_argument('--address', default='127.0.0.1')
+    args = parser.parse_args()
+    panel = load_price_panel(args.tickers, base_dir=args.base_dir)
+    prices = {ticker: frame.drop(columns='stock').reset_index(drop=True)
+              for ticker, frame in panel.groupby(panel['stock'].astype(object), sort=True)}
+    service = AnalysisService(prices, scorers=args.scorers, n_workers=args.workers, window=args.window_ms / 1000.0,
+                              max_batch=args.max_batch)
+    try:
+        asyncio.run(serve(service, args.port, args.address))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,113 @@
+import time
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from app.batcher import MicroBatcher
+from app.metrics import ServiceMetrics
+from app import workers
+
+## This module is the transport-independent core of the scoring service. An AnalysisService owns a process pool whose workers load the scorers and price histories once at start-up, one micro-batcher per endpoint, and the latency metrics. Request handlers (see app/server.py) only decode JSON and await the service's coroutines; all CPU-bound work runs in the pool, so the event loop stays free to accept and batch more requests.
+
+
+class AnalysisService:
+    def __init__(self, prices=None, scorers=('vader',), n_workers=1, window=0.005, max_batch=256):
+        """
+        Args:
+            prices (dict or None): Ticker -> price DataFrame kept in memory for the correlation endpoint
+            scorers (iterable of str): Scorers to load ('vader', 'textblob'); the first is the default
+            n_workers (int): Worker processes; 0 runs the batches in a thread of this process (for tests and
+                debugging, the event loop is still not blocked)
+            window (float): Micro-batching window in seconds
+            max_batch (int): Requests that close a batch early
+        """
+        if n_workers < 0:
+            raise ValueError("n_workers must be at least 0.")
+        self.prices = dict(prices or {})
+        self.scorers = tuple(scorers)
+        self.n_workers = n_workers
+        self.window = window
+        self.max_batch = max_batch
+        self.metrics = ServiceMetrics()
+        self.executor = None
+        self.batchers = {}
+
+    async def start(self):
+        # Start the pool and wait until every worker has built its scorers
+        if self.n_workers:
+            self.executor = ProcessPoolExecutor(max_workers=self.n_workers, initializer=workers.init_worker,
+                                                initargs=(self.scorers, self.prices))
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[loop.run_in_executor(self.executor, workers.worker_info)
+                                   for _ in range(self.n_workers)])
+        else:
+            workers.init_worker(self.scorers, self.prices)
+        self.batchers = {
+            'score': MicroBatcher(workers.score_batch, self.executor, self.window, self.max_batch, 'score',
+                                  self.metrics),
+            'correlation': MicroBatcher(workers.correlate_batch, self.executor, self.window, self.max_batch,
+                                        'correlation', self.metrics),
+        }
+        print(f"Analysis service ready: {self.n_workers or 'in-process'} worker(s), scorers {list(self.scorers)}, "
+              f"{len(self.prices)} price histories.")
+        return self
+
+    async def close(self):
+        for batcher in self.batchers.values():
+            await batcher.drain()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    async def _timed(self, endpoint, build):
+        # Validate and build one request, submit it to the endpoint's batcher and record the end-to-end latency
+        start = time.perf_counter()
+        try:
+            result = await self.batchers[endpoint].submit(build())
+        except Exception:
+            self.metrics.record(endpoint, time.perf_counter() - start, error=True)
+            raise
+        self.metrics.record(endpoint, time.perf_counter() - start)
+        return result
+
+    def _scorer(self, scorer):
+        scorer = scorer or self.scorers[0]
+        if scorer not in self.scorers:
+            raise ValueError(f"Unknown scorer '{scorer}'. Available: {list(self.scorers)}.")
+        return scorer
+
+    async def score(self, headlines, scorer=None):
+        """
+        Sentiment scores of headlines.
+        Args:
+            headlines (list of str): Headlines
+            scorer (str or None): 'vader' (compound) or 'textblob' (polarity); None = the default scorer
+        Returns:
+            list: Scores in input order
+        """
+        def build():
+            return {'headlines': [str(text) for text in headlines], 'scorer': self._scorer(scorer)}
+        return await self._timed('score', build)
+
+    async def correlate(self, ticker, headlines, dates, horizons=(1, 5), intraday=True, scorer=None):
+        """
+        Correlate a ticker's article sentiment with its forward session returns.
+        Args:
+            ticker (str): Ticker with a loaded price history
+            headlines (list of str): Article headlines
+            dates (list of str): Publication timestamps (with an offset, or in exchange time)
+            horizons (iterable of int): Forward return horizons in sessions
+            intraday (bool): Also correlate with the event session's open-to-close return
+            scorer (str or None): Scorer name (None = the default scorer)
+        Returns:
+            list: One dict per horizon with ticker, horizon, n, articles and Pearson/Spearman r and p-values
+        """
+        def build():
+            if ticker not in self.prices:
+                raise KeyError(f"No price history loaded for '{ticker}'.")
+            if len(headlines) != len(dates):
+                raise ValueError("headlines and dates must have the same length.")
+            steps = [int(h) for h in horizons]
+            if not steps or min(steps) < 1:
+                raise ValueError("horizons must be positive integers.")
+            return {'ticker': ticker, 'headlines': [str(text) for text in headlines], 'dates': list(dates),
+                    'horizons': steps, 'intraday': bool(intraday), 'scorer': self._scorer(scorer)}
+        return await self._timed('correlation', build)
@@ -0,0 +1,115 @@
+import numpy as np
+from scripts.correlation_batch import _correlate_ticker
+from scripts.event_join import to_utc_ns
+
+## This module holds the batch handlers that run in the service's worker processes. init_worker builds the sentiment scorers (VADER's SentimentIntensityAnalyzer, TextBlob) once per process, warms them with one call so the first request does not pay for lexicon loading, and keeps the preloaded price histories. The handlers take a whole micro-batch of requests: headlines repeated across the requests of a batch are scored once, and the per-ticker correlation reuses the session join and correlation stage of scripts/correlation_batch.py.
+
+# Scorers and price histories owned by the current process (pool worker, or the service process in in-process mode)
+_scorers = {}
+_prices = {}
+
+
+def _build_vader():
+    from scripts.nltk_resources import default_manager
+    polarity_scores = default_manager().vader_analyzer().polarity_scores
+    return lambda texts: [polarity_scores(text)['compound'] for text in texts]
+
+
+def _build_textblob():
+    from textblob import TextBlob
+    return lambda texts: [TextBlob(text).sentiment.polarity for text in texts]
+
+
+def _build_lexicon(kind):
+    # Vectorized lexicon scorer; scores a whole micro-batch in one pass
+    from scripts.lexicon_scorer import lexicon_scorer
+    scorer = lexicon_scorer(kind)
+    return lambda texts: scorer.score(texts).tolist()
+
+
+# scorer name -> builder of a function scoring a list of texts
+SCORER_BUILDERS = {
+    'vader': _build_vader,
+    'textblob': _build_textblob,
+    'vader_lexicon': lambda: _build_lexicon('vader'),
+    'textblob_lexicon': lambda: _build_lexicon('textblob'),
+}
+
+
+def init_worker(scorers=('vader',), prices=None):
+    """
+    Build and warm the scorers and keep the price histories in this process.
+    Args:
+        scorers (iterable of str): Scorer names from SCORER_BUILDERS
+        prices (dict or None): Ticker -> price DataFrame (Date, Open, Close, ...)
+    """
+    for name in scorers:
+        if name not in _scorers:
+            _scorers[name] = SCORER_BUILDERS[name]()
+            _scorers[name](["Stocks rally as earnings beat estimates"])
+    if prices is not None:
+        _prices.update(prices)
+
+
+def worker_info(_=None):
+    # Loaded scorers and tickers of this process (also used to start the pool's workers up front)
+    return {'scorers': sorted(_scorers), 'tickers': sorted(_prices)}
+
+
+def _score_unique(texts, scorer):
+    # Score a list of texts, each distinct text once
+    unique = list(dict.fromkeys(texts))
+    scores = dict(zip(unique, _scorers[scorer](unique)))
+    return [scores[text] for text in texts]
+
+
+def _check_scorer(scorer):
+    if scorer not in _scorers:
+        return ValueError(f"Scorer '{scorer}' is not loaded. Available: {sorted(_scorers)}.")
+    return None
+
+
+def score_batch(requests):
+    """
+    Score the headlines of a micro-batch of requests.
+    Args:
+        requests (list of dict): {'headlines': [...], 'scorer': 'vader'}
+    Returns:
+        list: Scores per request (or a ValueError for an unknown scorer)
+    """
+    results = [_check_scorer(request['scorer']) for request in requests]
+    for scorer in {request['scorer'] for request in requests if request['scorer'] in _scorers}:
+        members = [i for i, request in enumerate(requests) if request['scorer'] == scorer]
+        texts = [text for i in members for text in requests[i]['headlines']]
+        scores = _score_unique(texts, scorer)
+        start = 0
+        for i in members:
+            count = len(requests[i]['headlines'])
+            results[i] = scores[start:start + count]
+            start += count
+    return results
+
+
+def correlate_batch(requests):
+    """
+    Correlate session sentiment with forward returns for a micro-batch of per-ticker requests.
+    Args:
+        requests (list of dict): {'ticker', 'headlines', 'dates', 'horizons', 'intraday', 'scorer'}
+    Returns:
+        list: Result rows per request (see correlation_batch.RESULT_COLUMNS), or a KeyError/ValueError
+    """
+    results = []
+    for request in requests:
+        error = _check_scorer(request['scorer'])
+        if error is None and request['ticker'] not in _prices:
+            error = KeyError(f"No price history loaded for '{request['ticker']}'.")
+        if error is not None:
+            results.append(error)
+            continue
+        sentiment = np.asarray(_score_unique(request['headlines'], request['scorer']), dtype='float64')
+        published, valid = to_utc_ns(request['dates'])
+        published = np.where(valid, published, np.iinfo(np.int64).min).astype('datetime64[ns]')
+        rows, _ = _correlate_ticker(request['ticker'], published, sentiment, _prices[request['ticker']],
+                                    tuple(request['horizons']), request['intraday'])
+        results.append(rows)
+    return results
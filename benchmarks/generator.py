@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+## This script generates deterministic synthetic data shaped like the project inputs: FNSPID news rows (headline, url, publisher, date with a UTC-4 offset, stock) and OHLCV price histories. The same (rows, seed) always gives the same frame, so benchmark runs on different machines or commits measure the same work. Generation is vectorized so that 10M-row frames can be built in seconds.
+
+SIZES = {'10k': 10_000, '1M': 1_000_000, '10M': 10_000_000}
+
+TICKERS = ['AAPL', 'AMZN', 'GOOG', 'META', 'MSFT', 'NVDA', 'TSLA', 'A', 'AA', 'AAL', 'ABBV', 'ABC', 'ADBE', 'AMD']
+PUBLISHERS = [
+    'Paul Quintaro', 'Lisa Levin', 'Benzinga Newsdesk', 'Charles Gross', 'Monica Gerson', 'Eddie Staley',
+    'Hal Lindon', 'ETF Professor', 'Juan Carlos Lopez', 'Benzinga Staff', 'Vick Meyer', 'webmaster',
+    'Benzinga_Newsdesk', 'Zacks', 'Jayson Derrick', 'Allie Wickman', 'Shanthi Rexaline', 'Craig Jones',
+    'Wayne Duggan', 'Nelson Hem', 'vishwanath@benzinga.com', 'Arianna@Benzinga.com', 'Jacob Gold',
+]
+SUBJECTS = ['Shares', 'Stock', 'Options', 'Q3 EPS', 'Q4 Sales', 'Price Target', 'Earnings', 'Guidance', 'Dividend']
+ACTIONS = [
+    'hits new 52-week high', 'trading lower', 'trading higher', 'beats estimates', 'misses estimates',
+    'upgraded to Buy', 'downgraded to Sell', 'raised to $150', 'lowered to $90', 'maintains Neutral rating',
+    'surge after FDA approval', 'fall on weak guidance', 'announces buyback', 'reports record revenue',
+]
+SUFFIXES = ['', ' in Pre-Market', ' amid sector rally', ' after analyst call', ', Up 5%', ', Down 3%', ' this week']
+
+
+def _choice(rng, values, n, p=None):
+    return np.asarray(values, dtype=object)[rng.choice(len(values), n, p=p)]
+
+
+def make_news(n_rows, seed=0, start='2011-04-27', days=3300, tickers=TICKERS):
+    """
+    Build a news frame with the raw_analyst_ratings.csv columns.
+    Args:
+        n_rows (int): Number of articles
+        seed (int): Random seed
+        start (str): First publication date
+        days (int): Number of days the publication dates are spread over
+        tickers (list): Stock symbols to draw from
+    Returns:
+        DataFrame: Unnamed index column plus headline, url, publisher, date ('YYYY-MM-DD HH:MM:SS-04:00') and stock
+    """
+    rng = np.random.default_rng(seed)
+    # Publishers and tickers are skewed, as in the real data (a few publishers write most articles)
+    publisher_weights = 1.0 / np.arange(1, len(PUBLISHERS) + 1) ** 1.2
+    ticker_weights = 1.0 / np.arange(1, len(tickers) + 1) ** 0.5
+    stock = pd.Categorical.from_codes(rng.choice(len(tickers), n_rows, p=ticker_weights / ticker_weights.sum()),
+                                      categories=list(tickers))
+    publisher = pd.Categorical.from_codes(
+        rng.choice(len(PUBLISHERS), n_rows, p=publisher_weights / publisher_weights.sum()), categories=PUBLISHERS
+    )
+    # Headlines come from a finite set of templates, so many repeat exactly (as in the real feed)
+    headline = (pd.Series(stock).astype(str) + ' ' + _choice(rng, SUBJECTS, n_rows) + ' '
+                + _choice(rng, ACTIONS, n_rows) + _choice(rng, SUFFIXES, n_rows))
+    # Publication times: mostly between 07:00 and 18:00, the rest spread over the whole day (weekends included)
+    day = rng.integers(0, days, n_rows)
+    minute = np.where(rng.random(n_rows) < 0.8, rng.integers(7 * 60, 18 * 60, n_rows), rng.integers(0, 24 * 60, n_rows))
+    timestamps = pd.Timestamp(start) + pd.to_timedelta(day, unit='D') + pd.to_timedelta(minute, unit='min')
+    date = pd.Series(timestamps.strftime('%Y-%m-%d %H:%M:%S')) + '-04:00'
+    url = 'https://www.benzinga.com/news/' + pd.Series(np.arange(n_rows)).astype(str)
+    return pd.DataFrame({
+        'Unnamed: 0': np.arange(n_rows),
+        'headline': headline.to_numpy(),
+        'url': url.to_numpy(),
+        'publisher': np.asarray(publisher, dtype=object),
+        'date': date.to_numpy(),
+        'stock': np.asarray(stock, dtype=object),
+    })
+
+
+def make_prices(n_rows, seed=0, start='1980-12-12', freq='B'):
+    """
+    Build one OHLCV history with the yfinance_data CSV columns (geometric random walk).
+    Args:
+        n_rows (int): Number of bars
+        seed (int): Random seed
+        start (str): First bar date
+        freq (str): Bar frequency; histories longer than the business-day calendar allows should use e.g. 'min'
+    Returns:
+        DataFrame: Date (as 'YYYY-MM-DD' strings for daily bars), Open, High, Low, Close, Adj Close, Volume,
+            Dividends, Stock Splits
+    """
+    rng = np.random.default_rng(seed)
+    daily = freq in ('B', 'D')
+    # Smaller steps for intraday bars keep long histories within float range
+    drift, sigma = (0.0003, 0.02) if daily else (0.0, 0.001)
+    close = 20.0 * np.exp(np.cumsum(rng.normal(drift, sigma, n_rows)))
+    open_ = close * np.exp(rng.normal(0, 0.005, n_rows))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, n_rows)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, n_rows)))
+    dates = pd.date_range(start, periods=n_rows, freq=freq)
+    return pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d') if daily else dates.strftime('%Y-%m-%d %H:%M:%S'),
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Adj Close': close,
+        'Volume': rng.integers(1_000_000, 100_000_000, n_rows),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    })
+
+
+def price_frequency(n_rows, start='1980-12-12'):
+    # Business days from the default start run past the Timestamp range (2262) after about 73k bars; use minute bars
+    # beyond what the calendar from start can hold
+    capacity = np.busday_count(pd.Timestamp(start).date(), pd.Timestamp.max.date())
+    return 'B' if n_rows <= capacity else 'min'
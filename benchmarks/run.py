@@ -0,0 +1,269 @@
+import os
+import io
+import sys
+import gc
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import contextlib
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from benchmarks.generator import SIZES, make_news, make_prices, price_frequency
+
+## This script times and memory-profiles the key analyzer methods on synthetic data (see generator.py) and compares the results with a stored baseline. Each case has a setup step (building a fresh analyzer on a copy of the input, not timed) and a measured step; wall time is the best of several repeats and peak memory is measured with tracemalloc in a separate run so tracing does not distort the timings. Results are written as JSON; with --baseline, every case slower or larger than the configured thresholds, or missing from the baseline, is reported and the exit status is 1.
+#
+# Usage: python -m benchmarks.run --sizes 10k 1M --baseline benchmarks/baseline.json
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'latest.json')
+
+
+class BenchmarkData:
+    # Generated inputs for one size, built once and shared by the cases
+
+    def __init__(self, rows, seed=0):
+        self.rows = rows
+        self.seed = seed
+        self._news = None
+        self._prices = None
+        self._daily_prices = None
+
+    @property
+    def news(self):
+        if self._news is None:
+            self._news = make_news(self.rows, seed=self.seed)
+        return self._news
+
+    @property
+    def prices(self):
+        if self._prices is None:
+            self._prices = make_prices(self.rows, seed=self.seed, freq=price_frequency(self.rows))
+        return self._prices
+
+    @property
+    def daily_prices(self):
+        # Daily bars covering the news date range, for the correlation cases
+        if self._daily_prices is None:
+            self._daily_prices = make_prices(2400, seed=self.seed, start='2011-01-03')
+        return self._daily_prices
+
+
+# ----- cases: setup(data) -> state (not timed), run(state) (timed) -----
+
+def _article_analyzer(data):
+    from scripts.sentiment_analysis import ArticleDataAnalyzer
+    return ArticleDataAnalyzer(data.news.copy(), render='off')
+
+
+def _formatted_article_analyzer(data):
+    analyzer = _article_analyzer(data)
+    analyzer.format_datetime(compact=True)
+    return analyzer
+
+
+def _prepared_financial_analyzer(data):
+    from scripts.financial_analysis import FinancialDataAnalyzer
+    analyzer = FinancialDataAnalyzer(data.prices.copy(), 'AAPL', render='off')
+    analyzer.change_to_datetime()
+    return analyzer
+
+
+def _correlation_analyzer(data):
+    from scripts.correlation_analysis import CorrelationAnalyzer
+    return CorrelationAnalyzer(data.news[['headline', 'date', 'stock']].copy(), data.daily_prices.copy(), 'AAPL',
+                               render='off')
+
+
+def _aligned_correlation_analyzer(data):
+    analyzer = _correlation_analyzer(data)
+    analyzer.align_by_date()
+    analyzer.analyze_sentiment()
+    analyzer.calculate_daily_returns()
+    return analyzer
+
+
+def _stopwords_analyzer(data):
+    analyzer = _article_analyzer(data)
+    analyzer.stop_words  # load outside the timed step
+    return analyzer
+
+
+CASES = {
+    'ArticleDataAnalyzer.format_datetime': (_article_analyzer, lambda a: a.format_datetime(), ()),
+    'ArticleDataAnalyzer.format_datetime_compact': (_article_analyzer, lambda a: a.format_datetime(compact=True), ()),
+    'ArticleDataAnalyzer.build_sentiment_cube': (_formatted_article_analyzer, lambda a: a.build_sentiment_cube(), ()),
+    'ArticleDataAnalyzer.sentiment_analysis': (_article_analyzer, lambda a: a.sentiment_analysis(), ('vader_lexicon',)),
+    'ArticleDataAnalyzer.sentiment_analysis_lexicon': (
+        _article_analyzer, lambda a: a.sentiment_analysis(backend='lexicon'), ('vader_lexicon',)
+    ),
+    'ArticleDataAnalyzer.identify_common_words_and_phrases': (
+        _stopwords_analyzer, lambda a: a.identify_common_words_and_phrases(), ('stopwords',)
+    ),
+    'FinancialDataAnalyzer.calculate_technical_indicators': (
+        _prepared_financial_analyzer, lambda a: a.calculate_technical_indicators(), ()
+    ),
+    'FinancialDataAnalyzer.analyze_stock_price_trends': (
+        _prepared_financial_analyzer, lambda a: a.analyze_stock_price_trends(), ()
+    ),
+    'CorrelationAnalyzer.align_by_date': (_correlation_analyzer, lambda a: a.align_by_date(), ()),
+    'CorrelationAnalyzer.merge_and_correlate': (_aligned_correlation_analyzer, lambda a: a.merge_and_correlate(), ()),
+}
+
+
+def missing_resources(names):
+    if not names:
+        return []
+    from scripts.nltk_resources import default_manager
+    return default_manager().missing(list(names))
+
+
+def measure(setup, run, data, repeat=3, memory=True):
+    """
+    Time run(setup(data)) repeat times and optionally measure its peak traced memory once more.
+    Returns:
+        dict: seconds (best), mean_seconds, repeats and peak_memory_mb (None without memory)
+    """
+    timings = []
+    for _ in range(repeat):
+        state = setup(data)
+        gc.collect()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run(state)
+            timings.append(time.perf_counter() - start)
+        del state
+    peak = None
+    if memory:
+        state = setup(data)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                run(state)
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+        del state
+    return {'seconds': min(timings), 'mean_seconds': float(np.mean(timings)), 'repeats': repeat, 'peak_memory_mb': peak}
+
+
+def run_benchmarks(sizes=('10k',), cases=None, repeat=3, memory=True, seed=0):
+    """
+    Run the selected cases at the selected sizes.
+    Returns:
+        dict: {'meta': environment info, 'results': one entry per (case, size)}
+    """
+    results = []
+    for size in sizes:
+        data = BenchmarkData(SIZES[size] if size in SIZES else int(size), seed)
+        for name in cases or CASES:
+            setup, run, resources = CASES[name]
+            entry = {'case': name, 'size': size, 'rows': data.rows}
+            missing = missing_resources(resources)
+            if missing:
+                entry.update(status='skipped', reason=f"missing NLTK resources: {', '.join(missing)}")
+            else:
+                entry.update(status='ok', **measure(setup, run, data, repeat, memory))
+            print(_format_entry(entry))
+            results.append(entry)
+    return {'meta': environment(seed), 'results': results}
+
+
+def environment(seed):
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'seed': seed,
+    }
+
+
+def _format_entry(entry):
+    if entry['status'] != 'ok':
+        return f"{entry['case']:55s} {entry['size']:>5s}  skipped ({entry['reason']})"
+    memory = f"{entry['peak_memory_mb']:9.1f} MB" if entry['peak_memory_mb'] is not None else ''
+    return f"{entry['case']:55s} {entry['size']:>5s} {entry['seconds']:10.4f} s {memory}"
+
+
+def compare(current, baseline, time_threshold=0.25, memory_threshold=0.25, min_seconds=0.01):
+    """
+    Compare a run with a baseline run.
+    Args:
+        current, baseline (dict): Outputs of run_benchmarks (or loaded JSON files)
+        time_threshold (float): Allowed relative slowdown (0.25 = 25% slower)
+        memory_threshold (float): Allowed relative growth of peak memory
+        min_seconds (float): Cases faster than this in the baseline are not checked for time (timer noise)
+    Returns:
+        list: Regressions as dicts with case, size, metric, baseline, current and ratio; cases that ran but have
+        no baseline entry are listed with metric 'missing' (refresh the baseline with --update-baseline)
+    """
+    reference = {(r['case'], r['size']): r for r in baseline['results'] if r.get('status') == 'ok'}
+    regressions = []
+    for result in current['results']:
+        if result.get('status') != 'ok':
+            continue
+        base = reference.get((result['case'], result['size']))
+        if base is None:
+            regressions.append({'case': result['case'], 'size': result['size'], 'metric': 'missing',
+                                'baseline': None, 'current': result['seconds'], 'ratio': None})
+            continue
+        checks = [('seconds', time_threshold)]
+        if result.get('peak_memory_mb') is not None and base.get('peak_memory_mb'):
+            checks.append(('peak_memory_mb', memory_threshold))
+        for metric, threshold in checks:
+            if metric == 'seconds' and base['seconds'] < min_seconds:
+                continue
+            ratio = result[metric] / base[metric]
+            if ratio > 1 + threshold:
+                regressions.append({'case': result['case'], 'size': result['size'], 'metric': metric,
+                                    'baseline': base[metric], 'current': result[metric], 'ratio': ratio})
+    return regressions
+
+
+def save(report, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the analyzers on synthetic FNSPID-shaped data.")
+    parser.add_argument('--sizes', nargs='*', default=['10k'], help=f"Row counts: {', '.join(SIZES)} or an integer")
+    parser.add_argument('--cases', nargs='*', default=None, choices=list(CASES), metavar='CASE')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc run")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=None, help="Baseline JSON to compare against")
+    parser.add_argument('--time-threshold', type=float, default=0.25)
+    parser.add_argument('--memory-threshold', type=float, default=0.25)
+    parser.add_argument('--update-baseline', action='store_true', help="Write this run to --baseline")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.cases, args.repeat, not args.no_memory, args.seed)
+    save(report, args.output)
+    print(f"Results written to {args.output}")
+    if args.baseline and args.update_baseline:
+        save(report, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+    elif args.baseline:
+        regressions = compare(report, load(args.baseline), args.time_threshold, args.memory_threshold)
+        for r in regressions:
+            if r['metric'] == 'missing':
+                print(f"MISSING    {r['case']} [{r['size']}]: not in the baseline, rerun with --update-baseline")
+                continue
+            print(f"REGRESSION {r['case']} [{r['size']}] {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} "
+                  f"({r['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
@@ -0,0 +1,230 @@
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scripts.cross_correlation import CrossCorrelationEngine
+
+## This script backtests news sentiment as a trading signal. Articles are mapped onto trading sessions with EventJoiner, and the mean sentiment of each (ticker, session) is compared with a positive and a negative threshold: +1 (long) at or above pos_th, -1 (short) at or below neg_th, 0 (flat) otherwise or without news. A signal is known at the close of its session, so it first earns the next session's return (no look-ahead). With a holding period of H sessions, every signal opens a 1/H slice that is held for H sessions (overlapping portfolios), so the position is the H-session moving sum of the signals divided by H. The position is a difference of cumulative sums, which holds for every H at once. The signals of all threshold pairs, holding periods, tickers and sessions form one broadcasted (holding x pair x ticker x session) array; the grid is split into chunks to bound memory, and large grids can spread the chunks over worker processes. Per-ticker results come with an equal-weighted portfolio ('ALL') over the tickers trading each session.
+
+RESULT_COLUMNS = ['ticker', 'pos_th', 'neg_th', 'holding', 'days', 'total_return', 'annual_return', 'annual_volatility',
+                  'sharpe', 'hit_rate', 'turnover', 'exposure']
+PORTFOLIO = 'ALL'
+
+
+def _metrics(pnl, valid, position, change, periods_per_year):
+    """
+    Performance statistics over the last axis (sessions).
+    Args:
+        pnl (ndarray): Strategy returns (0 where there is no return)
+        valid (ndarray): Sessions with a return, broadcastable to pnl
+        position, change (ndarray): Absolute positions and absolute position changes, like pnl
+        periods_per_year (int): Sessions per year used for annualizing
+    Returns:
+        dict: Arrays of the RESULT_COLUMNS statistics, one value per leading index
+    """
+    days = np.broadcast_to(valid, pnl.shape).sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = pnl.sum(axis=-1) / days
+        variance = ((pnl * pnl).sum(axis=-1) - days * mean * mean) / (days - 1)
+        std = np.sqrt(np.maximum(variance, 0.0))
+        sharpe = np.where(std > 1e-12, mean / std * np.sqrt(periods_per_year), np.nan)
+        hit_rate = (pnl > 0).sum(axis=-1) / (pnl != 0).sum(axis=-1)
+        return {
+            'days': days,
+            'total_return': np.expm1(np.log1p(pnl).sum(axis=-1)),
+            'annual_return': mean * periods_per_year,
+            'annual_volatility': std * np.sqrt(periods_per_year),
+            'sharpe': sharpe,
+            'hit_rate': hit_rate,
+            'turnover': (change * valid).sum(axis=-1) / days,
+            'exposure': (position * valid).sum(axis=-1) / days,
+        }
+
+
+def _evaluate_chunk(sentiment, returns, pos, neg, holdings, periods_per_year, per_ticker):
+    """
+    Backtest a chunk of threshold pairs for all holding periods in one broadcasted computation.
+    Args:
+        sentiment (ndarray): (ticker x session) mean sentiment, NaN without news
+        returns (ndarray): (ticker x session) return of the next session, NaN without one
+        pos, neg (ndarray): Threshold pairs of the chunk
+        holdings (ndarray): Holding periods in sessions
+        periods_per_year (int): Sessions per year
+        per_ticker (bool): Also return per-ticker statistics
+    Returns:
+        dict: 'portfolio' statistics of shape (holding x pair), and 'ticker' of shape (holding x pair x ticker)
+    """
+    # (pair x ticker x session) signals; NaN sentiment compares False and stays flat
+    signal = ((sentiment >= pos[:, None, None]).astype('int8') - (sentiment <= neg[:, None, None]).astype('int8'))
+    cumulative = np.concatenate([np.zeros(signal.shape[:-1] + (1,)), np.cumsum(signal, axis=-1, dtype='float64')],
+                                axis=-1)
+    n = sentiment.shape[-1]
+    # Position at session d: signals of sessions d - H + 1 .. d, each worth 1/H
+    end = np.arange(1, n + 1)
+    start = np.maximum(end[None, :] - holdings[:, None], 0)
+    position = (cumulative[None, ..., end] - np.take(cumulative, start, axis=-1).transpose(2, 0, 1, 3)) \
+        / holdings[:, None, None, None]
+    valid = ~np.isnan(returns)
+    pnl = position * np.where(valid, returns, 0.0)
+    change = np.abs(np.diff(position, axis=-1, prepend=0.0))
+    # Equal-weighted portfolio over the tickers with a return in each session
+    traded = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(traded > 0, 1.0 / traded, 0.0)
+    result = {'portfolio': _metrics((pnl * weight).sum(axis=-2), traded > 0, (np.abs(position) * weight * valid).sum(axis=-2),
+                                    (change * weight * valid).sum(axis=-2), periods_per_year)}
+    if per_ticker:
+        result['ticker'] = _metrics(pnl, valid, np.abs(position), change, periods_per_year)
+    return result
+
+
+class SentimentBacktester:
+    def __init__(self, pos_thresholds=(0.05, 0.1, 0.2, 0.3, 0.5), neg_thresholds=(-0.05, -0.1, -0.2, -0.3, -0.5),
+                 holding_periods=(1, 2, 5, 10), periods_per_year=252, max_cells=2_000_000, n_workers=1,
+                 ticker_col='stock', news_date_col='date', price_date_col='Date'):
+        """
+        Args:
+            pos_thresholds (iterable of float): Long thresholds (session sentiment >= pos_th)
+            neg_thresholds (iterable of float): Short thresholds (session sentiment <= neg_th); pairs with
+                neg_th >= pos_th are skipped
+            holding_periods (iterable of int): Sessions each signal is held for
+            periods_per_year (int): Sessions per year used to annualize returns, volatility and Sharpe
+            max_cells (int): Largest (holding x pair x ticker x session) array evaluated at once
+            n_workers (int or None): Processes the grid chunks are spread over (None = all cores, 1 = in-process)
+            ticker_col, news_date_col, price_date_col (str): Column names (see EventJoiner)
+        """
+        pos = np.asarray(sorted(set(float(v) for v in pos_thresholds)), dtype='float64')
+        neg = np.asarray(sorted(set(float(v) for v in neg_thresholds)), dtype='float64')
+        pos_grid, neg_grid = np.meshgrid(pos, neg, indexing='ij')
+        keep = (neg_grid < pos_grid).ravel()
+        if not keep.any():
+            raise ValueError("No threshold pair with neg_th < pos_th.")
+        self.pairs = np.column_stack([pos_grid.ravel()[keep], neg_grid.ravel()[keep]])
+        self.holding_periods = np.asarray(sorted(set(int(h) for h in holding_periods)), dtype='int64')
+        if len(self.holding_periods) == 0 or self.holding_periods[0] < 1:
+            raise ValueError("Holding periods must be positive numbers of sessions.")
+        self.periods_per_year = periods_per_year
+        self.max_cells = max_cells
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.ticker_col = ticker_col
+        self.engine = CrossCorrelationEngine(horizons=(1,), intraday=False, ticker_col=ticker_col,
+                                             news_date_col=news_date_col, price_date_col=price_date_col)
+
+    def session_panel(self, news, prices, value_col='sentiment_score', value=None):
+        """
+        Session sentiment and next-session returns as dense (ticker x session) matrices on the union calendar.
+        Returns:
+            tuple: (sentiment, returns, tickers, session dates); returns[:, d] is the return earned by a position
+                taken at the close of session d
+        """
+        sessions, sentiment = self.engine.session_sentiment(news, prices, value_col, value)
+        dates, column = np.unique(sessions['session_date'].to_numpy(), return_inverse=True)
+        codes = sessions['_code'].to_numpy()
+        has_ticker = self.ticker_col in sessions.columns
+        tickers = list(sessions[self.ticker_col].cat.categories) if has_ticker else ['']
+        shape = (len(tickers), len(dates))
+        daily = np.full(shape, np.nan)
+        signal = np.full(shape, np.nan)
+        signal[codes, column] = sentiment
+        daily[codes, column] = sessions['fwd_return_1'].to_numpy()
+        returns = np.full(shape, np.nan)
+        returns[:, :-1] = daily[:, 1:]
+        return signal, returns, tickers, pd.DatetimeIndex(dates)
+
+    def _chunks(self, n_tickers, n_sessions):
+        # Threshold-pair chunks small enough for max_cells, and at least one per worker
+        per_pair = len(self.holding_periods) * max(n_tickers, 1) * max(n_sessions, 1)
+        size = max(1, self.max_cells // per_pair)
+        count = max(int(np.ceil(len(self.pairs) / size)), min(self.n_workers, len(self.pairs)))
+        return [chunk for chunk in np.array_split(np.arange(len(self.pairs)), count) if len(chunk)]
+
+    def run_matrices(self, sentiment, returns, tickers=None, per_ticker=True):
+        """
+        Backtest every (pos_th, neg_th, holding) combination on prepared matrices (see session_panel).
+        Returns:
+            DataFrame: RESULT_COLUMNS per combination, for the portfolio ('ALL') and, with per_ticker, each ticker
+        """
+        sentiment = np.atleast_2d(np.asarray(sentiment, dtype='float64'))
+        returns = np.atleast_2d(np.asarray(returns, dtype='float64'))
+        tickers = [str(i) for i in range(len(sentiment))] if tickers is None else list(tickers)
+        chunks = self._chunks(*sentiment.shape)
+        args = [(sentiment, returns, self.pairs[idx, 0], self.pairs[idx, 1], self.holding_periods,
+                 self.periods_per_year, per_ticker) for idx in chunks]
+        if self.n_workers > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_workers, len(args))) as executor:
+                parts = list(executor.map(_evaluate_chunk, *zip(*args)))
+        else:
+            parts = [_evaluate_chunk(*arg) for arg in args]
+        frames = [self._frame(parts, 'portfolio', [PORTFOLIO])]
+        if per_ticker:
+            frames.append(self._frame(parts, 'ticker', tickers))
+        return pd.concat(frames, ignore_index=True)[RESULT_COLUMNS]
+
+    def _frame(self, parts, key, tickers):
+        # Stack chunk statistics (holding x pair [x ticker]) into one row per combination
+        stats = {name: np.concatenate([part[key][name] if key == 'ticker' else part[key][name][..., None]
+                                       for part in parts], axis=1) for name in parts[0][key]}
+        n_hold, n_pairs, n_tickers = stats['days'].shape
+        frame = pd.DataFrame({
+            'ticker': np.tile(np.asarray(tickers, dtype=object), n_hold * n_pairs),
+            'pos_th': np.tile(np.repeat(self.pairs[:, 0], n_tickers), n_hold),
+            'neg_th': np.tile(np.repeat(self.pairs[:, 1], n_tickers), n_hold),
+            'holding': np.repeat(self.holding_periods, n_pairs * n_tickers),
+        })
+        for name, values in stats.items():
+            frame[name] = values.ravel()
+        frame['days'] = frame['days'].astype('int64')
+        return frame.sort_values(['ticker', 'holding', 'pos_th', 'neg_th'], kind='stable')
+
+    def run(self, news, prices, value_col='sentiment_score', value=None, per_ticker=True):
+        """
+        Backtest the threshold grid on news and prices.
+        Args:
+            news (DataFrame): Articles with a publication timestamp, a sentiment score and, for several tickers,
+                a ticker column
+            prices (DataFrame): Daily bars with Date and Close (and the ticker column for several tickers)
+            value_col (str): Per-article sentiment column
+            value (array or None): Per-article values used instead of news[value_col]
+            per_ticker (bool): Also report each ticker, not only the equal-weighted portfolio
+        Returns:
+            DataFrame: RESULT_COLUMNS per ticker and (pos_th, neg_th, holding)
+        """
+        sentiment, returns, tickers, _ = self.session_panel(news, prices, value_col, value)
+        return self.run_matrices(sentiment, returns, tickers, per_ticker)
+
+
+def best_combinations(results, metric='sharpe', ticker=PORTFOLIO, top=5):
+    """
+    Best threshold combinations of a backtest by one metric.
+    Returns:
+        DataFrame: The top rows of results for ticker, sorted by metric (descending)
+    """
+    rows = results[results['ticker'] == ticker]
+    return rows.sort_values(metric, ascending=False, na_position='last').head(top).reset_index(drop=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Backtest sentiment thresholds as long/short trading signals.")
+    parser.add_argument('--base-dir', default="../data")
+    parser.add_argument('--tickers', nargs='*', default=None)
+    parser.add_argument('--pos', nargs='*', type=float, default=[0.05, 0.1, 0.2, 0.3, 0.5])
+    parser.add_argument('--neg', nargs='*', type=float, default=[-0.05, -0.1, -0.2, -0.3, -0.5])
+    parser.add_argument('--holding', nargs='*', type=int, default=[1, 2, 5, 10])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--metric', default='sharpe', choices=RESULT_COLUMNS[5:])
+    parser.add_argument('--output', default=None, help="Also write the full result grid (.parquet or .csv)")
+    args = parser.parse_args()
+    from scripts.lexicon_scorer import vader_lexicon_scores
+    from scripts.sentiment_cache import score_texts, scorer_version
+    from scripts.utils import load_news_data, load_price_panel
+    prices = load_price_panel(args.tickers, base_dir=args.base_dir)
+    news = load_news_data(args.base_dir, tickers=list(prices['stock'].cat.categories))
+    news['sentiment_score'] = score_texts(news['headline'].fillna("").astype(str), vader_lexicon_scores,
+                                          'vader_compound_lexicon', scorer_version('nltk'))
+    backtester = SentimentBacktester(args.pos, args.neg, args.holding, n_workers=args.workers)
+    results = backtester.run(news, prices)
+    if args.output:
+        results.to_parquet(args.output) if args.output.endswith('.parquet') else results.to_csv(args.output, index=False)
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(best_combinations(results, args.metric, top=10))
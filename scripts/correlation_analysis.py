@@ -1,17 +1,41 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 from scripts.utils import get_stock_name
-from textblob import TextBlob
+from scripts.sentiment_cache import score_texts, scorer_version
+from scripts.event_join import EventJoiner
+from scripts.event_study import EventStudyEngine
+from scripts.backtest import SentimentBacktester, best_combinations
+from scripts.rolling_correlation import RollingCorrelationEngine
+from scripts.cross_correlation import CrossCorrelationEngine, lag_matrices
+from scripts.significance import SignificanceTester
+from scripts.plotting import PlotEmitter, PlotSpec
+from scripts.instrumentation import instrumented
 
 # This script performs correlation analysis between news sentiment and stock prices.The purpose is to establish statistical correlations between the sentiment derived from news articles and the corresponding stock price movements. This involves tracking stock price changes around the date the article was published and analyzing the impact of news sentiment on stock performance. This analysis should consider the publication date and potentially the time the article was published if such data can be inferred or is available.
 
-class CorrelationAnalyzer:
-    def __init__(self, news_df, stock_df, stock_prefix):
+class CorrelationAnalyzer(PlotEmitter):
+    def __init__(self, news_df, stock_df, stock_prefix, render='show', instrumentation=None):
+        # render: 'show' displays plots, 'defer' collects them in self.plot_specs (see render_plots), 'off' skips them
+        # instrumentation: optional scripts.instrumentation.Instrumentation recording per-stage time, memory and rows
         self.news_df = news_df
         self.stock_df = stock_df
         self.stock_prefix = stock_prefix
         self.stock_name = get_stock_name(self.stock_prefix)
+        self._init_plotting(render)
+        self.instrumentation = instrumentation
+
+    @classmethod
+    def from_price_store(cls, news_df, store, stock_prefix, render='show', instrumentation=None):
+        # Attach to a ticker in a memory-mapped PriceStore (see scripts/price_store.py) without copying its prices
+        return cls(news_df, store.frame(stock_prefix), stock_prefix, render=render, instrumentation=instrumentation)
+
+    def _news_date_col(self):
+        # Publication timestamp column of news_df ('date' or 'Date')
+        date_col = next((col for col in ('date', 'Date') if col in self.news_df.columns), None)
+        if date_col is None:
+            raise KeyError("No publication timestamp column found in news_df. Expected 'date' or 'Date'.")
+        return date_col
     
+    @instrumented('news_df')
     def convert_date_to_datetime(self):
         # Convert the date column to datetime format and normalize to date only
         news_date_col = None
@@ -40,6 +64,7 @@ class CorrelationAnalyzer:
         else:
             raise KeyError("Neither 'Date' nor 'date_only' column found in stock_df.")
 
+    @instrumented('news_df')
     def align_by_date(self):
         # Align both dataframes by date_only
         self.convert_date_to_datetime()
@@ -47,16 +72,32 @@ class CorrelationAnalyzer:
         self.news_df = self.news_df.sort_values('date_only')
         self.stock_df = self.stock_df.sort_values('date_only')
 
-    def analyze_sentiment(self, text_column='headline'):
-        # Perform sentiment analysis on news headlines
-        def get_sentiment(text):
-            return TextBlob(str(text)).sentiment.polarity
-        self.news_df['sentiment_score'] = self.news_df[text_column].apply(get_sentiment)
+    @instrumented('news_df')
+    def analyze_sentiment(self, text_column='headline', cache=None, backend='row'):
+        # Perform sentiment analysis on news headlines (TextBlob polarity)
+        # Repeated headlines are scored once; pass a SentimentScoreCache to reuse scores across runs
+        # backend='lexicon' scores the whole column at once with the vectorized scorer of scripts/lexicon_scorer.py
+        if backend not in ('row', 'lexicon'):
+            raise ValueError(f"Unknown sentiment backend '{backend}'. Expected 'row' or 'lexicon'.")
+
+        def get_sentiment(texts):
+            from textblob import TextBlob
+            return [TextBlob(text).sentiment.polarity for text in texts]
+        if backend == 'lexicon':
+            from scripts.lexicon_scorer import textblob_lexicon_scores
+            score_fn, scorer_id = textblob_lexicon_scores, 'textblob_polarity_lexicon'
+        else:
+            score_fn, scorer_id = get_sentiment, 'textblob_polarity'
+        self.news_df['sentiment_score'] = score_texts(
+            self.news_df[text_column], score_fn, scorer_id, scorer_version('textblob'), cache=cache
+        )
 
+    @instrumented('stock_df')
     def calculate_daily_returns(self):
         # Compute daily returns for stock prices
         self.stock_df['daily_return'] = self.stock_df['Close'].pct_change()
 
+    @instrumented('news_df')
     def merge_and_correlate(self):
         # Aggregate sentiment by date (mean if multiple headlines)
         daily_sentiment = self.news_df.groupby('date_only')['sentiment_score'].mean().reset_index()
@@ -69,16 +110,156 @@ class CorrelationAnalyzer:
         print(f"Pearson correlation between average daily news sentiment and {self.stock_name} daily returns: {correlation:.4f}")
         return merged, correlation
 
+    @instrumented('news_df')
+    def merge_sessions_and_correlate(self, return_column='fwd_return_1', horizons=(1, 5), intraday=True):
+        """
+        Like merge_and_correlate, but each article is mapped to the next trading session (weekend and after-hours
+        news is kept) and sentiment is correlated with a forward return instead of the same-day return.
+        Args:
+            return_column (str): 'fwd_return_<h>' for a horizon in horizons, or 'intraday_return'
+            horizons (iterable of int): Forward return horizons in sessions
+            intraday (bool): Also compute the open-to-close return of the event session
+        Returns:
+            tuple: (per-session DataFrame with article_count, sentiment_score and returns, Pearson correlation)
+        """
+        date_col = self._news_date_col()
+        joiner = EventJoiner(horizons=horizons, intraday=intraday, news_date_col=date_col)
+        self.events = joiner.join(self.news_df, self.stock_df)
+        merged = joiner.aggregate(self.events, value=self.news_df['sentiment_score'])
+        merged = merged.dropna(subset=[return_column, 'sentiment_score'])
+        correlation = merged[return_column].corr(merged['sentiment_score'], method='pearson')
+        print(f"Pearson correlation between session news sentiment and {self.stock_name} {return_column}: {correlation:.4f}")
+        return merged, correlation
+
+    @instrumented('news_df')
+    def test_significance(self, merged, return_column='daily_return', tester=None):
+        """
+        Permutation p-value and block bootstrap confidence interval of the correlation returned by
+        merge_and_correlate (or merge_sessions_and_correlate, with its return_column).
+        Args:
+            merged (DataFrame): Merged frame with 'sentiment_score' and the return column
+            return_column (str): Return column that was correlated
+            tester (SignificanceTester or None): Resampling settings (default: 10,000 permutations, 2,000 bootstraps)
+        Returns:
+            dict: n, r, perm_p, ci_low, ci_high, boot_se, block_length
+        """
+        tester = tester or SignificanceTester()
+        result = tester.test(merged['sentiment_score'], merged[return_column])
+        print(f"{self.stock_name}: r = {result['r']:.4f}, permutation p = {result['perm_p']:.4f}, "
+              f"{tester.confidence:.0%} CI [{result['ci_low']:.4f}, {result['ci_high']:.4f}] (n = {result['n']:.0f})")
+        return result
+
+    @instrumented('news_df')
+    def rolling_correlation(self, windows=(20, 60, 120), expanding=True, halflives=(), spearman=True, min_periods=10,
+                            expanding_spearman=False):
+        """
+        Rolling, expanding and exponentially weighted correlation between daily sentiment and daily returns
+        (see scripts/rolling_correlation.py). Run after align_by_date, analyze_sentiment and calculate_daily_returns.
+        Windows are counted in trading days; days without news are missing, not dropped.
+        Returns:
+            DataFrame: date, window, n, pearson_r and spearman_r per trading day and window
+        """
+        engine = RollingCorrelationEngine(windows, expanding, halflives, spearman, min_periods, expanding_spearman)
+        daily_sentiment = self.news_df.groupby('date_only')['sentiment_score'].mean().reset_index()
+        result = engine.run(daily_sentiment, self.stock_df[['date_only', 'daily_return']], date_col='date_only')
+        result = result.drop(columns='ticker')
+        spec = PlotSpec(f'{self.stock_prefix}_rolling_correlation', f"{self.stock_name}: Rolling Sentiment/Return Correlation",
+                        "Date", "Pearson Correlation", figsize=(14, 5))
+        for window, rows in result.groupby('window', observed=True):
+            spec.line(pd.to_datetime(rows['date']), rows['pearson_r'], label=window)
+        self._emit(spec.hline(0, color='grey', linewidth=0.8).set(legend=True, grid=True))
+        return result
+
+    @instrumented('news_df')
+    def cross_correlation(self, max_lag=10, horizons=(1, 5), intraday=False, min_periods=10):
+        """
+        Lead/lag correlation between session news sentiment and forward returns (see scripts/cross_correlation.py).
+        Run after analyze_sentiment. Lags are trading sessions; positive lags mean sentiment leads returns.
+        Returns:
+            DataFrame: Pearson correlation indexed by lag, one column per return horizon
+        """
+        date_col = self._news_date_col()
+        engine = CrossCorrelationEngine(max_lag, horizons, intraday, min_periods, news_date_col=date_col)
+        matrices = lag_matrices(engine.run(self.news_df, self.stock_df))
+        matrix = next(iter(matrices.values())) if matrices else pd.DataFrame()
+        spec = PlotSpec(f'{self.stock_prefix}_cross_correlation', f"{self.stock_name}: Sentiment/Return Cross-Correlation",
+                        "Lag (sessions, positive = sentiment leads)", "Pearson Correlation", figsize=(10, 5))
+        for horizon in matrix.columns:
+            spec.line(matrix.index, matrix[horizon], label=horizon, marker='o')
+        self._emit(spec.hline(0, color='grey', linewidth=0.8).vline(0, color='grey', linestyle='--').set(legend=True, grid=True))
+        return matrix
+
+    @instrumented('news_df')
+    def event_study(self, window=(-5, 10), estimation_window=120, gap=10, by='sentiment_class', market=None,
+                    level='article'):
+        """
+        Abnormal returns around the news (see scripts/event_study.py). Run after analyze_sentiment (or
+        sentiment_analysis); articles are grouped by sentiment_class, derived from sentiment_score when missing.
+        Args:
+            window (tuple): Event window in sessions relative to the news session, e.g. (-5, 10)
+            estimation_window (int): Sessions used to estimate normal returns, ending gap sessions before the window
+            gap (int): Sessions between the estimation and event windows
+            by (str, list or None): Event columns to aggregate by ('sentiment_class', 'publisher', ...)
+            market (Series or None): Market returns indexed by date; uses the market model when given, otherwise
+                the constant-mean model
+            level (str): 'article' (one event per article) or 'bucket' (one per session and sentiment class)
+        Returns:
+            tuple: (summary DataFrame per group, CAAR DataFrame indexed by relative session)
+        """
+        date_col = self._news_date_col()
+        engine = EventStudyEngine(window, estimation_window, gap, min(60, estimation_window),
+                                  model='mean' if market is None else 'market', level=level, news_date_col=date_col)
+        self.event_study_events = engine.run(self.news_df, self.stock_df, market)
+        summary = engine.summary(by)
+        _, caar = engine.caar(by)
+        spec = PlotSpec(f'{self.stock_prefix}_event_study', f"{self.stock_name}: Cumulative Abnormal Return Around News",
+                        "Sessions relative to the news session", "CAAR", figsize=(10, 5))
+        for group in caar.columns:
+            spec.line(caar.index, caar[group], label=str(group), marker='o')
+        self._emit(spec.hline(0, color='grey', linewidth=0.8).vline(0, color='grey', linestyle='--').set(legend=True, grid=True))
+        print(f"{self.stock_name}: event study over sessions {window[0]}..{window[1]} "
+              f"({int(summary['events'].sum())} events)")
+        return summary, caar
+
+    @instrumented('news_df')
+    def sentiment_backtest(self, pos_thresholds=(0.05, 0.1, 0.2, 0.3, 0.5), neg_thresholds=(-0.05, -0.1, -0.2, -0.3, -0.5),
+                           holding_periods=(1, 2, 5, 10), n_workers=1):
+        """
+        Backtest session sentiment as a long/short signal over a grid of thresholds and holding periods
+        (see scripts/backtest.py). Run after analyze_sentiment (or sentiment_analysis).
+        Args:
+            pos_thresholds, neg_thresholds (iterable of float): Long and short thresholds on session sentiment
+            holding_periods (iterable of int): Sessions each signal is held for
+            n_workers (int or None): Processes for very large grids
+        Returns:
+            DataFrame: pos_th, neg_th, holding and the return, Sharpe, hit rate and turnover statistics per combination
+        """
+        date_col = self._news_date_col()
+        backtester = SentimentBacktester(pos_thresholds, neg_thresholds, holding_periods, n_workers=n_workers,
+                                         news_date_col=date_col)
+        # A single ticker is its own portfolio
+        result = backtester.run(self.news_df, self.stock_df, per_ticker=False)
+        result['ticker'] = self.stock_prefix
+        spec = PlotSpec(f'{self.stock_prefix}_sentiment_backtest', f"{self.stock_name}: Sentiment Signal Backtest",
+                        "Positive threshold (best negative threshold)", "Annualized Sharpe Ratio", figsize=(10, 5))
+        for holding, rows in result.groupby('holding'):
+            best = rows.groupby('pos_th')['sharpe'].max()
+            spec.line(best.index, best.to_numpy(), label=f"hold {holding}", marker='o')
+        self._emit(spec.hline(0, color='grey', linewidth=0.8).set(legend=True, grid=True))
+        top = best_combinations(result, ticker=self.stock_prefix, top=1)
+        if len(top):
+            print(f"{self.stock_name}: best sentiment signal pos_th={top['pos_th'][0]}, neg_th={top['neg_th'][0]}, "
+                  f"holding={top['holding'][0]} (Sharpe {top['sharpe'][0]:.2f})")
+        return result.reset_index(drop=True)
+
+    @instrumented('news_df')
     def plot_correlation(self, merged):
         # Scatter plot of sentiment vs. daily return
-        plt.figure(figsize=(8, 5))
-        plt.scatter(merged['sentiment_score'], merged['daily_return'], alpha=0.6)
-        plt.title(f"{self.stock_name}: News Sentiment vs. Daily Stock Return")
-        plt.xlabel("Daily News Sentiment Score")
-        plt.ylabel("Daily Stock Return (%)")
-        plt.grid(True)
-        plt.show()
+        spec = PlotSpec(f'{self.stock_prefix}_sentiment_vs_return', f"{self.stock_name}: News Sentiment vs. Daily Stock Return",
+                        "Daily News Sentiment Score", "Daily Stock Return (%)", figsize=(8, 5))
+        return self._emit(spec.scatter(merged['sentiment_score'], merged['daily_return'], alpha=0.6).set(grid=True))
 
+    @instrumented('news_df')
     def run_full_analysis(self, text_column='Headline'):
         self.align_by_date()
         self.analyze_sentiment(text_column)
@@ -0,0 +1,206 @@
+import os
+import argparse
+import warnings
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from scipy import stats
+from scripts.event_join import EventJoiner, to_utc_ns
+from scripts.price_store import PriceStore
+from scripts.sentiment_cache import score_texts, scorer_version
+from scripts.significance import SignificanceTester
+
+## This script runs the news sentiment / stock return correlation for a whole ticker universe in one headless job. The news frame is indexed by ticker once, headline sentiment is scored once (deduplicated and optionally cached) for every article of the universe, and the per-ticker stages (session join, per-session aggregation, Pearson/Spearman correlation for every return horizon) run in a process pool on plain NumPy arrays. All results land in a single table instead of one printout and one plot per ticker.
+
+RESULT_COLUMNS = ['ticker', 'horizon', 'n', 'articles', 'pearson_r', 'pearson_p', 'spearman_r', 'spearman_p']
+
+
+def _textblob_scores(texts):
+    from textblob import TextBlob
+    return [TextBlob(text).sentiment.polarity for text in texts]
+
+
+def _vader_scores(texts):
+    from scripts.sentiment_scoring import VaderScoringEngine
+    return VaderScoringEngine().score(texts)
+
+
+def _vader_lexicon_scores(texts):
+    from scripts.lexicon_scorer import vader_lexicon_scores
+    return vader_lexicon_scores(texts)
+
+
+def _textblob_lexicon_scores(texts):
+    from scripts.lexicon_scorer import textblob_lexicon_scores
+    return textblob_lexicon_scores(texts)
+
+
+# scorer name -> (score function, cache scorer id, package whose version keys the cache)
+SCORERS = {
+    'textblob': (_textblob_scores, 'textblob_polarity', 'textblob'),
+    'vader': (_vader_scores, 'vader_compound', 'nltk'),
+    'textblob_lexicon': (_textblob_lexicon_scores, 'textblob_polarity_lexicon', 'textblob'),
+    'vader_lexicon': (_vader_lexicon_scores, 'vader_compound_lexicon', 'nltk'),
+}
+
+
+def correlate(x, y):
+    """
+    Pearson and Spearman correlation with two-sided p-values, ignoring pairs with a NaN.
+    Returns:
+        dict: n, pearson_r, pearson_p, spearman_r, spearman_p (NaN when fewer than 3 pairs or a constant input)
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    keep = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[keep], y[keep]
+    out = {'n': int(keep.sum()), 'pearson_r': np.nan, 'pearson_p': np.nan, 'spearman_r': np.nan, 'spearman_p': np.nan}
+    if out['n'] < 3 or np.ptp(x) == 0 or np.ptp(y) == 0:
+        return out
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        out['pearson_r'], out['pearson_p'] = (float(v) for v in stats.pearsonr(x, y))
+        out['spearman_r'], out['spearman_p'] = (float(v) for v in stats.spearmanr(x, y))
+    return out
+
+
+def _correlate_ticker(ticker, published, sentiment, prices, horizons, intraday):
+    # Per-ticker stage: join the ticker's articles to its sessions, average sentiment per session and correlate
+    if isinstance(prices, PriceStore):
+        # A store is pickled as its path, so the worker maps the ticker's prices instead of receiving a copy
+        prices = prices.frame(ticker)
+    joiner = EventJoiner(horizons=horizons, intraday=intraday)
+    news = pd.DataFrame({'date': pd.to_datetime(published, utc=True)})
+    events = joiner.join(news, prices)
+    sessions = joiner.aggregate(events, value=sentiment)
+    rows = []
+    series = {}
+    for column in joiner.return_columns(sessions):
+        result = correlate(sessions['sentiment_score'], sessions[column])
+        horizon = 'intraday' if column == 'intraday_return' else f"t+{column.rsplit('_', 1)[1]}"
+        rows.append({'ticker': ticker, 'horizon': horizon, 'articles': int(sessions['article_count'].sum()), **result})
+        series[(ticker, horizon)] = (sessions['sentiment_score'].to_numpy(), sessions[column].to_numpy())
+    return rows, series
+
+
+class CorrelationBatchRunner:
+    def __init__(self, news_df, tickers=None, horizons=(1, 5), intraday=True, scorer='textblob',
+                 text_column='headline', date_column='date', ticker_col='stock', n_workers=1, cache=None,
+                 significance=None):
+        """
+        Args:
+            news_df (DataFrame): News with headline, date and stock columns (all tickers in one frame)
+            tickers (list or None): Universe to run (default: every ticker with both news and prices)
+            horizons (iterable of int): Forward return horizons in trading sessions
+            intraday (bool): Also correlate with the event session's open-to-close return
+            scorer (str): 'textblob' (polarity, as CorrelationAnalyzer) or 'vader' (compound)
+            text_column, date_column, ticker_col (str): Column names in news_df
+            n_workers (int or None): Processes for the per-ticker stages (None = all cores, 1 = in-process)
+            cache (SentimentScoreCache or None): Persistent score cache
+            significance (SignificanceTester or None): Adds permutation p-values and block bootstrap intervals
+                (perm_p, ci_low, ci_high, boot_se) for every (ticker, horizon)
+        """
+        if scorer not in SCORERS:
+            raise ValueError(f"Unknown scorer '{scorer}'. Expected one of {sorted(SCORERS)}.")
+        self.news_df = news_df
+        self.tickers = tickers
+        self.horizons = tuple(horizons)
+        self.intraday = intraday
+        self.scorer = scorer
+        self.text_column = text_column
+        self.date_column = date_column
+        self.ticker_col = ticker_col
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.cache = cache
+        self.significance = significance
+        self.results = None
+
+    def ticker_index(self):
+        # Row positions of every ticker's articles, built with one groupby
+        tickers = self.news_df[self.ticker_col].astype(object)
+        return tickers.groupby(tickers.to_numpy(), sort=True).indices
+
+    def score_sentiment(self, positions):
+        # Score the selected articles once; repeated headlines are scored once (and cached across runs with a cache)
+        score_fn, scorer_id, package = SCORERS[self.scorer]
+        texts = self.news_df[self.text_column].iloc[positions].fillna("").astype(str)
+        return score_texts(texts, score_fn, scorer_id, scorer_version(package), cache=self.cache)
+
+    def run(self, prices, output_path=None):
+        """
+        Correlate session-level news sentiment with forward returns for every ticker.
+        Args:
+            prices (DataFrame, dict or PriceStore): Long-format price panel with a ticker column (see
+                utils.load_price_panel), a dict of ticker -> price DataFrame, or a memory-mapped PriceStore
+            output_path (str or None): Also write the results table (.parquet or .csv)
+        Returns:
+            DataFrame: One row per (ticker, horizon) with n sessions, articles, Pearson and Spearman r and p-values
+        """
+        if isinstance(prices, dict):
+            price_frames = prices
+        elif isinstance(prices, PriceStore):
+            price_frames = {ticker: prices for ticker in prices.tickers}
+        else:
+            price_frames = {ticker: frame.drop(columns=self.ticker_col)
+                            for ticker, frame in prices.groupby(prices[self.ticker_col].astype(object), sort=True)}
+        index = self.ticker_index()
+        tickers = self.tickers if self.tickers is not None else [t for t in index if t in price_frames]
+        tickers = [t for t in tickers if t in index and t in price_frames]
+        positions = {t: index[t] for t in tickers}
+        # Score and parse the whole universe once, then hand each ticker its slice
+        universe = np.concatenate([positions[t] for t in tickers]) if tickers else np.array([], dtype=np.int64)
+        sentiment = self.score_sentiment(universe)
+        published, valid = to_utc_ns(self.news_df[self.date_column].iloc[universe])
+        published = np.where(valid, published, np.iinfo(np.int64).min)
+        bounds = np.cumsum([0] + [len(positions[t]) for t in tickers])
+        tasks = []
+        for i, ticker in enumerate(tickers):
+            part = slice(bounds[i], bounds[i + 1])
+            times = published[part].astype('datetime64[ns]')
+            tasks.append((ticker, times, sentiment[part], price_frames[ticker], self.horizons, self.intraday))
+        if self.n_workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_workers, len(tasks))) as executor:
+                parts = list(executor.map(_correlate_ticker, *zip(*tasks)))
+        else:
+            parts = [_correlate_ticker(*task) for task in tasks]
+        self.results = pd.DataFrame([row for rows, _ in parts for row in rows], columns=RESULT_COLUMNS)
+        if self.significance is not None:
+            series = {key: pair for _, pairs in parts for key, pair in pairs.items()}
+            tests = self.significance.sweep(series)[['perm_p', 'ci_low', 'ci_high', 'boot_se']]
+            keys = pd.MultiIndex.from_frame(self.results[['ticker', 'horizon']])
+            self.results = pd.concat([self.results, tests.reindex(keys).reset_index(drop=True)], axis=1)
+        if output_path is not None:
+            self.save(output_path)
+        return self.results
+
+    def save(self, path):
+        # Write the results table; the format follows the file extension
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if path.endswith('.parquet'):
+            self.results.to_parquet(path, index=False)
+        else:
+            self.results.to_csv(path, index=False)
+        print(f"Saved {len(self.results)} correlation results to {path}.")
+
+
+if __name__ == '__main__':
+    from scripts.utils import load_news_data, load_price_panel
+    parser = argparse.ArgumentParser(description="Correlate news sentiment with forward returns for many tickers.")
+    parser.add_argument('--base-dir', default="../data")
+    parser.add_argument('--tickers', nargs='*', default=None, help="Default: every ticker with a price file")
+    parser.add_argument('--horizons', nargs='*', type=int, default=[1, 5])
+    parser.add_argument('--scorer', default='textblob', choices=sorted(SCORERS))
+    parser.add_argument('--workers', type=int, default=None, help="Default: all cores")
+    parser.add_argument('--permutations', type=int, default=0, help="Permutation resamples per series (0 = none)")
+    parser.add_argument('--bootstrap', type=int, default=0, help="Block bootstrap resamples per series (0 = none)")
+    parser.add_argument('--output', default="../data/results/sentiment_correlation.csv")
+    args = parser.parse_args()
+    prices = load_price_panel(args.tickers, base_dir=args.base_dir)
+    tickers = list(prices['stock'].cat.categories)
+    news = load_news_data(args.base_dir, columns=['headline', 'date', 'stock'], tickers=tickers)
+    significance = None
+    if args.permutations or args.bootstrap:
+        significance = SignificanceTester(args.permutations, args.bootstrap, n_workers=args.workers)
+    runner = CorrelationBatchRunner(news, tickers, horizons=args.horizons, scorer=args.scorer, n_workers=args.workers,
+                                    significance=significance)
+    print(runner.run(prices, output_path=args.output).to_string(index=False))
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from scripts.event_join import EventJoiner
+
+## This script measures whether news sentiment leads or trails stock returns. Articles are mapped onto each ticker's trading-session calendar with EventJoiner: weekend, holiday and after-hours news goes to the next session. Session sentiment is then cross-correlated with forward returns for lags -L..L and several return horizons. Lags count trading sessions, so non-trading days never open a gap. Sessions without news are missing values, not zeros. The masked Pearson correlation at every lag needs six lagged sums over the valid pairs: count, x, y, x², y², xy. These are cross-correlations of the masked series, so they are computed with FFTs: one pass per ticker covers every lag and horizon, instead of one merge per lag.
+
+RESULT_COLUMNS = ['ticker', 'lag', 'horizon', 'n', 'pearson_r']
+
+
+def masked_cross_correlation(x, Y, max_lag, min_periods=10):
+    """
+    Pearson correlation of x[t] with Y[:, t + lag] for lag in -max_lag..max_lag, over the pairs where both are valid.
+    Args:
+        x (ndarray): Series of length n (NaN = missing)
+        Y (ndarray): (series x n) matrix, e.g. one row per return horizon (NaN = missing)
+        max_lag (int): Largest lag in both directions
+        min_periods (int): Minimum valid pairs at a lag
+    Returns:
+        tuple: (r, n) arrays of shape (rows of Y, 2 * max_lag + 1); column j is lag j - max_lag
+    """
+    from scipy.fft import next_fast_len, rfft, irfft
+    x = np.asarray(x, dtype='float64')
+    Y = np.atleast_2d(np.asarray(Y, dtype='float64'))
+    mx = ~np.isnan(x)
+    my = ~np.isnan(Y)
+    # Centering on the valid values keeps the moment differences well conditioned
+    xc = np.where(mx, x - (x[mx].mean() if mx.any() else 0.0), 0.0)
+    row_means = np.array([row[mask].mean() if mask.any() else 0.0 for row, mask in zip(Y, my)])
+    Yc = np.where(my, Y - row_means[:, None], 0.0)
+    n = len(x)
+    nfft = next_fast_len(n + max_lag + 1)
+    # sum_t a[t] * b[t + k] = irfft(conj(A) * B)[k], negative k wrapping to the end
+    left = np.conj(rfft(np.stack([mx.astype('float64'), xc, xc * xc]), nfft))
+    right = rfft(np.stack([my.astype('float64'), Yc, Yc * Yc]), nfft)
+    pairs = [(0, 0), (1, 0), (0, 1), (2, 0), (0, 2), (1, 1)]  # count, Sx, Sy, Sxx, Syy, Sxy
+    spectra = np.stack([left[i][None, :] * right[j] for i, j in pairs])
+    sums = irfft(spectra, nfft)
+    lags = np.arange(-max_lag, max_lag + 1)
+    sums = sums[:, :, lags % nfft]
+    count = np.rint(sums[0])
+    _, sx, sy, sxx, syy, sxy = sums
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vx = sxx - sx * sx / count
+        vy = syy - sy * sy / count
+        r = (sxy - sx * sy / count) / np.sqrt(vx * vy)
+    # Lags beyond the series length have no pairs; rounding-level variances mean a constant input
+    flat = (vx <= 1e-10 * np.abs(sxx)) | (vy <= 1e-10 * np.abs(syy))
+    r = np.where((count >= max(min_periods, 3)) & ~flat, np.clip(r, -1.0, 1.0), np.nan)
+    return r, count.astype('int64')
+
+
+class CrossCorrelationEngine:
+    def __init__(self, max_lag=10, horizons=(1, 5), intraday=False, min_periods=10, ticker_col='stock',
+                 news_date_col='date', price_date_col='Date'):
+        """
+        Args:
+            max_lag (int): Largest lead/lag in trading sessions. Positive lags pair sentiment with later returns
+                (sentiment leading), negative lags with earlier returns (sentiment trailing)
+            horizons (iterable of int): Forward return horizons in sessions (see EventJoiner)
+            intraday (bool): Also use the open-to-close return of each session
+            min_periods (int): Minimum sessions with both sentiment and a return at a lag
+            ticker_col, news_date_col, price_date_col (str): Column names (see EventJoiner)
+        """
+        self.max_lag = max_lag
+        self.horizons = tuple(horizons)
+        self.intraday = intraday
+        self.min_periods = min_periods
+        self.joiner = EventJoiner(horizons=horizons, intraday=intraday, ticker_col=ticker_col,
+                                  news_date_col=news_date_col, price_date_col=price_date_col)
+
+    def session_sentiment(self, news, prices, value_col='sentiment_score', value=None):
+        """
+        Mean article value per trading session on the full calendar (NaN for sessions without news).
+        Returns:
+            tuple: (session table of EventJoiner.sessions, sentiment array aligned with it)
+        """
+        events = self.joiner.join(news, prices)
+        sessions = self.joiner.session_table
+        idx = events['session_idx'].to_numpy()
+        values = np.asarray(news[value_col] if value is None else value, dtype='float64')
+        keep = (idx >= 0) & ~np.isnan(values)
+        counts = np.bincount(idx[keep], minlength=len(sessions))
+        sums = np.bincount(idx[keep], weights=values[keep], minlength=len(sessions))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sessions, np.where(counts > 0, sums / counts, np.nan)
+
+    def run(self, news, prices, value_col='sentiment_score', value=None):
+        """
+        Lead/lag correlations for every ticker, lag and horizon.
+        Args:
+            news (DataFrame): Articles with a publication timestamp, a per-article value (e.g. sentiment_score) and,
+                for several tickers, a ticker column
+            prices (DataFrame): Daily bars with Date, Open and Close (and the ticker column for several tickers)
+            value_col (str): Per-article value column
+            value (array or None): Per-article values used instead of news[value_col]
+        Returns:
+            DataFrame: Tidy table with ticker, lag, horizon ('t+h' or 'intraday'), n (sessions used) and pearson_r
+        """
+        sessions, sentiment = self.session_sentiment(news, prices, value_col, value)
+        columns = self.joiner.return_columns(sessions)
+        labels = ['intraday' if c == 'intraday_return' else f"t+{c.rsplit('_', 1)[1]}" for c in columns]
+        returns = sessions[columns].to_numpy(dtype='float64').T
+        codes = sessions['_code'].to_numpy()
+        has_ticker = self.joiner.ticker_col in sessions.columns
+        names = sessions[self.joiner.ticker_col].cat.categories if has_ticker else ['']
+        # Sessions are sorted by ticker, so each ticker is a contiguous block
+        bounds = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1], True]) if len(codes) else np.array([0])
+        lags = np.arange(-self.max_lag, self.max_lag + 1)
+        parts = []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            r, n = masked_cross_correlation(sentiment[lo:hi], returns[:, lo:hi], self.max_lag, self.min_periods)
+            parts.append(pd.DataFrame({
+                'ticker': names[codes[lo]],
+                'lag': np.repeat(lags[None, :], len(labels), axis=0).ravel(),
+                'horizon': np.repeat(labels, len(lags)),
+                'n': n.ravel(),
+                'pearson_r': r.ravel(),
+            }))
+        if not parts:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        return pd.concat(parts, ignore_index=True)[RESULT_COLUMNS]
+
+
+def lag_matrices(result, value='pearson_r'):
+    """
+    Reshape run() output into one lag x horizon matrix per ticker.
+    Returns:
+        dict: ticker -> DataFrame indexed by lag with one column per horizon
+    """
+    return {ticker: rows.pivot(index='lag', columns='horizon', values=value)[list(dict.fromkeys(rows['horizon']))]
+            for ticker, rows in result.groupby('ticker', sort=True)}
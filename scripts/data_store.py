@@ -0,0 +1,218 @@
+import os
+import json
+import argparse
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pandas.tseries.api import guess_datetime_format
+
+## This script provides a columnar data-access layer for the project data. Each CSV under the base data directory (raw_analyst_ratings.csv and yfinance_data/<STOCKPREFIX>_historical_data.csv) is converted once into a typed Parquet file: datetimes are stored already parsed, publisher/stock are stored as categoricals, and reads support column projection plus predicate pushdown by date range and ticker. A Parquet file is rebuilt automatically when its source CSV changes.
+
+# Schema metadata key holding the size/mtime of the CSV a Parquet file was built from
+_SOURCE_KEY = b'source_fingerprint'
+
+NEWS_FILENAME = 'raw_analyst_ratings.csv'
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume', 'Dividends', 'Stock Splits']
+CATEGORICAL_NEWS_COLUMNS = ['publisher', 'stock']
+_STRING_TYPES = {pa.string(): pd.StringDtype('pyarrow'), pa.large_string(): pd.StringDtype('pyarrow')}
+
+
+class ParquetDataStore:
+    def __init__(self, base_dir="../data", cache_dir=None, chunksize=500_000):
+        """
+        Args:
+            base_dir (str): Data directory holding raw_analyst_ratings.csv and yfinance_data/
+            cache_dir (str or None): Where the Parquet files are written (default: <base_dir>/parquet)
+            chunksize (int): CSV rows converted per chunk while building the news file
+        """
+        self.base_dir = base_dir
+        self.cache_dir = cache_dir or os.path.join(base_dir, 'parquet')
+        self.chunksize = chunksize
+
+    # ----- paths and staleness -----
+
+    def news_csv_path(self, filename=NEWS_FILENAME):
+        return os.path.join(self.base_dir, filename)
+
+    def price_csv_path(self, stock_prefix):
+        return os.path.join(self.base_dir, 'yfinance_data', f"{stock_prefix}_historical_data.csv")
+
+    def parquet_path(self, csv_path):
+        # Mirror the CSV layout below cache_dir, e.g. yfinance_data/AAPL_historical_data.parquet
+        relative = os.path.relpath(csv_path, self.base_dir)
+        return os.path.join(self.cache_dir, os.path.splitext(relative)[0] + '.parquet')
+
+    @staticmethod
+    def source_fingerprint(csv_path):
+        stat = os.stat(csv_path)
+        return json.dumps({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+
+    def is_stale(self, csv_path):
+        # A Parquet file is stale if it is missing or was built from a different version of the CSV
+        parquet_path = self.parquet_path(csv_path)
+        if not os.path.exists(parquet_path):
+            return True
+        metadata = pq.read_schema(parquet_path).metadata or {}
+        return metadata.get(_SOURCE_KEY, b'').decode('utf-8') != self.source_fingerprint(csv_path)
+
+    # ----- build step -----
+
+    def build_news(self, filename=NEWS_FILENAME, force=False):
+        """
+        Convert the news CSV to Parquet (only if missing or stale, unless force=True).
+        Returns:
+            str: Path of the Parquet file
+        """
+        csv_path = self.news_csv_path(filename)
+        parquet_path = self.parquet_path(csv_path)
+        if not force and not self.is_stale(csv_path):
+            return parquet_path
+        os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+        tmp_path = parquet_path + '.tmp'
+        writer = None
+        date_format = None
+        try:
+            # Convert chunk by chunk so building never needs the whole CSV in memory
+            for chunk in pd.read_csv(csv_path, chunksize=self.chunksize):
+                if 'date' in chunk.columns:
+                    if date_format is None:
+                        # Infer the format once, as pd.to_datetime does over a whole column
+                        first = chunk['date'].dropna()
+                        date_format = guess_datetime_format(str(first.iloc[0])) if len(first) else None
+                    chunk['date'] = pd.to_datetime(chunk['date'], errors='coerce', utc=True, format=date_format)
+                for col in CATEGORICAL_NEWS_COLUMNS:
+                    if col in chunk.columns:
+                        chunk[col] = chunk[col].astype('category')
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    schema = self._news_schema(table.schema, csv_path)
+                    writer = pq.ParquetWriter(tmp_path, schema)
+                writer.write_table(table.cast(schema))
+        finally:
+            if writer is not None:
+                writer.close()
+        os.replace(tmp_path, parquet_path)
+        print(f"Built {parquet_path} from {csv_path}.")
+        return parquet_path
+
+    def _news_schema(self, schema, csv_path):
+        # Fixed schema for every chunk: int32-indexed dictionaries and source fingerprint metadata
+        fields = []
+        for field in schema:
+            if field.name in CATEGORICAL_NEWS_COLUMNS:
+                field = pa.field(field.name, pa.dictionary(pa.int32(), pa.string()))
+            elif field.name == 'date':
+                field = pa.field('date', pa.timestamp('ns', tz='UTC'))
+            elif pa.types.is_null(field.type):
+                field = pa.field(field.name, pa.string())
+            fields.append(field)
+        return pa.schema(fields, metadata={_SOURCE_KEY: self.source_fingerprint(csv_path).encode('utf-8')})
+
+    def build_prices(self, stock_prefix, force=False):
+        """
+        Convert one ticker's historical price CSV to Parquet (only if missing or stale, unless force=True).
+        Returns:
+            str: Path of the Parquet file
+        """
+        csv_path = self.price_csv_path(stock_prefix)
+        parquet_path = self.parquet_path(csv_path)
+        if not force and not self.is_stale(csv_path):
+            return parquet_path
+        os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+        df = pd.read_csv(csv_path)
+        df['Date'] = pd.to_datetime(df['Date'])
+        for col in PRICE_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_SOURCE_KEY] = self.source_fingerprint(csv_path).encode('utf-8')
+        tmp_path = parquet_path + '.tmp'
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        os.replace(tmp_path, parquet_path)
+        print(f"Built {parquet_path} from {csv_path}.")
+        return parquet_path
+
+    def available_tickers(self):
+        # Tickers with a historical price CSV under yfinance_data/
+        price_dir = os.path.join(self.base_dir, 'yfinance_data')
+        suffix = '_historical_data.csv'
+        if not os.path.isdir(price_dir):
+            return []
+        return sorted(f[:-len(suffix)] for f in os.listdir(price_dir) if f.endswith(suffix))
+
+    def build_all(self, force=False):
+        # Explicit build step: convert the news CSV (if present) and every price CSV
+        paths = []
+        if os.path.exists(self.news_csv_path()):
+            paths.append(self.build_news(force=force))
+        for stock_prefix in self.available_tickers():
+            paths.append(self.build_prices(stock_prefix, force=force))
+        return paths
+
+    # ----- reads -----
+
+    @staticmethod
+    def _read(parquet_path, columns=None, filters=None):
+        dataset = ds.dataset(parquet_path, format='parquet')
+        expression = None
+        for f in filters or []:
+            expression = f if expression is None else expression & f
+        # Text columns stay Arrow-backed instead of becoming one Python object per row
+        return dataset.to_table(columns=columns, filter=expression).to_pandas(types_mapper=_STRING_TYPES.get)
+
+    @staticmethod
+    def _timestamp_scalar(value, tz):
+        # Arrow scalar matching the stored column type (tz-aware UTC for news, naive for prices)
+        ts = pd.Timestamp(value)
+        if tz is not None:
+            ts = ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+        elif ts.tzinfo is not None:
+            ts = ts.tz_localize(None)
+        return pa.scalar(ts.value, type=pa.timestamp('ns', tz=tz))
+
+    def _date_filters(self, field, start, end, tz):
+        filters = []
+        if start is not None:
+            filters.append(ds.field(field) >= self._timestamp_scalar(start, tz))
+        if end is not None:
+            filters.append(ds.field(field) <= self._timestamp_scalar(end, tz))
+        return filters
+
+    def load_news(self, columns=None, start=None, end=None, tickers=None, filename=NEWS_FILENAME):
+        """
+        Load the news data, building/refreshing its Parquet file first if needed.
+        Args:
+            columns (list or None): Columns to read (None reads all)
+            start, end (str or Timestamp or None): Inclusive publication date range (UTC)
+            tickers (list or None): Only return articles for these stock symbols
+        Returns:
+            DataFrame: News rows with 'date' already parsed and publisher/stock as categoricals
+        """
+        parquet_path = self.build_news(filename)
+        filters = self._date_filters('date', start, end, 'UTC')
+        if tickers is not None:
+            filters.append(ds.field('stock').isin(list(tickers)))
+        return self._read(parquet_path, columns, filters)
+
+    def load_prices(self, stock_prefix, columns=None, start=None, end=None):
+        """
+        Load one ticker's historical prices, building/refreshing its Parquet file first if needed.
+        Returns:
+            DataFrame: Price rows with 'Date' already parsed to datetime
+        """
+        parquet_path = self.build_prices(stock_prefix)
+        if columns is not None and 'Date' not in columns:
+            columns = ['Date'] + list(columns)
+        return self._read(parquet_path, columns, self._date_filters('Date', start, end, None))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Convert the project CSV files to Parquet.")
+    parser.add_argument('--base-dir', default="../data")
+    parser.add_argument('--cache-dir', default=None)
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the Parquet files are up to date")
+    args = parser.parse_args()
+    for path in ParquetDataStore(args.base_dir, args.cache_dir).build_all(force=args.force):
+        print(path)
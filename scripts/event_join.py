@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+## This script maps news events onto trading sessions. Article timestamps (FNSPID dates carry a UTC-4 offset) and session closes (16:00 America/New_York on every date of the price file) are converted to int64 UTC nanoseconds, and each article is assigned to the first session that closes after it with one sort-merge over (ticker, time). Weekend, holiday and after-hours news therefore lands on the next trading session instead of being dropped. Forward returns over configurable horizons are computed on the session arrays and gathered per article by integer position, so the join is O(n log n) in the number of articles plus bars, for any number of tickers, and never builds object-dtype key columns.
+
+MARKET_TZ = 'America/New_York'
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+SESSION_CLOSE = pd.Timedelta(hours=16)
+
+
+def to_utc_ns(values, naive_tz=MARKET_TZ):
+    """
+    Convert timestamps (strings with or without offsets, or datetimes) to int64 UTC nanoseconds.
+    Args:
+        values (Series or array): Timestamps; unparseable values become missing
+        naive_tz (str): Time zone assumed for timestamps without an offset
+    Returns:
+        tuple: (int64 array, bool mask of valid entries)
+    """
+    values = pd.Series(values).reset_index(drop=True)
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        # Strings with explicit offsets (e.g. '2020-06-05 10:30:54-04:00') parse straight to UTC
+        first = values.dropna()
+        date_format = guess_datetime_format(str(first.iloc[0])) if len(first) else None
+        has_offset = date_format is not None and '%z' in date_format
+        values = pd.to_datetime(values, errors='coerce', utc=has_offset, format=date_format)
+    if values.dt.tz is None:
+        values = values.dt.tz_localize(naive_tz, ambiguous='NaT', nonexistent='NaT')
+    index = pd.DatetimeIndex(values).tz_convert('UTC').as_unit('ns')
+    valid = ~index.isna()
+    return index.asi8, valid
+
+
+class EventJoiner:
+    def __init__(self, horizons=(1, 5), intraday=True, ticker_col='stock', news_date_col='date', price_date_col='Date',
+                 market_tz=MARKET_TZ):
+        """
+        Args:
+            horizons (iterable of int): Forward return horizons in sessions. The h-session return of an article runs
+                from the last close before the article to the close h sessions later (h=1 is the event session's
+                daily return)
+            intraday (bool): Also compute the event session's open-to-close return
+            ticker_col (str): Ticker column; used when present in both frames, otherwise all news maps to one calendar
+            news_date_col (str): Publication timestamp column of the news frame
+            price_date_col (str): Trading date column (or index name) of the price frame
+            market_tz (str): Exchange time zone; also assumed for news timestamps without an offset
+        """
+        self.horizons = tuple(sorted(set(int(h) for h in horizons)))
+        if any(h < 1 for h in self.horizons):
+            raise ValueError("Horizons must be positive numbers of sessions.")
+        self.intraday = intraday
+        self.ticker_col = ticker_col
+        self.news_date_col = news_date_col
+        self.price_date_col = price_date_col
+        self.market_tz = market_tz
+
+    # ----- sessions -----
+
+    def sessions(self, prices):
+        """
+        Build the session table: one row per (ticker, trading date), sorted by ticker then date.
+        Returns:
+            DataFrame: ticker (if any), session_date, open_ns/close_ns (int64 UTC), Open, Close, forward returns
+        """
+        if self.price_date_col not in prices.columns and self.price_date_col in prices.index.names:
+            prices = prices.reset_index(self.price_date_col)
+        dates = pd.to_datetime(prices[self.price_date_col])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        days = pd.DatetimeIndex(dates.dt.normalize())
+        has_ticker = self.ticker_col in prices.columns
+        codes, tickers = pd.factorize(prices[self.ticker_col]) if has_ticker else (np.zeros(len(prices), np.int64), None)
+        order = np.lexsort((days.asi8, codes))
+        days = days[order]
+        codes = codes[order]
+        table = pd.DataFrame({'session_date': days})
+        if has_ticker:
+            table.insert(0, self.ticker_col, pd.Categorical.from_codes(codes, tickers))
+        # Session bounds in exchange local time, then UTC (handles DST)
+        table['open_ns'] = (days + SESSION_OPEN).tz_localize(self.market_tz).tz_convert('UTC').as_unit('ns').asi8
+        table['close_ns'] = (days + SESSION_CLOSE).tz_localize(self.market_tz).tz_convert('UTC').as_unit('ns').asi8
+        close = prices['Close'].to_numpy(dtype='float64')[order]
+        table['Open'] = prices['Open'].to_numpy(dtype='float64')[order] if 'Open' in prices.columns else np.nan
+        table['Close'] = close
+        # Position of each session within its ticker, used to reject returns that cross ticker boundaries
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+        lengths = np.diff(np.r_[starts, len(codes)])
+        position = np.arange(len(codes)) - np.repeat(starts, lengths)
+        remaining = np.repeat(lengths, lengths) - position - 1
+        for h in self.horizons:
+            table[f'fwd_return_{h}'] = self._forward_return(close, position, remaining, h)
+        if self.intraday:
+            table['intraday_return'] = close / table['Open'].to_numpy() - 1.0
+        table['_code'] = codes
+        return table
+
+    @staticmethod
+    def _forward_return(close, position, remaining, h):
+        # Close[s + h - 1] / Close[s - 1] - 1 where both bars belong to the same ticker
+        out = np.full(len(close), np.nan)
+        valid = (position >= 1) & (remaining >= h - 1)
+        idx = np.flatnonzero(valid)
+        out[idx] = close[idx + h - 1] / close[idx - 1] - 1.0
+        return out
+
+    # ----- join -----
+
+    def join(self, news, prices):
+        """
+        Map every article to the next trading session of its ticker and attach the session's forward returns.
+        Args:
+            news (DataFrame): Articles with a publication timestamp column (and a ticker column for several tickers)
+            prices (DataFrame): Daily bars with Date, Open and Close (and a ticker column for several tickers)
+        Returns:
+            DataFrame: Indexed like news, with session_date, in_session (published between open and close),
+                session_idx (row of session_table, -1 when unmatched) and the forward return columns
+        """
+        sessions = self.sessions(prices)
+        published, valid = to_utc_ns(news[self.news_date_col], self.market_tz)
+        tickers = news[self.ticker_col] if self.ticker_col in news.columns else None
+        session_idx = self.match(published, valid, sessions, tickers)
+        matched = session_idx >= 0
+        take = np.where(matched, session_idx, 0)
+        out = pd.DataFrame(index=news.index)
+        if self.ticker_col in news.columns:
+            out[self.ticker_col] = news[self.ticker_col].to_numpy()
+        out['session_idx'] = session_idx
+        session_date = sessions['session_date'].to_numpy()[take]
+        out['session_date'] = np.where(matched, session_date, np.datetime64('NaT'))
+        out['in_session'] = matched & (published >= sessions['open_ns'].to_numpy()[take])
+        for col in self.return_columns(sessions):
+            out[col] = np.where(matched, sessions[col].to_numpy()[take], np.nan)
+        self.session_table = sessions
+        return out
+
+    def match(self, published, valid, sessions, tickers=None):
+        """
+        As-of match on (ticker, time): the first session whose close is strictly after the article.
+        Args:
+            published (ndarray): int64 UTC nanosecond publication times (see to_utc_ns)
+            valid (ndarray): bool mask of usable publication times
+            sessions (DataFrame): Output of sessions()
+            tickers (Series or None): Ticker per article (None maps every article to the single calendar)
+        Returns:
+            ndarray: int64 row positions into sessions, -1 for articles with no later session (or unknown ticker/date)
+        """
+        if tickers is not None and self.ticker_col in sessions.columns:
+            categories = sessions[self.ticker_col].cat.categories
+            news_codes = pd.Categorical(tickers.astype(object), categories=categories).codes.astype(np.int64)
+        else:
+            news_codes = np.zeros(len(published), dtype=np.int64)
+        valid = valid & (news_codes >= 0)
+        session_codes = sessions['_code'].to_numpy().astype(np.int64)
+        close_ns = sessions['close_ns'].to_numpy()
+        # One merge sort over sessions and events: sessions sort before events at equal times, so an article
+        # published exactly at the close goes to the next session
+        n_sessions = len(session_codes)
+        codes = np.concatenate((session_codes, news_codes[valid]))
+        times = np.concatenate((close_ns, published[valid]))
+        is_event = np.r_[np.zeros(n_sessions, dtype=np.int8), np.ones(valid.sum(), dtype=np.int8)]
+        order = np.lexsort((is_event, times, codes))
+        # Sessions are already in (ticker, time) order, so the number of sessions preceding an event in the merged
+        # order is the position of the first session after it
+        sessions_before = np.cumsum(is_event[order] == 0)
+        candidate = np.empty(len(order), dtype=np.int64)
+        candidate[order] = sessions_before
+        candidate = candidate[n_sessions:]
+        hit = candidate < n_sessions
+        hit[hit] = session_codes[candidate[hit]] == news_codes[valid][hit]
+        result = np.full(len(published), -1, dtype=np.int64)
+        result[np.flatnonzero(valid)[hit]] = candidate[hit]
+        return result
+
+    def aggregate(self, events, value_col='sentiment_score', value=None):
+        """
+        Collapse joined articles to one row per (ticker, session).
+        Args:
+            events (DataFrame): Output of the last join()
+            value_col (str): Per-article value to average (e.g. sentiment_score)
+            value (Series or array or None): Values aligned with events, used instead of events[value_col]
+        Returns:
+            DataFrame: ticker (if any), session_date, article_count, mean value and the session's forward returns
+        """
+        sessions = self.session_table
+        idx = events['session_idx'].to_numpy()
+        values = np.asarray(events[value_col] if value is None else value, dtype='float64')
+        keep = (idx >= 0) & ~np.isnan(values)
+        counts = np.bincount(idx[keep], minlength=len(sessions))
+        sums = np.bincount(idx[keep], weights=values[keep], minlength=len(sessions))
+        present = np.flatnonzero(counts)
+        out = {}
+        for col in (self.ticker_col, 'session_date'):
+            if col in sessions.columns:
+                out[col] = sessions[col].to_numpy()[present]
+        out['article_count'] = counts[present]
+        out[value_col] = sums[present] / counts[present]
+        for col in self.return_columns(sessions):
+            out[col] = sessions[col].to_numpy()[present]
+        return pd.DataFrame(out)
+
+    @staticmethod
+    def return_columns(sessions):
+        return [col for col in sessions.columns if col.startswith('fwd_return_') or col == 'intraday_return']
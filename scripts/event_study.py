@@ -0,0 +1,307 @@
+import argparse
+import numpy as np
+import pandas as pd
+from scripts.event_join import EventJoiner, to_utc_ns
+
+## This script runs event studies of news on stock prices. Every article (or every session's bucket of articles of one sentiment class) is an event on the trading session EventJoiner maps it to: weekend and after-hours news goes to the next session. A market model r = alpha + beta * r_market is estimated for each event over the estimation window that ends `gap` sessions before the event window. With no market series, the market is the equal-weighted mean return of the panel's tickers. model='mean' uses a constant-mean model instead, which also works for a single ticker. All windows come from cumulative sums of the return moments, so the parameters of every event cost a few array differences. Abnormal returns over the event window (e.g. sessions -5..+10) are gathered in one fancy-indexing step into a (sessions x window) matrix. Only the distinct event sessions are gathered, so events sharing a session share a row. Cumulative abnormal returns (CAR), their standardized version (SCAR) and the group averages by sentiment class or publisher come from sparse indicator products, without a Python loop over events.
+
+SUMMARY_COLUMNS = ['events', 'complete', 'mean_car', 'median_car', 'std_car', 't_stat', 'p_value', 'mean_scar', 'z_scar',
+                   'positive_share', 'mean_car_pre', 'mean_car_post']
+
+
+def _moment_sums(x, y):
+    # Cumulative sums of n, x, y, x^2, y^2 and xy over the rows where both series are present (leading zero row)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    moments = np.stack([valid.astype('float64'), x, y, x * x, y * y, x * y])
+    return np.concatenate([np.zeros((6, 1)), np.cumsum(moments, axis=1)], axis=1)
+
+
+class EventStudyEngine:
+    def __init__(self, window=(-5, 10), estimation_window=120, gap=10, min_estimation=60, model='market',
+                 level='article', class_col='sentiment_class', score_col='sentiment_score', ticker_col='stock',
+                 news_date_col='date', price_date_col='Date'):
+        """
+        Args:
+            window (tuple): First and last session of the event window relative to the event session (0)
+            estimation_window (int): Sessions used to estimate the model
+            gap (int): Sessions between the end of the estimation window and the start of the event window
+            min_estimation (int): Minimum sessions with returns in the estimation window (fewer = no estimate)
+            model (str): 'market' (market model) or 'mean' (constant-mean return model)
+            level (str): 'article' (one event per article) or 'bucket' (one event per session and sentiment class)
+            class_col (str): Sentiment class column; derived from score_col with the usual thresholds when missing
+            score_col (str): Sentiment score column (optional)
+            ticker_col, news_date_col, price_date_col (str): Column names (see EventJoiner)
+        """
+        start, end = (int(v) for v in window)
+        if start > end:
+            raise ValueError("The event window must start before it ends.")
+        if model not in ('market', 'mean'):
+            raise ValueError(f"Unknown model '{model}'. Expected 'market' or 'mean'.")
+        if level not in ('article', 'bucket'):
+            raise ValueError(f"Unknown event level '{level}'. Expected 'article' or 'bucket'.")
+        if min_estimation < 3 or min_estimation > estimation_window:
+            raise ValueError("min_estimation must be between 3 and estimation_window.")
+        self.window = (start, end)
+        self.offsets = np.arange(start, end + 1)
+        self.estimation_window = estimation_window
+        self.gap = gap
+        self.min_estimation = min_estimation
+        self.model = model
+        self.level = level
+        self.class_col = class_col
+        self.score_col = score_col
+        self.ticker_col = ticker_col
+        self.joiner = EventJoiner(horizons=(1,), intraday=False, ticker_col=ticker_col, news_date_col=news_date_col,
+                                  price_date_col=price_date_col)
+        self.events = None
+        self.abnormal = None
+
+    def session_returns(self, prices, market=None):
+        """
+        Daily stock and market returns on each ticker's session calendar.
+        Args:
+            prices (DataFrame): Daily bars with Date and Close (and the ticker column for several tickers)
+            market (Series or None): Market returns indexed by date (default: equal-weighted mean of the panel)
+        Returns:
+            DataFrame: Session table of EventJoiner.sessions with 'return' and 'market_return'
+        """
+        sessions = self.joiner.sessions(prices)
+        sessions = sessions.rename(columns={'fwd_return_1': 'return'})
+        returns = sessions['return'].to_numpy()
+        if self.model == 'mean':
+            sessions['market_return'] = 0.0
+        elif market is not None:
+            market = pd.Series(market)
+            market.index = pd.DatetimeIndex(pd.to_datetime(market.index)).tz_localize(None).normalize()
+            sessions['market_return'] = market.groupby(level=0).last().reindex(sessions['session_date']).to_numpy()
+        else:
+            if sessions['_code'].nunique() < 2:
+                raise ValueError("The equal-weighted market needs several tickers; pass market returns or use "
+                                 "model='mean'.")
+            days, _ = pd.factorize(sessions['session_date'])
+            present = ~np.isnan(returns)
+            counts = np.bincount(days[present], minlength=days.max() + 1 if len(days) else 0)
+            sums = np.bincount(days[present], weights=returns[present], minlength=len(counts))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                sessions['market_return'] = (sums / counts)[days] if len(days) else np.zeros(0)
+        return sessions
+
+    def estimate(self, sessions, event_sessions):
+        """
+        Model parameters for events on the given sessions, each over its own estimation window.
+        Args:
+            sessions (DataFrame): Output of session_returns()
+            event_sessions (ndarray): Row positions of event sessions in sessions
+        Returns:
+            dict: alpha, beta, sigma (residual standard deviation) and n (estimation sessions) per event session
+        """
+        codes = sessions['_code'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.zeros(0, dtype=int)
+        lengths = np.diff(np.r_[starts, len(codes)])
+        ticker_start = np.repeat(starts, lengths)[event_sessions]
+        ticker_end = np.repeat(starts + lengths, lengths)[event_sessions]
+        sums = _moment_sums(sessions['market_return'].to_numpy(dtype='float64'), sessions['return'].to_numpy())
+        # The estimation window ends gap sessions before the event window and stays inside the ticker's history
+        end = np.minimum(event_sessions + self.window[0] - self.gap, ticker_end)
+        start = np.maximum(end - self.estimation_window, ticker_start)
+        end = np.maximum(end, start)
+        n, sx, sy, sxx, syy, sxy = sums[:, end] - sums[:, start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            n_safe = np.where(n > 0, n, np.nan)
+            syy_c = syy - sy * sy / n_safe
+            if self.model == 'mean':
+                beta = np.zeros(len(n))
+                ssr = syy_c
+                dof = n - 1
+            else:
+                sxx_c = sxx - sx * sx / n_safe
+                sxy_c = sxy - sx * sy / n_safe
+                beta = sxy_c / sxx_c
+                ssr = syy_c - beta * sxy_c
+                dof = n - 2
+            alpha = (sy - beta * sx) / n_safe
+            sigma = np.sqrt(np.maximum(ssr, 0.0) / dof)
+        ok = n >= self.min_estimation
+        return {'alpha': np.where(ok, alpha, np.nan), 'beta': np.where(ok, beta, np.nan),
+                'sigma': np.where(ok, sigma, np.nan), 'n': n.astype('int64')}
+
+    def abnormal_returns(self, sessions, event_sessions, params):
+        """
+        Abnormal returns over the event window, gathered for all event sessions at once.
+        Returns:
+            ndarray: (event sessions x window length) abnormal returns; NaN outside the ticker's history or
+                without a model estimate
+        """
+        codes = sessions['_code'].to_numpy()
+        returns = sessions['return'].to_numpy()
+        market = sessions['market_return'].to_numpy(dtype='float64')
+        idx = event_sessions[:, None] + self.offsets[None, :]
+        inside = (idx >= 0) & (idx < len(codes))
+        idx = np.where(inside, idx, 0)
+        inside &= codes[idx] == codes[event_sessions][:, None]
+        expected = params['alpha'][:, None] + params['beta'][:, None] * market[idx]
+        return np.where(inside, returns[idx] - expected, np.nan)
+
+    def _event_table(self, news, sessions):
+        # Events with their session: one per article, or one per (session, sentiment class)
+        published, valid = to_utc_ns(news[self.joiner.news_date_col], self.joiner.market_tz)
+        tickers = news[self.ticker_col] if self.ticker_col in news.columns else None
+        session_idx = self.joiner.match(published, valid, sessions, tickers)
+        if self.class_col in news.columns:
+            classes = pd.Categorical(news[self.class_col])
+        elif self.score_col in news.columns:
+            from scripts.news_layout import classify_scores
+            classes = classify_scores(news[self.score_col])
+        else:
+            classes = None
+        matched = np.flatnonzero(session_idx >= 0)
+        events = pd.DataFrame({'session_idx': session_idx[matched]})
+        if classes is not None:
+            events[self.class_col] = classes[matched]
+        if self.score_col in news.columns:
+            events[self.score_col] = news[self.score_col].to_numpy(dtype='float64')[matched]
+        if self.level == 'article':
+            events.index = news.index[matched]
+            if 'publisher' in news.columns:
+                events['publisher'] = news['publisher'].to_numpy()[matched]
+            return events
+        keys = events.drop(columns=self.score_col, errors='ignore').columns.tolist()
+        agg = {'article_count': ('session_idx', 'size')}
+        if self.score_col in events.columns:
+            agg[self.score_col] = (self.score_col, 'mean')
+        return events.groupby(keys, observed=True, sort=True).agg(**agg).reset_index()
+
+    def run(self, news, prices, market=None):
+        """
+        Event study over all tickers.
+        Args:
+            news (DataFrame): Articles with a publication timestamp, a sentiment class (or score) and, optionally,
+                publisher and ticker columns
+            prices (DataFrame): Daily bars with Date and Close (and the ticker column for several tickers)
+            market (Series or None): Market returns indexed by date (model='market' only)
+        Returns:
+            DataFrame: One row per event with ticker, session_date, class/publisher/score, alpha, beta, sigma,
+                car, scar, car_pre (sessions before 0), car_post (from 0) and complete (full window available)
+        """
+        sessions = self.session_returns(prices, market)
+        events = self._event_table(news, sessions)
+        # Model and window are per session, so they are computed once for every distinct event session
+        unique_sessions, event_row = np.unique(events['session_idx'].to_numpy(), return_inverse=True)
+        params = self.estimate(sessions, unique_sessions)
+        abnormal = self.abnormal_returns(sessions, unique_sessions, params)
+        complete = ~np.isnan(abnormal).any(axis=1)
+        car = abnormal.sum(axis=1)
+        car = np.where(complete, car, np.nan)
+        pre = self.offsets < 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scar = car / (params['sigma'] * np.sqrt(len(self.offsets)))
+        if self.ticker_col in sessions.columns:
+            events.insert(0, self.ticker_col, sessions[self.ticker_col].to_numpy()[events['session_idx'].to_numpy()])
+        events.insert(1, 'session_date', sessions['session_date'].to_numpy()[events['session_idx'].to_numpy()])
+        for name, values in (('alpha', params['alpha']), ('beta', params['beta']), ('sigma', params['sigma']),
+                             ('car', car), ('scar', scar),
+                             ('car_pre', np.where(complete, abnormal[:, pre].sum(axis=1), np.nan)),
+                             ('car_post', np.where(complete, abnormal[:, ~pre].sum(axis=1), np.nan)),
+                             ('complete', complete)):
+            events[name] = values[event_row]
+        self.sessions = sessions
+        self.abnormal = abnormal
+        self._event_row = event_row
+        self.events = events
+        return events
+
+    def _groups(self, by):
+        # Group code per event and the group labels
+        if by is None:
+            return np.zeros(len(self.events), dtype='int64'), pd.Index(['all'], name='group')
+        by = [by] if isinstance(by, str) else list(by)
+        grouped = self.events.groupby(by, observed=True, sort=True)
+        codes = grouped.ngroup().to_numpy()
+        labels = pd.Index(list(grouped.groups.keys()), name=by[0]) if len(by) == 1 else \
+            pd.MultiIndex.from_tuples(list(grouped.groups.keys()), names=by)
+        return codes, labels
+
+    def summary(self, by='sentiment_class'):
+        """
+        Average abnormal performance per group of events (complete windows only).
+        Args:
+            by (str, list or None): Event columns to group by, e.g. 'sentiment_class', 'publisher' or both
+        Returns:
+            DataFrame: events, complete, mean/median/std CAR, cross-sectional t-statistic and p-value, mean SCAR
+                and its z-statistic, share of positive CARs, mean CAR before and from the event session
+        """
+        from scipy import stats
+        codes, labels = self._groups(by)
+        events = self.events
+        keep = events['complete'].to_numpy() & (codes >= 0)
+        frame = pd.DataFrame({'group': codes[keep], 'car': events['car'].to_numpy()[keep],
+                              'scar': events['scar'].to_numpy()[keep], 'car_pre': events['car_pre'].to_numpy()[keep],
+                              'car_post': events['car_post'].to_numpy()[keep]})
+        frame['positive'] = frame['car'] > 0
+        grouped = frame.groupby('group')
+        out = pd.DataFrame(index=np.arange(len(labels)))
+        out['events'] = np.bincount(codes[codes >= 0], minlength=len(labels))
+        out['complete'] = grouped.size().reindex(out.index, fill_value=0)
+        out['mean_car'] = grouped['car'].mean()
+        out['median_car'] = grouped['car'].median()
+        out['std_car'] = grouped['car'].std()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out['t_stat'] = out['mean_car'] / (out['std_car'] / np.sqrt(out['complete']))
+            out['p_value'] = 2 * stats.t.sf(np.abs(out['t_stat']), out['complete'] - 1)
+            out['mean_scar'] = grouped['scar'].mean()
+            out['z_scar'] = out['mean_scar'] * np.sqrt(grouped['scar'].count())
+        out['positive_share'] = grouped['positive'].mean()
+        out['mean_car_pre'] = grouped['car_pre'].mean()
+        out['mean_car_post'] = grouped['car_post'].mean()
+        out.index = labels
+        return out[SUMMARY_COLUMNS]
+
+    def caar(self, by='sentiment_class'):
+        """
+        Average and cumulative average abnormal returns per relative session (complete windows only).
+        Returns:
+            tuple: (AAR, CAAR) DataFrames indexed by relative session, one column per group
+        """
+        from scipy import sparse
+        codes, labels = self._groups(by)
+        keep = self.events['complete'].to_numpy() & (codes >= 0)
+        # Group x event-session indicator counts, so events sharing a session are summed through one row
+        weights = sparse.csr_matrix((np.ones(int(keep.sum())), (codes[keep], self._event_row[keep])),
+                                    shape=(len(labels), len(self.abnormal)))
+        counts = np.asarray(weights.sum(axis=1)).ravel()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            aar = (weights @ np.nan_to_num(self.abnormal)) / counts[:, None]
+        aar = pd.DataFrame(aar.T, index=pd.Index(self.offsets, name='day'), columns=labels)
+        aar.loc[:, counts == 0] = np.nan
+        return aar, aar.cumsum()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Event study of news sentiment on stock returns.")
+    parser.add_argument('--base-dir', default="../data")
+    parser.add_argument('--tickers', nargs='*', default=None)
+    parser.add_argument('--window', nargs=2, type=int, default=[-5, 10], metavar=('START', 'END'))
+    parser.add_argument('--estimation-window', type=int, default=120)
+    parser.add_argument('--gap', type=int, default=10)
+    parser.add_argument('--model', default='market', choices=['market', 'mean'])
+    parser.add_argument('--level', default='article', choices=['article', 'bucket'])
+    parser.add_argument('--by', nargs='*', default=['sentiment_class'], help="Event columns to group the summary by")
+    parser.add_argument('--output', default=None, help="Also write the per-event table (.parquet or .csv)")
+    args = parser.parse_args()
+    from scripts.lexicon_scorer import vader_lexicon_scores
+    from scripts.news_layout import classify_scores
+    from scripts.sentiment_cache import score_texts, scorer_version
+    from scripts.utils import load_news_data, load_price_panel
+    prices = load_price_panel(args.tickers, base_dir=args.base_dir)
+    news = load_news_data(args.base_dir, tickers=list(prices['stock'].cat.categories))
+    news['sentiment_score'] = score_texts(news['headline'].fillna("").astype(str), vader_lexicon_scores,
+                                          'vader_compound_lexicon', scorer_version('nltk'))
+    news['sentiment_class'] = classify_scores(news['sentiment_score'])
+    engine = EventStudyEngine(tuple(args.window), args.estimation_window, args.gap, model=args.model, level=args.level)
+    events = engine.run(news, prices)
+    if args.output:
+        events.to_parquet(args.output) if args.output.endswith('.parquet') else events.to_csv(args.output, index=False)
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(engine.summary(args.by or None))
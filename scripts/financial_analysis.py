@@ -1,8 +1,13 @@
+import os
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import talib
-import mplfinance as mpf
 from scripts.utils import get_stock_name
+from scripts.indicator_engine import TechnicalIndicatorEngine
+from scripts.incremental_indicators import IncrementalIndicatorState
+from scripts.price_store import PriceStore
+from scripts.trend_analysis import TrendEngine, direction, direction_counts, trend_states, DIRECTION_LABELS
+from scripts.plotting import PlotEmitter, PlotSpec
+from scripts.instrumentation import instrumented
 
 ## This script performs financial analysis based on the data provided in a DataFrame which is loaded from ../data/yfinance_data/<STOCKPREFIX>_historical_data.csv. Here is the mapping of the STOCKPREFIX to the stock name:
 # STOCKPREFIX = {
@@ -15,12 +20,23 @@ from scripts.utils import get_stock_name
 #     "NVDA": "NVIDIA",
 # }
 
-class FinancialDataAnalyzer:
-    def __init__(self, df, stock_prefix):
+class FinancialDataAnalyzer(PlotEmitter):
+    def __init__(self, df, stock_prefix, render='show', instrumentation=None):
+        # render: 'show' displays plots, 'defer' collects them in self.plot_specs (see render_plots), 'off' skips them
+        # instrumentation: optional scripts.instrumentation.Instrumentation recording per-stage time, memory and rows
         self.df = df
         self.stock_prefix = stock_prefix
         self.stock_name = get_stock_name(self.stock_prefix)
+        self._init_plotting(render)
+        self.instrumentation = instrumentation
 
+    @classmethod
+    def from_price_store(cls, store, stock_prefix, render='show', instrumentation=None):
+        # Attach to a ticker in a memory-mapped PriceStore (see scripts/price_store.py); the frame's price columns
+        # share memory with the store instead of holding a parsed copy
+        return cls(store.frame(stock_prefix), stock_prefix, render=render, instrumentation=instrumentation)
+
+    @instrumented()
     def change_to_datetime(self):
         # Convert the 'Date' column to datetime format
         self.df['Date'] = pd.to_datetime(self.df['Date'])
@@ -36,27 +52,27 @@ class FinancialDataAnalyzer:
         # Reset the index of the DataFrame
         self.df.reset_index(['Date'], inplace=True)
 
+    @instrumented()
     def plot_stock_prices(self):
         # Plot the stock prices over time and candlestick chart
-        plt.figure(figsize=(14, 7))
-        plt.plot(self.df.index, self.df['Close'], label='Close Price', color='blue', alpha=0.1)
-        plt.plot(self.df.index, self.df['Open'], label='Open Price', color='orange', alpha=0.5) # Plotting Open Price
-        plt.plot(self.df.index, self.df['High'], label='High Price', color='green', alpha=0.7) # Plotting High Price
-        plt.plot(self.df.index, self.df['Low'], label='Low Price', color='red', alpha=0.6) # Plotting Low Price
-        plt.title(f'{self.stock_name} Stock Prices Over Time')
-        plt.xlabel('Date')
-        plt.ylabel('Price (USD)')
-        plt.legend()
-        plt.grid()
-        plt.show()
+        spec = PlotSpec(f'{self.stock_prefix}_prices', f'{self.stock_name} Stock Prices Over Time', 'Date', 'Price (USD)',
+                        figsize=(14, 7))
+        spec.line(self.df.index, self.df['Close'], label='Close Price', color='blue', alpha=0.1)
+        spec.line(self.df.index, self.df['Open'], label='Open Price', color='orange', alpha=0.5) # Plotting Open Price
+        spec.line(self.df.index, self.df['High'], label='High Price', color='green', alpha=0.7) # Plotting High Price
+        spec.line(self.df.index, self.df['Low'], label='Low Price', color='red', alpha=0.6) # Plotting Low Price
+        self._emit(spec.set(legend=True, grid=True))
 
         # self.set_date_as_index()
-        mpf.plot(self.df, type='candle', style='charles',
-                 title=f'{self.stock_name} Stock Prices',
-                 ylabel='Price (USD)', volume=True)
+        ohlcv = self.df[[col for col in ('Open', 'High', 'Low', 'Close', 'Volume') if col in self.df.columns]]
+        self._emit(PlotSpec.candlestick(f'{self.stock_prefix}_candlestick', ohlcv, type='candle', style='charles',
+                                        title=f'{self.stock_name} Stock Prices',
+                                        ylabel='Price (USD)', volume='Volume' in ohlcv.columns))
     
+    @instrumented()
     def calculate_technical_indicators(self):
         # Calculate technical indicators using TA-Lib
+        import talib
         self.df['SMA_20'] = talib.SMA(self.df['Close'], timeperiod=20)
         self.df['SMA_50'] = talib.SMA(self.df['Close'], timeperiod=50)
         self.df['RSI'] = talib.RSI(self.df['Close'], timeperiod=14)
@@ -68,62 +84,115 @@ class FinancialDataAnalyzer:
         self.df['Upper_BB'], self.df['Middle_BB'], self.df['Lower_BB'] = talib.BBANDS(self.df['Close'], timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
         self.df['ATR'] = talib.ATR(self.df['High'], self.df['Low'], self.df['Close'], timeperiod=14)
 
+    @instrumented()
+    def update_technical_indicators(self, new_bars, state=None, state_path=None):
+        """
+        Append new daily bars to self.df and compute the technical indicators for those bars only.
+        Args:
+            new_bars (DataFrame): Bars to append (same columns as self.df, 'Date' as column or index)
+            state (IncrementalIndicatorState or None): State after the last bar of self.df
+            state_path (str or None): JSON file to load the state from (if state is None) and save it to afterwards
+        Returns:
+            IncrementalIndicatorState: The updated state
+        """
+        if state is None:
+            if state_path is not None and os.path.exists(state_path):
+                state = IncrementalIndicatorState.load(state_path)
+            else:
+                # No saved state yet: replay the existing history once
+                state = IncrementalIndicatorState.from_history(self.df)
+        new_bars = new_bars.copy()
+        if self.df.index.name == 'Date' and 'Date' in new_bars.columns:
+            new_bars['Date'] = pd.to_datetime(new_bars['Date'])
+            new_bars.set_index('Date', inplace=True)
+        indicators = state.update_frame(new_bars)
+        self.df = pd.concat([self.df, new_bars.join(indicators)])
+        if state_path is not None:
+            state.save(state_path)
+        return state
+
+    @staticmethod
+    def calculate_panel_indicators(panel, ticker_col='stock', date_col='Date', n_workers=1):
+        # Calculate the same indicators for many tickers at once from a long-format OHLCV frame or a PriceStore
+        # (see scripts/indicator_engine.py); returns a compact float32 frame instead of mutating a df
+        engine = TechnicalIndicatorEngine(ticker_col=ticker_col, date_col=date_col, n_workers=n_workers)
+        if isinstance(panel, PriceStore):
+            return engine.compute_store(panel)
+        return engine.compute(panel)
+
+    @instrumented()
     def plot_technical_indicators(self, start_date, end_date):
         # Plot technical indicators over a specified date range
         filtered_df = self.df[(self.df.index >= start_date) & (self.df.index <= end_date)]
-        
-        plt.figure(figsize=(14, 10))
-        
-        # Plot Close Price and SMA
-        plt.subplot(3, 1, 1)
-        plt.plot(filtered_df.index, filtered_df['Close'], label='Close Price', color='blue')
-        plt.plot(filtered_df.index, filtered_df['SMA_20'], label='20-Day SMA', color='orange')
-        plt.plot(filtered_df.index, filtered_df['SMA_50'], label='50-Day SMA', color='green')
-        plt.title(f'{self.stock_name} Stock Price and Technical Indicators')
-        plt.xlabel('Date')
-        plt.ylabel('Price (USD)')
-        plt.legend()
-        plt.grid()
-
-        # Plot RSI
-        plt.subplot(3, 1, 2)
-        plt.plot(filtered_df.index, filtered_df['RSI'], label='RSI', color='purple')
-        plt.axhline(70, linestyle='--', alpha=0.5, color='red')
-        plt.axhline(30, linestyle='--', alpha=0.5, color='green')
-        plt.title('Relative Strength Index (RSI)')
-        plt.xlabel('Date')
-        plt.ylabel('RSI Value')
-        plt.legend()
-        plt.grid()
-
-        # Plot MACD
-        plt.subplot(3, 1, 3)
-        plt.plot(filtered_df.index, filtered_df['MACD'], label='MACD', color='blue')
-        plt.plot(filtered_df.index, filtered_df['MACD_signal'], label='MACD Signal', color='orange')
-        plt.title('Moving Average Convergence Divergence (MACD)')
-        plt.xlabel('Date')
-        plt.ylabel('MACD Value')
-        plt.legend()
-        plt.grid()
-
-        plt.tight_layout()
-        plt.show()  
+        dates = filtered_df.index
+
+        # Close Price and SMA
+        spec = PlotSpec(f'{self.stock_prefix}_technical_indicators', f'{self.stock_name} Stock Price and Technical Indicators',
+                        'Date', 'Price (USD)', figsize=(14, 10))
+        spec.line(dates, filtered_df['Close'], label='Close Price', color='blue')
+        spec.line(dates, filtered_df['SMA_20'], label='20-Day SMA', color='orange')
+        spec.line(dates, filtered_df['SMA_50'], label='50-Day SMA', color='green')
+        spec.set(legend=True, grid=True)
+
+        # RSI
+        spec.subplot('Relative Strength Index (RSI)', 'Date', 'RSI Value', legend=True, grid=True)
+        spec.line(dates, filtered_df['RSI'], label='RSI', color='purple')
+        spec.hline(70, linestyle='--', alpha=0.5, color='red')
+        spec.hline(30, linestyle='--', alpha=0.5, color='green')
 
+        # MACD
+        spec.subplot('Moving Average Convergence Divergence (MACD)', 'Date', 'MACD Value', legend=True, grid=True)
+        spec.line(dates, filtered_df['MACD'], label='MACD', color='blue')
+        spec.line(dates, filtered_df['MACD_signal'], label='MACD Signal', color='orange')
+
+        self._emit(spec)
+        return filtered_df
+
+    @instrumented()
     def analyze_stock_price_trends(self):
-        # Analyze stock price trends
-        self.df['Trend'] = self.df['Close'].diff().apply(lambda x: 'Up' if x > 0 else 'Down' if x < 0 else 'No Change')
-        trend_counts = self.df['Trend'].value_counts()
+        # Analyze stock price trends; Trend is stored as int8 (1 up, -1 down, 0 no change, see DIRECTION_LABELS)
+        self.df['Trend'] = direction(self.df['Close'])
+        # Multi-timeframe trend state (strong_down..strong_up) from Close/SMA_20 and SMA_20/SMA_50, once the
+        # averages exist (see calculate_technical_indicators)
+        if 'SMA_20' in self.df.columns and 'SMA_50' in self.df.columns:
+            self.df['Trend_State'] = trend_states(self.df['Close'], self.df['SMA_20'], self.df['SMA_50'])
+        trend_counts = direction_counts(self.df['Trend'])
         print(f"Stock Price Trend Analysis for {self.stock_name}:\n{trend_counts}")
+        return trend_counts
+
+    @instrumented()
+    def analyze_trend_statistics(self, gap_threshold=0.01):
+        # Streak, overnight gap and drawdown statistics plus the distribution of streak lengths
+        panel = self.df.reset_index() if self.df.index.name == 'Date' else self.df
+        engine = TrendEngine(ticker_col=None, gap_threshold=gap_threshold)
+        summary = engine.summary(panel).iloc[0]
+        distribution = engine.streak_distribution(panel)
+        print(f"Trend Statistics for {self.stock_name}:\n{summary}")
+
+        spec = PlotSpec(f'{self.stock_prefix}_streak_lengths', f'{self.stock_name} Up/Down Streak Lengths',
+                        'Streak Length (days)', 'Number of Streaks', figsize=(10, 6))
+        for label, color in ((DIRECTION_LABELS[1], 'green'), (DIRECTION_LABELS[-1], 'red')):
+            streaks = distribution[distribution['direction'] == label]
+            spec.bar(streaks['length'], streaks['count'], label=label, color=color, alpha=0.6)
+        spec.set(legend=True)
+        self._emit(spec)
+        return summary, distribution
+
+    @staticmethod
+    def calculate_panel_trends(panel, ticker_col='stock', date_col='Date', gap_threshold=0.01):
+        # Per-ticker trend, streak, gap and drawdown statistics for a long-format OHLCV frame
+        # (see scripts/trend_analysis.py)
+        engine = TrendEngine(ticker_col=ticker_col, date_col=date_col, gap_threshold=gap_threshold)
+        return engine.summary(panel)
 
+    @instrumented()
     def visualize_stock_price_distribution(self):
         # Visualize the distribution of stock prices
-        plt.figure(figsize=(10, 6))
-        plt.hist(self.df['Close'], bins=50, color='blue', alpha=0.7)
-        plt.title(f'{self.stock_name} Stock Price Distribution')
-        plt.xlabel('Price (USD)')
-        plt.ylabel('Frequency')
-        plt.grid()
-        plt.show()
+        spec = PlotSpec(f'{self.stock_prefix}_price_distribution', f'{self.stock_name} Stock Price Distribution',
+                        'Price (USD)', 'Frequency', figsize=(10, 6))
+        counts, edges = np.histogram(self.df['Close'].dropna(), bins=50)
+        self._emit(spec.binned(counts, edges, color='blue', alpha=0.7).set(grid=True))
+        return pd.Series(counts, index=pd.IntervalIndex.from_breaks(edges), name='count')
 
     def correlate_sentiment_with_stock_prices(self):
         # Placeholder for sentiment analysis correlation
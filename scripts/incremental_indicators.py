@@ -0,0 +1,249 @@
+import json
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+
+## This script keeps the internal state of the indicators computed by FinancialDataAnalyzer.calculate_technical_indicators (price windows for SMA-20/50 and Bollinger Bands, EMA states for MACD, Wilder accumulators for RSI/ATR, the return window for volatility and the running cumulative products) so that appended daily bars can be processed in O(new bars) instead of recomputing the whole history. The state can be saved to and loaded from a JSON file between runs.
+#
+# Tolerance: every indicator replays TA-Lib's/pandas' own update order (running window totals, SMA-seeded EMAs, Wilder accumulators, sequential products). SMA_20/50, Middle_BB, MACD, Return and cumulative_return match a full recompute bit-for-bit; RSI, MACD_signal, ATR and the outer Bollinger Bands can differ in the last bits (relative error below 1e-11) because the compiled TA-Lib may fuse multiply-adds. Volatility is recomputed from its 20-return window rather than with pandas' online rolling algorithm, so Volatility and cumulative_volatility match to a relative error below 1e-12.
+
+STATE_VERSION = 1
+SMA_PERIODS = (20, 50)
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BB_PERIOD, BB_NBDEV = 20, 2.0
+VOLATILITY_WINDOW = 20
+NAN = float('nan')
+# TA-Lib treats values closer to zero than this as zero
+_TA_EPSILON = 0.00000000000001
+
+
+class IncrementalIndicatorState:
+    def __init__(self):
+        self.n = 0                      # bars processed
+        self.last_date = None           # ISO date of the last bar, used to reject out-of-order appends
+        self.closes = deque(maxlen=max(SMA_PERIODS + (BB_PERIOD, MACD_SLOW)))
+        self.prev_close = None
+        # MACD: EMA states plus the MACD values buffered until the signal EMA is seeded
+        self.ema_fast = None
+        self.ema_slow = None
+        self.ema_signal = None
+        self.macd_warmup = []
+        # Running window totals, as kept by TA-Lib's SMA and stddev
+        self.sma_totals = {period: 0.0 for period in SMA_PERIODS}
+        self.bb_total_sq = 0.0
+        # RSI / ATR: Wilder accumulators (sums during warm-up, averages afterwards)
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.atr = 0.0
+        # Volatility and cumulative products
+        self.returns = deque(maxlen=VOLATILITY_WINDOW)
+        self.cum_return = 1.0
+        self.cum_volatility = 1.0
+
+    # ----- per-bar update -----
+
+    def update(self, high, low, close, date=None):
+        """
+        Advance the state by one bar.
+        Returns:
+            dict: Indicator values for this bar (NaN where the indicator is still warming up)
+        """
+        i = self.n
+        out = {}
+        self.closes.append(close)
+
+        for period in SMA_PERIODS:
+            out[f'SMA_{period}'] = self._update_sma(period, close, i)
+
+        out['RSI'] = self._update_rsi(close, i)
+        out['MACD'], out['MACD_signal'] = self._update_macd(close, i)
+
+        # Daily return, rolling volatility and the running cumulative products (pandas skips NaN in cumprod)
+        ret = close / self.prev_close - 1.0 if self.prev_close is not None else NAN
+        out['Return'] = ret
+        if not math.isnan(ret):
+            self.returns.append(ret)
+            self.cum_return *= 1.0 + ret
+        out['cumulative_return'] = self.cum_return - 1.0 if not math.isnan(ret) else NAN
+        if i >= VOLATILITY_WINDOW:
+            volatility = float(np.std(np.fromiter(self.returns, float), ddof=1))
+            self.cum_volatility *= 1.0 + volatility
+            out['Volatility'] = volatility
+            out['cumulative_volatility'] = self.cum_volatility - 1.0
+        else:
+            out['Volatility'] = NAN
+            out['cumulative_volatility'] = NAN
+
+        out['Upper_BB'], out['Middle_BB'], out['Lower_BB'] = self._update_bbands(out[f'SMA_{BB_PERIOD}'], close, i)
+
+        out['ATR'] = self._update_atr(high, low, close, i)
+
+        self.prev_close = close
+        self.n += 1
+        if date is not None:
+            self.last_date = pd.Timestamp(date).isoformat()
+        return out
+
+    def _update_sma(self, period, close, i):
+        # TA-Lib SMA: add the new close, emit total/period, then drop the trailing close
+        self.sma_totals[period] += close
+        if i < period - 1:
+            return NAN
+        value = self.sma_totals[period] / period
+        self.sma_totals[period] -= self.closes[-period]
+        return value
+
+    def _update_bbands(self, middle, close, i):
+        # TA-Lib stddev from the running sum of squares around the precomputed SMA
+        self.bb_total_sq += close * close
+        if i < BB_PERIOD - 1:
+            return NAN, NAN, NAN
+        mean_sq = self.bb_total_sq / BB_PERIOD
+        trailing = self.closes[-BB_PERIOD]
+        self.bb_total_sq -= trailing * trailing
+        mean_sq -= middle * middle
+        std = math.sqrt(mean_sq) if mean_sq >= _TA_EPSILON else 0.0
+        deviation = std * BB_NBDEV
+        return middle + deviation, middle, middle - deviation
+
+    def _update_rsi(self, close, i):
+        if i == 0:
+            return NAN
+        delta = close - self.prev_close
+        if i <= RSI_PERIOD:
+            # Warm-up: plain sums of the first RSI_PERIOD gains/losses, averaged on the seed bar
+            if delta < 0:
+                self.avg_loss -= delta
+            else:
+                self.avg_gain += delta
+            if i < RSI_PERIOD:
+                return NAN
+            self.avg_loss /= RSI_PERIOD
+            self.avg_gain /= RSI_PERIOD
+        else:
+            self.avg_loss *= RSI_PERIOD - 1
+            self.avg_gain *= RSI_PERIOD - 1
+            if delta < 0:
+                self.avg_loss -= delta
+            else:
+                self.avg_gain += delta
+            self.avg_loss /= RSI_PERIOD
+            self.avg_gain /= RSI_PERIOD
+        total = self.avg_gain + self.avg_loss
+        return 100.0 * (self.avg_gain / total) if abs(total) >= _TA_EPSILON else 0.0
+
+    def _update_macd(self, close, i):
+        start = MACD_SLOW - 1
+        if i < start:
+            return NAN, NAN
+        if i == start:
+            # TA-Lib seeds both EMAs at bar slow-1 with the SMA of the preceding `period` closes
+            window = list(self.closes)
+            self.ema_fast = sum(window[-MACD_FAST:]) / MACD_FAST
+            self.ema_slow = sum(window[-MACD_SLOW:]) / MACD_SLOW
+        else:
+            self.ema_fast = (close - self.ema_fast) * (2.0 / (MACD_FAST + 1)) + self.ema_fast
+            self.ema_slow = (close - self.ema_slow) * (2.0 / (MACD_SLOW + 1)) + self.ema_slow
+        macd = self.ema_fast - self.ema_slow
+        if i < start + MACD_SIGNAL - 1:
+            self.macd_warmup.append(macd)
+            return NAN, NAN
+        if i == start + MACD_SIGNAL - 1:
+            self.macd_warmup.append(macd)
+            self.ema_signal = sum(self.macd_warmup) / MACD_SIGNAL
+            self.macd_warmup = []
+        else:
+            self.ema_signal = (macd - self.ema_signal) * (2.0 / (MACD_SIGNAL + 1)) + self.ema_signal
+        return macd, self.ema_signal
+
+    def _update_atr(self, high, low, close, i):
+        if i == 0:
+            return NAN
+        prev = self.prev_close
+        true_range = max(high - low, abs(high - prev), abs(low - prev))
+        if i < ATR_PERIOD:
+            self.atr += true_range
+            return NAN
+        if i == ATR_PERIOD:
+            self.atr = (self.atr + true_range) / ATR_PERIOD
+        else:
+            self.atr = (self.atr * (ATR_PERIOD - 1) + true_range) / ATR_PERIOD
+        return self.atr
+
+    # ----- batch helpers -----
+
+    def update_frame(self, bars):
+        """
+        Advance the state over appended bars (a DataFrame with High/Low/Close and a Date index or column).
+        Returns:
+            DataFrame: Indicator columns for the new bars, indexed like bars
+        """
+        dates = bars.index if 'Date' not in bars.columns else bars['Date']
+        dates = pd.to_datetime(pd.Series(dates, index=bars.index))
+        if self.last_date is not None and len(dates) and dates.iloc[0] <= pd.Timestamp(self.last_date):
+            raise ValueError(f"New bars must start after the last processed bar ({self.last_date}).")
+        rows = [
+            self.update(high, low, close, date)
+            for high, low, close, date in zip(bars['High'].to_numpy(float), bars['Low'].to_numpy(float),
+                                              bars['Close'].to_numpy(float), dates)
+        ]
+        return pd.DataFrame(rows, index=bars.index)
+
+    @classmethod
+    def from_history(cls, df):
+        # Build the state by replaying a full price history once
+        state = cls()
+        state.update_frame(df)
+        return state
+
+    # ----- persistence -----
+
+    def to_dict(self):
+        return {
+            'version': STATE_VERSION,
+            'n': self.n,
+            'last_date': self.last_date,
+            'closes': list(self.closes),
+            'prev_close': self.prev_close,
+            'ema_fast': self.ema_fast,
+            'ema_slow': self.ema_slow,
+            'ema_signal': self.ema_signal,
+            'macd_warmup': self.macd_warmup,
+            'sma_totals': {str(period): total for period, total in self.sma_totals.items()},
+            'bb_total_sq': self.bb_total_sq,
+            'avg_gain': self.avg_gain,
+            'avg_loss': self.avg_loss,
+            'atr': self.atr,
+            'returns': list(self.returns),
+            'cum_return': self.cum_return,
+            'cum_volatility': self.cum_volatility,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != STATE_VERSION:
+            raise ValueError(f"Unsupported indicator state version: {data.get('version')}")
+        state = cls()
+        for key, value in data.items():
+            if key == 'closes':
+                state.closes.extend(value)
+            elif key == 'returns':
+                state.returns.extend(value)
+            elif key == 'sma_totals':
+                state.sma_totals = {int(period): total for period, total in value.items()}
+            elif key != 'version':
+                setattr(state, key, value)
+        return state
+
+    def save(self, path):
+        # JSON round-trips Python floats exactly, so a reloaded state continues bit-for-bit
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,240 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from numpy.lib.stride_tricks import sliding_window_view
+
+## This script provides a panel-level technical indicator engine. It takes a long-format OHLCV frame for many tickers and computes the same indicator set as FinancialDataAnalyzer.calculate_technical_indicators for every ticker in one grouped pass: the prices are packed into a (ticker x bar) matrix and every indicator is evaluated with NumPy/SciPy array operations along the time axis, so there is no per-ticker or per-row Python loop. The seeding rules of TA-Lib (SMA-seeded EMAs, the MACD fast-EMA offset, Wilder averages for RSI/ATR, population std for Bollinger Bands) are reproduced so results match the per-ticker TA-Lib output within floating point tolerance (max abs diff ~1e-10 before the float32 cast).
+
+INDICATOR_COLUMNS = [
+    'SMA_20', 'SMA_50', 'RSI', 'MACD', 'MACD_signal', 'Return', 'Volatility',
+    'cumulative_return', 'cumulative_volatility', 'Upper_BB', 'Middle_BB', 'Lower_BB', 'ATR',
+]
+
+
+def _shift_right(x, n):
+    # Shift a (ticker x bar) matrix n bars to the right, filling with NaN
+    out = np.full_like(x, np.nan)
+    if n < x.shape[1]:
+        out[:, n:] = x[:, :x.shape[1] - n]
+    return out
+
+
+def rolling_apply(x, window, func):
+    # Apply a window reduction (e.g. np.mean) along the bar axis; the first window-1 bars are NaN
+    out = np.full_like(x, np.nan)
+    if x.shape[1] >= window:
+        out[:, window - 1:] = func(sliding_window_view(x, window, axis=1), axis=-1)
+    return out
+
+
+def sma(x, period):
+    return rolling_apply(x, period, np.mean)
+
+
+def smoothed(x, alpha, seed_index, seed):
+    """
+    Exponential smoothing y[t] = y[t-1] + alpha * (x[t] - y[t-1]) for every row at once.
+    Args:
+        x (ndarray): (ticker x bar) input
+        alpha (float): Smoothing factor (2/(n+1) for an EMA, 1/n for Wilder smoothing)
+        seed_index (int): Bar at which the recursion starts
+        seed (ndarray): Per-ticker value of y at seed_index
+    Returns:
+        ndarray: Smoothed matrix, NaN before seed_index
+    """
+    out = np.full_like(x, np.nan)
+    if seed_index >= x.shape[1]:
+        return out
+    out[:, seed_index] = seed
+    if seed_index + 1 < x.shape[1]:
+        # First-order IIR filter; zi carries the seed into the recursion
+        from scipy.signal import lfilter
+        zi = ((1 - alpha) * seed)[:, None]
+        out[:, seed_index + 1:], _ = lfilter([alpha], [1.0, alpha - 1.0], x[:, seed_index + 1:], axis=1, zi=zi)
+    return out
+
+
+def ema(x, period, seed_index=None):
+    # TA-Lib EMA: seeded with the SMA of the `period` bars ending at seed_index
+    if seed_index is None:
+        seed_index = period - 1
+    if seed_index >= x.shape[1]:
+        return np.full_like(x, np.nan)
+    seed = x[:, seed_index - period + 1:seed_index + 1].mean(axis=1)
+    return smoothed(x, 2.0 / (period + 1), seed_index, seed)
+
+
+def wilder(x, period, first):
+    # Wilder average: seeded with the mean of `period` values starting at `first`
+    seed_index = first + period - 1
+    if seed_index >= x.shape[1]:
+        return np.full_like(x, np.nan)
+    seed = x[:, first:seed_index + 1].mean(axis=1)
+    return smoothed(x, 1.0 / period, seed_index, seed)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    # TA-Lib MACD: both EMAs start at bar slow-1, so the fast EMA is seeded on bars [slow-fast, slow-1]
+    start = slow - 1
+    macd_line = ema(close, fast, seed_index=start) - ema(close, slow, seed_index=start)
+    signal_line = ema(macd_line, signal, seed_index=start + signal - 1)
+    macd_line[:, :start + signal - 1] = np.nan
+    return macd_line, signal_line
+
+
+def rsi(close, period=14):
+    delta = close - _shift_right(close, 1)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    avg_gain = wilder(gain, period, first=1)
+    avg_loss = wilder(loss, period, first=1)
+    total = avg_gain + avg_loss
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = np.where(total != 0, 100.0 * avg_gain / total, 0.0)
+    out[np.isnan(total)] = np.nan
+    return out
+
+
+def atr(high, low, close, period=14):
+    prev_close = _shift_right(close, 1)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    true_range[:, 0] = np.nan
+    return wilder(true_range, period, first=1)
+
+
+def bbands(close, period=20, nbdev=2.0):
+    middle = sma(close, period)
+    std = rolling_apply(close, period, np.std)
+    return middle + nbdev * std, middle, middle - nbdev * std
+
+
+def cumulative(x):
+    # (1 + x).cumprod() - 1 with pandas semantics: NaN rows stay NaN and are skipped by the product
+    growth = np.cumprod(np.where(np.isnan(x), 1.0, 1.0 + x), axis=1) - 1.0
+    growth[np.isnan(x)] = np.nan
+    return growth
+
+
+def compute_indicator_matrix(open_, high, low, close):
+    """
+    Compute the full indicator set on (ticker x bar) matrices.
+    Returns:
+        dict: Indicator name -> (ticker x bar) float64 matrix
+    """
+    out = {}
+    out['SMA_20'] = sma(close, 20)
+    out['SMA_50'] = sma(close, 50)
+    out['RSI'] = rsi(close, 14)
+    out['MACD'], out['MACD_signal'] = macd(close, 12, 26, 9)
+    prev_close = _shift_right(close, 1)
+    out['Return'] = close / prev_close - 1.0
+    out['Volatility'] = rolling_apply(out['Return'], 20, lambda w, axis: np.std(w, axis=axis, ddof=1))
+    out['cumulative_return'] = cumulative(out['Return'])
+    out['cumulative_volatility'] = cumulative(out['Volatility'])
+    out['Upper_BB'], out['Middle_BB'], out['Lower_BB'] = bbands(close, 20, 2.0)
+    out['ATR'] = atr(high, low, close, 14)
+    return out
+
+
+def _pack(values, starts, lengths):
+    # Scatter a sorted long column into a left-aligned (ticker x max_len) matrix padded with NaN
+    matrix = np.full((len(starts), lengths.max() if len(lengths) else 0), np.nan)
+    rows = np.repeat(np.arange(len(starts)), lengths)
+    cols = np.arange(len(values)) - np.repeat(starts, lengths)
+    matrix[rows, cols] = values
+    return matrix, rows, cols
+
+
+def _compute_sorted(panel, ticker_col):
+    # Compute indicators for a panel already sorted by (ticker, date); returns float32 columns in row order
+    codes = pd.factorize(panel[ticker_col], sort=False)[0]
+    boundaries = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate(([0], boundaries)) if len(codes) else np.array([], dtype=int)
+    lengths = np.diff(np.concatenate((starts, [len(codes)])))
+    matrices = {}
+    for col in ('Open', 'High', 'Low', 'Close'):
+        matrices[col], rows, cols = _pack(panel[col].to_numpy(dtype='float64'), starts, lengths)
+    result = compute_indicator_matrix(matrices['Open'], matrices['High'], matrices['Low'], matrices['Close'])
+    return {name: result[name][rows, cols].astype('float32') for name in INDICATOR_COLUMNS}
+
+
+def _compute_store_group(store, tickers, ticker_col):
+    # Compute indicators for some tickers of a PriceStore (the store arrives pickled as its path)
+    return _compute_sorted(store.panel(tickers, ['Open', 'High', 'Low', 'Close'], ticker_col=ticker_col), ticker_col)
+
+
+class TechnicalIndicatorEngine:
+    def __init__(self, ticker_col='stock', date_col='Date', n_workers=1):
+        """
+        Args:
+            ticker_col (str): Column holding the ticker symbol in the long-format panel
+            date_col (str): Column (or index level name) holding the bar date
+            n_workers (int or None): Processes used to split tickers across (None = all cores, 1 = in-process)
+        """
+        self.ticker_col = ticker_col
+        self.date_col = date_col
+        self.n_workers = n_workers or os.cpu_count() or 1
+
+    def compute(self, panel):
+        """
+        Compute SMA_20/50, RSI, MACD, returns, volatility, cumulative return/volatility, Bollinger Bands and ATR
+        for every ticker of a long-format OHLCV frame.
+        Args:
+            panel (DataFrame): Rows of (ticker, date, Open, High, Low, Close, ...)
+        Returns:
+            DataFrame: ticker, date and float32 indicator columns, with the same index and row order as panel
+        """
+        if self.date_col not in panel.columns and self.date_col in panel.index.names:
+            panel = panel.reset_index(self.date_col)
+        # Sort by (ticker, date) once; positions lets us restore the caller's row order at the end
+        order = np.lexsort((panel[self.date_col].to_numpy(), pd.factorize(panel[self.ticker_col])[0]))
+        sorted_panel = panel.iloc[order]
+        tickers = pd.unique(sorted_panel[self.ticker_col])
+        if self.n_workers > 1 and len(tickers) > 1:
+            columns = self._compute_parallel(sorted_panel, tickers)
+        else:
+            columns = _compute_sorted(sorted_panel, self.ticker_col)
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        result = pd.DataFrame({name: values[inverse] for name, values in columns.items()}, index=panel.index)
+        result.insert(0, self.date_col, panel[self.date_col].to_numpy())
+        result.insert(0, self.ticker_col, panel[self.ticker_col].to_numpy())
+        return result
+
+    def compute_store(self, store, tickers=None):
+        """
+        Compute the indicators for tickers of a memory-mapped PriceStore. The store is already grouped by ticker in
+        date order, so nothing is sorted; with n_workers > 1 each worker maps the store itself and only receives
+        its tickers' names.
+        Args:
+            store (PriceStore): Price store (see scripts/price_store.py)
+            tickers (list or None): Tickers to compute (default: all)
+        Returns:
+            DataFrame: ticker, date and float32 indicator columns, grouped by ticker in date order
+        """
+        tickers = store.tickers if tickers is None else list(tickers)
+        groups = [list(group) for group in np.array_split(tickers, min(self.n_workers, len(tickers)))] if tickers else []
+        if len(groups) > 1:
+            with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+                futures = [executor.submit(_compute_store_group, store, group, self.ticker_col) for group in groups]
+                parts = [future.result() for future in futures]
+            columns = {name: np.concatenate([part[name] for part in parts]) for name in INDICATOR_COLUMNS}
+        else:
+            columns = _compute_store_group(store, tickers, self.ticker_col)
+        panel = store.panel(tickers, columns=['Date'], ticker_col=self.ticker_col)
+        result = pd.DataFrame(columns)
+        result.insert(0, self.date_col, panel['Date'].to_numpy())
+        result.insert(0, self.ticker_col, panel[self.ticker_col].to_numpy())
+        return result
+
+    def _compute_parallel(self, sorted_panel, tickers):
+        # Split the (sorted) panel into contiguous ticker groups and compute each group in its own process
+        groups = np.array_split(tickers, min(self.n_workers, len(tickers)))
+        is_in_group = [sorted_panel[self.ticker_col].isin(group).to_numpy() for group in groups]
+        needed = [self.ticker_col, 'Open', 'High', 'Low', 'Close']
+        with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [executor.submit(_compute_sorted, sorted_panel.loc[mask, needed], self.ticker_col) for mask in is_in_group]
+            parts = [future.result() for future in futures]
+        # Groups are contiguous blocks of the sorted panel, so concatenation restores sorted order
+        return {name: np.concatenate([part[name] for part in parts]) for name in INDICATOR_COLUMNS}
@@ -0,0 +1,234 @@
+import os
+import io
+import sys
+import json
+import time
+import logging
+import cProfile
+import pstats
+import functools
+import tracemalloc
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+## This script provides per-stage instrumentation for the analyzer classes. Each decorated analyzer method (a "stage") is measured for wall time, CPU time, resident memory (current and the process high-water mark), optionally the tracemalloc peak, and the rows of the analyzer's frame going in and coming out. Records are sent to pluggable sinks: a log line, a JSON-lines file, or an in-memory report. One chosen stage can additionally be run under cProfile. Without an Instrumentation object the decorator calls the method directly, and with one the default measurements cost a few tens of microseconds per stage, so it can stay enabled in production runs.
+
+
+_process = None
+
+
+def _rss_mb():
+    # Current resident set size of this process (None without psutil)
+    global _process
+    if _process is None:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        _process = psutil.Process()
+    return _process.memory_info().rss / 2 ** 20
+
+
+def _max_rss_mb():
+    # Process high-water mark of the resident set size (ru_maxrss is in KiB on Linux, bytes on macOS)
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 2 ** 20 if sys.platform == 'darwin' else maxrss / 2 ** 10
+
+
+def count_rows(value):
+    # Rows of a DataFrame/Series (or of the first frame in a tuple result), None otherwise
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    if hasattr(value, 'shape') and hasattr(value, 'index'):
+        return int(value.shape[0])
+    return None
+
+
+# ----- sinks -----
+
+class LoggingSink:
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger('scripts.instrumentation')
+        self.level = level
+
+    def emit(self, record):
+        memory = f" rss={record['rss_mb']:.1f}MB ({record['rss_delta_mb']:+.1f})" if record['rss_mb'] is not None else ''
+        traced = f" traced_peak={record['traced_peak_mb']:.1f}MB" if record.get('traced_peak_mb') is not None else ''
+        self.logger.log(
+            self.level, "%s wall=%.4fs cpu=%.4fs rows=%s->%s%s%s%s", record['stage'], record['wall_s'], record['cpu_s'],
+            record['rows_in'], record['rows_out'], memory, traced, f" error={record['error']}" if record['error'] else ''
+        )
+
+
+class JSONLinesSink:
+    def __init__(self, path):
+        # Records are appended, one JSON object per line
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def emit(self, record):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+class MemorySink:
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.records)
+
+    def summary(self):
+        # Total wall/CPU time and call count per stage, slowest first
+        frame = self.to_frame()
+        if frame.empty:
+            return frame
+        summary = frame.groupby('stage').agg(calls=('wall_s', 'size'), wall_s=('wall_s', 'sum'), cpu_s=('cpu_s', 'sum'),
+                                             max_rss_mb=('max_rss_mb', 'max'))
+        return summary.sort_values('wall_s', ascending=False)
+
+    def clear(self):
+        self.records = []
+
+
+class Instrumentation:
+    def __init__(self, sinks=None, trace_memory=False, profile_stage=None, profile_dir=None):
+        """
+        Args:
+            sinks (list or None): Objects with an emit(record) method (default: one MemorySink)
+            trace_memory (bool): Also record the tracemalloc peak per stage (slows allocation-heavy code)
+            profile_stage (str or None): Stage to run under cProfile, e.g. 'CorrelationAnalyzer.merge_and_correlate'
+                or just 'merge_and_correlate'
+            profile_dir (str or None): Where '<stage>.prof' files are written (stats are also kept in self.profiles)
+        """
+        self.sinks = list(sinks) if sinks is not None else [MemorySink()]
+        self.trace_memory = trace_memory
+        self.profile_stage = profile_stage
+        self.profile_dir = profile_dir
+        self.profiles = {}
+        self._stack = []
+        self._owns_tracing = False
+
+    @property
+    def report(self):
+        # The first in-memory sink, if any
+        return next((sink for sink in self.sinks if isinstance(sink, MemorySink)), None)
+
+    def _wants_profile(self, stage):
+        return self.profile_stage is not None and self.profile_stage in (stage, stage.split('.', 1)[-1])
+
+    def run(self, stage, func, rows_in=None, rows_after=None):
+        """
+        Run func() as a measured stage and emit one record.
+        Args:
+            stage (str): Stage name ('Class.method')
+            func (callable): The work
+            rows_in (int or None): Rows going in
+            rows_after (callable or None): Returns the rows after the stage when the result is not a frame
+        Returns:
+            The result of func()
+        """
+        parent = self._stack[-1]['stage'] if self._stack else None
+        entry = {'stage': stage, 'traced_max': 0}
+        self._stack.append(entry)
+        tracing = self.trace_memory
+        if tracing:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            # Remember the enclosing stage's peak before resetting it for this one
+            if len(self._stack) > 1:
+                self._stack[-2]['traced_max'] = max(self._stack[-2]['traced_max'], tracemalloc.get_traced_memory()[1])
+            traced_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        profiler = cProfile.Profile() if self._wants_profile(stage) else None
+        rss_start = _rss_mb()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        error = None
+        try:
+            if profiler is not None:
+                result = profiler.runcall(func)
+            else:
+                result = func()
+            return result
+        except BaseException as exc:
+            error = type(exc).__name__
+            result = None
+            raise
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            rss = _rss_mb()
+            self._stack.pop()
+            rows_out = count_rows(result)
+            if rows_out is None and rows_after is not None:
+                rows_out = rows_after()
+            record = {
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+                'stage': stage,
+                'parent': parent,
+                'wall_s': wall,
+                'cpu_s': cpu,
+                'rss_mb': rss,
+                'rss_delta_mb': rss - rss_start if rss is not None else None,
+                'max_rss_mb': _max_rss_mb(),
+                'rows_in': rows_in,
+                'rows_out': rows_out,
+                'error': error,
+            }
+            if tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], entry['traced_max'])
+                record['traced_peak_mb'] = (peak - traced_start) / 2 ** 20
+                if self._stack:
+                    self._stack[-1]['traced_max'] = max(self._stack[-1]['traced_max'], peak)
+                elif self._owns_tracing:
+                    tracemalloc.stop()
+                    self._owns_tracing = False
+            if profiler is not None:
+                self._save_profile(stage, profiler, record)
+            for sink in self.sinks:
+                sink.emit(record)
+
+    def _save_profile(self, stage, profiler, record):
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        self.profiles[stage] = stats
+        if self.profile_dir is not None:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = os.path.join(self.profile_dir, f"{stage}.prof")
+            stats.dump_stats(path)
+            record['profile_path'] = path
+
+    def profile_text(self, stage, limit=20, sort='cumulative'):
+        # Top functions of a profiled stage as text
+        stream = io.StringIO()
+        self.profiles[stage].stream = stream
+        self.profiles[stage].sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+
+def instrumented(frame_attr='df'):
+    """
+    Decorator for analyzer methods: measure the call as a stage when self.instrumentation is set.
+    Args:
+        frame_attr (str): Attribute holding the analyzer's main frame, used for rows in/out
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = getattr(self, 'instrumentation', None)
+            if instrumentation is None:
+                return method(self, *args, **kwargs)
+            rows = lambda: count_rows(getattr(self, frame_attr, None))
+            stage = f"{type(self).__name__}.{method.__name__}"
+            return instrumentation.run(stage, lambda: method(self, *args, **kwargs), rows_in=rows(), rows_after=rows)
+        return wrapper
+    return decorator
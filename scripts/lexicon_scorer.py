@@ -0,0 +1,508 @@
+import time
+import argparse
+from itertools import chain
+import numpy as np
+import pandas as pd
+
+## This script provides vectorized, lexicon-based sentiment scorers that reproduce NLTK's VADER compound score and TextBlob's polarity for whole batches of headlines at once. The lexicon is compiled once into a vocabulary index (term -> column) with one feature array per rule input (valence, booster scalar, negation, capitals, ...). A batch of headlines is split on whitespace, each distinct raw token is cleaned and looked up once (the result is cached in the vocabulary), and the batch becomes a flat stream of vocabulary ids with its headline offsets, i.e. the structure of a CSR document-term matrix. The context rules of the reference scorers (intensifiers, negation, capitals, "least", "but", modifier chains, exclamation marks) are applied to that stream as shifted-array and running-state operations instead of per-word Python loops. The rule-adjusted score of every token occurrence is stored in the matrix, so a headline's polarity is a row sum (normalized for VADER, averaged over the assessed words for TextBlob).
+## The scores match the per-row scorers on ordinary headlines (see accuracy_report). Not reproduced: TextBlob's emoticon and "(!)" sarcasm assessments, and the sentence-break marker VADER and TextBlob insert for blank lines.
+## Example: python -m scripts.lexicon_scorer --rows 20000
+
+LEXICON_KINDS = ('vader', 'textblob')
+
+
+class LexiconScorer:
+    # Shared vocabulary and batch encoding; subclasses define the term features and the scoring rules
+    def __init__(self):
+        self.terms = {}
+        self._features = {name: [] for name in self.FEATURES}
+        self._arrays = None
+        self._token_cache = {}
+
+    def term_id(self, term):
+        # Column of a term in the vocabulary, adding it (and its features) on first sight
+        index = self.terms.get(term)
+        if index is None:
+            index = self.terms[term] = len(self.terms)
+            for name, value in zip(self.FEATURES, self._term_features(term)):
+                self._features[name].append(value)
+            self._arrays = None
+        return index
+
+    def features(self):
+        # Feature arrays indexed by term id, rebuilt only when the vocabulary has grown
+        if self._arrays is None:
+            self._arrays = {name: np.asarray(values) for name, values in self._features.items()}
+        return self._arrays
+
+    def encode(self, texts):
+        """
+        Turn a batch of texts into vocabulary ids laid out like a CSR matrix.
+        Args:
+            texts (iterable): Texts (missing values are scored as empty strings)
+        Returns:
+            tuple: (term ids of all token occurrences in text order, row offsets of each text)
+        """
+        texts = _as_strings(texts)
+        pieces = [text.split() for text in texts]
+        counts = np.fromiter(map(len, pieces), dtype='int64', count=len(pieces))
+        flat = np.fromiter(chain.from_iterable(pieces), dtype=object, count=int(counts.sum()))
+        # Each distinct raw token is split into terms once; the mapping is kept for later batches
+        codes, uniques = pd.factorize(flat)
+        cache = self._token_cache
+        parts = []
+        for token in uniques:
+            ids = cache.get(token)
+            if ids is None:
+                ids = cache[token] = [self.term_id(term) for term in self._split_token(token)]
+            parts.append(ids)
+        lengths = np.fromiter((len(ids) for ids in parts), dtype='int64', count=len(parts))
+        ends = np.cumsum(lengths)
+        terms = np.fromiter(chain.from_iterable(parts), dtype='int64', count=int(ends[-1]) if len(ends) else 0)
+        # Expand every raw token into its terms, keeping text order
+        n_terms = lengths[codes]
+        total = int(n_terms.sum())
+        within = np.arange(total) - np.repeat(np.cumsum(n_terms) - n_terms, n_terms)
+        ids = terms[np.repeat(ends[codes] - lengths[codes], n_terms) + within]
+        rows = np.repeat(np.arange(len(texts)), counts)
+        row_lengths = np.bincount(rows, weights=n_terms, minlength=len(texts)).astype('int64')
+        return ids, np.concatenate([[0], np.cumsum(row_lengths)])
+
+    def document_term_matrix(self, texts):
+        """
+        Rule-adjusted document-term matrix of a batch.
+        Returns:
+            scipy.sparse.csr_matrix: One row per text and one column per vocabulary term; an entry is the score
+                that term contributes to the text after the context rules (0 for words that carry no sentiment)
+        """
+        return self._matrix(texts)[0]
+
+    def _matrix(self, texts):
+        from scipy import sparse
+        texts = _as_strings(texts)
+        ids, indptr = self.encode(texts)
+        values, extra = self._token_scores(ids, indptr, texts)
+        # The token stream is already grouped by text, so the CSR arrays are used as they are (no sorting)
+        matrix = sparse.csr_matrix((values, ids, indptr), shape=(len(indptr) - 1, len(self.terms)))
+        return matrix, extra
+
+    def score(self, texts):
+        """
+        Score a batch of texts.
+        Returns:
+            numpy.ndarray: One score per text, in input order
+        """
+        matrix, extra = self._matrix(texts)
+        # Row sums add each text's entries in token order, like the reference scorers
+        return self._polarity(matrix @ np.ones(matrix.shape[1]), extra)
+
+
+def _as_strings(texts):
+    # Texts as a list of str, missing values as empty strings
+    if isinstance(texts, list) and all(type(text) is str for text in texts):
+        return texts
+    return pd.Series(texts, dtype=object).fillna("").astype(str).tolist()
+
+
+def _positions(indptr):
+    # Text index, start offset and position within the text of every token
+    lengths = np.diff(indptr)
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    starts = indptr[:-1][rows]
+    return rows, starts, np.arange(indptr[-1]) - starts
+
+
+def _shift(ids, index, valid):
+    # ids[index] where valid, else a placeholder (term 0) that the caller masks out
+    return ids[np.where(valid, index, 0)]
+
+
+class VaderLexiconScorer(LexiconScorer):
+    FEATURES = ('valence', 'in_lexicon', 'booster', 'is_booster', 'negated', 'upper', 'kind', 'of', 'least',
+                'at_very', 'never', 'so_this', 'but')
+
+    def __init__(self, analyzer=None):
+        """
+        Args:
+            analyzer (SentimentIntensityAnalyzer or None): Source of the lexicon and rule constants (default: the
+                analyzer from scripts.nltk_resources, i.e. the same one the per-row scorer uses)
+        """
+        if analyzer is None:
+            from scripts.nltk_resources import default_manager
+            analyzer = default_manager().vader_analyzer()
+        self.lexicon = analyzer.lexicon
+        self.constants = analyzer.constants
+        super().__init__()
+        # Lexicon words get the first columns; idiom words are added so that idioms can be matched by id
+        for term in self.lexicon:
+            self.term_id(term)
+        self.idioms = [(tuple(self.term_id(w) for w in key.split()), value)
+                       for key, value in self.constants.SPECIAL_CASE_IDIOMS.items()]
+        self.booster_pairs = [tuple(self.term_id(w) for w in key.split())
+                              for key in self.constants.BOOSTER_DICT if len(key.split()) == 2]
+
+    def _term_features(self, term):
+        lower = term.lower()
+        c = self.constants
+        return (self.lexicon.get(lower, 0.0), lower in self.lexicon, c.BOOSTER_DICT.get(lower, 0.0),
+                lower in c.BOOSTER_DICT, c.negated([term]), term.isupper(), lower == 'kind', lower == 'of',
+                lower == 'least', lower in ('at', 'very'), term == 'never', term in ('so', 'this'), lower == 'but')
+
+    def _split_token(self, token):
+        # VADER drops one-character tokens and strips a single leading or trailing punctuation mark from a word
+        if len(token) <= 1:
+            return []
+        has_punctuation = self.constants.REGEX_REMOVE_PUNCTUATION.search
+        for mark in self.constants.PUNC_LIST:
+            if token.endswith(mark):
+                word = token[:-len(mark)]
+                if len(word) > 1 and not has_punctuation(word):
+                    return [word]
+            if token.startswith(mark):
+                word = token[len(mark):]
+                if len(word) > 1 and not has_punctuation(word):
+                    return [word]
+        return [token]
+
+    def _token_scores(self, ids, indptr, texts):
+        f = self.features()
+        c = self.constants
+        n_texts = len(indptr) - 1
+        rows, starts, pos = _positions(indptr)
+        lengths = np.diff(indptr)
+        values = np.zeros(len(ids))
+
+        # Capitals count only when some, but not all, words of the text are in capitals
+        n_upper = np.bincount(rows, weights=f['upper'][ids], minlength=n_texts)
+        cap_diff = ((lengths - n_upper) > 0) & (n_upper > 0)
+
+        # VADER looks a repeated word up at its first occurrence (list.index), so only first occurrences are
+        # scored and the other occurrences copy their value
+        lexical = np.flatnonzero(f['in_lexicon'][ids] & ~f['is_booster'][ids])
+        key = rows[lexical] * len(self.terms) + ids[lexical]
+        order = np.argsort(key, kind='stable')
+        sorted_key = key[order]
+        group_start = np.r_[True, sorted_key[1:] != sorted_key[:-1]]
+        first = np.empty(len(lexical), dtype='int64')
+        first[order] = order[np.maximum.accumulate(np.where(group_start, np.arange(len(order)), 0))]
+        t = lexical[np.unique(first)]
+
+        term = ids[t]
+        cap = cap_diff[rows[t]]
+        v = f['valence'][term].astype('float64')
+        v = np.where(f['upper'][term] & cap, np.where(v > 0, v + c.C_INCR, v - c.C_INCR), v)
+        for k in (1, 2, 3):
+            has = pos[t] >= k
+            prev = _shift(ids, t - k, has)
+            active = has & ~f['in_lexicon'][prev]
+            # Intensifiers up to three words back, dampened with distance
+            s = f['booster'][prev].astype('float64')
+            s = np.where(v < 0, -s, s)
+            caps_booster = f['is_booster'][prev] & f['upper'][prev] & cap
+            s = np.where(caps_booster, np.where(v > 0, s + c.C_INCR, s - c.C_INCR), s)
+            if k > 1:
+                s = np.where(s != 0, s * (0.95 if k == 2 else 0.9), s)
+            v = np.where(active, v + s, v)
+            # Negation, with the "never so/this" special cases
+            if k == 1:
+                v = np.where(active & f['negated'][prev], v * c.N_SCALAR, v)
+            else:
+                one = _shift(ids, t - 1, has)
+                emphasis = f['never'][prev] & f['so_this'][_shift(ids, t - k + 1, has)]
+                if k == 3:
+                    emphasis |= f['so_this'][one]
+                factor = 1.5 if k == 2 else 1.25
+                v = np.where(active & emphasis, v * factor,
+                             np.where(active & ~emphasis & f['negated'][prev], v * c.N_SCALAR, v))
+            if k == 3:
+                v = self._idioms(v, ids, t, active, pos[t], lengths[rows[t]])
+        # "least" before a word negates it, except in "at least" / "very least"
+        has1 = pos[t] >= 1
+        prev1 = _shift(ids, t - 1, has1)
+        least = has1 & ~f['in_lexicon'][prev1] & f['least'][prev1]
+        prev2 = _shift(ids, t - 2, pos[t] >= 2)
+        least &= (pos[t] < 2) | ~f['at_very'][prev2]
+        v = np.where(least, v * c.N_SCALAR, v)
+        # "kind of" is skipped like a booster word
+        has_next = pos[t] < lengths[rows[t]] - 1
+        kind_of = f['kind'][term] & has_next & f['of'][_shift(ids, t + 1, has_next)]
+        v = np.where(kind_of, 0.0, v)
+
+        # Copy each first occurrence's value to the repeats of the word
+        scored = np.zeros(len(ids))
+        scored[t] = v
+        values[lexical] = scored[lexical[first]]
+
+        # The first "but" halves the words before it and raises the words after it by half
+        buts = np.flatnonzero(f['but'][ids])
+        but_rows, first_but = np.unique(rows[buts], return_index=True)
+        but_pos = np.full(n_texts, -1)
+        but_pos[but_rows] = pos[buts[first_but]]
+        bp = but_pos[rows[lexical]]
+        lp = pos[lexical]
+        values[lexical] = np.where(bp < 0, values[lexical],
+                                   np.where(lp < bp, values[lexical] * 0.5,
+                                            np.where(lp > bp, values[lexical] * 1.5, values[lexical])))
+
+        # Punctuation emphasis of the raw text
+        exclamations = np.minimum(np.fromiter((text.count('!') for text in texts), dtype='int64', count=len(texts)), 4)
+        questions = np.fromiter((text.count('?') for text in texts), dtype='int64', count=len(texts))
+        emphasis = exclamations * 0.292 + np.where(questions > 1, np.where(questions <= 3, questions * 0.18, 0.96), 0)
+        return values, emphasis
+
+    def _idioms(self, v, ids, t, active, pos, lengths):
+        # Idioms around the word replace its valence; "kind of"-style bigrams before it dampen it
+        if not self.idioms and not self.booster_pairs:
+            return v
+
+        def window(offsets, valid):
+            return [_shift(ids, t + o, valid) for o in offsets]
+
+        def matches(seq, offsets, valid):
+            got = window(offsets, valid)
+            return valid & np.logical_and.reduce([g == s for g, s in zip(got, seq)])
+
+        matched = np.zeros(len(t), dtype=bool)
+        replaced = v.copy()
+        for offsets in ((-1, 0), (-2, -1, 0), (-2, -1), (-3, -2, -1), (-3, -2)):
+            for seq, value in self.idioms:
+                if len(seq) == len(offsets):
+                    hit = active & ~matched & matches(seq, offsets, active)
+                    replaced = np.where(hit, value, replaced)
+                    matched |= hit
+        for offsets, valid in (((0, 1), lengths - 1 > pos), ((0, 1, 2), lengths - 1 > pos + 1)):
+            for seq, value in self.idioms:
+                if len(seq) == len(offsets):
+                    replaced = np.where(active & matches(seq, offsets, active & valid), value, replaced)
+        dampened = np.zeros(len(t), dtype=bool)
+        for seq in self.booster_pairs:
+            dampened |= matches(seq, (-3, -2), active) | matches(seq, (-2, -1), active)
+        replaced = np.where(active & dampened, replaced + self.constants.B_DECR, replaced)
+        return np.where(active, replaced, v)
+
+    def _polarity(self, sums, emphasis):
+        sums = np.where(sums > 0, sums + emphasis, np.where(sums < 0, sums - emphasis, sums))
+        return np.round(sums / np.sqrt(sums * sums + 15), 4)
+
+
+class TextBlobLexiconScorer(LexiconScorer):
+    FEATURES = ('known', 'polarity', 'intensity', 'modifier', 'negation', 'ly', 'long_m', 'long_n', 'exclamation')
+
+    def __init__(self, lexicon=None):
+        """
+        Args:
+            lexicon (textblob.en.Sentiment or None): Source of the word scores (default: TextBlob's English lexicon)
+        """
+        from textblob import _text
+        if lexicon is None:
+            from textblob.en import sentiment as lexicon
+        self.lexicon = lexicon
+        self.negations = set(lexicon.negations)
+        self.text = _text
+        self.punctuation = tuple(_text.PUNCTUATION.replace('.', ''))
+        super().__init__()
+        for term in list(lexicon.keys()):
+            if ' ' not in term:
+                self.term_id(term)
+
+    def _term_features(self, term):
+        entry = self.lexicon.get(term)
+        known = entry is not None and None in entry
+        p, _, i = entry[None] if known else (0.0, 0.0, 1.0)
+        modifier = known and any(tag in entry for tag in self.lexicon.modifiers)
+        return (known, p, i, modifier, term in self.negations, self.lexicon.modifier(term), len(term) > 2,
+                len(term.strip("'")) > 1, term == '!')
+
+    def _split_token(self, token):
+        # TextBlob's tokenizer applied to one whitespace-separated token (none of its rules crosses whitespace)
+        text = self.text
+        for a, b in text.replacements.items():
+            token = token.replace(a, b)
+        for quote in ('“', '”', '‘', '’', "'", '"'):
+            token = token.replace(quote, f" {quote} ")
+        terms = []
+        for t in token.split():
+            tail = []
+            while t.startswith(self.punctuation) and t not in text.replacements:
+                terms.append(t[0])
+                t = t[1:]
+            while t.endswith(self.punctuation + ('.',)) and t not in text.replacements:
+                if t.endswith(self.punctuation):
+                    tail.append(t[-1])
+                    t = t[:-1]
+                if t.endswith('...'):
+                    tail.append('...')
+                    t = t[:-3].rstrip('.')
+                if t.endswith('.'):
+                    if (t in text.ABBREVIATIONS or text.RE_ABBR1.match(t) or text.RE_ABBR2.match(t)
+                            or text.RE_ABBR3.match(t)):
+                        break
+                    tail.append(t[-1])
+                    t = t[:-1]
+            if t != '':
+                terms.append(t)
+            terms.extend(reversed(tail))
+        return [term.lower() for term in terms]
+
+    def _token_scores(self, ids, indptr, texts):
+        f = self.features()
+        n = len(ids)
+        n_texts = len(indptr) - 1
+        rows, starts, pos = _positions(indptr)
+        idx = np.arange(n)
+        known = f['known'][ids]
+        unknown = ~known
+
+        # Last known word at or before each token (-1 when there is none in the text)
+        last_known = np.maximum.accumulate(np.where(known, idx, -1))
+        last_known = np.where(last_known >= starts, last_known, -1)
+        prev_known = np.where(pos > 0, np.r_[-1, last_known[:-1]], -1)
+        anchor = np.where(known, prev_known, last_known)
+        has_anchor = anchor >= 0
+        anchor_safe = np.where(has_anchor, anchor, 0)
+
+        # A modifier ("very") stays active across short unknown words; longer ones end it, except negations
+        # after an "-ly" modifier, which are absorbed into its assessment ("really not")
+        negation = unknown & f['negation'][ids]
+        ly = f['ly'][ids[anchor_safe]] & f['modifier'][ids[anchor_safe]] & has_anchor
+        resets = unknown & f['long_m'][ids] & ~(negation & ly)
+        reset_count = np.cumsum(resets)
+        before = np.r_[0, reset_count[:-1]]
+        m_active = has_anchor & f['modifier'][ids[anchor_safe]] & (before - reset_count[anchor_safe] == 0)
+        absorbed = negation & m_active & ly
+
+        # A pending negation is set by a negation word and cleared by known words and longer unknown words
+        sets = negation & ~absorbed
+        clears = known | absorbed | (unknown & ~negation & f['long_n'][ids])
+        last_set = np.r_[-1, np.maximum.accumulate(np.where(sets, idx, -1))[:-1]]
+        last_clear = np.r_[-1, np.maximum.accumulate(np.where(clears, idx, -1))[:-1]]
+        negated = (last_set >= starts) & (last_set > last_clear)
+
+        # Assessments: a known word starts one unless a modifier is active, in which case it extends the chain
+        k = np.flatnonzero(known)
+        merge = m_active[k]
+        chain_id = np.cumsum(~merge) - 1
+        n_chains = int(chain_id[-1]) + 1 if len(k) else 0
+        intensity = f['intensity'][ids[k]].astype('float64')
+        intensity = np.where(negated[k], 1.0 / intensity, intensity)
+        # Intensity of the previous word of the chain (only read for merged words)
+        prev_intensity = np.r_[1.0, intensity[:-1]]
+        p = f['polarity'][ids[k]].astype('float64')
+        p = np.where(merge, np.clip(p * prev_intensity, -1.0, 1.0), p)
+        last = np.r_[chain_id[1:] != chain_id[:-1], True] if len(k) else np.zeros(0, dtype=bool)
+        chain_p = p[last]
+        chain_end = k[last]
+        chain_neg = np.bincount(chain_id, weights=negated[k], minlength=n_chains) > 0
+        # Absorbed negations belong to the chain of the word before them
+        position_chain = np.full(n, -1)
+        position_chain[k] = chain_id
+        absorbed_chain = position_chain[anchor[absorbed]]
+        chain_neg[absorbed_chain] = True
+        # "!" boosts the latest assessment, unless a later word of the same chain overwrites its score
+        bangs = np.flatnonzero(unknown & f['exclamation'][ids] & has_anchor)
+        is_end = np.zeros(n, dtype=bool)
+        is_end[chain_end] = True
+        bangs = bangs[is_end[anchor[bangs]]]
+        boosts = np.bincount(position_chain[anchor[bangs]], minlength=n_chains)
+        for r in range(int(boosts.max()) if n_chains else 0):
+            chain_p = np.where(boosts > r, np.clip(chain_p * 1.25, -1.0, 1.0), chain_p)
+        chain_p = np.where(chain_neg, chain_p * -0.5, chain_p)
+
+        values = np.zeros(n)
+        values[chain_end] = chain_p
+        assessments = np.bincount(rows[chain_end], minlength=n_texts)
+        return values, assessments
+
+    def _polarity(self, sums, assessments):
+        return sums / np.maximum(assessments, 1)
+
+
+# Scorers are compiled once per process and shared
+_scorers = {}
+
+
+def lexicon_scorer(kind='vader'):
+    """
+    The process-wide lexicon scorer of a kind, compiled on first use.
+    Args:
+        kind (str): 'vader' (VADER compound score) or 'textblob' (TextBlob polarity)
+    Returns:
+        LexiconScorer
+    """
+    if kind not in LEXICON_KINDS:
+        raise ValueError(f"Unknown lexicon scorer '{kind}'. Expected one of {list(LEXICON_KINDS)}.")
+    if kind not in _scorers:
+        _scorers[kind] = VaderLexiconScorer() if kind == 'vader' else TextBlobLexiconScorer()
+    return _scorers[kind]
+
+
+def vader_lexicon_scores(texts):
+    return lexicon_scorer('vader').score(texts)
+
+
+def textblob_lexicon_scores(texts):
+    return lexicon_scorer('textblob').score(texts)
+
+
+def _reference_scores(kind, texts):
+    # The per-row scorers the lexicon scorers reproduce
+    if kind == 'vader':
+        from scripts.sentiment_scoring import VaderScoringEngine
+        return VaderScoringEngine().score(texts)
+    from textblob import TextBlob
+    return [TextBlob(text).sentiment.polarity for text in texts]
+
+
+def accuracy_report(texts, kinds=LEXICON_KINDS):
+    """
+    Compare the lexicon scorers with the per-row VADER/TextBlob scorers on the same texts.
+    Args:
+        texts (iterable): Texts to score (every row is scored, duplicates included)
+        kinds (iterable): Scorers to compare ('vader', 'textblob')
+    Returns:
+        DataFrame: One row per scorer with the agreement (share of identical scores, mean and max absolute
+            difference, Pearson r, share of identical sentiment classes) and the throughput of both paths
+    """
+    from scripts.news_layout import classify_scores
+    texts = pd.Series(texts, dtype=object).fillna("").astype(str).tolist()
+    rows = []
+    for kind in kinds:
+        scorer = lexicon_scorer(kind)
+        start = time.perf_counter()
+        reference = np.asarray(_reference_scores(kind, texts), dtype='float64')
+        reference_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        scores = scorer.score(texts)
+        lexicon_seconds = time.perf_counter() - start
+        diff = np.abs(scores - reference)
+        rows.append({
+            'scorer': kind,
+            'rows': len(texts),
+            'identical': float(np.mean(diff < 1e-9)) if len(texts) else np.nan,
+            'mean_abs_diff': float(diff.mean()) if len(texts) else np.nan,
+            'max_abs_diff': float(diff.max()) if len(texts) else np.nan,
+            'pearson_r': float(np.corrcoef(scores, reference)[0, 1]) if len(texts) > 1 and np.ptp(reference) > 0 else np.nan,
+            'class_agreement': float(np.mean(np.asarray(classify_scores(scores)) == np.asarray(classify_scores(reference)))),
+            'row_rows_per_s': len(texts) / reference_seconds if reference_seconds > 0 else np.nan,
+            'lexicon_rows_per_s': len(texts) / lexicon_seconds if lexicon_seconds > 0 else np.nan,
+            'speedup': reference_seconds / lexicon_seconds if lexicon_seconds > 0 else np.nan,
+        })
+    return pd.DataFrame(rows).set_index('scorer')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare the vectorized lexicon scorers with the per-row scorers.")
+    parser.add_argument('--news', default=None, help="News CSV with a headline column (default: synthetic headlines)")
+    parser.add_argument('--rows', type=int, default=20000, help="Headlines to score")
+    parser.add_argument('--kinds', nargs='*', default=list(LEXICON_KINDS), choices=list(LEXICON_KINDS))
+    args = parser.parse_args()
+    if args.news:
+        headlines = pd.read_csv(args.news, usecols=['headline'], nrows=args.rows)['headline']
+    else:
+        from benchmarks.generator import make_news
+        headlines = make_news(args.rows, seed=0)['headline']
+    # Compile the lexicons before timing
+    for kind in args.kinds:
+        lexicon_scorer(kind)
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(accuracy_report(headlines, args.kinds))
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+## This script provides a compact in-memory layout for the news frame. Instead of materializing year/month/day/hour/minute/dayOfWeek as int64 columns, dates as Python date objects and weekday/month names as per-row strings, the analyzer keeps only the datetime column (int64 nanoseconds since the epoch) and derives calendar fields on demand through a CalendarView: each field is computed once with integer arithmetic, stored as a small integer array and cached. Weekday and month names are attached only to the aggregated counts. Publisher, stock and sentiment class are stored as categoricals.
+
+WEEKDAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MONTH_ORDER = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
+SENTIMENT_CLASSES = ['negative', 'neutral', 'positive']
+
+DAY_NS = 86_400 * 10 ** 9
+HOUR_NS = 3_600 * 10 ** 9
+MINUTE_NS = 60 * 10 ** 9
+
+# Field name -> dtype of the cached array (missing timestamps are stored as -1)
+CALENDAR_FIELDS = {
+    'year': 'int16',
+    'month': 'int8',
+    'day': 'int8',
+    'hour': 'int8',
+    'minute': 'int8',
+    'dayOfWeek': 'int8',
+    'day_number': 'int32',  # days since 1970-01-01
+}
+
+
+class CalendarView:
+    def __init__(self, dates):
+        """
+        Args:
+            dates (Series): Datetime column (tz-aware or naive). Fields of tz-aware values are in their own
+                time zone (UTC for the frames built by format_datetime).
+        """
+        index = pd.DatetimeIndex(dates)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        self.index = dates.index
+        self.ns = index.as_unit('ns').asi8
+        self.valid = ~index.isna()
+        self._fields = {}
+
+    def __len__(self):
+        return len(self.ns)
+
+    def _compute(self, name):
+        days = np.floor_divide(self.ns, DAY_NS)
+        if name == 'day_number':
+            return days
+        if name == 'dayOfWeek':
+            # 1970-01-01 was a Thursday (Monday = 0)
+            return (days + 3) % 7
+        if name in ('hour', 'minute'):
+            time_of_day = self.ns - days * DAY_NS
+            return time_of_day // HOUR_NS if name == 'hour' else (time_of_day // MINUTE_NS) % 60
+        day = days.astype('datetime64[D]')
+        month = day.astype('datetime64[M]')
+        year = day.astype('datetime64[Y]')
+        if name == 'year':
+            return year.astype('int64') + 1970
+        if name == 'month':
+            return (month.astype('int64') - year.astype('datetime64[M]').astype('int64')) + 1
+        return (day - month).astype('int64') + 1
+
+    def values(self, name):
+        # Cached small-int array of a calendar field (-1 where the timestamp is missing)
+        if name not in self._fields:
+            if name not in CALENDAR_FIELDS:
+                raise KeyError(f"Unknown calendar field '{name}'. Choose from {list(CALENDAR_FIELDS)}.")
+            values = np.where(self.valid, self._compute(name), -1)
+            self._fields[name] = values.astype(CALENDAR_FIELDS[name])
+        return self._fields[name]
+
+    def __getitem__(self, name):
+        # Calendar field as a Series aligned with the news frame
+        return pd.Series(self.values(name), index=self.index, name=name, copy=False)
+
+    def date_only(self):
+        # Calendar date as datetime64 (midnight), the compact counterpart of a column of date objects
+        dates = self.values('day_number').astype('datetime64[D]').astype('datetime64[ns]')
+        dates[~self.valid] = np.datetime64('NaT')
+        return pd.Series(dates, index=self.index, name='date_only')
+
+    @property
+    def nbytes(self):
+        # Memory held by the cached fields
+        return sum(values.nbytes for values in self._fields.values())
+
+    # ----- aggregation (names are attached to the counts, not to the rows) -----
+
+    def counts(self, name, minlength=0):
+        # Occurrences of each value of a field (missing timestamps are ignored)
+        values = self.values(name)
+        return np.bincount(values[values >= 0].astype('int64'), minlength=minlength)
+
+    def weekday_counts(self):
+        return pd.Series(self.counts('dayOfWeek', 7), index=pd.Index(WEEKDAY_ORDER, name='weekday'), name='count')
+
+    def month_counts(self):
+        return name_counts(self.values('month'), MONTH_ORDER, first=1, index_name='month_name')
+
+    def hour_counts(self):
+        # Articles per hour of day, only the hours that occur (as value_counts().sort_index())
+        counts = self.counts('hour', 24)
+        hours = np.flatnonzero(counts)
+        return pd.Series(counts[hours], index=pd.Index(hours, name='hour'), name='count')
+
+    def day_counts(self):
+        # Articles per calendar date, indexed by date objects (as groupby(dates.dt.date).size())
+        days = self.values('day_number')
+        days, counts = np.unique(days[self.valid], return_counts=True)
+        dates = pd.to_datetime(days.astype('int64'), unit='D').date
+        return pd.Series(counts, index=pd.Index(dates, name='date'))
+
+
+def name_counts(codes, names, first=0, index_name=None):
+    """
+    Count integer codes and label the counts with names.
+    Args:
+        codes (array-like): Integer codes; values outside [first, first + len(names)) and NaN are ignored
+        names (list): Label of each code, in order
+        first (int): Code of names[0] (e.g. 1 for month numbers)
+        index_name (str or None): Name of the resulting index
+    Returns:
+        Series: Count per name (zero for names that do not occur), in the order of names
+    """
+    codes = np.asarray(pd.to_numeric(pd.Series(codes), errors='coerce'), dtype='float64') - first
+    codes = codes[(codes >= 0) & (codes < len(names)) & (codes == np.floor(codes))].astype('int64')
+    return pd.Series(np.bincount(codes, minlength=len(names)), index=pd.Index(names, name=index_name), name='count')
+
+
+def classify_scores(scores, pos_th=0.2, neg_th=-0.2):
+    """
+    Vectorized sentiment classes (same thresholds as ArticleDataAnalyzer.sentiment_class).
+    Returns:
+        Categorical: 'negative', 'neutral' or 'positive' per score (NaN scores are 'neutral')
+    """
+    scores = np.asarray(scores, dtype='float64')
+    codes = np.where(scores >= pos_th, 2, np.where(scores <= neg_th, 0, 1)).astype('int8')
+    return pd.Categorical.from_codes(codes, categories=SENTIMENT_CLASSES)
+
+
+def compact_news_frame(df, categorical=('publisher', 'stock')):
+    """
+    Store repeated string columns as categoricals (in place).
+    Args:
+        df (DataFrame): News frame
+        categorical (iterable of str): Columns to convert when present
+    Returns:
+        DataFrame: df
+    """
+    for column in categorical:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    return df
+
+
+def memory_per_row(df):
+    # Deep memory usage of a frame in bytes per row
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
@@ -0,0 +1,147 @@
+import os
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+from scripts.sentiment_scoring import VaderScoringEngine
+from scripts.sentiment_cache import score_texts, scorer_version
+from scripts.ngram_counter import NGramCounter
+from scripts.nltk_resources import default_manager
+from scripts.news_layout import CalendarView, WEEKDAY_ORDER, MONTH_ORDER
+
+## This script provides a streaming mode for the news analysis. Instead of loading the whole news file into one DataFrame (and adding eight derived date columns to it, as ArticleDataAnalyzer.format_datetime does), the file is read in chunks; each chunk's dates are parsed, its headlines scored and tokenized, and the results are folded into running aggregates. Peak memory is bounded by the chunk size plus the size of the aggregates (number of distinct days, publishers and tokens), independent of the number of rows.
+
+
+def _add(total, part):
+    # Fold one chunk's counts/sums into the running total
+    if total is None:
+        return part.astype('float64')
+    return total.add(part, fill_value=0)
+
+
+class NewsAggregates:
+    def __init__(self):
+        self.rows = 0
+        self.day_counts = None          # articles per calendar date (UTC)
+        self.weekday_counts = None      # articles per weekday name
+        self.month_counts = None        # articles per month name
+        self.hour_counts = None         # articles per hour of day (UTC)
+        self.publisher_counts = None    # articles per publisher
+        self.publisher_compound_sum = None
+        self.token_counts = None        # keyword frequencies, as in identify_common_words_and_phrases
+
+    def update(self, chunk, stop_words=None):
+        """
+        Fold one chunk into the aggregates. chunk must have a parsed (UTC) 'date' column and, optionally,
+        'publisher', 'compound' and 'headline' columns.
+        """
+        self.rows += len(chunk)
+        if 'date' in chunk.columns:
+            calendar = CalendarView(chunk['date'])
+            self.day_counts = _add(self.day_counts, calendar.day_counts())
+            self.weekday_counts = _add(self.weekday_counts, calendar.weekday_counts())
+            self.month_counts = _add(self.month_counts, pd.Series(calendar.counts('month', 13)[1:], index=range(1, 13)))
+            self.hour_counts = _add(self.hour_counts, calendar.hour_counts())
+        if 'publisher' in chunk.columns:
+            publishers = chunk['publisher'].astype(object)
+            self.publisher_counts = _add(self.publisher_counts, publishers.value_counts())
+            if 'compound' in chunk.columns:
+                self.publisher_compound_sum = _add(
+                    self.publisher_compound_sum, chunk['compound'].groupby(publishers).sum()
+                )
+        if stop_words is not None and 'headline' in chunk.columns:
+            # Same tokenization as ArticleDataAnalyzer.identify_common_words_and_phrases
+            counter = NGramCounter(stop_words, tokenizer='whitespace', adjacency='raw')
+            self.token_counts = _add(self.token_counts, counter.count(chunk['headline'].dropna(), n=1).to_series())
+        return self
+
+    # ----- finalized views (integer counts, canonical ordering) -----
+
+    @staticmethod
+    def _counts(series):
+        return pd.Series(dtype='int64') if series is None else series.astype('int64')
+
+    def articles_per_day(self):
+        return self._counts(self.day_counts).sort_index()
+
+    def articles_per_weekday(self):
+        return self._counts(self.weekday_counts).reindex(WEEKDAY_ORDER, fill_value=0)
+
+    def articles_per_month(self):
+        counts = self._counts(self.month_counts)
+        counts.index = [MONTH_ORDER[int(m) - 1] for m in counts.index]
+        return counts.reindex(MONTH_ORDER, fill_value=0)
+
+    def articles_per_hour(self):
+        return self._counts(self.hour_counts).sort_index()
+
+    def articles_per_publisher(self):
+        return self._counts(self.publisher_counts).sort_values(ascending=False, kind='stable')
+
+    def mean_compound_by_publisher(self):
+        if self.publisher_compound_sum is None:
+            return pd.Series(dtype='float64')
+        return (self.publisher_compound_sum / self.publisher_counts.reindex(self.publisher_compound_sum.index)).sort_index()
+
+    def most_common_tokens(self, top_n=20):
+        return self._counts(self.token_counts).sort_values(ascending=False, kind='stable').head(top_n)
+
+
+class StreamingNewsPipeline:
+    def __init__(self, path, chunksize=200_000, score_sentiment=True, count_tokens=True, stop_words=None,
+                 n_workers=1, cache=None, spike_detector=None):
+        """
+        Args:
+            path (str): News source, a CSV (e.g. raw_analyst_ratings.csv) or a Parquet file built by data_store.py
+            chunksize (int): Rows processed per chunk; bounds peak memory
+            score_sentiment (bool): Score each chunk's headlines with VADER (adds per-publisher mean compound)
+            count_tokens (bool): Accumulate keyword frequencies
+            stop_words (set or None): Stopwords for token counting (default: NLTK English stopwords)
+            n_workers (int or None): Worker processes for VADER scoring within a chunk
+            cache (SentimentScoreCache or None): Persistent score cache shared across chunks and runs
+            spike_detector (SpikeDetector or None): Fed every chunk; its events are emitted while the file streams
+        """
+        self.path = path
+        self.chunksize = chunksize
+        self.score_sentiment = score_sentiment
+        self.count_tokens = count_tokens
+        self.stop_words = stop_words
+        self.engine = VaderScoringEngine(n_workers=n_workers)
+        self.cache = cache
+        self.spike_detector = spike_detector
+
+    def chunks(self):
+        # Yield the source as DataFrames of at most chunksize rows
+        if os.path.splitext(self.path)[1] == '.parquet':
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(self.path).iter_batches(batch_size=self.chunksize):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(self.path, chunksize=self.chunksize)
+
+    def run(self):
+        """
+        Stream the whole source once.
+        Returns:
+            NewsAggregates: Per-day/weekday/month/hour counts, per-publisher counts and mean compound, token frequencies
+        """
+        stop_words = None
+        if self.count_tokens:
+            stop_words = self.stop_words
+            if stop_words is None:
+                stop_words = default_manager().stopwords('english')
+        aggregates = NewsAggregates()
+        date_format = None
+        for chunk in self.chunks():
+            if 'date' in chunk.columns and not pd.api.types.is_datetime64_any_dtype(chunk['date']):
+                if date_format is None:
+                    # Infer the format once from the first value, as pd.to_datetime does for a whole column
+                    first = chunk['date'].dropna()
+                    date_format = guess_datetime_format(str(first.iloc[0])) if len(first) else None
+                chunk['date'] = pd.to_datetime(chunk['date'], errors='coerce', utc=True, format=date_format)
+            if self.score_sentiment and 'headline' in chunk.columns:
+                headlines = chunk['headline'].fillna("").astype(str)
+                chunk['compound'] = score_texts(headlines, self.engine.score, 'vader_compound', scorer_version('nltk'),
+                                                cache=self.cache)
+            aggregates.update(chunk, stop_words)
+            if self.spike_detector is not None:
+                self.spike_detector.update(chunk)
+        return aggregates
@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+## This script provides the n-gram counting engine used for headline keyword analysis. Headlines are tokenized in one vectorized Arrow pass, every token is integer-encoded against a vocabulary built in the same pass, stopwords/non-alphabetic tokens are filtered through a boolean mask over the vocabulary, and unigrams, bigrams and trigrams are counted as packed int64 keys with NumPy. Counts can be broken down by a grouping column (publisher, ticker, day) in the same pass, and top-k results are exact.
+
+# Tokenizers: 'whitespace' matches str.split() (as in identify_common_words_and_phrases); 'word' splits on every
+# non-letter run, which keeps the same alphabetic tokens as nltk.word_tokenize for typical headlines
+# ("Apple's" -> "apple", "s"), except that hyphenated words are split into their parts.
+TOKENIZERS = {
+    'whitespace': lambda texts: pc.utf8_split_whitespace(texts),
+    'word': lambda texts: pc.split_pattern_regex(texts, r'[\W\d_]+'),
+}
+
+
+class NGramCounts:
+    def __init__(self, vocabulary, n, keys, counts, first_seen, group_codes=None, groups=None):
+        self.vocabulary = vocabulary    # token strings, indexed by token id
+        self.n = n
+        self.keys = keys                # packed n-gram keys (token ids in base len(vocabulary))
+        self.counts = counts
+        self.first_seen = first_seen    # position of the first occurrence, used to break ties
+        self.group_codes = group_codes  # group code per (group, n-gram) row, or None
+        self.groups = groups            # group labels, indexed by group code
+
+    def decode(self, keys):
+        # Unpack int64 keys into tuples of token strings
+        size = len(self.vocabulary)
+        ids = np.empty((len(keys), self.n), dtype=np.int64)
+        rest = np.asarray(keys, dtype=np.int64)
+        for i in range(self.n - 1, -1, -1):
+            ids[:, i] = rest % size
+            rest = rest // size
+        words = self.vocabulary[ids.ravel()].reshape(ids.shape)
+        return [tuple(row) for row in words]
+
+    def to_series(self):
+        # All counts as a Series indexed by the space-joined n-gram (summed over groups)
+        if self.group_codes is not None:
+            return NGramCounts(self.vocabulary, self.n, *_reduce(self.keys, self.counts, self.first_seen)).to_series()
+        index = [' '.join(t) for t in self.decode(self.keys)]
+        return pd.Series(self.counts, index=index, name='count')
+
+    def top_k(self, k=20):
+        """
+        Most common n-grams over all groups, ties broken by first occurrence (like Counter.most_common).
+        Returns:
+            list: (ngram tuple, count) pairs
+        """
+        if self.group_codes is not None:
+            return NGramCounts(self.vocabulary, self.n, *_reduce(self.keys, self.counts, self.first_seen)).top_k(k)
+        if len(self.counts) == 0:
+            return []
+        if k < len(self.counts):
+            # Partition on count first so only the candidates around the cut-off are sorted
+            kth = np.partition(self.counts, len(self.counts) - k)[len(self.counts) - k]
+            candidates = np.flatnonzero(self.counts >= kth)
+        else:
+            candidates = np.arange(len(self.counts))
+        order = candidates[np.lexsort((self.first_seen[candidates], -self.counts[candidates]))][:k]
+        return list(zip(self.decode(self.keys[order]), self.counts[order].tolist()))
+
+    def top_k_by_group(self, k=20):
+        """
+        Most common n-grams within each group.
+        Returns:
+            DataFrame: group, ngram (space-joined), count and rank (0-based) rows, k per group at most
+        """
+        if self.group_codes is None:
+            raise ValueError("These counts were not computed with groups.")
+        order = np.lexsort((self.first_seen, -self.counts, self.group_codes))
+        group_codes = self.group_codes[order]
+        starts = np.flatnonzero(np.r_[True, group_codes[1:] != group_codes[:-1]])
+        rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        selected = order[rank < k]
+        return pd.DataFrame({
+            'group': self.groups[self.group_codes[selected]],
+            'ngram': [' '.join(t) for t in self.decode(self.keys[selected])],
+            'count': self.counts[selected],
+            'rank': rank[rank < k],
+        })
+
+
+def _reduce(keys, counts, first_seen, group_codes=None):
+    # Sum counts of identical (group, key) rows and keep the earliest first occurrence
+    if group_codes is None:
+        unique, inverse = np.unique(keys, return_inverse=True)
+        codes = None
+    else:
+        # Densify the keys first so (group, key) packs into one int64 without overflow
+        unique_keys, key_codes = np.unique(keys, return_inverse=True)
+        width = max(len(unique_keys), 1)
+        combined, inverse = np.unique(group_codes.astype(np.int64) * width + key_codes, return_inverse=True)
+        codes, unique = combined // width, unique_keys[combined % width]
+    summed = np.bincount(inverse, weights=counts, minlength=len(unique)).astype(np.int64)
+    first = np.full(len(unique), np.iinfo(np.int64).max)
+    np.minimum.at(first, inverse, first_seen)
+    return (unique, summed, first) if codes is None else (unique, summed, first, codes)
+
+
+class NGramCounter:
+    def __init__(self, stop_words=(), tokenizer='whitespace', adjacency='raw', lowercase=True):
+        """
+        Args:
+            stop_words (iterable): Tokens to drop (compared after lowercasing)
+            tokenizer (str): 'whitespace' (str.split semantics) or 'word' (letter runs, close to nltk.word_tokenize)
+            adjacency (str): 'raw' forms n-grams only from adjacent raw tokens that are all kept (as in
+                identify_common_words_and_phrases); 'filtered' forms them over the kept tokens of each headline
+                (as in analyze_headlines)
+            lowercase (bool): Lowercase text before tokenizing
+        """
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer '{tokenizer}'. Expected one of {sorted(TOKENIZERS)}.")
+        if adjacency not in ('raw', 'filtered'):
+            raise ValueError("adjacency must be 'raw' or 'filtered'.")
+        self.stop_words = frozenset(stop_words)
+        self.tokenizer = tokenizer
+        self.adjacency = adjacency
+        self.lowercase = lowercase
+
+    def encode(self, texts):
+        """
+        Tokenize and integer-encode texts in one pass.
+        Returns:
+            tuple: (vocabulary array, token ids, document index per token, keep mask per token)
+        """
+        texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+        present = texts.notna()
+        texts[present] = texts[present].astype(str)
+        array = pa.array(texts, type=pa.string(), from_pandas=True)
+        if self.lowercase:
+            array = pc.utf8_lower(array)
+        lists = TOKENIZERS[self.tokenizer](array)
+        tokens = pc.list_flatten(lists)
+        docs = pc.list_parent_indices(lists).to_numpy()
+        encoded = tokens.dictionary_encode()
+        vocabulary = np.asarray(encoded.dictionary.to_pylist(), dtype=object)
+        ids = encoded.indices.to_numpy().astype(np.int64)
+        # Filtering is decided once per vocabulary entry, then broadcast to every token
+        keep_vocabulary = np.fromiter((w.isalpha() and w not in self.stop_words for w in vocabulary), bool, len(vocabulary))
+        return vocabulary, ids, docs, keep_vocabulary[ids]
+
+    def count(self, texts, n=1, groups=None):
+        """
+        Count n-grams of size n.
+        Args:
+            texts (Series or list): Headlines (None/NaN entries are skipped)
+            n (int): 1, 2 or 3
+            groups (Series or list or None): Group label per text (e.g. publisher) for per-group counts
+        Returns:
+            NGramCounts
+        """
+        return self.count_many(texts, ns=(n,), groups=groups)[n]
+
+    def count_many(self, texts, ns=(1, 2, 3), groups=None):
+        # Count several n-gram sizes from a single tokenization pass
+        vocabulary, ids, docs, keep = self.encode(texts)
+        size = max(len(vocabulary), 1)
+        if max(ns) > 1 and size ** max(ns) >= np.iinfo(np.int64).max:
+            raise ValueError("Vocabulary too large to pack n-grams into int64 keys.")
+        positions = np.arange(len(ids))
+        if self.adjacency == 'filtered':
+            ids, docs, positions = ids[keep], docs[keep], positions[keep]
+            keep = np.ones(len(ids), dtype=bool)
+        group_codes = groups_index = None
+        if groups is not None:
+            doc_groups, groups_index = pd.factorize(pd.Series(groups, dtype=object).reset_index(drop=True))
+            groups_index = np.asarray(groups_index, dtype=object)
+        results = {}
+        for n in ns:
+            m = len(ids) - n + 1
+            if m <= 0:
+                valid = np.zeros(0, dtype=bool)
+                keys = np.zeros(0, dtype=np.int64)
+            else:
+                valid = keep[:m].copy()
+                keys = ids[:m].copy()
+                for j in range(1, n):
+                    valid &= keep[j:j + m] & (docs[j:j + m] == docs[:m])
+                    keys = keys * size + ids[j:j + m]
+            keys, first_seen = keys[valid], positions[:max(m, 0)][valid]
+            if groups is None:
+                results[n] = NGramCounts(vocabulary, n, *_reduce(keys, np.ones(len(keys)), first_seen))
+            else:
+                token_groups = doc_groups[docs[:max(m, 0)][valid]]
+                has_group = token_groups >= 0
+                unique, counts, first, codes = _reduce(keys[has_group], np.ones(has_group.sum()), first_seen[has_group],
+                                                       token_groups[has_group])
+                results[n] = NGramCounts(vocabulary, n, unique, counts, first, codes, groups_index)
+        return results
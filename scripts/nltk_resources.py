@@ -0,0 +1,146 @@
+import os
+import argparse
+
+## This script manages the NLTK data used by the project (punkt, stopwords, wordnet, vader_lexicon) without touching the network at import or analysis time. Resources are resolved from a pinned local directory first (the repository's nltk_data/ folder, or the directory named by the NLTK_RESOURCE_DIR environment variable), then from NLTK's usual search path. Loaded objects (stopword sets, the VADER analyzer, the lemmatizer) are built on first use and cached per process, and nltk itself is only imported at that point. Downloading is an explicit provisioning step: python -m scripts.nltk_resources download.
+
+DEFAULT_DATA_DIR = os.environ.get(
+    'NLTK_RESOURCE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nltk_data')
+)
+
+# Resource name -> path inside an NLTK data directory
+RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+    'vader_lexicon': 'sentiment/vader_lexicon.zip',
+}
+
+
+class NLTKResourceManager:
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, search_default_paths=True):
+        """
+        Args:
+            data_dir (str): Pinned directory searched first (and the download target of provision())
+            search_default_paths (bool): Also search NLTK's default data path (~/nltk_data, /usr/share/nltk_data, ...)
+        """
+        self.data_dir = data_dir
+        self.search_default_paths = search_default_paths
+        self._loaded = {}
+
+    def _search_path(self):
+        # Point nltk at the pinned directory; done lazily so importing this module does not import nltk
+        import nltk
+        if self.data_dir not in nltk.data.path:
+            nltk.data.path.insert(0, self.data_dir)
+        return nltk
+
+    def find(self, name):
+        """
+        Locate a resource without downloading it.
+        Returns:
+            str: Path of the resource
+        Raises:
+            LookupError: If the resource is not installed, with the command that provisions it
+        """
+        return str(self._locate(name))
+
+    def _locate(self, name):
+        # nltk PathPointer of a resource (a file system or zip entry pointer), or LookupError
+        nltk = self._search_path()
+        try:
+            paths = None if self.search_default_paths else [self.data_dir]
+            return nltk.data.find(RESOURCES.get(name, name), paths=paths)
+        except LookupError:
+            raise LookupError(
+                f"NLTK resource '{name}' is not installed in {self.data_dir} or the NLTK data path. "
+                f"Provision it with: python -m scripts.nltk_resources download {name}"
+            ) from None
+
+    def available(self, name):
+        try:
+            self.find(name)
+            return True
+        except LookupError:
+            return False
+
+    def missing(self, names=None):
+        # Names of the resources (default: all known ones) that are not installed
+        return [name for name in (names or RESOURCES) if not self.available(name)]
+
+    # ----- lazily loaded objects -----
+
+    def _cached(self, key, build):
+        if key not in self._loaded:
+            self._loaded[key] = build()
+        return self._loaded[key]
+
+    def stopwords(self, language='english'):
+        # Stopword set for a language, read from the resolved corpus (not nltk's global search path)
+        def build():
+            from nltk.corpus.reader import WordListCorpusReader
+            reader = WordListCorpusReader(self._locate('stopwords'), r'(?!README|\.).*', encoding='utf8')
+            return frozenset(reader.words(language))
+        return self._cached(('stopwords', language), build)
+
+    def vader_analyzer(self):
+        # VADER SentimentIntensityAnalyzer built from the resolved lexicon file (not nltk's global search path)
+        def build():
+            from nltk.sentiment import SentimentIntensityAnalyzer
+            pointer = self._locate('vader_lexicon')
+            if hasattr(pointer, 'zipfile'):
+                path = os.path.join(pointer.zipfile.filename, pointer.entry, 'vader_lexicon', 'vader_lexicon.txt')
+            else:
+                path = os.path.join(pointer.path, 'vader_lexicon.txt')
+            return SentimentIntensityAnalyzer(lexicon_file='file:' + path)
+        return self._cached('vader', build)
+
+    def lemmatizer(self):
+        # WordNet lemmatizer (wordnet itself is read on the first lemmatize call, through nltk's search path)
+        def build():
+            self._search_path()
+            from nltk.stem import WordNetLemmatizer
+            return WordNetLemmatizer()
+        return self._cached('lemmatizer', build)
+
+    # ----- provisioning -----
+
+    def provision(self, names=None, quiet=False):
+        """
+        Download resources into the pinned directory (explicit step, never called by the analysis code).
+        Returns:
+            list: Names that could not be downloaded
+        """
+        nltk = self._search_path()
+        os.makedirs(self.data_dir, exist_ok=True)
+        failed = []
+        for name in names or RESOURCES:
+            if not nltk.download(name, download_dir=self.data_dir, quiet=quiet):
+                failed.append(name)
+        return failed
+
+
+# Shared per-process manager
+_default_manager = None
+
+
+def default_manager():
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = NLTKResourceManager()
+    return _default_manager
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Check or provision the NLTK resources used by the project.")
+    parser.add_argument('command', choices=['status', 'download'])
+    parser.add_argument('names', nargs='*', help=f"Resources (default: {', '.join(RESOURCES)})")
+    parser.add_argument('--dir', default=DEFAULT_DATA_DIR, help="Pinned NLTK data directory")
+    args = parser.parse_args()
+    manager = NLTKResourceManager(args.dir)
+    if args.command == 'download':
+        failed = manager.provision(args.names or None)
+        if failed:
+            parser.exit(1, f"Could not download: {', '.join(failed)}\n")
+    for name in args.names or RESOURCES:
+        print(f"{name:15s} {'ok' if manager.available(name) else 'missing'}")
@@ -0,0 +1,260 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+## This script separates plotting from the analysis code. Analyzer methods describe each figure as a PlotSpec (titles, labels and the already-aggregated arrays to draw) instead of calling matplotlib directly. Depending on the analyzer's render mode a spec is shown right away (the interactive notebook behaviour), collected for later, or dropped. Collected specs are written to PNG/SVG files by PlotRenderer through a process pool on the Agg backend. matplotlib, seaborn and mplfinance are imported only inside the drawing functions, so a headless run with render='off' never loads them.
+
+RENDER_MODES = ('show', 'defer', 'off')
+
+
+class PlotSpec:
+    def __init__(self, name, title=None, xlabel=None, ylabel=None, figsize=(12, 6)):
+        """
+        Args:
+            name (str): Identifier of the figure, used as the output file name
+            title, xlabel, ylabel (str or None): Labels of the first (or only) subplot
+            figsize (tuple): Figure size in inches
+        """
+        self.name = name
+        self.figsize = figsize
+        self.kind = 'axes'
+        self.data = None        # OHLCV frame for candlestick specs
+        self.options = {}
+        self.panels = []
+        self.subplot(title, xlabel, ylabel)
+
+    @classmethod
+    def candlestick(cls, name, ohlcv, **options):
+        # Candlestick chart drawn with mplfinance (options are passed to mpf.plot, e.g. title, volume)
+        spec = cls(name)
+        spec.kind = 'candlestick'
+        spec.data = ohlcv
+        spec.options = options
+        spec.panels = []
+        return spec
+
+    # ----- building -----
+
+    def subplot(self, title=None, xlabel=None, ylabel=None, legend=False, grid=False, xtick_rotation=None):
+        # Start a new subplot; layers added afterwards go to it (subplots are stacked vertically)
+        self.panels.append({'title': title, 'xlabel': xlabel, 'ylabel': ylabel, 'legend': legend, 'grid': grid,
+                            'xtick_rotation': xtick_rotation, 'layers': []})
+        return self
+
+    def set(self, **options):
+        # Update options of the current subplot (legend, grid, xtick_rotation, ...)
+        self.panels[-1].update(options)
+        return self
+
+    def _layer(self, kind, **layer):
+        layer['kind'] = kind
+        self.panels[-1]['layers'].append(layer)
+        return self
+
+    def line(self, x, y, **style):
+        return self._layer('line', x=np.asarray(x), y=np.asarray(y), style=style)
+
+    def scatter(self, x, y, **style):
+        return self._layer('scatter', x=np.asarray(x), y=np.asarray(y), style=style)
+
+    def bar(self, labels, values, palette=None, **style):
+        # Vertical bars over categorical labels; palette is a seaborn palette name
+        return self._layer('bar', x=[str(label) for label in labels], y=np.asarray(values), palette=palette, style=style)
+
+    def barh(self, labels, values, palette=None, **style):
+        # Horizontal bars, first label on top (as seaborn.barplot with y=labels)
+        return self._layer('barh', x=[str(label) for label in labels], y=np.asarray(values), palette=palette, style=style)
+
+    def stacked_bar(self, labels, columns, colormap=None, legend_title=None):
+        # Stacked vertical bars; columns maps a series name to its values per label
+        return self._layer('stacked_bar', x=[str(label) for label in labels],
+                           columns={str(k): np.asarray(v) for k, v in columns.items()},
+                           colormap=colormap, legend_title=legend_title)
+
+    def histogram(self, values, bins=50, **style):
+        # Histogram stored as bin counts, so the raw values are not kept in the spec
+        values = np.asarray(values, dtype='float64')
+        counts, edges = np.histogram(values[~np.isnan(values)], bins=bins)
+        return self.binned(counts, edges, **style)
+
+    def binned(self, counts, edges, **style):
+        # Histogram from precomputed bin counts and edges
+        return self._layer('hist', counts=np.asarray(counts), edges=np.asarray(edges), style=style)
+
+    def hline(self, y, **style):
+        return self._layer('hline', y=y, style=style)
+
+    def vline(self, x, text=None, **style):
+        # Vertical marker line; text is written next to it near the top of the subplot
+        return self._layer('vline', x=x, text=text, style=style)
+
+    def __repr__(self):
+        return f"PlotSpec(name={self.name!r}, kind={self.kind!r}, panels={len(self.panels)})"
+
+
+def _palette_colors(palette, n):
+    if palette is None:
+        return None
+    import seaborn as sns
+    return sns.color_palette(palette, n)
+
+
+def draw(spec, fig):
+    """
+    Draw an axes spec onto a matplotlib Figure.
+    Returns:
+        Figure: fig
+    """
+    axes = fig.subplots(len(spec.panels), 1, squeeze=False)[:, 0]
+    for ax, panel in zip(axes, spec.panels):
+        for layer in panel['layers']:
+            kind = layer['kind']
+            style = layer.get('style', {})
+            if kind == 'line':
+                ax.plot(layer['x'], layer['y'], **style)
+            elif kind == 'scatter':
+                ax.scatter(layer['x'], layer['y'], **style)
+            elif kind == 'bar':
+                ax.bar(layer['x'], layer['y'], color=_palette_colors(layer['palette'], len(layer['x'])), **style)
+            elif kind == 'barh':
+                ax.barh(layer['x'], layer['y'], color=_palette_colors(layer['palette'], len(layer['x'])), **style)
+                ax.invert_yaxis()
+            elif kind == 'stacked_bar':
+                from matplotlib import colormaps
+                cmap = colormaps[layer['colormap'] or 'tab10']
+                colors = cmap(np.linspace(0, 1, len(layer['columns'])))
+                bottom = np.zeros(len(layer['x']))
+                for color, (label, values) in zip(colors, layer['columns'].items()):
+                    ax.bar(layer['x'], values, bottom=bottom, label=label, color=color)
+                    bottom = bottom + values
+                ax.legend(title=layer['legend_title'])
+            elif kind == 'hist':
+                edges = layer['edges']
+                ax.hist(edges[:-1], bins=edges, weights=layer['counts'], **style)
+            elif kind == 'hline':
+                ax.axhline(layer['y'], **style)
+            elif kind == 'vline':
+                ax.axvline(layer['x'], **style)
+                if layer['text']:
+                    ax.text(layer['x'], ax.get_ylim()[1] * 0.95, layer['text'], rotation=90,
+                            verticalalignment='top', color=style.get('color'))
+        ax.set_title(panel['title'])
+        ax.set_xlabel(panel['xlabel'])
+        ax.set_ylabel(panel['ylabel'])
+        if panel['legend']:
+            ax.legend()
+        if panel['grid']:
+            ax.grid(True)
+        if panel['xtick_rotation'] is not None:
+            ax.tick_params(axis='x', labelrotation=panel['xtick_rotation'])
+    fig.tight_layout()
+    return fig
+
+
+def show(spec):
+    # Draw a spec with pyplot and display it (interactive / notebook use)
+    if spec.kind == 'candlestick':
+        import mplfinance as mpf
+        mpf.plot(spec.data, **spec.options)
+        return
+    import matplotlib.pyplot as plt
+    draw(spec, plt.figure(figsize=spec.figsize))
+    plt.show()
+
+
+def file_name(spec, index=None):
+    # File-system friendly name for a spec, prefixed with its position when given
+    base = re.sub(r'[^A-Za-z0-9_.-]+', '_', spec.name).strip('_') or 'plot'
+    return base if index is None else f"{index:03d}_{base}"
+
+
+def render_to_files(spec, path_base, formats=('png',), dpi=100):
+    """
+    Render one spec and write one file per format, without changing the matplotlib backend.
+    Returns:
+        list: Paths written
+    """
+    paths = [f"{path_base}.{fmt}" for fmt in formats]
+    if spec.kind == 'candlestick':
+        # mplfinance builds the figure through pyplot; save it directly and close it, leaving the backend alone
+        import matplotlib.pyplot as plt
+        import mplfinance as mpf
+        fig, _ = mpf.plot(spec.data, returnfig=True, **spec.options)
+        try:
+            for path in paths:
+                fig.savefig(path, dpi=dpi)
+        finally:
+            plt.close(fig)
+        return paths
+    # Figure + Agg canvas directly: no pyplot state, so this is safe in worker processes
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=spec.figsize)
+    FigureCanvasAgg(fig)
+    draw(spec, fig)
+    for path in paths:
+        fig.savefig(path, dpi=dpi)
+    return paths
+
+
+class PlotRenderer:
+    def __init__(self, output_dir="../reports/figures", formats=('png',), dpi=100, n_workers=1):
+        """
+        Args:
+            output_dir (str): Directory the figure files are written to
+            formats (iterable of str): File formats, e.g. ('png', 'svg')
+            dpi (int): Resolution of raster formats
+            n_workers (int or None): Worker processes (None = all cores, 1 = render in-process)
+        """
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.dpi = dpi
+        self.n_workers = n_workers or os.cpu_count() or 1
+
+    def render(self, specs):
+        """
+        Write every spec to files.
+        Returns:
+            list: Paths written, in spec order
+        """
+        specs = list(specs)
+        os.makedirs(self.output_dir, exist_ok=True)
+        bases = [os.path.join(self.output_dir, file_name(spec, i)) for i, spec in enumerate(specs)]
+        if self.n_workers > 1 and len(specs) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_workers, len(specs))) as executor:
+                futures = [executor.submit(render_to_files, spec, base, self.formats, self.dpi)
+                           for spec, base in zip(specs, bases)]
+                paths = [future.result() for future in futures]
+        else:
+            paths = [render_to_files(spec, base, self.formats, self.dpi) for spec, base in zip(specs, bases)]
+        return [path for group in paths for path in group]
+
+
+class PlotEmitter:
+    # Mixin for the analyzers: holds the render mode and routes the specs built by their methods
+
+    def _init_plotting(self, render):
+        if render not in RENDER_MODES:
+            raise ValueError(f"render must be one of {RENDER_MODES}, got '{render}'.")
+        self.render = render
+        self.plot_specs = []
+
+    def _emit(self, spec):
+        # Show the spec now ('show'), keep it for render_plots ('defer') or drop it ('off')
+        if self.render == 'show':
+            show(spec)
+        elif self.render == 'defer':
+            self.plot_specs.append(spec)
+        return spec
+
+    def render_plots(self, output_dir="../reports/figures", formats=('png',), dpi=100, n_workers=1, clear=True):
+        """
+        Write the deferred plot specs to files (see PlotRenderer).
+        Returns:
+            list: Paths written
+        """
+        paths = PlotRenderer(output_dir, formats, dpi, n_workers).render(self.plot_specs)
+        if clear:
+            self.plot_specs = []
+        return paths
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+## This script packs the historical prices of every ticker into one memory-mapped column store. Each column (Date as datetime64[ns], Open/High/Low/Close/Volume as float64) is a single contiguous .npy file holding all tickers back to back, in date order within each ticker, and index.json maps every ticker to its [start, stop) row range. Opening the store reads only the small index and maps the column files read-only, so it is near-instant whatever the data size. A ticker's prices are slices of the mapped arrays, and the DataFrames built on them share that memory instead of copying it. A PriceStore is pickled as its path, so worker processes map the same files: the operating system keeps one copy of the pages in its cache for all of them, and resident memory does not grow with the number of workers.
+
+STORE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+INDEX_FILENAME = 'index.json'
+STORE_VERSION = 1
+
+
+def _column_path(path, column, generation):
+    # Column files carry the build generation, so a rebuild never overwrites files that a reader has mapped
+    return os.path.join(path, f"{column.replace(' ', '_')}-{generation}.npy")
+
+
+class PriceStore:
+    def __init__(self, path):
+        """
+        Open an existing store read-only (see PriceStore.build and build_price_store to create one).
+        Args:
+            path (str): Store directory holding index.json and one .npy file per column
+        """
+        self.path = path
+        with open(os.path.join(path, INDEX_FILENAME)) as f:
+            self.index = json.load(f)
+        if self.index.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported price store version {self.index.get('version')} in {path}.")
+        self.columns = ['Date'] + self.index['columns']
+        self.offsets = {ticker: tuple(bounds) for ticker, bounds in self.index['tickers'].items()}
+        # Mapping reads only the .npy headers; data pages are loaded on access
+        self._arrays = {name: np.load(_column_path(path, name, self.index['generation']), mmap_mode='r')
+                        for name in self.columns}
+
+    # Pickling a store sends its path only; the receiving process maps the files itself
+    def __reduce__(self):
+        return (PriceStore, (self.path,))
+
+    @classmethod
+    def build(cls, path, prices, ticker_col='stock', date_col='Date', columns=STORE_COLUMNS, sources=None):
+        """
+        Write a store from in-memory prices, replacing any store at path.
+        Args:
+            path (str): Store directory
+            prices (dict or DataFrame): Ticker -> price DataFrame, or a long-format panel with a ticker column
+            ticker_col (str): Ticker column of a panel
+            date_col (str): Date column (or index name) of the price frames
+            columns (list): Price columns to store (missing ones are stored as NaN)
+            sources (dict or None): Ticker -> fingerprint of the source file, kept to detect stale stores
+        Returns:
+            PriceStore: The new store, opened
+        """
+        if not isinstance(prices, dict):
+            prices = {ticker: frame for ticker, frame in prices.groupby(prices[ticker_col].astype(object), sort=True)}
+        tickers = sorted(prices)
+        frames = []
+        for ticker in tickers:
+            frame = prices[ticker]
+            if date_col not in frame.columns and frame.index.name == date_col:
+                frame = frame.reset_index()
+            frame = frame.assign(**{date_col: pd.to_datetime(frame[date_col])}).sort_values(date_col, kind='stable')
+            frames.append(frame)
+        lengths = [len(frame) for frame in frames]
+        bounds = np.cumsum([0] + lengths).tolist()
+        os.makedirs(path, exist_ok=True)
+        # Write the new generation's columns next to the old ones, then switch index.json over to them in one
+        # rename: a reader sees either the old or the new store, never a mix
+        generation = time.time_ns()
+        for column in ['Date'] + list(columns):
+            if column == 'Date':
+                values = [frame[date_col].to_numpy(dtype='datetime64[ns]') for frame in frames]
+                dtype = 'datetime64[ns]'
+            else:
+                values = [frame[column].to_numpy(dtype='float64') if column in frame.columns
+                          else np.full(len(frame), np.nan) for frame in frames]
+                dtype = 'float64'
+            np.save(_column_path(path, column, generation),
+                    np.concatenate(values) if values else np.zeros(0, dtype=dtype))
+        index = {
+            'version': STORE_VERSION,
+            'generation': generation,
+            'columns': list(columns),
+            'rows': bounds[-1],
+            'tickers': {ticker: [bounds[i], bounds[i + 1]] for i, ticker in enumerate(tickers)},
+            'sources': sources or {},
+        }
+        tmp_index = os.path.join(path, INDEX_FILENAME + '.tmp')
+        with open(tmp_index, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_index, os.path.join(path, INDEX_FILENAME))
+        # Processes that still map an older generation keep their open files (removal only unlinks the names)
+        for name in os.listdir(path):
+            if name.endswith('.npy') and not name.endswith(f"-{generation}.npy"):
+                os.remove(os.path.join(path, name))
+        print(f"Built price store {path} with {len(tickers)} tickers and {bounds[-1]} rows.")
+        return cls(path)
+
+    @property
+    def tickers(self):
+        return sorted(self.offsets)
+
+    def __contains__(self, ticker):
+        return ticker in self.offsets
+
+    def __len__(self):
+        return self.index['rows']
+
+    def __getitem__(self, ticker):
+        return self.frame(ticker)
+
+    def column(self, name):
+        # Whole column as a read-only memory-mapped array
+        if name not in self._arrays:
+            raise KeyError(f"Column '{name}' is not in the price store. Available: {self.columns}.")
+        return self._arrays[name]
+
+    def bounds(self, ticker):
+        if ticker not in self.offsets:
+            raise KeyError(f"Ticker '{ticker}' is not in the price store.")
+        return self.offsets[ticker]
+
+    def arrays(self, ticker, columns=None):
+        """
+        A ticker's columns as read-only views of the mapped files (no copy).
+        Returns:
+            dict: Column name -> array
+        """
+        start, stop = self.bounds(ticker)
+        return {name: self.column(name)[start:stop] for name in (columns or self.columns)}
+
+    def frame(self, ticker, columns=None, start=None, end=None):
+        """
+        A ticker's prices as a DataFrame whose columns share memory with the store.
+        Args:
+            ticker (str): Ticker
+            columns (list or None): Columns (Date is always included; None = all)
+            start, end (str or Timestamp or None): Inclusive date range, found by binary search
+        Returns:
+            DataFrame: Date, Open, High, Low, Close, Volume in date order (read-only data; adding columns,
+                set_index and the like work as usual)
+        """
+        names = ['Date'] + [name for name in (columns or self.columns) if name != 'Date']
+        arrays = self.arrays(ticker, names)
+        if start is not None or end is not None:
+            dates = arrays['Date']
+            lo = np.searchsorted(dates, np.datetime64(pd.Timestamp(start), 'ns')) if start is not None else 0
+            hi = (np.searchsorted(dates, np.datetime64(pd.Timestamp(end), 'ns'), side='right') if end is not None
+                  else len(dates))
+            arrays = {name: values[lo:hi] for name, values in arrays.items()}
+        return pd.DataFrame(arrays, copy=False)
+
+    def panel(self, tickers=None, columns=None, ticker_col='stock'):
+        """
+        Several tickers as one long-format frame. The store is grouped by ticker, so consecutive tickers are read
+        as one slice of each column without a copy.
+        Returns:
+            DataFrame: Ticker column (categorical) followed by the requested columns
+        """
+        tickers = self.tickers if tickers is None else list(tickers)
+        names = ['Date'] + [name for name in (columns or self.columns) if name != 'Date']
+        bounds = [self.bounds(ticker) for ticker in tickers]
+        contiguous = all(bounds[i][1] == bounds[i + 1][0] for i in range(len(bounds) - 1))
+        if contiguous and bounds:
+            part = slice(bounds[0][0], bounds[-1][1])
+            data = {name: self.column(name)[part] for name in names}
+        else:
+            positions = np.concatenate([np.arange(lo, hi) for lo, hi in bounds]) if bounds else np.zeros(0, dtype=int)
+            data = {name: self.column(name)[positions] for name in names}
+        lengths = [hi - lo for lo, hi in bounds]
+        codes = np.repeat(np.arange(len(tickers), dtype='int32'), lengths)
+        frame = pd.DataFrame(data, copy=False)
+        frame.insert(0, ticker_col, pd.Categorical.from_codes(codes, categories=tickers))
+        return frame
+
+    def is_stale(self, base_dir, tickers=None):
+        # True if the source CSVs changed (or tickers were added) since the store was built
+        from scripts.data_store import ParquetDataStore
+        data_store = ParquetDataStore(base_dir)
+        tickers = data_store.available_tickers() if tickers is None else tickers
+        sources = self.index.get('sources', {})
+        return any(sources.get(ticker) != data_store.source_fingerprint(data_store.price_csv_path(ticker))
+                   for ticker in tickers)
+
+
+def build_price_store(base_dir="../data", path=None, tickers=None, force=False):
+    """
+    Build (if missing or stale) and open the store for the price CSVs under base_dir/yfinance_data.
+    Args:
+        base_dir (str): Data directory
+        path (str or None): Store directory (default: <base_dir>/price_store)
+        tickers (list or None): Tickers to include (default: every ticker with a price file)
+        force (bool): Rebuild even if the store is up to date
+    Returns:
+        PriceStore: The opened store
+    """
+    from scripts.data_store import ParquetDataStore
+    path = path or os.path.join(base_dir, 'price_store')
+    data_store = ParquetDataStore(base_dir)
+    tickers = data_store.available_tickers() if tickers is None else list(tickers)
+    if not force and os.path.exists(os.path.join(path, INDEX_FILENAME)):
+        store = PriceStore(path)
+        if set(store.tickers) == set(tickers) and not store.is_stale(base_dir, tickers):
+            return store
+    # Parsing goes through the Parquet layer, so dates are read already typed
+    prices = {ticker: data_store.load_prices(ticker) for ticker in tickers}
+    sources = {ticker: data_store.source_fingerprint(data_store.price_csv_path(ticker)) for ticker in tickers}
+    return PriceStore.build(path, prices, sources=sources)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pack the price CSVs into a memory-mapped column store.")
+    parser.add_argument('--base-dir', default="../data")
+    parser.add_argument('--path', default=None, help="Store directory (default: <base-dir>/price_store)")
+    parser.add_argument('--tickers', nargs='*', default=None)
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the store is up to date")
+    args = parser.parse_args()
+    store = build_price_store(args.base_dir, args.path, args.tickers, force=args.force)
+    for ticker in store.tickers:
+        start, stop = store.bounds(ticker)
+        print(f"{ticker}: {stop - start} rows")
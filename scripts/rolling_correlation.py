@@ -0,0 +1,231 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+## This script computes rolling, expanding and exponentially weighted correlations between daily news sentiment and stock returns, for many window lengths and tickers in one call. Pearson correlations come from running sums of the pair moments (count, x, y, x², y², xy): one cumulative sum per moment gives every window length by a subtraction. Exponentially weighted moments are one linear recursion per moment. Spearman correlations rank the values inside each window (vectorized over sliding windows, in chunks), which costs O(n·w·log w) for a window of w days; the expanding Spearman correlation is therefore only computed on request (expanding_spearman=True), since it grows quadratically with the history. Days without news (the rows an inner join would drop) stay on the trading calendar as NaN and are masked out of the moments, so a window always spans the same number of trading days and counts only the days that have both a sentiment score and a return.
+
+RESULT_COLUMNS = ['ticker', 'date', 'window', 'n', 'pearson_r', 'spearman_r']
+
+# Cells (window rows x window length) ranked at once by the Spearman computation
+SPEARMAN_CHUNK_CELLS = 2_000_000
+
+
+def _pair_moments(x, y):
+    # Moments of the valid (x, y) pairs, shape (6, n): count, x, y, x², y², xy. Values are centered for precision.
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if valid.any():
+        x = x - x[valid].mean()
+        y = y - y[valid].mean()
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    return np.stack([valid.astype('float64'), x, y, x * x, y * y, x * y])
+
+
+def _pearson_from_moments(m):
+    # Correlation from (possibly weighted) moment sums; NaN for a constant input
+    count, sx, sy, sxx, syy, sxy = m
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sxy - sx * sy / count
+        vx = sxx - sx * sx / count
+        vy = syy - sy * sy / count
+        r = cov / np.sqrt(vx * vy)
+    # Variances at rounding level relative to the sums mean a constant window
+    flat = (vx <= 1e-12 * np.abs(sxx)) | (vy <= 1e-12 * np.abs(syy))
+    return np.where(flat, np.nan, np.clip(r, -1.0, 1.0))
+
+
+def rolling_pearson(x, y, windows, min_periods=10):
+    """
+    Rolling Pearson correlation for several window lengths from one set of cumulative moment sums.
+    Args:
+        x, y (ndarray): Aligned series (NaN = missing)
+        windows (iterable of int): Window lengths in rows (trading days)
+        min_periods (int): Minimum valid pairs in a window (capped at the window length, at least 3)
+    Returns:
+        tuple: (r, n) arrays of shape (len(windows), len(x)); n is the number of valid pairs per window
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    windows = np.asarray(list(windows), dtype='int64')
+    moments = _pair_moments(x, y)
+    cumulative = np.concatenate([np.zeros((6, 1)), np.cumsum(moments, axis=1)], axis=1)
+    end = np.arange(1, len(x) + 1)
+    start = np.maximum(end[None, :] - windows[:, None], 0)
+    sums = cumulative[:, end][:, None, :] - cumulative[:, start]
+    # Window count sums are exact integers in float64
+    n = np.rint(sums[0]).astype('int64')
+    sums[0] = n
+    r = _pearson_from_moments(sums)
+    required = np.maximum(np.minimum(min_periods, windows), 3)[:, None]
+    return np.where(n >= required, r, np.nan), n
+
+
+def rolling_spearman(x, y, window, min_periods=10):
+    """
+    Rolling Spearman correlation: Pearson correlation of the ranks of the valid pairs in each window (ties averaged).
+    Returns:
+        ndarray: One value per row of x
+    """
+    from scipy.stats import rankdata
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    valid = ~(np.isnan(x) | np.isnan(y))
+    # Leading NaN padding gives the first rows partial windows, as for the Pearson sums
+    pad = np.full(window - 1, np.nan)
+    xw = sliding_window_view(np.concatenate([pad, np.where(valid, x, np.nan)]), window)
+    yw = sliding_window_view(np.concatenate([pad, np.where(valid, y, np.nan)]), window)
+    out = np.full(len(x), np.nan)
+    step = max(1, SPEARMAN_CHUNK_CELLS // window)
+    required = max(min(min_periods, window), 3)
+    for lo in range(0, len(x), step):
+        rx = rankdata(xw[lo:lo + step], axis=1, nan_policy='omit')
+        ry = rankdata(yw[lo:lo + step], axis=1, nan_policy='omit')
+        mask = ~np.isnan(rx)
+        moments = np.stack([mask.sum(axis=1), np.nansum(rx, 1), np.nansum(ry, 1), np.nansum(rx * rx, 1),
+                            np.nansum(ry * ry, 1), np.nansum(rx * ry, 1)]).astype('float64')
+        r = _pearson_from_moments(moments)
+        out[lo:lo + step] = np.where(moments[0] >= required, r, np.nan)
+    return out
+
+
+def ewm_pearson(x, y, halflife, min_periods=10):
+    """
+    Exponentially weighted Pearson correlation (as pandas ewm(halflife=...).corr with adjust=True).
+    Weights keep decaying over missing days.
+    Returns:
+        tuple: (r, n) with n the number of valid pairs seen so far
+    """
+    from scipy.signal import lfilter
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    decay = np.exp(-np.log(2.0) / halflife)
+    sums = lfilter([1.0], [1.0, -decay], _pair_moments(x, y), axis=1)
+    n = np.cumsum(~(np.isnan(x) | np.isnan(y)))
+    r = _pearson_from_moments(sums)
+    return np.where(n >= max(min_periods, 3), r, np.nan), n
+
+
+class RollingCorrelationEngine:
+    def __init__(self, windows=(20, 60, 120), expanding=True, halflives=(), spearman=True, min_periods=10,
+                 expanding_spearman=False):
+        """
+        Args:
+            windows (iterable of int): Rolling window lengths in trading days
+            expanding (bool): Also compute the expanding (all history so far) correlation
+            halflives (iterable of float): Half-lives in trading days of exponentially weighted variants (Pearson only)
+            spearman (bool): Also compute Spearman correlations for the rolling windows
+            min_periods (int): Minimum days with both sentiment and a return for a value
+            expanding_spearman (bool): Also compute the expanding Spearman correlation (O(n²) in the history length;
+                NaN otherwise)
+        """
+        self.windows = tuple(int(w) for w in windows)
+        self.expanding = expanding
+        self.halflives = tuple(halflives)
+        self.spearman = spearman
+        self.min_periods = min_periods
+        self.expanding_spearman = expanding_spearman
+
+    def compute(self, x, y):
+        """
+        All configured correlations of one aligned pair of series.
+        Returns:
+            dict: window label ('rolling_<w>', 'expanding', 'ewm_<halflife>') -> (n, pearson_r, spearman_r) arrays
+        """
+        x = np.asarray(x, dtype='float64')
+        y = np.asarray(y, dtype='float64')
+        windows = list(self.windows)
+        labels = [f"rolling_{w}" for w in windows]
+        if self.expanding and len(x):
+            # An expanding window is a rolling window as long as the series
+            windows.append(len(x))
+            labels.append('expanding')
+        out = {}
+        if windows:
+            r, n = rolling_pearson(x, y, windows, self.min_periods)
+            for i, (label, window) in enumerate(zip(labels, windows)):
+                ranked = self.expanding_spearman if label == 'expanding' else self.spearman
+                rho = rolling_spearman(x, y, window, self.min_periods) if ranked else np.full(len(x), np.nan)
+                out[label] = (n[i], r[i], rho)
+        for halflife in self.halflives:
+            r, n = ewm_pearson(x, y, halflife, self.min_periods)
+            out[f"ewm_{halflife:g}"] = (n, r, np.full(len(x), np.nan))
+        return out
+
+    def run(self, sentiment, returns=None, ticker_col='stock', date_col='date', sentiment_col='sentiment_score',
+            return_col='daily_return'):
+        """
+        Correlations for every ticker and window.
+        Args:
+            sentiment (DataFrame): Daily sentiment with ticker, date and sentiment columns; with returns=None it must
+                also hold the return column (e.g. the merged frame of CorrelationAnalyzer.merge_and_correlate)
+            returns (DataFrame or None): Returns on the full trading calendar (ticker, date, return columns). Days
+                without news are kept as missing sentiment instead of being dropped.
+            ticker_col, date_col, sentiment_col, return_col (str): Column names (without a ticker column, all
+                rows are one series)
+        Returns:
+            DataFrame: Tidy table with ticker, date, window, n (days with both values in the window), pearson_r and
+                spearman_r, one row per (ticker, date, window)
+        """
+        if returns is None:
+            frame = sentiment[[c for c in (ticker_col, date_col, sentiment_col, return_col) if c in sentiment.columns]]
+        else:
+            keys = [c for c in (ticker_col, date_col) if c in returns.columns and c in sentiment.columns]
+            frame = returns[keys + [return_col]].merge(sentiment[keys + [sentiment_col]], on=keys, how='left')
+        if ticker_col not in frame.columns:
+            frame = frame.assign(**{ticker_col: ''})
+        frame = frame.sort_values([ticker_col, date_col], kind='stable')
+        tickers = frame[ticker_col].astype(object).to_numpy()
+        x = frame[sentiment_col].to_numpy(dtype='float64')
+        y = frame[return_col].to_numpy(dtype='float64')
+        dates = frame[date_col].to_numpy()
+        parts = []
+        for ticker, positions in pd.Series(tickers).groupby(tickers, sort=True).indices.items():
+            for label, (n, pearson_r, spearman_r) in self.compute(x[positions], y[positions]).items():
+                parts.append((ticker, label, dates[positions], n, pearson_r, spearman_r))
+        if not parts:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        sizes = [len(part[2]) for part in parts]
+        result = pd.DataFrame({
+            'ticker': np.repeat([part[0] for part in parts], sizes),
+            'date': np.concatenate([part[2] for part in parts]),
+            'window': np.repeat([part[1] for part in parts], sizes),
+            'n': np.concatenate([part[3] for part in parts]).astype('int64'),
+            'pearson_r': np.concatenate([part[4] for part in parts]),
+            'spearman_r': np.concatenate([part[5] for part in parts]),
+        })
+        result['ticker'] = result['ticker'].astype('category')
+        result['window'] = result['window'].astype('category')
+        return result
+
+
+def regimes(result, window, threshold=0.2, column='pearson_r'):
+    """
+    Split each ticker's correlation history into regimes: runs of consecutive days whose correlation is above
+    threshold ('positive'), below -threshold ('negative') or in between ('neutral'). Days without a value are skipped.
+    Args:
+        result (DataFrame): Output of RollingCorrelationEngine.run
+        window (str): Window label, e.g. 'rolling_60'
+        threshold (float): Absolute correlation that separates a regime from 'neutral'
+        column (str): 'pearson_r' or 'spearman_r'
+    Returns:
+        DataFrame: ticker, regime, start, end, days and mean correlation of each run
+    """
+    rows = result[(result['window'] == window) & result[column].notna()]
+    rows = rows.sort_values(['ticker', 'date'], kind='stable')
+    if rows.empty:
+        return pd.DataFrame(columns=['ticker', 'regime', 'start', 'end', 'days', 'mean_r'])
+    r = rows[column].to_numpy()
+    state = np.where(r >= threshold, 1, np.where(r <= -threshold, -1, 0))
+    tickers = rows['ticker'].astype(object).to_numpy()
+    # A run starts where the state or the ticker changes
+    starts = np.flatnonzero(np.r_[True, (state[1:] != state[:-1]) | (tickers[1:] != tickers[:-1])])
+    ends = np.r_[starts[1:], len(r)] - 1
+    dates = rows['date'].to_numpy()
+    return pd.DataFrame({
+        'ticker': tickers[starts],
+        'regime': np.array(['negative', 'neutral', 'positive'])[state[starts] + 1],
+        'start': dates[starts],
+        'end': dates[ends],
+        'days': ends - starts + 1,
+        'mean_r': np.add.reduceat(r, starts) / (ends - starts + 1),
+    })
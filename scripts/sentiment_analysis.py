@@ -1,53 +1,111 @@
-import nltk
-from nltk.corpus import stopwords
-from nltk import word_tokenize, ngrams, FreqDist
-from nltk.sentiment import SentimentIntensityAnalyzer
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import re
-from collections import Counter
+from scripts.sentiment_scoring import VaderScoringEngine
+from scripts.sentiment_cache import score_texts, scorer_version
+from scripts.ngram_counter import NGramCounter
+from scripts.plotting import PlotEmitter, PlotSpec
+from scripts.instrumentation import instrumented
+from scripts.nltk_resources import default_manager
+from scripts.news_layout import CalendarView, classify_scores, compact_news_frame, name_counts, WEEKDAY_ORDER, MONTH_ORDER
+from scripts.sentiment_cube import SentimentCube
+from scripts.spike_detector import SpikeDetector
 
 ## This script performs sentiment analysis and data analysis on article headlines based on the data provided in a DataFrame which is loaded from ../data/raw_analysis_data.csv.
+# NLTK data is resolved from a local directory on first use and never downloaded here
+# (provision it once with: python -m scripts.nltk_resources download)
 
-
-# Download NLTK resources if not already present
-print("Downloading NLTK resources...")
-nltk.download('punkt', quiet=True, force=True)
-nltk.download('punkt_tab', quiet=True, force=True)
-nltk.download('stopwords', quiet=True, force=True)
-nltk.download('wordnet', quiet=True, force=True)
-nltk.download('vader_lexicon', quiet=True, force=True)
-print("NLTK resources downloaded.")
-
-class ArticleDataAnalyzer:
-    def __init__(self, df):
+class ArticleDataAnalyzer(PlotEmitter):
+    def __init__(self, df, render='show', instrumentation=None):
         # Initialize the ArticleDataAnalyzer with a DataFrame
+        # render: 'show' displays plots, 'defer' collects them in self.plot_specs (see render_plots), 'off' skips them
+        # instrumentation: optional scripts.instrumentation.Instrumentation recording per-stage time, memory and rows
         self.df = df
-        self.ensure_nltk_resources()
-        self.stop_words = set(stopwords.words('english'))
-        self.lemmatizer = nltk.WordNetLemmatizer()
+        self._init_plotting(render)
+        self.instrumentation = instrumentation
+        self.resources = default_manager()
+        self._stop_words = None
+        self._calendar = None
+        # Optional SentimentCube; when set, the publisher and calendar analyses roll it up instead of the rows
+        self._cube = None
+
+    @property
+    def stop_words(self):
+        # English stopwords, loaded on first use
+        if self._stop_words is None:
+            self._stop_words = set(self.resources.stopwords('english'))
+        return self._stop_words
+
+    @stop_words.setter
+    def stop_words(self, value):
+        self._stop_words = set(value)
+
+    @property
+    def lemmatizer(self):
+        return self.resources.lemmatizer()
 
     def ensure_nltk_resources(self):
-        # Ensure NLTK resources are available
-        try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
-            nltk.data.find('corpora/wordnet')
-            nltk.data.find('sentiment/vader_lexicon.zip')
+        # Check (without downloading) that the NLTK resources are installed; returns the missing ones
+        missing = self.resources.missing(['stopwords', 'wordnet', 'vader_lexicon'])
+        if missing:
+            print(f"NLTK resources not found: {', '.join(missing)}. Run: python -m scripts.nltk_resources download")
+        else:
             print("NLTK resources are available.")
-        except LookupError:
-            print("NLTK resources not found. Downloading...")
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
-            nltk.download('wordnet', quiet=True)
-            nltk.download('vader_lexicon', quiet=True)
-            print("NLTK resources downloaded.")
-
-    def format_datetime(self):
-        # Convert 'date' column to datetime format
+        return missing
+
+    @property
+    def calendar(self):
+        # Calendar fields of the 'date' column, derived on demand and cached (None until 'date' is a datetime column)
+        if 'date' not in self.df.columns or not pd.api.types.is_datetime64_any_dtype(self.df['date']):
+            return None
+        key = (id(self.df), len(self.df))
+        if self._calendar is None or self._calendar[0] != key:
+            self._calendar = (key, CalendarView(self.df['date']))
+        return self._calendar[1]
+
+    @property
+    def cube(self):
+        # The SentimentCube of the current frame (None if none was built, or the frame was replaced or resized since)
+        if self._cube is None or self._cube[0] != (id(self.df), len(self.df)):
+            return None
+        return self._cube[1]
+
+    @cube.setter
+    def cube(self, value):
+        self._cube = None if value is None else ((id(self.df), len(self.df)), value)
+
+    @instrumented()
+    def build_sentiment_cube(self, path=None):
+        """
+        Aggregate the news frame into a SentimentCube (see scripts/sentiment_cube.py) and use it for the publisher,
+        weekday, month and publication frequency analyses. Run after format_datetime (and sentiment_analysis, for
+        the sentiment analyses).
+        Args:
+            path (str or None): Also save the cube to this Parquet file (reload it with SentimentCube.load)
+        Returns:
+            SentimentCube: The cube (also stored in self.cube)
+        """
+        self.cube = SentimentCube.from_frame(self.df)
+        if path is not None:
+            self.cube.save(path)
+        print(f"Sentiment cube built: {len(self.cube)} cells from {self.cube.rows} articles.")
+        return self.cube
+
+    @instrumented()
+    def format_datetime(self, compact=False):
+        """
+        Convert the 'date' column to datetime (UTC).
+        Args:
+            compact (bool): Keep only the datetime column and store publisher/stock as categoricals; calendar fields
+                (year, month, hour, dayOfWeek, ...) are then read from self.calendar instead of materialized columns
+        """
         if 'date' in self.df.columns:
             self.df['date'] = pd.to_datetime(self.df['date'], errors='coerce', utc=True)
+            self._calendar = None
+            self._cube = None
+            if compact:
+                compact_news_frame(self.df)
+                print("Date column formatted to datetime (compact layout, calendar fields in analyzer.calendar).")
+                return
             self.df['year'] = self.df['date'].dt.year
             self.df['month'] = self.df['date'].dt.month
             self.df['day'] = self.df['date'].dt.day
@@ -68,53 +126,58 @@ class ArticleDataAnalyzer:
         else:
             print("Date column is already set as index.")
 
+    @instrumented()
     def analyze_headlines(self):
-        # Combine all headlines into a single text
-        all_headlines = ' '.join(self.df['headline'].dropna().astype(str))
-
         # Calculate headline length statistics
         self.df['headline_length'] = self.df['headline'].str.len()
         headline_stats = self.df['headline_length'].describe()
         print(headline_stats)
 
-        # Tokenize and clean
-        tokens = word_tokenize(all_headlines.lower())
-        stop_words = set(stopwords.words('english'))
-        tokens = [word for word in tokens if word.isalpha() and word not in stop_words]
+        # Tokenize, clean and count unigrams/bigrams in one pass (bigrams are formed over the kept words of each headline)
+        counter = NGramCounter(self.stop_words, tokenizer='word', adjacency='filtered')
+        counts = counter.count_many(self.df['headline'].dropna(), ns=(1, 2))
 
         # Get most common keywords (unigrams)
-        fdist = FreqDist(tokens)
         print("Most common keywords:")
-        print(fdist.most_common(20))
+        print([(ngram[0], count) for ngram, count in counts[1].top_k(20)])
 
         # Get most common bigrams (phrases)
-        bigrams = ngrams(tokens, 2)
-        bigram_fdist = FreqDist(bigrams)
         print("\nMost common bigrams (phrases):")
-        for phrase, count in bigram_fdist.most_common(20):
+        for phrase, count in counts[2].top_k(20):
             print(' '.join(phrase), ":", count)
 
 
-    def sentiment_analysis(self):
+    @instrumented()
+    def sentiment_analysis(self, n_workers=1, chunk_size=20000, min_parallel_rows=50000, cache=None, backend='row'):
         """
         Perform sentiment analysis on headlines using NLTK's VADER SentimentIntensityAnalyzer.
         Adds 'sentiment_score' and 'sentiment_class' columns to the DataFrame.
+        Args:
+            n_workers (int or None): Worker processes used for scoring (None = all cores, 1 = serial)
+            chunk_size (int): Headlines per worker task
+            min_parallel_rows (int): Frames smaller than this are scored serially
+            cache (SentimentScoreCache or None): Persistent score cache; only headlines not seen before are scored
+            backend (str): 'row' scores each headline with the analyzer, 'lexicon' scores all of them at once with
+                the vectorized scorer of scripts/lexicon_scorer.py (same scores, much faster; n_workers is not used)
         """
-
-        # Ensure VADER sentiment analyzer is available
-        try:
-            nltk.data.find('sentiment/vader_lexicon.zip')
-        except LookupError:
-            print("Downloading vader_lexicon...")
-            nltk.download('vader_lexicon', quiet=True)
-
-        sia = SentimentIntensityAnalyzer()
-        headlines = self.df['headline'].fillna("").astype(str).tolist()
-        # Use list comprehension for speed
-        sentiment_scores = [sia.polarity_scores(headline) for headline in headlines]
-        self.df['sentiment_score'] = [score['compound'] for score in sentiment_scores]
+        if backend not in ('row', 'lexicon'):
+            raise ValueError(f"Unknown sentiment backend '{backend}'. Expected 'row' or 'lexicon'.")
+
+        # Fail early (and offline) if the VADER lexicon is not installed
+        self.resources.find('vader_lexicon')
+        headlines = self.df['headline'].fillna("").astype(str)
+        if backend == 'lexicon':
+            from scripts.lexicon_scorer import vader_lexicon_scores
+            score_fn, scorer_id = vader_lexicon_scores, 'vader_compound_lexicon'
+        else:
+            engine = VaderScoringEngine(n_workers=n_workers, chunk_size=chunk_size, min_parallel_rows=min_parallel_rows)
+            score_fn, scorer_id = engine.score, 'vader_compound'
+        # Repeated headlines are scored once; with a cache, only unseen ones are scored at all
+        self.df['sentiment_score'] = score_texts(headlines, score_fn, scorer_id, scorer_version('nltk'), cache=cache)
         self.df['compound'] = self.df['sentiment_score']  # For compatibility
-        self.df['sentiment_class'] = self.df['sentiment_score'].apply(self.sentiment_class)
+        self.df['sentiment_class'] = classify_scores(self.df['sentiment_score'])
+        # A cube built before this has no (or outdated) scores
+        self._cube = None
         print("Sentiment analysis complete. Columns 'sentiment_score', 'compound' and 'sentiment_class' added.")
 
     @staticmethod
@@ -135,57 +198,51 @@ class ArticleDataAnalyzer:
         else:
             return 'neutral'
 
+    @instrumented()
     def analyze_articles_by_weekday(self):
         # Count and visualize articles published by weekday
-        if 'dayOfWeek' in self.df.columns and 'weekday' in self.df.columns:
-            # Group by weekday name for correct order
-            weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            articles_per_day = self.df['weekday'].value_counts().reindex(weekday_order, fill_value=0)
+        # Counted on the integer day of week; names are attached to the seven counts only
+        calendar = self.calendar
+        if self.cube is not None or calendar is not None or 'weekday' in self.df.columns:
+            if self.cube is not None:
+                articles_per_day = self.cube.weekday_counts()
+            elif calendar is not None:
+                articles_per_day = calendar.weekday_counts()
+            else:
+                articles_per_day = self.df['weekday'].value_counts().reindex(WEEKDAY_ORDER, fill_value=0)
             print("Articles published by weekday:")
             print(articles_per_day)
 
             # Plotting
-            plt.figure(figsize=(12, 6))
-            articles_per_day.plot(kind='bar')
-            plt.title('Articles Published by Weekday')
-            plt.xlabel('Weekday')
-            plt.ylabel('Number of Articles')
-            plt.xticks(rotation=45)
-            plt.show()
+            spec = PlotSpec('articles_by_weekday', 'Articles Published by Weekday', 'Weekday', 'Number of Articles')
+            self._emit(spec.bar(articles_per_day.index, articles_per_day.values).set(xtick_rotation=45))
+            return articles_per_day
         else:
             print("'dayOfWeek' or 'weekday' column not found in DataFrame.")
     
+    @instrumented()
     def analyze_articles_by_month(self):
         # Count and visualize articles published by month
-        if 'month' in self.df.columns:
-            # Map month numbers to month names
-            month_order = [
-                'January', 'February', 'March', 'April', 'May', 'June',
-                'July', 'August', 'September', 'October', 'November', 'December'
-            ]
-            def safe_month_name(x):
-                try:
-                    if pd.notnull(x) and int(x) == x and 1 <= int(x) <= 12:
-                        return month_order[int(x)-1]
-                except Exception:
-                    pass
-                return 'Unknown'
-            self.df['month_name'] = self.df['month'].apply(safe_month_name)
-            articles_per_month = self.df['month_name'].value_counts().reindex(month_order, fill_value=0)
+        # Month numbers are counted and mapped to names afterwards (invalid or missing months are ignored)
+        calendar = self.calendar
+        if self.cube is not None or calendar is not None or 'month' in self.df.columns:
+            if self.cube is not None:
+                articles_per_month = self.cube.month_counts()
+            elif calendar is not None:
+                articles_per_month = calendar.month_counts()
+            else:
+                articles_per_month = name_counts(self.df['month'], MONTH_ORDER, first=1, index_name='month_name')
             print("Articles published by month:")
             print(articles_per_month)
 
             # Plotting
-            plt.figure(figsize=(12, 6))
-            articles_per_month.plot(kind='bar')
-            plt.title('Articles Published by Month')
-            plt.xlabel('Month')
-            plt.ylabel('Number of Articles')
-            plt.xticks(rotation=45)
-            plt.show()
+            spec = PlotSpec('articles_by_month', 'Articles Published by Month', 'Month', 'Number of Articles')
+            self._emit(spec.bar(articles_per_month.index, articles_per_month.values).set(xtick_rotation=45))
+            return articles_per_month
         else:
             print("'month' column not found in DataFrame.")
     
+    @instrumented()
     def extended_publication_frequency_analysis(self):
         # Let's enhance the analysis by:
         # 1. Highlighting spikes (outliers) in publication frequency
@@ -194,22 +251,20 @@ class ArticleDataAnalyzer:
 
 
         # 1. Highlight spikes in publication frequency
-        if 'date' in self.df.columns:
-            articles_per_day = self.df.groupby(self.df['date'].dt.date).size()
+        calendar = self.cube if self.cube is not None else self.calendar
+        if calendar is not None:
+            articles_per_day = calendar.day_counts()
             mean_count = articles_per_day.mean()
             std_count = articles_per_day.std()
             spike_threshold = mean_count + 3 * std_count
             spikes = articles_per_day[articles_per_day > spike_threshold]
+            days = pd.to_datetime(articles_per_day.index)
 
-            plt.figure(figsize=(14, 5))
-            articles_per_day.plot(label='Articles per Day')
-            plt.scatter(spikes.index, spikes.values, color='red', label='Spikes (>3σ)', zorder=5)
-            plt.title('Number of Articles Published Per Day with Spikes Highlighted')
-            plt.xlabel('Date')
-            plt.ylabel('Article Count')
-            plt.legend()
-            plt.tight_layout()
-            plt.show()
+            spec = PlotSpec('articles_per_day_spikes', 'Number of Articles Published Per Day with Spikes Highlighted',
+                            'Date', 'Article Count', figsize=(14, 5))
+            spec.line(days, articles_per_day.values, label='Articles per Day')
+            spec.scatter(pd.to_datetime(spikes.index), spikes.values, color='red', label='Spikes (>3σ)', zorder=5)
+            self._emit(spec.set(legend=True))
 
             # 2. Annotate known market events (example: COVID-19 crash)
             # You can add more events as needed
@@ -218,127 +273,133 @@ class ArticleDataAnalyzer:
                 '2016 Election': '2016-11-08',
                 'Brexit Vote': '2016-06-23'
             }
-            plt.figure(figsize=(14, 5))
-            articles_per_day.plot(label='Articles per Day')
+            spec = PlotSpec('articles_per_day_events', 'Articles Published Per Day with Major Market Events',
+                            'Date', 'Article Count', figsize=(14, 5))
+            spec.line(days, articles_per_day.values, label='Articles per Day')
             for event, date in event_dates.items():
                 if date in articles_per_day.index.astype(str):
-                    plt.axvline(date, color='orange', linestyle='--', alpha=0.7)
-                    plt.text(date, plt.ylim()[1]*0.95, event, rotation=90, verticalalignment='top', color='orange')
-            plt.title('Articles Published Per Day with Major Market Events')
-            plt.xlabel('Date')
-            plt.ylabel('Article Count')
-            plt.tight_layout()
-            plt.show()
+                    spec.vline(pd.Timestamp(date), text=event, color='orange', linestyle='--', alpha=0.7)
+            self._emit(spec)
 
             # 3. Analyze publishing times (hour of day)
-            if 'date' in self.df.columns and pd.api.types.is_datetime64_any_dtype(self.df['date']):
-                self.df['hour'] = self.df['date'].dt.hour
-                hour_counts = self.df['hour'].value_counts().sort_index()
-                plt.figure(figsize=(10, 4))
-                hour_counts.plot(kind='bar')
-                plt.title('Distribution of Article Publications by Hour of Day')
-                plt.xlabel('Hour of Day')
-                plt.ylabel('Article Count')
-                plt.tight_layout()
-                plt.show()
-            else:
-                print("No time information available in 'date' column for hourly analysis.")
+            hour_counts = calendar.hour_counts()
+            spec = PlotSpec('articles_by_hour', 'Distribution of Article Publications by Hour of Day',
+                            'Hour of Day', 'Article Count', figsize=(10, 4))
+            self._emit(spec.bar(hour_counts.index, hour_counts.values).set(xtick_rotation=90))
 
             # Summary:
             # - Spikes in publication frequency are highlighted.
             # - Major market events are annotated.
             # - Publishing time distribution is shown if time data is available.
-                # Publisher Analysis
+            return {'articles_per_day': articles_per_day, 'spikes': spikes, 'hour_counts': hour_counts}
         else:
             print("No 'date' column or datetime index found for publication frequency analysis.")
             return
     
+    @instrumented()
+    def detect_publication_spikes(self, resolution='day', key_col=None, halflife=30, z=3.0, min_count=5, warmup=30):
+        """
+        Flag local bursts in publication frequency with an EWMA detector (see scripts/spike_detector.py), instead of
+        one mean + 3σ threshold over the whole history. Rows are replayed in their current order.
+        Args:
+            resolution (str): 'minute', 'hour' or 'day'
+            key_col (str or None): Track each ticker ('stock') or publisher ('publisher') separately
+            halflife, z, min_count, warmup: Detector settings (see SpikeDetector)
+        Returns:
+            DataFrame: One row per spike with key, bucket, timestamp, count, mean, std and zscore
+        """
+        detector = SpikeDetector(resolution, halflife, z, min_count, warmup, key_col=key_col)
+        spikes = detector.replay(self.df)
+        print(f"{len(spikes)} publication spikes detected at {resolution} resolution.")
+        if key_col is None and resolution == 'day' and self.calendar is not None:
+            articles_per_day = self.calendar.day_counts()
+            spec = PlotSpec('articles_per_day_local_spikes', 'Articles Published Per Day with Local (EWMA) Spikes',
+                            'Date', 'Article Count', figsize=(14, 5))
+            spec.line(pd.to_datetime(articles_per_day.index), articles_per_day.values, label='Articles per Day')
+            spike_days = pd.to_datetime(spikes['bucket']).dt.date
+            spec.scatter(pd.to_datetime(spike_days), articles_per_day.reindex(spike_days).values, color='red',
+                         label=f'Spikes (>{z:g}σ EWMA)', zorder=5)
+            self._emit(spec.set(legend=True))
+        return spikes
+
+    @instrumented()
     def identify_common_words_and_phrases(self, top_n=20):
         # Efficiently identify and visualize common keywords and bigrams in headlines
-        # Use pandas vectorized string operations for faster processing
-        headlines = self.df['headline'].dropna().astype(str).str.lower()
-        # Tokenize all headlines at once using pandas explode
-        tokens = headlines.str.split().explode()
-        # Remove stopwords and non-alpha tokens efficiently
-        stop_words = self.stop_words
-        tokens = tokens[tokens.str.isalpha() & ~tokens.isin(stop_words)]
+        # Tokenize all headlines once and count integer-encoded unigrams and bigrams (see scripts/ngram_counter.py)
+        counter = NGramCounter(self.stop_words, tokenizer='whitespace', adjacency='raw')
+        counts = counter.count_many(self.df['headline'].dropna(), ns=(1, 2))
         # Get most common keywords (unigrams)
-        fdist = tokens.value_counts().head(top_n)
+        top_unigrams = counts[1].top_k(top_n)
+        fdist = pd.Series([count for _, count in top_unigrams], index=[ngram[0] for ngram, _ in top_unigrams], name='count')
         print("Most common keywords:")
         print(fdist)
         # Visualize unigrams
-        plt.figure(figsize=(10, 5))
-        sns.barplot(x=fdist.values, y=fdist.index, palette='Blues_d')
-        plt.title(f'Top {top_n} Most Common Keywords in Headlines')
-        plt.xlabel('Frequency')
-        plt.ylabel('Keyword')
-        plt.tight_layout()
-        plt.show()
-        # For bigrams, use pandas rolling window for efficiency
-        
-        bigrams = headlines.apply(lambda x: [tuple(x.split()[i:i+2]) for i in range(len(x.split())-1)])
-        bigram_list = [bigram for sublist in bigrams for bigram in sublist if all(word.isalpha() and word not in stop_words for word in bigram)]
-        bigram_counts = Counter(bigram_list).most_common(top_n)
+        spec = PlotSpec('common_keywords', f'Top {top_n} Most Common Keywords in Headlines', 'Frequency', 'Keyword',
+                        figsize=(10, 5))
+        self._emit(spec.barh(fdist.index, fdist.values, palette='Blues_d'))
+        # Bigrams of adjacent words that are both kept
+        bigram_counts = counts[2].top_k(top_n)
+        bigrams = pd.Series([count for _, count in bigram_counts], index=[' '.join(p) for p, _ in bigram_counts],
+                            name='count', dtype='int64')
         print(f"\nMost common bigrams (phrases):")
-        for phrase, count in bigram_counts:
-            print(' '.join(phrase), ":", count)
+        for phrase, count in bigrams.items():
+            print(phrase, ":", count)
         # Visualize bigrams
-        if bigram_counts:
-            phrases, counts = zip(*bigram_counts)
-            phrases = [' '.join(p) for p in phrases]
-            plt.figure(figsize=(10, 5))
-            sns.barplot(x=list(counts), y=list(phrases), palette='Greens_d')
-            plt.title(f'Top {top_n} Most Common Bigrams in Headlines')
-            plt.xlabel('Frequency')
-            plt.ylabel('Bigram Phrase')
-            plt.tight_layout()
-            plt.show()
-       
-
+        if len(bigrams):
+            spec = PlotSpec('common_bigrams', f'Top {top_n} Most Common Bigrams in Headlines', 'Frequency',
+                            'Bigram Phrase', figsize=(10, 5))
+            self._emit(spec.barh(bigrams.index, bigrams.values, palette='Greens_d'))
+        return fdist, bigrams
+
+    def _publisher_counts(self):
+        # Articles per publisher, most frequent first
+        if self.cube is not None:
+            return self.cube.publisher_counts()
+        publishers = self.df['publisher']
+        if not isinstance(publishers.dtype, pd.CategoricalDtype):
+            return publishers.value_counts()
+        # Categorical column: drop unused categories and break ties by first appearance, as for strings
+        codes = pd.unique(publishers.cat.codes[publishers.notna()])
+        counts = publishers.value_counts().reindex(publishers.cat.categories[codes])
+        return counts.sort_values(ascending=False, kind='stable').rename_axis('publisher')
+
+    @instrumented()
     def top_publishers_by_articles(self):
         # Analyze and visualize the number of articles per publisher
         # Count articles per publisher
-        if 'publisher' in self.df.columns:
-            publisher_counts = self.df['publisher'].value_counts()
+        if 'publisher' in self.df.columns or self.cube is not None:
+            publisher_counts = self._publisher_counts()
             top_publishers = publisher_counts.head(30)
 
             # Plotting
-            plt.figure(figsize=(12, 6))
-            sns.barplot(x=top_publishers.index, y=top_publishers.values, palette='viridis')
-            plt.title('Top 30 Publishers by Number of Articles')
-            plt.xlabel('Publisher')
-            plt.ylabel('Number of Articles')
-            plt.xticks(rotation=90)
-            plt.show()
-
+            spec = PlotSpec('top_publishers', 'Top 30 Publishers by Number of Articles', 'Publisher', 'Number of Articles')
+            self._emit(spec.bar(top_publishers.index, top_publishers.values, palette='viridis').set(xtick_rotation=90))
+            return top_publishers
         else:
             print("No 'publisher' column found in DataFrame.")
     
+    @instrumented()
     def common_words_by_top_publishers(self):
         # Analyze and visualize common words in headlines by top publishers
         if 'publisher' in self.df.columns and 'headline' in self.df.columns:
-            top_publishers = self.df['publisher'].value_counts().head(30).index
-            top_publisher_df = self.df[self.df['publisher'].isin(top_publishers)]
-
-            # Combine all headlines for each publisher
-            publisher_headlines = top_publisher_df.groupby('publisher')['headline'].apply(lambda x: ' '.join(x.dropna()))
+            top_publishers = self._publisher_counts().head(30).index
+            top_publisher_df = self.df[self.df['publisher'].isin(top_publishers)].dropna(subset=['headline'])
 
-            # Tokenize and clean
-            tokens = publisher_headlines.apply(lambda x: word_tokenize(x.lower()))
-            tokens = tokens.apply(lambda x: [word for word in x if word.isalpha() and word not in self.stop_words])
-
-            # Get most common words for each publisher
-            common_words = tokens.apply(lambda x: FreqDist(x).most_common(20))
+            # Tokenize, clean and count words per publisher in a single pass
+            counter = NGramCounter(self.stop_words, tokenizer='word', adjacency='filtered')
+            counts = counter.count(top_publisher_df['headline'], n=1, groups=top_publisher_df['publisher'].astype(object))
+            common_words = counts.top_k_by_group(20)
 
             print("\nMost common words by top publishers:")
-            for publisher, words in common_words.items():
+            for publisher, words in common_words.groupby('group', sort=True):
                 print(f"\n{publisher}:")
-                for word, count in words:
+                for word, count in zip(words['ngram'], words['count']):
                     print(f"{word}: {count}")
-
+            return common_words
         else:
             print("No 'publisher' or 'headline' column found in DataFrame.")
 
+    @instrumented()
     def publisher_name_analysis(self):
         #Identify publisher names that look like email addresses and extract domains
         # Regex for email addresses
@@ -351,40 +412,39 @@ class ArticleDataAnalyzer:
         domain_counts = pd.Series(domains).value_counts()
         print("\nTop email domains among publishers:")
         print(domain_counts.head(10))
+        return domain_counts
 
+    @instrumented()
     def visualize_sentiment_score_by_top_publishers(self, top_n=10):
         """
         Visualize the average sentiment (using 'compound') and sentiment class distribution for the top publishers.
         Handles missing sentiment classes robustly and removes redundant imports.
         """
-        if 'publisher' not in self.df.columns or 'compound' not in self.df.columns or 'sentiment_class' not in self.df.columns:
+        if self.cube is not None:
+            # Both tables are roll-ups of the cube
+            avg_sentiment, sentiment_dist = self.cube.publisher_sentiment(top_n)
+        elif 'publisher' not in self.df.columns or 'compound' not in self.df.columns or 'sentiment_class' not in self.df.columns:
             print("Required columns ('publisher', 'compound', 'sentiment_class') not found in DataFrame.")
             return
-        # Get top publishers by article count
-        top_publishers = self.df['publisher'].value_counts().head(top_n).index
-        df_top = self.df[self.df['publisher'].isin(top_publishers)]
-        # Average compound sentiment per publisher
-        avg_sentiment = df_top.groupby('publisher')['compound'].mean().loc[top_publishers]
-        plt.figure(figsize=(12, 5))
-        sns.barplot(x=avg_sentiment.index, y=avg_sentiment.values, palette='coolwarm')
-        plt.title(f'Average Compound Sentiment by Top {top_n} Publishers')
-        plt.xlabel('Publisher')
-        plt.ylabel('Average Compound Sentiment')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.show()
-        # Sentiment class distribution per publisher (robust to missing classes)
-        sentiment_dist = df_top.groupby(['publisher', 'sentiment_class']).size().unstack(fill_value=0).loc[top_publishers]
-        # Ensure all sentiment classes are present
-        for col in ['positive', 'neutral', 'negative']:
-            if col not in sentiment_dist.columns:
-                sentiment_dist[col] = 0
-        sentiment_dist = sentiment_dist[['positive', 'neutral', 'negative']]
-        sentiment_dist.plot(kind='bar', stacked=True, figsize=(12, 6), colormap='Set2')
-        plt.title(f'Sentiment Class Distribution by Top {top_n} Publishers')
-        plt.xlabel('Publisher')
-        plt.ylabel('Number of Articles')
-        plt.xticks(rotation=45)
-        plt.legend(title='Sentiment Class')
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        else:
+            # Get top publishers by article count
+            top_publishers = self._publisher_counts().head(top_n).index
+            df_top = self.df[self.df['publisher'].isin(top_publishers)]
+            # Average compound sentiment per publisher
+            avg_sentiment = df_top.groupby('publisher', observed=True)['compound'].mean().loc[top_publishers]
+            # Sentiment class distribution per publisher (robust to missing classes)
+            sentiment_dist = df_top.groupby(['publisher', 'sentiment_class'], observed=True).size().unstack(fill_value=0).loc[top_publishers]
+            # Ensure all sentiment classes are present
+            for col in ['positive', 'neutral', 'negative']:
+                if col not in sentiment_dist.columns:
+                    sentiment_dist[col] = 0
+            sentiment_dist = sentiment_dist[['positive', 'neutral', 'negative']]
+        spec = PlotSpec('publisher_avg_sentiment', f'Average Compound Sentiment by Top {top_n} Publishers', 'Publisher',
+                        'Average Compound Sentiment', figsize=(12, 5))
+        self._emit(spec.bar(avg_sentiment.index, avg_sentiment.values, palette='coolwarm').set(xtick_rotation=45))
+        spec = PlotSpec('publisher_sentiment_classes', f'Sentiment Class Distribution by Top {top_n} Publishers',
+                        'Publisher', 'Number of Articles')
+        spec.stacked_bar(sentiment_dist.index, {col: sentiment_dist[col].to_numpy() for col in sentiment_dist.columns},
+                         colormap='Set2', legend_title='Sentiment Class')
+        self._emit(spec.set(xtick_rotation=45))
+        return avg_sentiment, sentiment_dist
\ No newline at end of file
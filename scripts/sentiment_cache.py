@@ -0,0 +1,161 @@
+import os
+import hashlib
+import sqlite3
+from importlib import metadata
+import numpy as np
+import pandas as pd
+
+## This script provides a persistent, content-addressed cache of sentiment scores. Scores are stored in a SQLite file keyed by a hash of the normalized headline plus the scorer name and version, so headlines re-published across publishers/tickers, and headlines already scored by an earlier run, are never scored twice.
+
+# SQLite limits the number of bound parameters per statement
+_SQL_BATCH = 500
+
+
+def normalize_headline(texts):
+    # Collapse runs of whitespace and strip the ends. Case and punctuation are kept,
+    # since VADER uses both (caps emphasis, '!' boosting).
+    return pd.Series(texts, dtype=object).astype(str).str.replace(r'\s+', ' ', regex=True).str.strip()
+
+
+def scorer_version(package):
+    # Installed version of the package providing a scorer, used in cache keys
+    try:
+        return f"{package}-{metadata.version(package)}"
+    except metadata.PackageNotFoundError:
+        return f"{package}-unknown"
+
+
+class SentimentScoreCache:
+    def __init__(self, path="../data/cache/sentiment_scores.sqlite", max_entries=5_000_000):
+        """
+        Args:
+            path (str): SQLite file holding the cache (created if missing).
+            max_entries (int or None): Upper bound on cached scores. The least recently used entries are evicted beyond it.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.duplicates = 0
+        self.evictions = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "key BLOB PRIMARY KEY, scorer TEXT NOT NULL, score REAL NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS scores_last_used ON scores (last_used)")
+        self.conn.commit()
+        # Monotonic access clock used for LRU eviction
+        row = self.conn.execute("SELECT COALESCE(MAX(last_used), 0) FROM scores").fetchone()
+        self.clock = row[0]
+
+    @staticmethod
+    def make_key(text, scorer, version):
+        # Content address of one (scorer, version, normalized text) triple
+        payload = f"{scorer}\x1f{version}\x1f{text}".encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def get_many(self, keys):
+        # Look up scores for a list of keys; returns {key: score} for the keys found
+        found = {}
+        for i in range(0, len(keys), _SQL_BATCH):
+            batch = keys[i:i + _SQL_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(f"SELECT key, score FROM scores WHERE key IN ({placeholders})", batch)
+            found.update(rows)
+        if found:
+            self.clock += 1
+            self.conn.executemany("UPDATE scores SET last_used = ? WHERE key = ?", [(self.clock, k) for k in found])
+            self.conn.commit()
+        return found
+
+    def put_many(self, keys, scores, scorer):
+        # Store newly computed scores, then evict if the cache grew beyond max_entries
+        self.clock += 1
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO scores (key, scorer, score, last_used) VALUES (?, ?, ?, ?)",
+            [(k, scorer, float(s), self.clock) for k, s in zip(keys, scores)],
+        )
+        self.conn.commit()
+        self.evict()
+
+    def evict(self):
+        # Drop the least recently used entries beyond max_entries
+        if self.max_entries is None:
+            return 0
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return 0
+        self.conn.execute(
+            "DELETE FROM scores WHERE key IN (SELECT key FROM scores ORDER BY last_used LIMIT ?)", (excess,)
+        )
+        self.conn.commit()
+        self.evictions += excess
+        return excess
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def stats(self):
+        # Hit/miss counters for this session plus the current cache size
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'duplicates': self.duplicates,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self),
+        }
+
+    def reset_stats(self):
+        self.hits = self.misses = self.duplicates = self.evictions = 0
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def score_texts(texts, score_fn, scorer, version, cache=None):
+    """
+    Score texts with score_fn, scoring every distinct normalized text only once.
+    Args:
+        texts (iterable): Texts to score (one per row)
+        score_fn (callable): Maps a list of strings to a list of float scores
+        scorer (str): Scorer name, e.g. 'vader_compound' or 'textblob_polarity'
+        version (str): Scorer version; part of the cache key so upgrades do not reuse stale scores
+        cache (SentimentScoreCache or None): Persistent cache to read from and write to
+    Returns:
+        numpy.ndarray: One float score per input text, in input order
+    """
+    normalized = normalize_headline(texts)
+    codes, uniques = pd.factorize(normalized)
+    uniques = list(uniques)
+    unique_scores = np.full(len(uniques), np.nan)
+
+    if cache is None:
+        unique_scores[:] = score_fn(uniques)
+        return unique_scores[codes]
+
+    cache.duplicates += len(codes) - len(uniques)
+    keys = [cache.make_key(text, scorer, version) for text in uniques]
+    found = cache.get_many(keys)
+    missing = [i for i, key in enumerate(keys) if key not in found]
+    cache.hits += len(keys) - len(missing)
+    cache.misses += len(missing)
+    if found:
+        hit_positions = [i for i, key in enumerate(keys) if key in found]
+        unique_scores[hit_positions] = [found[keys[i]] for i in hit_positions]
+    if missing:
+        new_scores = score_fn([uniques[i] for i in missing])
+        unique_scores[missing] = new_scores
+        cache.put_many([keys[i] for i in missing], new_scores, scorer)
+    return unique_scores[codes]
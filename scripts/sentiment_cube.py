@@ -0,0 +1,319 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scripts.news_layout import CalendarView, SENTIMENT_CLASSES, WEEKDAY_ORDER, MONTH_ORDER, classify_scores
+
+## This script pre-aggregates the news frame into a sentiment cube. Each cell holds the article count, the sum and sum of squares of the compound score, and the class counts for one (publisher, stock, UTC date, UTC hour) combination. The publisher, weekday, month, hour and day analyses of ArticleDataAnalyzer only need counts and score moments. They are therefore answered by rolling up the cells with bincount over integer codes, instead of regrouping the article rows on every call. The cube is built once and persisted to Parquet. New articles are folded in with append(), which aggregates only the new rows and merges them into the existing cells.
+
+DIMENSIONS = ['publisher', 'stock', 'day', 'hour']
+MEASURES = ['count', 'scored', 'sum', 'sumsq', 'negative', 'neutral', 'positive', 'first_row']
+ROLLUP_KEYS = ['publisher', 'stock', 'date', 'hour', 'weekday', 'month', 'year']
+
+# Schema metadata key holding the cube settings and article count
+_CUBE_KEY = b'sentiment_cube'
+
+
+def _categorical(df, column):
+    # Column as a Categorical (all missing if the column does not exist)
+    if column not in df.columns:
+        return pd.Categorical.from_codes(np.full(len(df), -1), categories=pd.Index([], dtype=object))
+    values = df[column]
+    return values.array if isinstance(values.dtype, pd.CategoricalDtype) else pd.Categorical(values)
+
+
+def _recode(values, categories):
+    # Codes of a Categorical against a (superset) list of categories
+    return pd.Categorical(values, categories=categories).codes
+
+
+class SentimentCube:
+    def __init__(self, score_col='compound', date_col='date', pos_th=0.2, neg_th=-0.2):
+        """
+        Args:
+            score_col (str): Per-article score whose moments are stored (missing column = counts only)
+            date_col (str): Publication timestamp column; dates and hours are taken in UTC
+            pos_th, neg_th (float): Class thresholds (as ArticleDataAnalyzer.sentiment_class)
+        """
+        self.score_col = score_col
+        self.date_col = date_col
+        self.pos_th = pos_th
+        self.neg_th = neg_th
+        self.rows = 0  # articles folded in so far
+        self.has_scores = False  # whether any folded-in batch had the score column
+        self.cells = self._empty_cells()
+        self._marginals = {}
+
+    @classmethod
+    def from_frame(cls, df, **settings):
+        # Build a cube from a news frame in one pass
+        return cls(**settings).append(df)
+
+    @staticmethod
+    def _empty_cells():
+        cells = pd.DataFrame({column: pd.Series(dtype='int64') for column in DIMENSIONS + MEASURES})
+        for column in ('publisher', 'stock'):
+            cells[column] = pd.Categorical([], categories=pd.Index([], dtype=object))
+        return cells.astype({'day': 'int32', 'hour': 'int8', 'sum': 'float64', 'sumsq': 'float64'})
+
+    def __len__(self):
+        return len(self.cells)
+
+    # ----- building -----
+
+    def _aggregate(self, df):
+        # Cells of one batch of articles, with publisher/stock codes against the batch's own categories
+        dates = df[self.date_col]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, errors='coerce', utc=True)
+        calendar = CalendarView(dates)
+        publisher = _categorical(df, 'publisher')
+        stock = _categorical(df, 'stock')
+        if self.score_col in df.columns:
+            scores = df[self.score_col].to_numpy(dtype='float64')
+            # Missing scores are 'neutral', as in the sentiment_class column
+            classes = np.asarray(classify_scores(scores, self.pos_th, self.neg_th).codes)
+        else:
+            scores = np.full(len(df), np.nan)
+            classes = np.full(len(df), -1)
+        scored = ~np.isnan(scores)
+        values = np.where(scored, scores, 0.0)
+        frame = pd.DataFrame({
+            'publisher': publisher.codes,
+            'stock': stock.codes,
+            'day': calendar.values('day_number'),
+            'hour': calendar.values('hour'),
+            'count': np.ones(len(df), dtype='int64'),
+            'scored': scored.astype('int64'),
+            'sum': values,
+            'sumsq': values * values,
+            'negative': (classes == 0).astype('int64'),
+            'neutral': (classes == 1).astype('int64'),
+            'positive': (classes == 2).astype('int64'),
+            'first_row': np.arange(self.rows, self.rows + len(df), dtype='int64'),
+        })
+        cells = self._regroup(frame)
+        return cells, publisher.categories, stock.categories
+
+    @staticmethod
+    def _regroup(frame):
+        # Sum cells that share all dimensions (first_row keeps the earliest article)
+        aggregations = {column: 'sum' for column in MEASURES}
+        aggregations['first_row'] = 'min'
+        return frame.groupby(DIMENSIONS, sort=False).agg(aggregations).reset_index()
+
+    def append(self, df):
+        """
+        Fold new articles into the cube (only the new rows are aggregated).
+        Args:
+            df (DataFrame): Articles with the date column and, when available, publisher, stock and the score column
+        Returns:
+            SentimentCube: self
+        """
+        if len(df) == 0:
+            return self
+        new, new_publishers, new_stocks = self._aggregate(df)
+        old = self.cells
+        # Existing categories keep their codes; unseen publishers/stocks are added at the end
+        publishers = old['publisher'].cat.categories
+        publishers = publishers.append(new_publishers[~new_publishers.isin(publishers)])
+        stocks = old['stock'].cat.categories
+        stocks = stocks.append(new_stocks[~new_stocks.isin(stocks)])
+        new['publisher'] = _recode(pd.Categorical.from_codes(new['publisher'], categories=new_publishers), publishers)
+        new['stock'] = _recode(pd.Categorical.from_codes(new['stock'], categories=new_stocks), stocks)
+        if len(old):
+            old = old.assign(publisher=old['publisher'].cat.codes, stock=old['stock'].cat.codes)
+            new = self._regroup(pd.concat([old, new], ignore_index=True))
+        new['publisher'] = pd.Categorical.from_codes(new['publisher'], categories=publishers)
+        new['stock'] = pd.Categorical.from_codes(new['stock'], categories=stocks)
+        self.cells = new.astype({'day': 'int32', 'hour': 'int8'})[DIMENSIONS + MEASURES]
+        self.rows += len(df)
+        self.has_scores = self.has_scores or self.score_col in df.columns
+        self._marginals = {}
+        return self
+
+    # ----- persistence -----
+
+    def save(self, path):
+        # Write the cells and settings to one Parquet file (atomically)
+        table = pa.Table.from_pandas(self.cells, preserve_index=False)
+        settings = {'score_col': self.score_col, 'date_col': self.date_col, 'pos_th': self.pos_th,
+                    'neg_th': self.neg_th, 'rows': self.rows, 'has_scores': self.has_scores}
+        metadata = dict(table.schema.metadata or {})
+        metadata[_CUBE_KEY] = json.dumps(settings).encode('utf-8')
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        table = pq.read_table(path)
+        settings = json.loads((table.schema.metadata or {})[_CUBE_KEY].decode('utf-8'))
+        rows = settings.pop('rows')
+        has_scores = settings.pop('has_scores', None)
+        cube = cls(**settings)
+        cube.rows = rows
+        cube.cells = cls._empty_cells() if table.num_rows == 0 else table.to_pandas()
+        # Files written before the flag was stored: scored cells tell
+        cube.has_scores = bool(cube.cells['scored'].sum() > 0) if has_scores is None else has_scores
+        return cube
+
+    # ----- queries -----
+
+    def filter(self, publishers=None, stocks=None, start=None, end=None):
+        """
+        Sub-cube of some publishers, stocks and/or an inclusive UTC date range.
+        Returns:
+            SentimentCube: New cube sharing the settings (its cells are a subset of this cube's)
+        """
+        keep = np.ones(len(self.cells), dtype=bool)
+        if publishers is not None:
+            keep &= self.cells['publisher'].isin(list(publishers)).to_numpy()
+        if stocks is not None:
+            keep &= self.cells['stock'].isin(list(stocks)).to_numpy()
+        day = self.cells['day'].to_numpy()
+        timed = self.cells['hour'].to_numpy() >= 0
+        if start is not None:
+            keep &= timed & (day >= _day_number(start))
+        if end is not None:
+            keep &= timed & (day <= _day_number(end))
+        cube = SentimentCube(self.score_col, self.date_col, self.pos_th, self.neg_th)
+        cube.cells = self.cells[keep].reset_index(drop=True)
+        cube.rows = int(cube.cells['count'].sum())
+        cube.has_scores = self.has_scores
+        return cube
+
+    def _timed(self):
+        # Cells with a publication timestamp
+        return self.cells[self.cells['hour'].to_numpy() >= 0]
+
+    def _marginal(self, name):
+        # Small rollups shared by several queries, computed once per cube state (append() clears them)
+        if name not in self._marginals:
+            self._marginals[name] = self._day_hour() if name == 'day_hour' else self._publisher_totals()
+        return self._marginals[name]
+
+    def _day_hour(self):
+        # (first day number, articles per day x hour matrix) over the timed cells
+        cells = self._timed()
+        day = cells['day'].to_numpy().astype('int64')
+        first = int(day.min()) if len(day) else 0
+        days = int(day.max()) - first + 1 if len(day) else 0
+        codes = (day - first) * 24 + cells['hour'].to_numpy()
+        counts = np.bincount(codes, weights=cells['count'].to_numpy(), minlength=days * 24)
+        return first, counts.astype('int64').reshape(days, 24)
+
+    def _publisher_totals(self):
+        # Measures summed per publisher, for publishers with at least one article
+        codes = self.cells['publisher'].cat.codes.to_numpy()
+        known = codes >= 0
+        size = len(self.cells['publisher'].cat.categories)
+        totals = {column: np.bincount(codes[known], weights=self.cells[column].to_numpy()[known], minlength=size)
+                  for column in MEASURES if column != 'first_row'}
+        first = np.full(size, np.iinfo('int64').max)
+        np.minimum.at(first, codes[known], self.cells['first_row'].to_numpy()[known])
+        frame = pd.DataFrame(totals, index=self.cells['publisher'].cat.categories.rename('publisher'))
+        frame['first_row'] = first
+        return frame[frame['count'] > 0]
+
+    def weekday_counts(self):
+        # Articles per weekday (as CalendarView.weekday_counts)
+        first, counts = self._marginal('day_hour')
+        weekday = (np.arange(first, first + len(counts)) + 3) % 7
+        counts = np.bincount(weekday, weights=counts.sum(axis=1), minlength=7).astype('int64')
+        return pd.Series(counts, index=pd.Index(WEEKDAY_ORDER, name='weekday'), name='count')
+
+    def month_counts(self):
+        # Articles per month name (as CalendarView.month_counts)
+        first, counts = self._marginal('day_hour')
+        month = np.arange(first, first + len(counts)).astype('datetime64[D]').astype('datetime64[M]').astype('int64') % 12
+        counts = np.bincount(month, weights=counts.sum(axis=1), minlength=12).astype('int64')
+        return pd.Series(counts, index=pd.Index(MONTH_ORDER, name='month_name'), name='count')
+
+    def hour_counts(self):
+        # Articles per hour of day, only the hours that occur (as CalendarView.hour_counts)
+        counts = self._marginal('day_hour')[1].sum(axis=0)
+        hours = np.flatnonzero(counts)
+        return pd.Series(counts[hours], index=pd.Index(hours, name='hour'), name='count')
+
+    def day_counts(self):
+        # Articles per UTC date, indexed by date objects (as CalendarView.day_counts)
+        first, counts = self._marginal('day_hour')
+        counts = counts.sum(axis=1)
+        days = np.flatnonzero(counts)
+        dates = pd.to_datetime(days + first, unit='D').date
+        return pd.Series(counts[days], index=pd.Index(dates, name='date'))
+
+    def publisher_counts(self):
+        # Articles per publisher, most frequent first; ties in order of first appearance (as Series.value_counts)
+        frame = self._marginal('publisher').sort_values('first_row', kind='stable')
+        counts = frame['count'].astype('int64').rename('count')
+        return counts.sort_values(ascending=False, kind='stable')
+
+    def top_publishers(self, n=30):
+        return self.publisher_counts().head(n)
+
+    def publisher_sentiment(self, top_n=10):
+        """
+        Mean score and class counts of the top publishers (as ArticleDataAnalyzer.visualize_sentiment_score_by_top_publishers).
+        Returns:
+            tuple: (mean score per publisher, DataFrame of positive/neutral/negative counts per publisher)
+        Raises:
+            KeyError: If the cube was built from articles without the score column
+        """
+        if not self.has_scores:
+            raise KeyError(f"The cube was built without the '{self.score_col}' column. "
+                           "Rebuild it after sentiment_analysis.")
+        top = self.top_publishers(top_n).index
+        frame = self._marginal('publisher').loc[top]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = pd.Series(frame['sum'] / frame['scored'], index=top, name=self.score_col)
+        classes = frame[list(reversed(SENTIMENT_CLASSES))].astype('int64')
+        classes.columns.name = 'sentiment_class'
+        return mean, classes
+
+    def rollup(self, by=('publisher',)):
+        """
+        Aggregate the cube along any of publisher, stock, date, hour, weekday, month and year.
+        Returns:
+            DataFrame: One row per group with count, scored, mean, std (sample) and the class counts
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        unknown = [key for key in by if key not in ROLLUP_KEYS]
+        if unknown:
+            raise KeyError(f"Unknown rollup keys {unknown}. Choose from {ROLLUP_KEYS}.")
+        cells = self.cells
+        if any(key not in ('publisher', 'stock') for key in by):
+            cells = self._timed()
+        day = cells['day'].to_numpy()
+        derived = {
+            'date': lambda: pd.to_datetime(day.astype('int64'), unit='D'),
+            'hour': lambda: cells['hour'].to_numpy(),
+            'weekday': lambda: pd.Categorical.from_codes((day.astype('int64') + 3) % 7, categories=WEEKDAY_ORDER),
+            'month': lambda: day.astype('datetime64[D]').astype('datetime64[M]').astype('int64') % 12 + 1,
+            'year': lambda: day.astype('datetime64[D]').astype('datetime64[Y]').astype('int64') + 1970,
+        }
+        keys = {key: cells[key].to_numpy() if key in ('publisher', 'stock') else derived[key]() for key in by}
+        measures = ['count', 'scored', 'sum', 'sumsq'] + SENTIMENT_CLASSES
+        grouped = cells[measures].groupby([pd.Series(keys[key], name=key, index=cells.index) for key in by],
+                                          observed=True, sort=True).sum()
+        n = grouped['scored']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            grouped['mean'] = grouped['sum'] / n
+            variance = (grouped['sumsq'] - grouped['sum'] ** 2 / n) / (n - 1)
+            grouped['std'] = np.sqrt(variance.clip(lower=0)).where(n > 1)
+        return grouped[['count', 'scored', 'mean', 'std'] + SENTIMENT_CLASSES]
+
+
+def _day_number(value):
+    # Days since 1970-01-01 of a date (tz-aware values are taken in UTC)
+    timestamp = pd.Timestamp(value)
+    if timestamp.tz is not None:
+        timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+    return int(timestamp.normalize().value // (86_400 * 10 ** 9))
@@ -0,0 +1,67 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+## This script provides a batched VADER scoring engine for article headlines. Headlines are split into chunks which are scored on a configurable process pool, each worker building its own SentimentIntensityAnalyzer once. Small inputs (or n_workers=1) are scored serially in the calling process with exactly the same code path, so both paths return identical scores.
+
+# Analyzer owned by the current process (pool worker or the caller in serial mode)
+_worker_sia = None
+
+
+def _init_worker():
+    # Build the SentimentIntensityAnalyzer once per process
+    global _worker_sia
+    if _worker_sia is None:
+        from scripts.nltk_resources import default_manager
+        _worker_sia = default_manager().vader_analyzer()
+
+
+def _score_chunk(headlines):
+    # Score one chunk of headlines and return the compound scores
+    _init_worker()
+    polarity_scores = _worker_sia.polarity_scores
+    return [polarity_scores(headline)['compound'] for headline in headlines]
+
+
+class VaderScoringEngine:
+    def __init__(self, n_workers=1, chunk_size=20000, min_parallel_rows=50000):
+        """
+        Args:
+            n_workers (int or None): Number of worker processes. None uses every available core, 1 scores serially.
+            chunk_size (int): Number of headlines sent to a worker per task.
+            min_parallel_rows (int): Inputs smaller than this are always scored serially, since pool start-up would dominate.
+        """
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        if n_workers < 1:
+            raise ValueError("n_workers must be at least 1.")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.n_workers = n_workers
+        self.chunk_size = chunk_size
+        self.min_parallel_rows = min_parallel_rows
+
+    def chunks(self, headlines):
+        # Split headlines into consecutive chunks of at most chunk_size items
+        return [headlines[i:i + self.chunk_size] for i in range(0, len(headlines), self.chunk_size)]
+
+    def use_parallel(self, n_rows):
+        # Decide whether a pool is worth starting for n_rows headlines
+        return self.n_workers > 1 and n_rows >= self.min_parallel_rows and n_rows > self.chunk_size
+
+    def score(self, headlines):
+        """
+        Compute VADER compound scores for a list of headline strings.
+        Returns:
+            list: Compound scores in the same order as the input.
+        """
+        headlines = list(headlines)
+        if not self.use_parallel(len(headlines)):
+            return _score_chunk(headlines)
+        chunks = self.chunks(headlines)
+        n_workers = min(self.n_workers, len(chunks))
+        scores = []
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker) as executor:
+            # map preserves chunk order, so the result lines up with the input
+            for chunk_scores in executor.map(_score_chunk, chunks):
+                scores.extend(chunk_scores)
+        return scores
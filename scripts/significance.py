@@ -0,0 +1,158 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+## This script attaches significance to the sentiment/return correlations. It provides a permutation p-value: how often a correlation at least as strong arises when the pairing of sentiment and returns is shuffled. It also provides a moving-block bootstrap confidence interval; resampling blocks of consecutive days keeps the short-range autocorrelation of returns and sentiment. Resamples are computed in batches as NumPy matrix operations, one row per resample. A permutation batch is one row-wise shuffle and one matrix-vector product. A bootstrap batch only sums precomputed block moments, so it costs O(resamples x blocks) instead of O(resamples x days). The permutation test stops early (Besag-Clifford) once enough resamples have reached the observed correlation, so clearly insignificant series are settled after one batch. Every series and batch draws from its own stream spawned from one SeedSequence, so results depend only on the seed, not on the number of workers. Series are tested in a process pool.
+
+RESULT_COLUMNS = ['n', 'r', 'perm_p', 'permutations', 'ci_low', 'ci_high', 'boot_se', 'block_length']
+
+
+def _standardize(x):
+    x = x - x.mean()
+    scale = np.sqrt((x * x).sum())
+    return x / scale if scale > 0 else np.full_like(x, np.nan)
+
+
+def _pearson_from_sums(n, sx, sy, sxx, syy, sxy):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sxy - sx * sy / n) / np.sqrt((sxx - sx * sx / n) * (syy - sy * sy / n))
+
+
+def permutation_batch(x, y, size, seed):
+    """
+    Correlations of size random re-pairings of x and y.
+    Args:
+        x, y (ndarray): Valid pairs only
+        size (int): Number of permutations in the batch
+        seed (SeedSequence or int): Random stream of the batch
+    Returns:
+        ndarray: size permuted correlations
+    """
+    rng = np.random.default_rng(seed)
+    zx, zy = _standardize(x), _standardize(y)
+    # With standardized inputs the correlation of a re-pairing is a dot product
+    return rng.permuted(np.broadcast_to(zy, (size, len(zy))), axis=1) @ zx
+
+
+def block_bootstrap_batch(x, y, size, block_length, seed):
+    """
+    Correlations of size moving-block bootstrap resamples of the pairs (x, y): ceil(n / block_length) blocks of
+    consecutive pairs with random starts, the last block truncated so every resample has n pairs.
+    Returns:
+        ndarray: size resampled correlations (NaN for a constant resample)
+    """
+    rng = np.random.default_rng(seed)
+    n = len(x)
+    blocks = -(-n // block_length)
+    last = n - (blocks - 1) * block_length
+    starts = rng.integers(0, n - block_length + 1, size=(size, blocks))
+    # Each resample's moment sums are sums of block sums, read from cumulative sums of the centered moments
+    x = x - x.mean()
+    y = y - y.mean()
+    cumulative = np.concatenate([np.zeros((5, 1)), np.cumsum(np.stack([x, y, x * x, y * y, x * y]), axis=1)], axis=1)
+    lengths = np.full(blocks, block_length)
+    lengths[-1] = last
+    sums = (cumulative[:, starts + lengths] - cumulative[:, starts]).sum(axis=2)
+    return _pearson_from_sums(n, *sums)
+
+
+def default_block_length(n):
+    # n^(1/3), a common rule of thumb for the moving-block bootstrap
+    return max(1, int(round(n ** (1 / 3))))
+
+
+def _test_series(x, y, n_permutations, n_bootstrap, block_length, batch_size, stop_after, confidence, seed):
+    # Process pool entry point: test one series of valid pairs
+    n = len(x)
+    block_length = min(block_length or default_block_length(n), max(n, 1))
+    row = dict.fromkeys(RESULT_COLUMNS, np.nan)
+    row.update(n=n, block_length=block_length, permutations=0)
+    if n < 3 or np.ptp(x) == 0 or np.ptp(y) == 0:
+        return row
+    r = float(np.clip(_standardize(x) @ _standardize(y), -1.0, 1.0))
+    row['r'] = r
+    permutation_seed, bootstrap_seed = seed.spawn(2)
+    if n_permutations:
+        sizes = [min(batch_size, n_permutations - lo) for lo in range(0, n_permutations, batch_size)]
+        exceed = done = 0
+        for size, batch_seed in zip(sizes, permutation_seed.spawn(len(sizes))):
+            # Two-sided; the tolerance keeps ties with the observed value from rounding out
+            exceed += int(np.sum(np.abs(permutation_batch(x, y, size, batch_seed)) >= abs(r) - 1e-12))
+            done += size
+            if stop_after and exceed >= stop_after:
+                break
+        # The observed pairing counts as one of the permutations
+        row['perm_p'] = (exceed + 1) / (done + 1)
+        row['permutations'] = done
+    if n_bootstrap:
+        sizes = [min(batch_size, n_bootstrap - lo) for lo in range(0, n_bootstrap, batch_size)]
+        boot = np.concatenate([block_bootstrap_batch(x, y, size, block_length, batch_seed)
+                               for size, batch_seed in zip(sizes, bootstrap_seed.spawn(len(sizes)))])
+        boot = boot[~np.isnan(boot)]
+        if len(boot) > 1:
+            tail = (1 - confidence) / 2
+            row['ci_low'], row['ci_high'] = np.quantile(boot, [tail, 1 - tail])
+            row['boot_se'] = boot.std(ddof=1)
+    return row
+
+
+class SignificanceTester:
+    def __init__(self, n_permutations=10_000, n_bootstrap=2_000, block_length=None, confidence=0.95, seed=0,
+                 batch_size=1_000, stop_after=100, n_workers=1):
+        """
+        Args:
+            n_permutations (int): Maximum permutation resamples per series (0 = no permutation test)
+            n_bootstrap (int): Block bootstrap resamples per series (0 = no confidence interval)
+            block_length (int or None): Days per bootstrap block (default: n^(1/3) of each series)
+            confidence (float): Confidence level of the percentile interval
+            seed (int): Seed of the whole run; every series and batch gets its own stream spawned from it
+            batch_size (int): Resamples computed at once; bounds memory at about 16 * batch_size * n bytes
+            stop_after (int or None): Stop permuting a series once this many resamples reached the observed
+                correlation (p-values above roughly stop_after / n_permutations are then estimated from fewer
+                resamples); None always runs n_permutations
+            n_workers (int or None): Processes testing series in parallel (None = all cores, 1 = in-process)
+        """
+        self.n_permutations = n_permutations
+        self.n_bootstrap = n_bootstrap
+        self.block_length = block_length
+        self.confidence = confidence
+        self.seed = seed
+        self.batch_size = batch_size
+        self.stop_after = stop_after
+        self.n_workers = n_workers or os.cpu_count() or 1
+
+    def sweep(self, series):
+        """
+        Test many series in one pass.
+        Args:
+            series (dict): key -> (x, y), e.g. (ticker, horizon) -> (session sentiment, forward return); pairs with
+                a NaN are dropped
+        Returns:
+            DataFrame: One row per key (index) with n, r, perm_p, permutations (resamples run), ci_low, ci_high,
+                boot_se and block_length
+        """
+        keys = list(series)
+        tasks = []
+        for key, seed in zip(keys, np.random.SeedSequence(self.seed).spawn(len(keys))):
+            x, y = (np.asarray(v, dtype='float64') for v in series[key])
+            keep = ~(np.isnan(x) | np.isnan(y))
+            tasks.append((x[keep], y[keep], self.n_permutations, self.n_bootstrap, self.block_length,
+                          self.batch_size, self.stop_after, self.confidence, seed))
+        if self.n_workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_workers, len(tasks))) as executor:
+                rows = list(executor.map(_test_series, *zip(*tasks)))
+        else:
+            rows = [_test_series(*task) for task in tasks]
+        result = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+        if keys:
+            result.index = pd.Index(keys)
+        return result.astype({'n': 'int64', 'permutations': 'int64', 'block_length': 'int64'})
+
+    def test(self, x, y):
+        """
+        Test one series.
+        Returns:
+            dict: n, r, perm_p, permutations, ci_low, ci_high, boot_se, block_length
+        """
+        return self.sweep({'series': (x, y)}).to_dict('records')[0]
@@ -0,0 +1,197 @@
+import math
+import numpy as np
+import pandas as pd
+from scripts.event_join import to_utc_ns
+
+## This script detects publication spikes in the article stream as the articles arrive. Articles are counted in time buckets (minute, hour or day, in UTC), optionally separately per ticker or publisher. For every key the detector keeps an exponentially weighted mean and variance of its bucket counts. A bucket is flagged as soon as its count exceeds mean + z·std of the buckets before it (and a minimum count). Empty buckets between two articles are folded in with a closed-form decay, so a quiet stretch costs O(1) whatever its length. Memory is one small state per key, independent of the history length. The spike event is emitted by the article that crosses the threshold. The batch mode replays a historical file with the same state updates applied once per non-empty (key, bucket) cell instead of once per article, so it reproduces the online events exactly.
+
+RESOLUTIONS = {'minute': 60 * 10 ** 9, 'hour': 3_600 * 10 ** 9, 'day': 86_400 * 10 ** 9}
+EVENT_COLUMNS = ['key', 'bucket', 'timestamp', 'count', 'mean', 'std', 'zscore']
+
+
+class _KeyState:
+    __slots__ = ('bucket', 'count', 'mean', 'var', 'buckets', 'required')
+
+    def __init__(self, bucket):
+        self.bucket = bucket    # current (open) bucket
+        self.count = 0          # articles in the current bucket so far
+        self.mean = 0.0         # EWMA of the counts of the closed buckets
+        self.var = 0.0          # EW variance of the counts of the closed buckets
+        self.buckets = 0        # closed buckets, empty ones included
+        self.required = 0       # count at which the current bucket becomes a spike
+
+
+class SpikeDetector:
+    def __init__(self, resolution='hour', halflife=24, z=3.0, min_count=5, warmup=24, key_col=None, date_col='date',
+                 naive_tz='UTC', on_spike=None):
+        """
+        Args:
+            resolution (str): Bucket size, 'minute', 'hour' or 'day' (UTC)
+            halflife (float): Half-life of the count statistics, in buckets
+            z (float): Standard deviations above the mean that make a spike
+            min_count (int): Minimum articles in a spike bucket
+            warmup (int): Buckets a key must have seen before it can report spikes
+            key_col (str or None): Column with the key to track separately, e.g. 'stock' or 'publisher'
+                (None = one stream for all articles)
+            date_col (str): Publication timestamp column
+            naive_tz (str): Time zone assumed for timestamps without an offset
+            on_spike (callable or None): Called with each event dict as it is emitted
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution '{resolution}'. Choose from {list(RESOLUTIONS)}.")
+        self.resolution = resolution
+        self.bucket_ns = RESOLUTIONS[resolution]
+        self.alpha = 1.0 - math.exp(-math.log(2.0) / halflife)
+        self.z = z
+        self.min_count = min_count
+        self.warmup = warmup
+        self.key_col = key_col
+        self.date_col = date_col
+        self.naive_tz = naive_tz
+        self.on_spike = on_spike
+        self.states = {}
+        self.events = []
+        self.late = 0  # articles dropped because their bucket had already closed
+
+    def _count(self, key, buckets, sizes):
+        """
+        Fold the non-empty buckets of one key into its state, in order. Shared by the online and batch modes, so
+        both apply exactly the same arithmetic.
+        Args:
+            key: Key of the state
+            buckets (list of int): Bucket numbers, non-decreasing and not before the state's current bucket
+            sizes (list of int): Articles in each bucket
+        Returns:
+            list: (cell index, position of the triggering article within the cell, event) per new spike
+        """
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = _KeyState(buckets[0])
+            state.required = self.min_count
+        alpha, beta, z, min_count, warmup = self.alpha, 1.0 - self.alpha, self.z, self.min_count, self.warmup
+        bucket, count, mean, var, seen, required = (state.bucket, state.count, state.mean, state.var, state.buckets,
+                                                     state.required)
+        hits = []
+        for i, (t, n) in enumerate(zip(buckets, sizes)):
+            if t > bucket:
+                # Close the current bucket, then decay over the empty buckets before t
+                delta = count - mean
+                mean = mean + alpha * delta
+                var = beta * (var + alpha * delta * delta)
+                gap = t - bucket - 1
+                if gap > 0:
+                    # gap updates with a count of zero, in closed form
+                    decay = beta ** gap
+                    var = decay * (var + mean * mean * (1.0 - decay))
+                    mean = decay * mean
+                seen += gap + 1
+                bucket, count = t, 0
+                required = max(min_count, math.floor(mean + z * math.sqrt(var)) + 1)
+            before = count
+            count += n
+            if before < required <= count and seen >= warmup:
+                std = math.sqrt(var)
+                zscore = (required - mean) / std if std > 0 else math.inf
+                event = {'key': key, 'bucket': t, 'count': required, 'mean': mean, 'std': std, 'zscore': zscore}
+                hits.append((i, required - before - 1, event))
+        state.bucket, state.count, state.mean, state.var, state.buckets, state.required = (bucket, count, mean, var,
+                                                                                           seen, required)
+        return hits
+
+    def _emit(self, event, timestamp_ns):
+        event['bucket'] = pd.Timestamp(event['bucket'] * self.bucket_ns, tz='UTC')
+        event['timestamp'] = pd.Timestamp(timestamp_ns, tz='UTC')
+        self.events.append(event)
+        if self.on_spike is not None:
+            self.on_spike(event)
+        return event
+
+    def process(self, timestamp, key=None):
+        """
+        Online mode: count one article.
+        Args:
+            timestamp (Timestamp, str or int): Publication time (int = UTC nanoseconds)
+            key: Ticker, publisher, ... (None with key_col=None)
+        Returns:
+            dict or None: The spike event if this article made its bucket a spike
+        """
+        if not isinstance(timestamp, (int, np.integer)):
+            timestamp = pd.Timestamp(timestamp)
+            if timestamp.tz is None:
+                timestamp = timestamp.tz_localize(self.naive_tz)
+            timestamp = timestamp.value
+        bucket = timestamp // self.bucket_ns
+        state = self.states.get(key)
+        if state is not None and bucket < state.bucket:
+            self.late += 1
+            return None
+        hits = self._count(key, [bucket], [1])
+        return self._emit(hits[0][2], timestamp) if hits else None
+
+    def update(self, chunk):
+        """
+        Batch mode: count a chunk of articles in arrival order, continuing from the current state. Gives the same
+        events as calling process() for every row.
+        Args:
+            chunk (DataFrame): Articles with the date column (and key_col); rows with a missing date are skipped
+        Returns:
+            list: Spike events emitted by this chunk, in arrival order
+        """
+        ns, valid = to_utc_ns(chunk[self.date_col], naive_tz=self.naive_tz)
+        rows = np.flatnonzero(valid)
+        if not len(rows):
+            return []
+        if self.key_col is None:
+            codes, keys = np.zeros(len(rows), dtype='int64'), [None]
+        else:
+            codes, keys = pd.factorize(chunk[self.key_col].to_numpy()[rows], use_na_sentinel=False)
+            keys = list(keys)
+        ns = ns[rows]
+        buckets = ns // self.bucket_ns
+        # Group by key, keeping the arrival order within each key
+        order = np.argsort(codes, kind='stable')
+        codes, buckets = codes[order], buckets[order]
+        first = np.r_[True, codes[1:] != codes[:-1]]
+        # An article is late if an earlier article of its key (in this chunk or before) opened a later bucket.
+        # Offsetting each key's buckets past the previous key's turns the per-key running maximum into one accumulate.
+        offset = codes * (int(buckets.max() - buckets.min()) + 1) - buckets.min()
+        running = np.maximum.accumulate(buckets + offset) - offset
+        previous = np.r_[buckets[0], running[:-1]]
+        current = np.array([self.states[key].bucket if key in self.states else buckets.min() for key in keys])
+        previous[first] = current[codes[first]]
+        late = buckets < np.maximum(previous, current[codes])
+        self.late += int(late.sum())
+        order, codes, buckets = order[~late], codes[~late], buckets[~late]
+        if not len(codes):
+            return []
+        # One state update per non-empty (key, bucket) cell
+        starts = np.flatnonzero(np.r_[True, (codes[1:] != codes[:-1]) | (buckets[1:] != buckets[:-1])])
+        sizes = np.diff(np.r_[starts, len(codes)])
+        cell_codes = codes[starts]
+        groups = np.flatnonzero(np.r_[True, cell_codes[1:] != cell_codes[:-1], True])
+        cell_buckets, cell_sizes = buckets[starts].tolist(), sizes.tolist()
+        hits = []
+        for lo, hi in zip(groups[:-1].tolist(), groups[1:].tolist()):
+            for i, position, event in self._count(keys[cell_codes[lo]], cell_buckets[lo:hi], cell_sizes[lo:hi]):
+                hits.append((order[starts[lo + i] + position], event))
+        hits.sort(key=lambda item: item[0])
+        return [self._emit(event, int(ns[position])) for position, event in hits]
+
+    def replay(self, df, chunksize=None):
+        """
+        Replay a historical frame from a fresh state.
+        Args:
+            df (DataFrame): Articles in arrival order
+            chunksize (int or None): Rows per update (None = all at once)
+        Returns:
+            DataFrame: All spike events (see events_frame)
+        """
+        self.states, self.events, self.late = {}, [], 0
+        step = chunksize or max(len(df), 1)
+        for lo in range(0, len(df), step):
+            self.update(df.iloc[lo:lo + step])
+        return self.events_frame()
+
+    def events_frame(self):
+        # Events emitted so far as a DataFrame
+        return pd.DataFrame(self.events, columns=EVENT_COLUMNS)
@@ -0,0 +1,267 @@
+import numpy as np
+import pandas as pd
+
+## This script computes price-trend and streak analytics for one or many tickers with flat NumPy array operations. The day-to-day direction is stored as int8 (-1 down, 0 no change, 1 up). Up and down streaks are run-length encoded: run boundaries are found with one comparison of neighbouring bars, so longest, mean and distribution of the streaks come from the run lengths. Overnight gaps compare each Open with the previous Close. Drawdowns are measured from the running maximum Close. Multi-timeframe trend states combine the Close/SMA_20 and SMA_20/SMA_50 relations. A long-format panel is sorted by (ticker, date) once, and per-ticker statistics are reductions over contiguous blocks (bincount, reduceat), so there is no per-row or per-ticker Python loop.
+
+DIRECTION_LABELS = {1: 'Up', -1: 'Down', 0: 'No Change'}
+# Trend state codes -2..2 -> labels (Close vs SMA_20 plus SMA_20 vs SMA_50)
+TREND_STATES = ['strong_down', 'down', 'neutral', 'up', 'strong_up']
+ROW_COLUMNS = ['direction', 'streak', 'gap', 'drawdown', 'trend_state']
+SUMMARY_COLUMNS = [
+    'bars', 'up_days', 'down_days', 'flat_days', 'longest_up', 'longest_down', 'mean_up_streak', 'mean_down_streak',
+    'gap_ups', 'gap_downs', 'mean_abs_gap', 'gap_fill_rate', 'max_drawdown', 'max_drawdown_date',
+    'longest_drawdown', 'current_drawdown',
+]
+
+
+def group_starts(codes):
+    # Bool mask of the first row of each block of equal codes
+    return np.r_[True, codes[1:] != codes[:-1]] if len(codes) else np.zeros(0, dtype=bool)
+
+
+def direction(close, first=None):
+    """
+    Day-to-day direction of the close (as Close.diff() > 0 / < 0).
+    Args:
+        close (ndarray): Closes, sorted by ticker and date
+        first (ndarray or None): Bool mask of each ticker's first bar (None = one ticker)
+    Returns:
+        ndarray: int8 direction; 0 for a ticker's first bar and around missing closes
+    """
+    close = np.asarray(close, dtype='float64')
+    change = np.diff(close, prepend=np.nan)
+    if first is not None:
+        change[first] = np.nan
+    # NaN compares False both ways, as in the 'No Change' label of the per-row version
+    return (change > 0).astype('int8') - (change < 0).astype('int8')
+
+
+def runs(values, first=None):
+    """
+    Run-length encoding of a sequence, with runs also broken at each ticker's first bar.
+    Returns:
+        tuple: (start index, length) arrays of the runs
+    """
+    values = np.asarray(values)
+    if not len(values):
+        return np.zeros(0, dtype='int64'), np.zeros(0, dtype='int64')
+    boundary = np.r_[True, values[1:] != values[:-1]]
+    if first is not None:
+        boundary |= first
+    starts = np.flatnonzero(boundary)
+    return starts, np.diff(np.r_[starts, len(values)])
+
+
+def streaks(directions, first=None):
+    """
+    Signed length of the streak each bar belongs to so far (e.g. 3 on the third up day in a row, -2 on the second
+    down day, 0 for no change).
+    Returns:
+        ndarray: int32 running streak lengths
+    """
+    starts, lengths = runs(directions, first)
+    position = np.arange(len(directions)) - np.repeat(starts, lengths) + 1
+    return (position * directions).astype('int32')
+
+
+def running_drawdown(close, first=None):
+    """
+    Drawdown from the running maximum close of each ticker (0 at a new high, -0.25 at 25% below the peak).
+    Returns:
+        ndarray: float64 drawdowns (NaN where the close is missing)
+    """
+    close = np.asarray(close, dtype='float64')
+    if not len(close):
+        return close.copy()
+    first = group_starts(np.zeros(len(close))) if first is None else first
+    # Running maximum on value ranks (0 = missing, so it never raises the peak). Offsetting each ticker's ranks past
+    # the previous ticker's turns the per-ticker running maximum into one accumulate over the flat array.
+    values, ranks = np.unique(close, return_inverse=True)
+    missing = np.isnan(values)
+    ranks = np.where(missing[ranks], 0, ranks + 1)
+    offset = (np.cumsum(first) - 1) * (len(values) + 1)
+    peak_rank = np.maximum.accumulate(ranks + offset) - offset
+    peak = np.r_[np.nan, np.where(missing, np.nan, values)][peak_rank]
+    return close / peak - 1.0
+
+
+def previous_close(close, first=None):
+    # Close of the previous bar, NaN on each ticker's first bar
+    previous = np.r_[np.nan, np.asarray(close, dtype='float64')[:-1]]
+    if first is not None:
+        previous[first] = np.nan
+    return previous
+
+
+def overnight_gaps(open_, close, first=None, previous=None):
+    # Open relative to the previous close, NaN on each ticker's first bar (previous: precomputed previous_close)
+    previous = previous_close(close, first) if previous is None else previous
+    return np.asarray(open_, dtype='float64') / previous - 1.0
+
+
+def trend_states(close, sma_short, sma_long):
+    """
+    Multi-timeframe trend state per bar: sign(Close - SMA_short) + sign(SMA_short - SMA_long), from -2 (close below
+    a falling short average) to 2 (close above a rising one).
+    Returns:
+        Categorical: TREND_STATES label per bar (int8 codes; missing while the averages warm up)
+    """
+    close, sma_short, sma_long = (np.asarray(x, dtype='float64') for x in (close, sma_short, sma_long))
+    state = np.sign(close - sma_short) + np.sign(sma_short - sma_long)
+    codes = np.where(np.isnan(state), -1, state + 2).astype('int8')
+    return pd.Categorical.from_codes(codes, categories=TREND_STATES)
+
+
+def direction_counts(directions):
+    # Days per direction label, most frequent first (as value_counts of the labels)
+    counts = np.bincount(np.asarray(directions, dtype='int64') + 1, minlength=3)
+    series = pd.Series(counts[[2, 0, 1]], index=pd.Index(['Up', 'Down', 'No Change'], name='Trend'), name='count')
+    return series[series > 0].sort_values(ascending=False, kind='stable')
+
+
+class TrendEngine:
+    def __init__(self, ticker_col='stock', date_col='Date', gap_threshold=0.01, sma_columns=('SMA_20', 'SMA_50')):
+        """
+        Args:
+            ticker_col (str): Ticker column of a long-format panel (missing column = one ticker)
+            date_col (str): Column (or index level) holding the bar date
+            gap_threshold (float): Relative overnight gap counted as a gap up / gap down
+            sma_columns (tuple): Short and long moving-average columns used for the trend states (skipped if absent)
+        """
+        self.ticker_col = ticker_col
+        self.date_col = date_col
+        self.gap_threshold = gap_threshold
+        self.sma_columns = sma_columns
+
+    def _arrays(self, panel, columns):
+        """
+        The needed columns as arrays sorted by (ticker, date); a panel that is already grouped by ticker in date
+        order (the usual layout) is not sorted or copied again.
+        Returns:
+            tuple: (column -> array, sort order or None, ticker names, ticker code per sorted row)
+        """
+        if self.date_col not in panel.columns and self.date_col in panel.index.names:
+            panel = panel.reset_index(self.date_col)
+        if self.ticker_col in panel.columns:
+            codes, names = pd.factorize(panel[self.ticker_col], sort=False)
+        else:
+            codes, names = np.zeros(len(panel), dtype='int64'), pd.Index([''])
+        dates = panel[self.date_col].to_numpy() if self.date_col in panel.columns else np.arange(len(panel))
+        arrays = {column: panel[column].to_numpy() for column in columns if column in panel.columns}
+        arrays['date'] = dates
+        step = np.diff(codes)
+        if len(codes) and ((step > 0) | ((step == 0) & (dates[1:] >= dates[:-1]))).all():
+            return arrays, None, names, codes
+        order = np.lexsort((dates, codes))
+        return {column: values[order] for column, values in arrays.items()}, order, names, codes[order]
+
+    def compute(self, panel):
+        """
+        Per-bar trend columns for every ticker.
+        Args:
+            panel (DataFrame): Rows of (ticker, date, Open, Close, ...) and optionally the SMA columns
+        Returns:
+            DataFrame: direction (int8), streak (int32), gap and drawdown (float32) and trend_state (categorical),
+                with the same index and row order as panel
+        """
+        short, long = self.sma_columns
+        arrays, order, _, codes = self._arrays(panel, ['Open', 'Close', short, long])
+        first = group_starts(codes)
+        close = arrays['Close'].astype('float64')
+        directions = direction(close, first)
+        columns = {
+            'direction': directions,
+            'streak': streaks(directions, first),
+            'gap': (overnight_gaps(arrays['Open'], close, first) if 'Open' in arrays
+                    else np.full(len(close), np.nan)).astype('float32'),
+            'drawdown': running_drawdown(close, first).astype('float32'),
+        }
+        if short in arrays and long in arrays:
+            columns['trend_state'] = trend_states(close, arrays[short], arrays[long])
+        if order is not None:
+            inverse = np.empty_like(order)
+            inverse[order] = np.arange(len(order))
+            columns = {name: values[inverse] for name, values in columns.items()}
+        return pd.DataFrame(columns, index=panel.index)
+
+    def summary(self, panel):
+        """
+        Per-ticker trend, streak, gap and drawdown statistics.
+        Returns:
+            DataFrame: One row per ticker (index, in order of first appearance) with SUMMARY_COLUMNS
+        """
+        arrays, _, names, codes = self._arrays(panel, ['Open', 'High', 'Low', 'Close'])
+        size = len(names)
+        first = group_starts(codes)
+        block_starts = np.flatnonzero(first)
+        close = arrays['Close'].astype('float64')
+        directions = direction(close, first)
+        out = pd.DataFrame(index=pd.Index(names, name=self.ticker_col))
+        out['bars'] = np.bincount(codes, minlength=size)
+        for label, value in (('up_days', 1), ('down_days', -1), ('flat_days', 0)):
+            out[label] = np.bincount(codes, weights=directions == value, minlength=size).astype('int64')
+        # Streaks: runs of equal direction, broken at ticker boundaries
+        starts, lengths = runs(directions, first)
+        run_codes, run_values = codes[starts], directions[starts]
+        run_blocks = np.flatnonzero(group_starts(run_codes))
+        for name, value in (('up', 1), ('down', -1)):
+            mask = run_values == value
+            out[f'longest_{name}'] = _block_max(np.where(mask, lengths, 0), run_blocks)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                out[f'mean_{name}_streak'] = (np.bincount(run_codes, weights=lengths * mask, minlength=size)
+                                              / np.bincount(run_codes, weights=mask, minlength=size))
+        # Overnight gaps
+        if 'Open' in arrays:
+            previous = previous_close(close, first)
+            gaps = overnight_gaps(arrays['Open'], close, first, previous)
+            up, down = gaps > self.gap_threshold, gaps < -self.gap_threshold
+            out['gap_ups'] = np.bincount(codes, weights=up, minlength=size).astype('int64')
+            out['gap_downs'] = np.bincount(codes, weights=down, minlength=size).astype('int64')
+            valid = ~np.isnan(gaps)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                out['mean_abs_gap'] = (np.bincount(codes[valid], weights=np.abs(gaps[valid]), minlength=size)
+                                       / np.bincount(codes[valid], minlength=size))
+            if 'High' in arrays and 'Low' in arrays:
+                # A gap is filled when the session trades back to the previous close
+                filled = (up & (arrays['Low'] <= previous)) | (down & (arrays['High'] >= previous))
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    out['gap_fill_rate'] = (np.bincount(codes, weights=filled, minlength=size)
+                                            / np.bincount(codes, weights=up | down, minlength=size))
+        # Drawdowns: deepest point and its date, longest stretch below a previous peak, drawdown at the last bar
+        drawdowns = running_drawdown(close, first)
+        deepest = np.where(np.isnan(drawdowns), np.inf, drawdowns)
+        minimum = np.minimum.reduceat(deepest, block_starts) if len(close) else np.zeros(0)
+        # First bar of each block that reaches the block minimum
+        hits = np.flatnonzero(deepest == np.repeat(minimum, np.diff(np.r_[block_starts, len(close)])))
+        positions = hits[group_starts(codes[hits])]
+        out['max_drawdown'] = drawdowns[positions]
+        out['max_drawdown_date'] = pd.Series(arrays['date'][positions], index=out.index).where(out['max_drawdown'].notna())
+        below = drawdowns < 0
+        starts, lengths = runs(below, first)
+        out['longest_drawdown'] = _block_max(np.where(below[starts], lengths, 0), np.flatnonzero(group_starts(codes[starts])))
+        out['current_drawdown'] = drawdowns[np.r_[block_starts[1:], len(close)] - 1] if len(close) else []
+        return out.reindex(columns=SUMMARY_COLUMNS)
+
+    def streak_distribution(self, panel):
+        """
+        How often each streak length occurs.
+        Returns:
+            DataFrame: ticker (if the panel has one), direction ('Up'/'Down'), length and count, sorted
+        """
+        arrays, _, names, codes = self._arrays(panel, ['Close'])
+        first = group_starts(codes)
+        directions = direction(arrays['Close'].astype('float64'), first)
+        starts, lengths = runs(directions, first)
+        keep = directions[starts] != 0
+        runs_frame = pd.DataFrame({
+            'direction': np.where(directions[starts][keep] > 0, DIRECTION_LABELS[1], DIRECTION_LABELS[-1]),
+            'length': lengths[keep],
+        })
+        if self.ticker_col in panel.columns:
+            runs_frame.insert(0, self.ticker_col, np.asarray(names)[codes[starts][keep]])
+        return runs_frame.value_counts().rename('count').sort_index().reset_index()
+
+
+def _block_max(values, block_starts):
+    # Maximum of each contiguous block (blocks given by their start positions)
+    return np.maximum.reduceat(values, block_starts) if len(values) else np.zeros(0, dtype=values.dtype)
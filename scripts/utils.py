@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 def get_stock_name(stock_prefix):
     # Mapping of stock prefixes to stock names
@@ -15,8 +14,65 @@ def get_stock_name(stock_prefix):
     }
     return stock_prefix_mapping.get(stock_prefix, "Unknown Stock")
 
-def load_financial_data(stock_prefix, base_dir="../data"):
-    """Load the financial data from the base data directory."""
+def load_financial_data(stock_prefix, base_dir="../data", use_parquet=False, columns=None, start=None, end=None):
+    """Load the financial data from the base data directory.
+
+    By default the CSV is read as is ('Date' stays a string). With use_parquet=True the CSV is converted once
+    to a typed Parquet file (see scripts/data_store.py) and later calls read the Parquet file instead, with
+    'Date' already parsed.
+    """
+    if use_parquet:
+        from scripts.data_store import ParquetDataStore
+        return ParquetDataStore(base_dir).load_prices(stock_prefix, columns=columns, start=start, end=end)
     filepath = f"{base_dir}/yfinance_data/{stock_prefix}_historical_data.csv"
-    df = pd.read_csv(filepath)
-    return df
\ No newline at end of file
+    df = pd.read_csv(filepath, usecols=None if columns is None else ['Date'] + [c for c in columns if c != 'Date'])
+    if start is not None or end is not None:
+        dates = pd.to_datetime(df['Date'])
+        df = df[_in_date_range(dates, start, end)]
+    return df
+
+def load_price_panel(stock_prefixes=None, base_dir="../data", use_parquet=True, ticker_col='stock'):
+    """Load several tickers' historical prices into one long-format frame with a ticker column.
+
+    stock_prefixes defaults to every ticker with a file under {base_dir}/yfinance_data.
+    """
+    if stock_prefixes is None:
+        from scripts.data_store import ParquetDataStore
+        stock_prefixes = ParquetDataStore(base_dir).available_tickers()
+    frames = []
+    for stock_prefix in stock_prefixes:
+        df = load_financial_data(stock_prefix, base_dir=base_dir, use_parquet=use_parquet)
+        df.insert(0, ticker_col, stock_prefix)
+        frames.append(df)
+    panel = pd.concat(frames, ignore_index=True)
+    panel[ticker_col] = panel[ticker_col].astype('category')
+    return panel
+
+def load_news_data(base_dir="../data", use_parquet=True, columns=None, start=None, end=None, tickers=None):
+    """Load the news data (raw_analyst_ratings.csv) from the base data directory.
+
+    With use_parquet=True, 'date' is returned already parsed (UTC) and publisher/stock as categoricals;
+    start/end/tickers are pushed down into the Parquet scan.
+    """
+    if use_parquet:
+        from scripts.data_store import ParquetDataStore
+        return ParquetDataStore(base_dir).load_news(columns=columns, start=start, end=end, tickers=tickers)
+    df = pd.read_csv(f"{base_dir}/raw_analyst_ratings.csv", usecols=columns)
+    if tickers is not None:
+        df = df[df['stock'].isin(tickers)]
+    if start is not None or end is not None:
+        dates = pd.to_datetime(df['date'], errors='coerce', utc=True)
+        df = df[_in_date_range(dates, start, end)]
+    return df
+
+def _in_date_range(dates, start, end):
+    # Boolean mask for an inclusive [start, end] range, matching the timezone of dates
+    mask = pd.Series(True, index=dates.index)
+    tz = dates.dt.tz
+    for bound, keep in ((start, dates.__ge__), (end, dates.__le__)):
+        if bound is not None:
+            bound = pd.Timestamp(bound)
+            if tz is not None:
+                bound = bound.tz_localize(tz) if bound.tzinfo is None else bound.tz_convert(tz)
+            mask &= keep(bound)
+    return mask
\ No newline at end of file
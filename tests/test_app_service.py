@@ -0,0 +1,84 @@
+import json
+import asyncio
+import unittest
+import pandas as pd
+from app.batcher import MicroBatcher
+from app.metrics import ServiceMetrics
+from app.service import AnalysisService
+from benchmarks.generator import make_news, make_prices
+from scripts.correlation_batch import CorrelationBatchRunner
+from scripts.sentiment_scoring import VaderScoringEngine
+
+try:
+    from tornado.testing import AsyncHTTPTestCase
+except ImportError:
+    AsyncHTTPTestCase = None
+
+
+def _double_or_fail(items):
+    return [ValueError("negative") if item < 0 else 2 * item for item in items]
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_requests_share_batches(self):
+        metrics = ServiceMetrics()
+
+        async def main():
+            batcher = MicroBatcher(_double_or_fail, window=0.01, max_batch=4, metrics=metrics)
+            return await asyncio.gather(*[batcher.submit(i) for i in range(10)], batcher.submit(-1),
+                                        return_exceptions=True)
+        results = asyncio.run(main())
+        self.assertEqual(results[:10], [2 * i for i in range(10)])
+        self.assertIsInstance(results[10], ValueError)  # fails only its own request
+        self.assertEqual(metrics.batch_sizes['batch'].recent().tolist(), [4, 4, 3])
+
+
+class TestAnalysisService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.prices = {'AAPL': make_prices(600, seed=1, start='2019-01-02')}
+        cls.news = make_news(1500, seed=0, start='2019-01-02', days=800, tickers=['AAPL'])
+
+    def test_score_and_correlate_match_batch_code(self):
+        async def main():
+            service = await AnalysisService(self.prices, n_workers=0).start()
+            headlines = self.news['headline'].tolist()
+            scores = await asyncio.gather(*[service.score([text]) for text in headlines[:300]])
+            rows = await service.correlate('AAPL', headlines, self.news['date'].tolist())
+            with self.assertRaises(KeyError):
+                await service.correlate('MSFT', headlines, self.news['date'].tolist())
+            await service.close()
+            return scores, rows, service.metrics.snapshot()
+        scores, rows, metrics = asyncio.run(main())
+        self.assertEqual([s[0] for s in scores], VaderScoringEngine().score(self.news['headline'][:300]))
+        expected = CorrelationBatchRunner(self.news, scorer='vader').run(
+            pd.concat([self.prices['AAPL'].assign(stock='AAPL')]))
+        pd.testing.assert_frame_equal(pd.DataFrame(rows)[expected.columns], expected)
+        self.assertEqual(metrics['endpoints']['score']['requests'], 300)
+        self.assertEqual(metrics['endpoints']['correlation']['errors'], 1)
+        self.assertLess(metrics['batches']['score']['batches'], 300)
+
+
+@unittest.skipIf(AsyncHTTPTestCase is None, "Tornado is not installed")
+class TestServer(AsyncHTTPTestCase if AsyncHTTPTestCase is not None else unittest.TestCase):
+    def get_app(self):
+        from app.server import make_app
+        self.service = AnalysisService({'AAPL': make_prices(300, seed=1, start='2019-01-02')}, n_workers=0)
+        self.io_loop.run_sync(self.service.start)
+        return make_app(self.service)
+
+    def test_endpoints(self):
+        response = self.fetch('/score', method='POST', body=json.dumps({'headlines': ['Shares surge on record revenue']}))
+        self.assertEqual(response.code, 200)
+        self.assertGreater(json.loads(response.body)['scores'][0], 0)
+        response = self.fetch('/correlation', method='POST',
+                              body=json.dumps({'ticker': 'TSLA', 'headlines': [], 'dates': []}))
+        self.assertEqual(response.code, 404)
+        response = self.fetch('/score', method='POST', body='not json')
+        self.assertEqual(response.code, 400)
+        metrics = json.loads(self.fetch('/metrics').body)
+        self.assertEqual(metrics['endpoints']['score']['requests'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import numpy as np
+import pandas as pd
+from benchmarks.generator import make_news, make_prices
+from scripts.backtest import SentimentBacktester, best_combinations
+from scripts.correlation_analysis import CorrelationAnalyzer
+
+
+def _brute_force(sentiment, returns, pos, neg, holding):
+    # Per-ticker positions with a pandas rolling sum, then the equal-weighted portfolio
+    signal = np.where(sentiment >= pos, 1, np.where(sentiment <= neg, -1, 0))
+    position = pd.DataFrame(signal.T).rolling(holding, min_periods=1).sum().to_numpy().T / holding
+    pnl = position * returns
+    traded = (~np.isnan(pnl)).sum(axis=0)
+    portfolio = np.where(traded > 0, np.nansum(pnl, axis=0) / np.maximum(traded, 1), np.nan)
+    return pnl, portfolio
+
+
+class TestSentimentBacktester(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        tickers = ['AAPL', 'TSLA', 'NVDA']
+        cls.prices = pd.concat([make_prices(500 - 60 * i, seed=i, start='2018-01-02').assign(stock=ticker)
+                                for i, ticker in enumerate(tickers)], ignore_index=True)
+        cls.news = make_news(3000, seed=3, start='2018-01-02', days=700, tickers=tickers)
+        cls.news['sentiment_score'] = np.random.default_rng(0).uniform(-1, 1, len(cls.news))
+
+    def test_grid_matches_per_combination_loop(self):
+        backtester = SentimentBacktester((0.1, 0.3), (-0.2, -0.4), (1, 3, 7))
+        result = backtester.run(self.news, self.prices)
+        self.assertEqual(len(result), 4 * 3 * 4)
+        sentiment, returns, tickers, _ = backtester.session_panel(self.news, self.prices)
+        for pos, neg, holding in [(0.1, -0.2, 1), (0.3, -0.4, 7), (0.1, -0.4, 3)]:
+            pnl, portfolio = _brute_force(sentiment, returns, pos, neg, holding)
+            rows = result[(result['pos_th'] == pos) & (result['neg_th'] == neg) & (result['holding'] == holding)]
+            rows = rows.set_index('ticker')
+            for i, ticker in enumerate(tickers):
+                x = pnl[i][~np.isnan(pnl[i])]
+                self.assertEqual(rows.loc[ticker, 'days'], len(x))
+                self.assertAlmostEqual(rows.loc[ticker, 'sharpe'], x.mean() / x.std(ddof=1) * np.sqrt(252), places=9)
+                self.assertAlmostEqual(rows.loc[ticker, 'total_return'], np.prod(1 + x) - 1, places=9)
+                self.assertAlmostEqual(rows.loc[ticker, 'hit_rate'], (x > 0).sum() / (x != 0).sum(), places=12)
+            x = portfolio[~np.isnan(portfolio)]
+            self.assertAlmostEqual(rows.loc['ALL', 'annual_return'], x.mean() * 252, places=9)
+        # A signal only earns the returns after its session
+        self.assertTrue(np.isnan(returns[:, -1]).all())
+
+    def test_chunks_and_workers_agree(self):
+        expected = SentimentBacktester().run(self.news, self.prices)
+        chunked = SentimentBacktester(max_cells=20_000, n_workers=2)
+        self.assertGreater(len(chunked._chunks(3, 500)), 2)
+        pd.testing.assert_frame_equal(chunked.run(self.news, self.prices), expected)
+        top = best_combinations(expected, 'sharpe', top=3)
+        self.assertEqual(list(top['ticker'].unique()), ['ALL'])
+        self.assertTrue(top['sharpe'].is_monotonic_decreasing)
+        with self.assertRaises(ValueError):
+            SentimentBacktester((-0.5,), (0.5,))
+        with self.assertRaises(ValueError):
+            SentimentBacktester(holding_periods=(0,))
+
+    def test_analyzer_backtest_single_ticker(self):
+        prices = self.prices[self.prices['stock'] == 'AAPL'].drop(columns='stock')
+        news = self.news[self.news['stock'] == 'AAPL'].drop(columns='stock')
+        analyzer = CorrelationAnalyzer(news.copy(), prices.copy(), 'AAPL', render='defer')
+        result = analyzer.sentiment_backtest(holding_periods=(1, 5))
+        self.assertEqual(len(result), 25 * 2)
+        self.assertTrue((result['ticker'] == 'AAPL').all())
+        self.assertTrue(result['turnover'].between(0, 2).all())
+        self.assertTrue(result['exposure'].between(0, 1).all())
+        self.assertEqual(analyzer.plot_specs[-1].name, 'AAPL_sentiment_backtest')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from benchmarks.generator import make_news, make_prices, price_frequency
+from benchmarks.run import compare
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def test_generator_is_deterministic(self):
+        news = make_news(500, seed=1)
+        self.assertTrue(news.equals(make_news(500, seed=1)))
+        self.assertFalse(news.equals(make_news(500, seed=2)))
+        self.assertEqual(list(news.columns), ['Unnamed: 0', 'headline', 'url', 'publisher', 'date', 'stock'])
+        self.assertTrue(news['date'].str.endswith('-04:00').all())
+        prices = make_prices(300, seed=1)
+        self.assertTrue(((prices['Low'] <= prices[['Open', 'Close']].min(axis=1))
+                         & (prices['High'] >= prices[['Open', 'Close']].max(axis=1))).all())
+        # Daily bars from the default start only fit about 73k business days before the Timestamp limit
+        self.assertEqual(price_frequency(70_000), 'B')
+        self.assertEqual(price_frequency(90_000), 'min')
+        self.assertEqual(len(make_prices(90_000, freq=price_frequency(90_000))), 90_000)
+
+    def test_compare_flags_regressions(self):
+        def report(seconds, memory):
+            return {'results': [{'case': 'c', 'size': '10k', 'status': 'ok', 'seconds': seconds,
+                                 'peak_memory_mb': memory}]}
+        baseline = report(1.0, 100.0)
+        self.assertEqual(compare(report(1.2, 110.0), baseline), [])
+        regressions = compare(report(1.5, 200.0), baseline, time_threshold=0.25, memory_threshold=0.5)
+        self.assertEqual([r['metric'] for r in regressions], ['seconds', 'peak_memory_mb'])
+        # Cases below the timer noise floor are not checked for time
+        self.assertEqual(compare(report(0.004, 100.0), report(0.001, 100.0)), [])
+        # Cases without a baseline entry are listed rather than skipped
+        missing = compare(report(1.0, 100.0), {'results': []})
+        self.assertEqual([(r['case'], r['metric']) for r in missing], [('c', 'missing')])
+
+
+if __name__ == '__main__':
+    unittest.main()
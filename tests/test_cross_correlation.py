@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.cross_correlation import CrossCorrelationEngine, lag_matrices, masked_cross_correlation
+
+
+def direct_lag_corr(x, y, lag):
+    # Reference: shift, drop pairs with a NaN, correlate
+    a, b = (x[:len(x) - lag], y[lag:]) if lag >= 0 else (x[-lag:], y[:len(y) + lag])
+    keep = ~(np.isnan(a) | np.isnan(b))
+    return np.corrcoef(a[keep], b[keep])[0, 1], keep.sum()
+
+
+class TestCrossCorrelation(unittest.TestCase):
+    def test_matches_direct_lagged_correlation(self):
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=500)
+        Y = rng.normal(size=(2, 500))
+        Y[0, 2:] += 0.5 * x[:-2]  # sentiment leads the first series by two steps
+        x[rng.random(500) < 0.4] = np.nan
+        Y[rng.random((2, 500)) < 0.05] = np.nan
+        r, n = masked_cross_correlation(x, Y, max_lag=5)
+        for row in range(2):
+            for j, lag in enumerate(range(-5, 6)):
+                expected, count = direct_lag_corr(x, Y[row], lag)
+                self.assertAlmostEqual(r[row, j], expected, places=12)
+                self.assertEqual(n[row, j], count)
+        self.assertEqual(np.nanargmax(r[0]), 7)  # lag +2
+
+    def test_engine_counts_lags_in_sessions(self):
+        # Weekend news lands on Monday, so a lag of one session pairs Monday sentiment with Tuesday's return
+        days = pd.bdate_range('2021-01-04', periods=120)
+        rng = np.random.default_rng(1)
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.01, len(days)))
+        prices = pd.DataFrame({'Date': days, 'Open': close, 'Close': close})
+        returns = pd.Series(close).pct_change().to_numpy()
+        # One article per session, published the Sunday/previous evening, scored with the next session's return
+        published = days - pd.Timedelta(hours=6)
+        news = pd.DataFrame({'date': published.tz_localize('America/New_York'), 'sentiment_score': np.r_[returns[1:], np.nan]})
+        result = CrossCorrelationEngine(max_lag=3, horizons=(1,), min_periods=5).run(news, prices)
+        matrix = lag_matrices(result)['']
+        self.assertEqual(list(matrix.columns), ['t+1'])
+        self.assertAlmostEqual(matrix.loc[1, 't+1'], 1.0, places=10)
+        self.assertLess(abs(matrix.loc[0, 't+1']), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from benchmarks.generator import make_news, make_prices
+from scripts.data_store import ParquetDataStore
+from scripts.utils import load_financial_data
+
+
+class TestParquetDataStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base_dir = self.tmp.name
+        os.makedirs(os.path.join(self.base_dir, 'yfinance_data'))
+        self.news = make_news(2000, seed=1, start='2020-01-01', days=200, tickers=['AAPL', 'TSLA', 'NVDA'])
+        self.news.to_csv(os.path.join(self.base_dir, 'raw_analyst_ratings.csv'), index=False)
+        self.prices = make_prices(300, seed=2, start='2020-01-02')
+        self.prices.to_csv(os.path.join(self.base_dir, 'yfinance_data', 'AAPL_historical_data.csv'), index=False)
+        self.store = ParquetDataStore(self.base_dir)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rebuild_when_source_changes(self):
+        csv_path = self.store.price_csv_path('AAPL')
+        self.assertTrue(self.store.is_stale(csv_path))
+        self.assertEqual(len(self.store.load_prices('AAPL')), 300)
+        self.assertFalse(self.store.is_stale(csv_path))
+        # A changed CSV (new size and mtime) invalidates the Parquet file and the next read rebuilds it
+        make_prices(320, seed=2, start='2020-01-02').to_csv(csv_path, index=False)
+        os.utime(csv_path, ns=(os.stat(csv_path).st_atime_ns, os.stat(csv_path).st_mtime_ns + 10**9))
+        self.assertTrue(self.store.is_stale(csv_path))
+        self.assertEqual(len(self.store.load_prices('AAPL')), 320)
+        self.assertFalse(self.store.is_stale(csv_path))
+
+    def test_projection_pushdown_and_news_schema(self):
+        news = self.store.load_news()
+        self.assertEqual(str(news['date'].dtype), 'datetime64[ns, UTC]')
+        self.assertIsInstance(news['publisher'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(news['stock'].dtype, pd.CategoricalDtype)
+        expected_dates = pd.to_datetime(self.news['date'], utc=True, format='mixed')
+        pd.testing.assert_series_equal(news['date'], expected_dates, check_names=False)
+        # Projection and predicate pushdown on date range and ticker
+        subset = self.store.load_news(columns=['headline', 'date', 'stock'], start='2020-02-01', end='2020-03-31',
+                                      tickers=['AAPL', 'NVDA'])
+        self.assertEqual(list(subset.columns), ['headline', 'date', 'stock'])
+        keep = (expected_dates.between(pd.Timestamp('2020-02-01', tz='UTC'), pd.Timestamp('2020-03-31', tz='UTC'))
+                & self.news['stock'].isin(['AAPL', 'NVDA']))
+        self.assertEqual(len(subset), keep.sum())
+        self.assertTrue(set(subset['stock'].astype(str)) <= {'AAPL', 'NVDA'})
+        prices = self.store.load_prices('AAPL', columns=['Close'], start='2020-03-01', end='2020-03-31')
+        self.assertEqual(list(prices.columns), ['Date', 'Close'])
+        self.assertEqual(len(prices), pd.to_datetime(self.prices['Date']).between('2020-03-01', '2020-03-31').sum())
+
+    def test_load_financial_data_parquet_matches_csv(self):
+        csv = load_financial_data('AAPL', base_dir=self.base_dir)
+        # The default still reads the CSV as is and writes nothing
+        self.assertEqual(csv['Date'].dtype, object)
+        self.assertFalse(os.path.exists(os.path.join(self.base_dir, 'parquet')))
+        parquet = load_financial_data('AAPL', base_dir=self.base_dir, use_parquet=True)
+        pd.testing.assert_frame_equal(parquet, csv.assign(Date=pd.to_datetime(csv['Date'])), check_dtype=False)
+        window = load_financial_data('AAPL', base_dir=self.base_dir, use_parquet=True, columns=['Close'],
+                                     start='2020-02-01', end='2020-02-29')
+        expected = load_financial_data('AAPL', base_dir=self.base_dir, columns=['Close'], start='2020-02-01',
+                                       end='2020-02-29')
+        pd.testing.assert_frame_equal(window.reset_index(drop=True),
+                                      expected.assign(Date=pd.to_datetime(expected['Date'])).reset_index(drop=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.event_join import EventJoiner
+from scripts.correlation_batch import CorrelationBatchRunner, RESULT_COLUMNS
+from scripts.significance import SignificanceTester
+
+
+def make_prices():
+    # Two tickers over one week (Mon 2020-03-02 .. Fri 2020-03-06); TSLA has no bar on Wednesday
+    days = pd.bdate_range('2020-03-02', '2020-03-06')
+    frames = []
+    for ticker, skip in (('AAPL', None), ('TSLA', '2020-03-04')):
+        d = days[days != pd.Timestamp(skip)] if skip else days
+        close = 100.0 + np.arange(len(d))
+        frames.append(pd.DataFrame({'Date': d, 'Open': close - 0.5, 'Close': close, 'stock': ticker}))
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestEventJoiner(unittest.TestCase):
+    def setUp(self):
+        self.news = pd.DataFrame({
+            'date': [
+                '2020-03-02 11:00:00-04:00',  # during Monday's session (10:00 EST)
+                '2020-03-02 17:00:00-04:00',  # 16:00 EST, exactly at the close -> Tuesday
+                '2020-03-03 20:00:00-04:00',  # after hours Tuesday -> Wednesday (AAPL) / Thursday (TSLA)
+                '2020-02-29 12:00:00-04:00',  # Saturday -> Monday
+                '2020-03-06 18:00:00-04:00',  # after Friday's close -> no session
+            ],
+            'stock': ['AAPL', 'AAPL', 'TSLA', 'AAPL', 'AAPL'],
+        })
+        self.joiner = EventJoiner(horizons=(1, 2))
+        self.events = self.joiner.join(self.news, make_prices())
+
+    def test_articles_map_to_next_session(self):
+        expected = pd.to_datetime(['2020-03-02', '2020-03-03', '2020-03-05', '2020-03-02', None])
+        self.assertTrue(pd.DatetimeIndex(self.events['session_date']).equals(expected))
+        self.assertEqual(self.events['in_session'].tolist(), [True, False, False, False, False])
+
+    def test_forward_returns(self):
+        # AAPL closes 100..104; TSLA closes 100..103 on Mon, Tue, Thu, Fri
+        events = self.events
+        self.assertTrue(np.isnan(events['fwd_return_1'].iloc[0]))
+        self.assertAlmostEqual(events['fwd_return_1'].iloc[1], 101 / 100 - 1)
+        self.assertAlmostEqual(events['fwd_return_2'].iloc[1], 102 / 100 - 1)
+        self.assertAlmostEqual(events['fwd_return_1'].iloc[2], 102 / 101 - 1)
+        self.assertAlmostEqual(events['intraday_return'].iloc[2], 102 / 101.5 - 1)
+        self.assertTrue(np.isnan(events['fwd_return_1'].iloc[4]))
+
+    def test_aggregate(self):
+        sessions = self.joiner.aggregate(self.events, value=[1.0, 0.5, -1.0, 0.0, 2.0])
+        monday = sessions[(sessions['stock'] == 'AAPL') & (sessions['session_date'] == '2020-03-02')]
+        self.assertEqual(monday['article_count'].item(), 2)
+        self.assertAlmostEqual(monday['sentiment_score'].item(), 0.5)
+        self.assertEqual(len(sessions), 3)
+
+
+class TestCorrelationBatchRunner(unittest.TestCase):
+    def test_matches_single_ticker_join(self):
+        rng = np.random.default_rng(0)
+        days = pd.bdate_range('2020-01-01', periods=120)
+        prices = {}
+        for ticker in ('AAPL', 'TSLA'):
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(days))))
+            prices[ticker] = pd.DataFrame({'Date': days, 'Open': close * 1.001, 'Close': close})
+        n = 800
+        published = pd.Timestamp('2020-01-01', tz='Etc/GMT+4') + pd.to_timedelta(rng.integers(0, 160 * 24 * 60, n), unit='min')
+        news = pd.DataFrame({
+            'headline': rng.choice(['great beat', 'terrible loss', 'shares flat', 'good upgrade'], n),
+            'date': published.strftime('%Y-%m-%d %H:%M:%S-04:00'),
+            'stock': rng.choice(['AAPL', 'TSLA', 'MSFT'], n),
+        })
+        results = CorrelationBatchRunner(news, horizons=(1, 5)).run(prices)
+        self.assertEqual(list(results.columns), RESULT_COLUMNS)
+        self.assertEqual(results['ticker'].tolist(), ['AAPL'] * 3 + ['TSLA'] * 3)
+        self.assertEqual(results['horizon'].tolist(), ['t+1', 't+5', 'intraday'] * 2)
+
+        # Same numbers as joining one ticker by hand
+        from textblob import TextBlob
+        tsla = news[news['stock'] == 'TSLA']
+        joiner = EventJoiner(horizons=(1, 5))
+        events = joiner.join(tsla, prices['TSLA'])
+        sessions = joiner.aggregate(events, value=[TextBlob(h).sentiment.polarity for h in tsla['headline']])
+        expected = sessions['sentiment_score'].corr(sessions['fwd_return_5'])
+        row = results[(results['ticker'] == 'TSLA') & (results['horizon'] == 't+5')].iloc[0]
+        self.assertAlmostEqual(row['pearson_r'], expected)
+        self.assertEqual(row['articles'], len(tsla))
+
+        tested = CorrelationBatchRunner(news, horizons=(1, 5), significance=SignificanceTester(500, 200)).run(prices)
+        pd.testing.assert_frame_equal(tested[RESULT_COLUMNS], results)
+        self.assertTrue(tested['perm_p'].between(0, 1).all())
+        self.assertTrue((tested['ci_low'] <= tested['ci_high']).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+import pandas as pd
+from benchmarks.generator import make_news, make_prices
+from scripts.correlation_analysis import CorrelationAnalyzer
+from scripts.event_study import EventStudyEngine
+
+
+class TestEventStudyEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        tickers = ['AAPL', 'TSLA', 'NVDA']
+        cls.prices = pd.concat([make_prices(700, seed=i, start='2018-01-02').assign(stock=ticker)
+                                for i, ticker in enumerate(tickers)], ignore_index=True)
+        cls.news = make_news(4000, seed=2, start='2018-01-02', days=1000, tickers=tickers)
+        cls.news['sentiment_score'] = np.random.default_rng(0).uniform(-1, 1, len(cls.news))
+
+    def test_matches_per_event_regression(self):
+        engine = EventStudyEngine(window=(-3, 5), estimation_window=80, gap=5, min_estimation=40)
+        events = engine.run(self.news, self.prices)
+        sessions = engine.sessions
+        checked = 0
+        for _, event in events[events['complete']].iloc[::500].iterrows():
+            ticker = sessions[sessions['stock'] == event['stock']]
+            pos = event['session_idx'] - ticker.index[0]
+            estimation = ticker.iloc[max(pos - 3 - 5 - 80, 0):pos - 3 - 5].dropna(subset=['return', 'market_return'])
+            beta, alpha = np.polyfit(estimation['market_return'], estimation['return'], 1)
+            window = ticker.iloc[pos - 3:pos + 6]
+            car = (window['return'] - alpha - beta * window['market_return']).sum()
+            self.assertAlmostEqual(event['beta'], beta, places=8)
+            self.assertAlmostEqual(event['car'], car, places=10)
+            checked += 1
+        self.assertGreater(checked, 3)
+        # Events shortly after the start of a ticker's history have no estimate
+        early = events['session_date'] < pd.Timestamp('2018-03-01')
+        self.assertTrue(events.loc[early, 'alpha'].isna().all())
+
+    def test_summary_and_caar_agree(self):
+        engine = EventStudyEngine(window=(-5, 10))
+        engine.run(self.news, self.prices)
+        summary = engine.summary('sentiment_class')
+        self.assertEqual(list(summary.index), ['negative', 'neutral', 'positive'])
+        self.assertEqual(summary['events'].sum(), len(engine.events))
+        aar, caar = engine.caar('sentiment_class')
+        self.assertEqual(list(caar.index), list(range(-5, 11)))
+        np.testing.assert_allclose(caar.iloc[-1].to_numpy(), summary['mean_car'].to_numpy(), rtol=1e-9)
+        by_publisher = engine.summary(['sentiment_class', 'publisher'])
+        self.assertEqual(by_publisher['events'].sum(), len(engine.events))
+        # One bucket event per (session, class) with the article count
+        buckets = EventStudyEngine(window=(-5, 10), level='bucket').run(self.news, self.prices)
+        self.assertEqual(buckets['article_count'].sum(), len(engine.events))
+        self.assertFalse(buckets.duplicated(['session_idx', 'sentiment_class']).any())
+
+    def test_single_ticker_models(self):
+        prices = self.prices[self.prices['stock'] == 'AAPL'].drop(columns='stock')
+        news = self.news[self.news['stock'] == 'AAPL'].drop(columns='stock')
+        with self.assertRaises(ValueError):
+            EventStudyEngine().run(news, prices)
+        market = pd.Series(np.random.default_rng(1).normal(0, 0.01, len(prices)), index=pd.to_datetime(prices['Date']))
+        events = EventStudyEngine(model='market').run(news, prices, market=market)
+        self.assertTrue(events['beta'].notna().any())
+        analyzer = CorrelationAnalyzer(news.copy(), prices.copy(), 'AAPL', render='off')
+        summary, caar = analyzer.event_study(window=(-2, 4), by='sentiment_class')
+        self.assertEqual(caar.shape, (7, 3))
+        self.assertTrue((analyzer.event_study_events['beta'].dropna() == 0).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+import pandas as pd
+import os
+import tempfile
+from scripts.indicator_engine import TechnicalIndicatorEngine, INDICATOR_COLUMNS
+from scripts.incremental_indicators import IncrementalIndicatorState
+
+try:
+    import talib
+except ImportError:
+    talib = None
+
+
+def make_panel(lengths, seed=0):
+    # Random-walk OHLC histories for several tickers in long format
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, n in enumerate(lengths):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        frames.append(pd.DataFrame({
+            'stock': f"T{i}",
+            'Date': pd.bdate_range('2015-01-01', periods=n),
+            'Open': close * (1 + rng.normal(0, 0.01, n)),
+            'High': close * 1.02,
+            'Low': close * 0.98,
+            'Close': close,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestTechnicalIndicatorEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.panel = make_panel([600, 300, 30]).sample(frac=1, random_state=0)
+        cls.result = TechnicalIndicatorEngine().compute(cls.panel)
+
+    def test_shape_and_dtypes(self):
+        self.assertEqual(len(self.result), len(self.panel))
+        self.assertTrue(self.result.index.equals(self.panel.index))
+        for col in INDICATOR_COLUMNS:
+            self.assertEqual(self.result[col].dtype, np.float32)
+
+    def test_parallel_matches_serial(self):
+        parallel = TechnicalIndicatorEngine(n_workers=2).compute(self.panel)
+        pd.testing.assert_frame_equal(self.result, parallel)
+
+    @unittest.skipIf(talib is None, "TA-Lib is not installed")
+    def test_matches_talib(self):
+        for ticker, group in self.panel.sort_values('Date').groupby('stock'):
+            close, high, low = group['Close'], group['High'], group['Low']
+            macd, macd_signal, _ = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
+            upper, middle, lower = talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
+            expected = {
+                'SMA_20': talib.SMA(close, timeperiod=20),
+                'SMA_50': talib.SMA(close, timeperiod=50),
+                'RSI': talib.RSI(close, timeperiod=14),
+                'MACD': macd,
+                'MACD_signal': macd_signal,
+                'Upper_BB': upper,
+                'Lower_BB': lower,
+                'ATR': talib.ATR(high, low, close, timeperiod=14),
+                'Volatility': close.pct_change().rolling(window=20).std(),
+            }
+            got = self.result.loc[group.index]
+            for col, values in expected.items():
+                np.testing.assert_allclose(got[col].to_numpy(dtype='float64'), values.to_numpy(), rtol=1e-5, atol=1e-6,
+                                           err_msg=f"{ticker} {col}")
+
+
+class TestIncrementalIndicatorState(unittest.TestCase):
+    def test_incremental_matches_full_replay(self):
+        history = make_panel([400]).set_index('Date')
+        full = IncrementalIndicatorState().update_frame(history)
+        state = IncrementalIndicatorState.from_history(history.iloc[:300])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'state.json')
+            state.save(path)
+            state = IncrementalIndicatorState.load(path)
+        appended = pd.concat([state.update_frame(history.iloc[300:350]), state.update_frame(history.iloc[350:])])
+        pd.testing.assert_frame_equal(appended, full.iloc[300:])
+
+    def test_full_replay_matches_engine(self):
+        panel = make_panel([400])
+        replay = IncrementalIndicatorState().update_frame(panel.set_index('Date'))
+        engine = TechnicalIndicatorEngine().compute(panel)
+        for col in INDICATOR_COLUMNS:
+            np.testing.assert_allclose(replay[col].to_numpy(), engine[col].to_numpy(dtype='float64'), rtol=1e-5, atol=1e-6, err_msg=col)
+
+    def test_rejects_out_of_order_bars(self):
+        history = make_panel([100]).set_index('Date')
+        state = IncrementalIndicatorState.from_history(history)
+        with self.assertRaises(ValueError):
+            state.update_frame(history.iloc[-5:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+import pandas as pd
+from scripts.financial_analysis import FinancialDataAnalyzer
+from scripts.instrumentation import Instrumentation, JSONLinesSink, MemorySink, instrumented
+
+
+class _Pipeline:
+    def __init__(self, df, instrumentation=None):
+        self.df = df
+        self.instrumentation = instrumentation
+
+    @instrumented()
+    def filter(self):
+        self.df = self.df[self.df['x'] > 1]
+
+    @instrumented()
+    def run(self):
+        self.filter()
+        return self.df.head(1)
+
+    @instrumented()
+    def fail(self):
+        raise ValueError("boom")
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_records_nested_stages_and_rows(self):
+        instrumentation = Instrumentation(trace_memory=True)
+        result = _Pipeline(pd.DataFrame({'x': [1, 2, 3]}), instrumentation).run()
+        self.assertEqual(len(result), 1)
+        records = instrumentation.report.records
+        self.assertEqual([r['stage'] for r in records], ['_Pipeline.filter', '_Pipeline.run'])
+        self.assertEqual(records[0]['parent'], '_Pipeline.run')
+        self.assertEqual((records[0]['rows_in'], records[0]['rows_out']), (3, 2))
+        self.assertEqual((records[1]['rows_in'], records[1]['rows_out']), (3, 1))
+        self.assertGreaterEqual(records[1]['traced_peak_mb'], records[0]['traced_peak_mb'])
+        self.assertEqual(list(instrumentation.report.summary()['calls']), [1, 1])
+
+    def test_disabled_instrumentation_is_a_plain_call(self):
+        pipeline = _Pipeline(pd.DataFrame({'x': [1, 2, 3]}))
+        self.assertEqual(len(pipeline.run()), 1)
+
+    def test_json_lines_sink_profile_and_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'stages.jsonl')
+            instrumentation = Instrumentation([JSONLinesSink(path), MemorySink()], profile_stage='filter', profile_dir=tmp)
+            pipeline = _Pipeline(pd.DataFrame({'x': [1, 2, 3]}), instrumentation)
+            pipeline.run()
+            with self.assertRaises(ValueError):
+                pipeline.fail()
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual(records[-1]['error'], 'ValueError')
+            self.assertTrue(os.path.exists(records[0]['profile_path']))
+            self.assertIn('filter', instrumentation.profile_text('_Pipeline.filter'))
+
+    def test_analyzer_stages(self):
+        df = pd.DataFrame({'Date': pd.date_range('2024-01-01', periods=30).astype(str), 'Close': range(30)})
+        instrumentation = Instrumentation()
+        analyzer = FinancialDataAnalyzer(df, 'AAPL', render='off', instrumentation=instrumentation)
+        analyzer.change_to_datetime()
+        analyzer.visualize_stock_price_distribution()
+        stages = [r['stage'] for r in instrumentation.report.records]
+        self.assertEqual(stages, ['FinancialDataAnalyzer.change_to_datetime',
+                                  'FinancialDataAnalyzer.visualize_stock_price_distribution'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+from benchmarks.generator import make_news, make_prices
+from scripts.correlation_analysis import CorrelationAnalyzer
+from scripts.lexicon_scorer import accuracy_report, lexicon_scorer, _reference_scores
+from scripts.sentiment_analysis import ArticleDataAnalyzer
+from tests.test_sentiment_scoring import vader_available
+
+# Headlines exercising the context rules of both scorers
+EDGE_CASES = [
+    "Not very good!!", "really not good", "The stock is NOT GOOD at all but earnings were GREAT", "kind of bad",
+    "at least it is fine", "least good", "never so good", "cut the mustard good", "sort of happy news",
+    "good good bad good", "Good. Bad? Really??", "(AAPL) rises, beats... estimates!", "U.S. Inc. shares fall; bad",
+    "", "It's not bad", "no good", "hardly good", "Absolutely not happy", "amazingly good but terribly bad stock",
+]
+
+
+@unittest.skipUnless(vader_available(), "vader_lexicon is not installed")
+class TestLexiconScorer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.headlines = EDGE_CASES + make_news(3000, seed=4)['headline'].tolist()
+
+    def test_scores_match_per_row_scorers(self):
+        for kind in ('vader', 'textblob'):
+            expected = np.asarray(_reference_scores(kind, self.headlines), dtype='float64')
+            np.testing.assert_array_equal(lexicon_scorer(kind).score(self.headlines), expected)
+
+    def test_document_term_matrix_rows_hold_word_scores(self):
+        scorer = lexicon_scorer('vader')
+        matrix = scorer.document_term_matrix(["Shares rally on strong profit", "never this good", ""])
+        self.assertEqual(matrix.shape, (3, len(scorer.terms)))
+        self.assertGreater(matrix[0, scorer.terms['strong']], 0)
+        self.assertEqual(matrix[1, scorer.terms['good']], scorer.lexicon['good'] * 1.5)
+        self.assertEqual(matrix[2].nnz, 0)
+        report = accuracy_report(self.headlines[:500])
+        self.assertEqual(report.loc['vader', 'identical'], 1.0)
+        self.assertEqual(report.loc['textblob', 'class_agreement'], 1.0)
+
+    def test_analyzer_backends_agree(self):
+        news = make_news(800, seed=5, tickers=['AAPL'])
+        row = ArticleDataAnalyzer(news.copy(), render='off')
+        row.sentiment_analysis()
+        lexicon = ArticleDataAnalyzer(news.copy(), render='off')
+        lexicon.sentiment_analysis(backend='lexicon')
+        np.testing.assert_array_equal(lexicon.df['sentiment_score'], row.df['sentiment_score'])
+        self.assertTrue((lexicon.df['sentiment_class'] == row.df['sentiment_class']).all())
+
+        prices = make_prices(300, seed=1, start='2019-01-02')
+        scores = {}
+        for backend in ('row', 'lexicon'):
+            analyzer = CorrelationAnalyzer(news.copy(), prices.copy(), 'AAPL', render='off')
+            analyzer.analyze_sentiment(backend=backend)
+            scores[backend] = analyzer.news_df['sentiment_score'].to_numpy()
+        np.testing.assert_array_equal(scores['lexicon'], scores['row'])
+        with self.assertRaises(ValueError):
+            lexicon.sentiment_analysis(backend='bert')
+
+
+if __name__ == '__main__':
+    unittest.main()
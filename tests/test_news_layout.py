@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+import pandas as pd
+from benchmarks.generator import make_news
+from scripts.news_layout import CalendarView, classify_scores, memory_per_row, name_counts
+from scripts.sentiment_analysis import ArticleDataAnalyzer
+
+
+class TestCalendarView(unittest.TestCase):
+    def test_fields_match_datetime_accessors(self):
+        dates = pd.Series(pd.to_datetime(['1969-12-31 23:59:59', '2020-02-29 13:45:00', None, '2024-12-31 00:00:00'],
+                                         utc=True))
+        calendar = CalendarView(dates)
+        for field, accessor in [('year', 'year'), ('month', 'month'), ('day', 'day'), ('hour', 'hour'),
+                                ('minute', 'minute'), ('dayOfWeek', 'dayofweek')]:
+            expected = getattr(dates.dt, accessor).fillna(-1).astype('int64').tolist()
+            self.assertEqual(calendar[field].tolist(), expected, field)
+        self.assertEqual(calendar.values('month').dtype, np.int8)
+        self.assertEqual(calendar.weekday_counts().sum(), 3)
+        self.assertTrue(pd.isna(calendar.date_only().iloc[2]))
+
+    def test_name_counts_ignores_invalid_codes(self):
+        counts = name_counts([1, 2, 2, 13, np.nan, 1.5], ['January', 'February'], first=1)
+        self.assertEqual(counts.tolist(), [1, 2])
+
+    def test_classify_scores_matches_scalar_rule(self):
+        scores = [-0.5, -0.2, 0.0, 0.2, 0.9, np.nan]
+        expected = [ArticleDataAnalyzer.sentiment_class(s) for s in scores]
+        self.assertEqual(list(classify_scores(scores)), expected)
+
+
+class TestCompactLayout(unittest.TestCase):
+    def test_compact_analyses_match_wide_layout(self):
+        news = make_news(5000, seed=1)
+        wide = ArticleDataAnalyzer(news.copy(), render='off')
+        wide.format_datetime()
+        compact = ArticleDataAnalyzer(news.copy(), render='off')
+        compact.format_datetime(compact=True)
+        self.assertNotIn('weekday', compact.df.columns)
+        self.assertLess(memory_per_row(compact.df), memory_per_row(wide.df))
+        pd.testing.assert_series_equal(compact.analyze_articles_by_weekday(), wide.analyze_articles_by_weekday())
+        pd.testing.assert_series_equal(compact.analyze_articles_by_month(), wide.analyze_articles_by_month())
+        pd.testing.assert_series_equal(compact.top_publishers_by_articles(), wide.top_publishers_by_articles(),
+                                       check_index_type=False, check_categorical=False)
+        expected = wide.extended_publication_frequency_analysis()
+        result = compact.extended_publication_frequency_analysis()
+        pd.testing.assert_series_equal(result['articles_per_day'], expected['articles_per_day'], check_names=False)
+        pd.testing.assert_series_equal(result['hour_counts'], expected['hour_counts'], check_index_type=False,
+                                       check_dtype=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import nltk
+from scripts.news_stream import StreamingNewsPipeline
+
+
+def nltk_resources_available():
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+        nltk.data.find('corpora/stopwords')
+        return True
+    except LookupError:
+        return False
+
+
+def make_news(n=3000, seed=0):
+    # Small FNSPID-shaped news frame with UTC-4 timestamps
+    rng = np.random.default_rng(seed)
+    words = ['stock', 'hits', 'new', 'high', 'shares', 'crash', 'upgrade', 'downgrade', 'the', 'of', 'earnings', 'beat', '2020']
+    headlines = [' '.join(rng.choice(words, rng.integers(3, 9))) for _ in range(n)]
+    dates = pd.Timestamp('2019-01-01') + pd.to_timedelta(rng.integers(0, 500 * 24 * 60, n), unit='min')
+    return pd.DataFrame({
+        'headline': headlines,
+        'url': 'https://example.com',
+        'publisher': rng.choice(['Benzinga Insights', 'Lisa Levin', 'news@finance.com'], n),
+        'date': dates.strftime('%Y-%m-%d %H:%M:%S') + '-04:00',
+        'stock': rng.choice(['AAPL', 'TSLA'], n),
+    })
+
+
+@unittest.skipUnless(nltk_resources_available(), "vader_lexicon/stopwords are not installed")
+class TestStreamingNewsPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from scripts.sentiment_analysis import ArticleDataAnalyzer
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmpdir.name, 'news.csv')
+        news = make_news()
+        news.to_csv(cls.path)
+        cls.analyzer = ArticleDataAnalyzer(news.copy())
+        cls.analyzer.format_datetime()
+        cls.analyzer.sentiment_analysis()
+        cls.aggregates = StreamingNewsPipeline(cls.path, chunksize=700, stop_words=cls.analyzer.stop_words).run()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_calendar_counts_match_in_memory(self):
+        df = self.analyzer.df
+        pd.testing.assert_series_equal(self.aggregates.articles_per_day(), df.groupby(df['date'].dt.date).size(),
+                                       check_names=False)
+        expected_weekday = df['weekday'].value_counts().reindex(self.aggregates.articles_per_weekday().index, fill_value=0)
+        self.assertEqual(self.aggregates.articles_per_weekday().tolist(), expected_weekday.tolist())
+        self.assertEqual(self.aggregates.articles_per_hour().to_dict(), df['hour'].value_counts().to_dict())
+        self.assertEqual(self.aggregates.articles_per_month().sum(), len(df))
+
+    def test_publisher_aggregates_match_in_memory(self):
+        df = self.analyzer.df
+        self.assertEqual(self.aggregates.articles_per_publisher().to_dict(), df['publisher'].value_counts().to_dict())
+        expected = df.groupby('publisher')['compound'].mean()
+        got = self.aggregates.mean_compound_by_publisher()
+        np.testing.assert_allclose(got.loc[expected.index].to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+    def test_token_counts_match_in_memory(self):
+        headlines = self.analyzer.df['headline'].dropna().astype(str).str.lower()
+        tokens = headlines.str.split().explode()
+        tokens = tokens[tokens.str.isalpha() & ~tokens.isin(self.analyzer.stop_words)]
+        self.assertEqual(self.aggregates.token_counts.astype('int64').to_dict(), tokens.value_counts().to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
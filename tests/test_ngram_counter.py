@@ -0,0 +1,53 @@
+import unittest
+from collections import Counter
+import numpy as np
+from scripts.ngram_counter import NGramCounter
+
+
+def make_headlines(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    words = ['Stock', 'hits', 'new', 'high', 'shares', 'crash', 'upgrade', 'the', 'of', 'Q3', 'earnings', 'beat', '2020']
+    return [' '.join(rng.choice(words, rng.integers(1, 9))) for _ in range(n)]
+
+
+class TestNGramCounter(unittest.TestCase):
+    def setUp(self):
+        self.headlines = make_headlines()
+        self.stop_words = {'the', 'of'}
+
+    def reference(self, n):
+        # Plain-Python version of identify_common_words_and_phrases' counting
+        counter = Counter()
+        for headline in self.headlines:
+            tokens = headline.lower().split()
+            for i in range(len(tokens) - n + 1):
+                gram = tokens[i:i + n]
+                if all(t.isalpha() and t not in self.stop_words for t in gram):
+                    counter[tuple(gram)] += 1
+        return counter
+
+    def test_matches_counter_most_common(self):
+        counter = NGramCounter(self.stop_words)
+        results = counter.count_many(self.headlines, ns=(1, 2, 3))
+        for n in (1, 2, 3):
+            self.assertEqual(results[n].top_k(15), self.reference(n).most_common(15))
+
+    def test_grouped_counts_sum_to_total(self):
+        groups = ['a' if i % 3 else 'b' for i in range(len(self.headlines))]
+        counts = NGramCounter(self.stop_words).count(self.headlines, n=2, groups=groups)
+        by_group = counts.top_k_by_group(k=1000)
+        totals = by_group.groupby('ngram')['count'].sum()
+        expected = self.reference(2)
+        self.assertEqual(dict(totals), {' '.join(k): v for k, v in expected.items()})
+
+    def test_filtered_adjacency_skips_stopwords(self):
+        counts = NGramCounter({'of'}, tokenizer='word', adjacency='filtered').count(["Rise of Apple's shares"], n=2)
+        self.assertEqual(dict(counts.top_k()), {('rise', 'apple'): 1, ('apple', 's'): 1, ('s', 'shares'): 1})
+
+    def test_missing_headlines_are_skipped(self):
+        counts = NGramCounter().count(['up up', None, float('nan')], n=1)
+        self.assertEqual(counts.top_k(), [(('up',), 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+from scripts.nltk_resources import NLTKResourceManager, RESOURCES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestNLTKResourceManager(unittest.TestCase):
+    def test_missing_resource_raises_without_downloading(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = NLTKResourceManager(tmp, search_default_paths=False)
+            with self.assertRaisesRegex(LookupError, 'python -m scripts.nltk_resources download stopwords'):
+                manager.find('stopwords')
+            self.assertEqual(manager.missing(), list(RESOURCES))
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_pinned_directory_is_searched(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'corpora', 'stopwords'))
+            with open(os.path.join(tmp, 'corpora', 'stopwords', 'english'), 'w') as f:
+                f.write("the\nof\n")
+            os.makedirs(os.path.join(tmp, 'sentiment'))
+            with zipfile.ZipFile(os.path.join(tmp, 'sentiment', 'vader_lexicon.zip'), 'w') as archive:
+                archive.writestr('vader_lexicon/vader_lexicon.txt', "good\t1.9\t0.9\t[2, 2, 1]")
+            # Warm nltk's process-wide corpus loader and resource cache from the default path, when installed there
+            try:
+                from nltk.corpus import stopwords
+                from nltk.sentiment import SentimentIntensityAnalyzer
+                stopwords.words('english')
+                SentimentIntensityAnalyzer()
+            except LookupError:
+                pass
+            manager = NLTKResourceManager(tmp, search_default_paths=False)
+            self.assertTrue(manager.find('stopwords').startswith(tmp))
+            # The loaded objects come from the pinned files, even when nltk's default path has full copies
+            self.assertEqual(manager.stopwords(), frozenset(['the', 'of']))
+            self.assertEqual(manager.vader_analyzer().lexicon, {'good': 1.9})
+
+    def test_imports_do_not_load_heavy_modules(self):
+        code = (
+            "import sys\n"
+            "import scripts.sentiment_analysis, scripts.financial_analysis, scripts.correlation_analysis\n"
+            "heavy = ('nltk', 'textblob', 'talib', 'matplotlib', 'seaborn', 'mplfinance', 'scipy')\n"
+            "print(sorted(m for m in sys.modules if m.split('.')[0] in heavy))\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.plotting import PlotSpec, PlotRenderer
+from scripts.financial_analysis import FinancialDataAnalyzer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_prices(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({'Date': pd.bdate_range('2020-01-01', periods=n), 'Open': close, 'High': close * 1.01,
+                         'Low': close * 0.99, 'Close': close, 'Volume': 1e6})
+
+
+class TestPlotting(unittest.TestCase):
+    def test_defer_collects_specs_and_returns_data(self):
+        analyzer = FinancialDataAnalyzer(make_prices(), 'AAPL', render='defer')
+        analyzer.change_to_datetime()
+        counts = analyzer.visualize_stock_price_distribution()
+        self.assertEqual(counts.sum(), 120)
+        analyzer.plot_stock_prices()
+        self.assertEqual([spec.kind for spec in analyzer.plot_specs], ['axes', 'axes', 'candlestick'])
+
+    def test_off_mode_keeps_no_specs(self):
+        analyzer = FinancialDataAnalyzer(make_prices(), 'AAPL', render='off')
+        analyzer.change_to_datetime()
+        analyzer.plot_stock_prices()
+        self.assertEqual(analyzer.plot_specs, [])
+        with self.assertRaises(ValueError):
+            FinancialDataAnalyzer(make_prices(), 'AAPL', render='inline')
+
+    def test_compute_path_does_not_import_matplotlib(self):
+        code = (
+            "import sys\n"
+            "from tests.test_plotting import make_prices\n"
+            "from scripts.financial_analysis import FinancialDataAnalyzer\n"
+            "a = FinancialDataAnalyzer(make_prices(), 'AAPL', render='defer')\n"
+            "a.change_to_datetime(); a.calculate_technical_indicators(); a.visualize_stock_price_distribution()\n"
+            "print(any(m.split('.')[0] in ('matplotlib', 'seaborn', 'mplfinance') for m in sys.modules))\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], 'False')
+
+    def test_renderer_writes_files(self):
+        spec = PlotSpec('bars / test', 'Title', 'x', 'y').bar(['a', 'b'], [1, 2], palette='viridis')
+        spec.subplot('Second').line([0, 1, 2], [1, 0, 1], label='line').hline(0.5).set(legend=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = PlotRenderer(tmp, formats=('png', 'svg')).render([spec])
+            self.assertEqual([os.path.basename(p) for p in paths], ['000_bars_test.png', '000_bars_test.svg'])
+            self.assertTrue(all(os.path.getsize(p) > 0 for p in paths))
+
+    def test_candlestick_files_keep_the_session_backend(self):
+        # In-process rendering must not switch the caller's (e.g. notebook) backend or leave figures open
+        code = (
+            "import os, sys, tempfile\n"
+            "import matplotlib; matplotlib.use('svg')\n"
+            "import matplotlib.pyplot as plt\n"
+            "from tests.test_plotting import make_prices\n"
+            "from scripts.financial_analysis import FinancialDataAnalyzer\n"
+            "a = FinancialDataAnalyzer(make_prices(), 'AAPL', render='defer')\n"
+            "a.change_to_datetime(); a.plot_stock_prices()\n"
+            "tmp = tempfile.mkdtemp()\n"
+            "paths = a.render_plots(tmp)\n"
+            "print(matplotlib.get_backend(), len(plt.get_fignums()), all(os.path.getsize(p) > 0 for p in paths))\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], 'svg 0 True')
+
+
+if __name__ == '__main__':
+    unittest.main()
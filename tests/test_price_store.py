@@ -0,0 +1,60 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from benchmarks.generator import make_prices
+from scripts.financial_analysis import FinancialDataAnalyzer
+from scripts.indicator_engine import TechnicalIndicatorEngine
+from scripts.price_store import PriceStore
+
+
+class TestPriceStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.prices = {ticker: make_prices(400 + 50 * i, seed=i, start='2015-01-02')
+                       for i, ticker in enumerate(['TSLA', 'AAPL', 'NVDA'])}
+        self.store = PriceStore.build(self.tmp.name, self.prices)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_frames_are_zero_copy_views(self):
+        store = PriceStore(self.tmp.name)
+        self.assertEqual(store.tickers, ['AAPL', 'NVDA', 'TSLA'])
+        frame = store.frame('AAPL')
+        expected = self.prices['AAPL'][['Date', 'Open', 'High', 'Low', 'Close', 'Volume']]
+        expected = expected.assign(Date=pd.to_datetime(expected['Date']), Volume=expected['Volume'].astype('float64'))
+        pd.testing.assert_frame_equal(frame, expected)
+        for column in ('Date', 'Close'):
+            self.assertTrue(np.shares_memory(frame[column].to_numpy(), store.column(column)))
+        window = store.frame('AAPL', start='2015-03-01', end='2015-03-31')
+        self.assertTrue(window['Date'].between('2015-03-01', '2015-03-31').all())
+        self.assertEqual(len(window), expected['Date'].between('2015-03-01', '2015-03-31').sum())
+        # Workers receive the path only
+        self.assertLess(len(pickle.dumps(store)), 200)
+        pd.testing.assert_frame_equal(pickle.loads(pickle.dumps(store)).frame('NVDA'), store.frame('NVDA'))
+
+    def test_indicators_from_store_match_panel(self):
+        panel = pd.concat([frame.assign(stock=ticker) for ticker, frame in self.prices.items()], ignore_index=True)
+        panel['Date'] = pd.to_datetime(panel['Date'])
+        expected = TechnicalIndicatorEngine().compute(panel).sort_values(['stock', 'Date']).reset_index(drop=True)
+        result = FinancialDataAnalyzer.calculate_panel_indicators(self.store, n_workers=2)
+        result['stock'] = result['stock'].astype(object)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_analyzer_attaches_and_rebuild_swaps_files(self):
+        analyzer = FinancialDataAnalyzer.from_price_store(self.store, 'TSLA', render='off')
+        analyzer.change_to_datetime()
+        analyzer.calculate_technical_indicators()
+        self.assertEqual(len(analyzer.df), 400)
+        PriceStore.build(self.tmp.name, {'TSLA': self.prices['TSLA']})
+        self.assertEqual(PriceStore(self.tmp.name).tickers, ['TSLA'])
+        self.assertEqual(len([name for name in os.listdir(self.tmp.name) if name.endswith('.npy')]), 6)
+        # The analyzer keeps reading the generation it mapped
+        self.assertEqual(analyzer.df['Close'].notna().sum(), 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
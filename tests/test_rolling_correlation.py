@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scripts.rolling_correlation import RollingCorrelationEngine, ewm_pearson, regimes, rolling_pearson, rolling_spearman
+
+
+def make_series(n=400, seed=0):
+    # Correlated sentiment/return pair with missing news days and a few missing returns
+    rng = np.random.default_rng(seed)
+    y = rng.normal(0, 0.02, n)
+    x = np.round(25 * y + rng.normal(0, 1, n), 1)
+    x[rng.random(n) < 0.4] = np.nan
+    y[rng.random(n) < 0.02] = np.nan
+    return x, y
+
+
+class TestRollingCorrelation(unittest.TestCase):
+    def test_rolling_pearson_matches_pandas(self):
+        x, y = make_series()
+        r, n = rolling_pearson(x, y, [20, 60], min_periods=10)
+        valid = pd.Series(~(np.isnan(x) | np.isnan(y)))
+        for i, window in enumerate([20, 60]):
+            expected = pd.Series(x).rolling(window, min_periods=1).corr(pd.Series(y))
+            expected[valid.rolling(window, min_periods=1).sum() < 10] = np.nan
+            np.testing.assert_allclose(r[i], expected.to_numpy(), atol=1e-10)
+            np.testing.assert_array_equal(n[i], valid.rolling(window, min_periods=1).sum().to_numpy())
+
+    def test_rolling_spearman_matches_scipy(self):
+        x, y = make_series()
+        rho = rolling_spearman(x, y, 60, min_periods=10)
+        for t in (30, 150, 399):
+            xs, ys = x[max(0, t - 59):t + 1], y[max(0, t - 59):t + 1]
+            keep = ~(np.isnan(xs) | np.isnan(ys))
+            self.assertAlmostEqual(rho[t], stats.spearmanr(xs[keep], ys[keep])[0], places=12)
+
+    def test_ewm_matches_pandas(self):
+        x, y = make_series()
+        r, _ = ewm_pearson(x, y, halflife=20, min_periods=10)
+        xs, ys = pd.Series(x), pd.Series(y)
+        expected = (xs + 0 * ys).ewm(halflife=20, min_periods=10).corr(ys + 0 * xs)
+        np.testing.assert_allclose(r, expected.to_numpy(), atol=1e-10)
+
+    def test_run_keeps_days_without_news(self):
+        x, y = make_series(200)
+        dates = pd.bdate_range('2020-01-01', periods=200)
+        returns = pd.DataFrame({'stock': 'AAPL', 'date': dates, 'daily_return': y})
+        sentiment = pd.DataFrame({'stock': 'AAPL', 'date': dates, 'sentiment_score': x}).dropna()
+        engine = RollingCorrelationEngine(windows=(20,), halflives=(10,))
+        result = engine.run(sentiment, returns)
+        self.assertEqual(len(result), 3 * 200)
+        self.assertEqual(set(result['window']), {'rolling_20', 'expanding', 'ewm_10'})
+        expanding = result[result['window'] == 'expanding']
+        keep = ~(np.isnan(x) | np.isnan(y))
+        self.assertAlmostEqual(expanding['pearson_r'].iloc[-1], np.corrcoef(x[keep], y[keep])[0, 1], places=10)
+        # The quadratic expanding Spearman correlation is opt-in
+        self.assertTrue(expanding['spearman_r'].isna().all())
+        self.assertTrue(result.loc[result['window'] == 'rolling_20', 'spearman_r'].notna().any())
+        ranked = RollingCorrelationEngine(windows=(), expanding_spearman=True).run(sentiment, returns)
+        self.assertAlmostEqual(ranked['spearman_r'].iloc[-1], stats.spearmanr(x[keep], y[keep])[0], places=10)
+        periods = regimes(result, 'rolling_20', threshold=0.2)
+        self.assertEqual(periods['days'].sum(), result[result['window'] == 'rolling_20']['pearson_r'].notna().sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
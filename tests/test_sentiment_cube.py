@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.news_layout import CalendarView, classify_scores
+from scripts.sentiment_analysis import ArticleDataAnalyzer
+from scripts.sentiment_cube import SentimentCube
+
+
+def make_news(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    minutes = rng.integers(0, 400 * 24 * 60, n)
+    df = pd.DataFrame({
+        'date': pd.Timestamp('2019-12-01', tz='UTC') + pd.to_timedelta(minutes, unit='min'),
+        'publisher': rng.choice(['Zacks', 'Lisa Levin', 'Benzinga Newsdesk', 'a@b.com'], n, p=[0.4, 0.3, 0.2, 0.1]),
+        'stock': rng.choice(['AAPL', 'TSLA', 'A'], n),
+        'compound': np.round(rng.uniform(-1, 1, n), 2),
+    })
+    df.loc[3, 'date'] = pd.NaT
+    df.loc[4, 'publisher'] = None
+    df['sentiment_class'] = classify_scores(df['compound'])
+    return df
+
+
+class TestSentimentCube(unittest.TestCase):
+    def setUp(self):
+        self.df = make_news()
+        self.cube = SentimentCube.from_frame(self.df)
+
+    def test_calendar_rollups_match_rows(self):
+        calendar = CalendarView(self.df['date'])
+        for name in ('weekday_counts', 'month_counts', 'hour_counts', 'day_counts'):
+            pd.testing.assert_series_equal(getattr(self.cube, name)(), getattr(calendar, name)())
+
+    def test_publisher_queries_match_analyzer(self):
+        analyzer = ArticleDataAnalyzer(self.df, render='off')
+        expected_avg, expected_dist = analyzer.visualize_sentiment_score_by_top_publishers(top_n=3)
+        pd.testing.assert_series_equal(self.cube.publisher_counts(), self.df['publisher'].value_counts())
+        avg, dist = self.cube.publisher_sentiment(top_n=3)
+        pd.testing.assert_series_equal(avg, expected_avg, atol=1e-12)
+        np.testing.assert_array_equal(dist.to_numpy(), expected_dist.to_numpy())
+        # With a cube the analyzer answers from it
+        analyzer.cube = self.cube
+        cube_avg, cube_dist = analyzer.visualize_sentiment_score_by_top_publishers(top_n=3)
+        pd.testing.assert_series_equal(cube_avg, expected_avg, atol=1e-12)
+
+    def test_rollup_moments(self):
+        result = self.cube.rollup(['stock', 'month'])
+        timed = self.df.dropna(subset=['date'])
+        expected = timed.groupby(['stock', timed['date'].dt.month.rename('month')])['compound'].agg(['size', 'mean', 'std'])
+        np.testing.assert_array_equal(result['count'].to_numpy(), expected['size'].to_numpy())
+        np.testing.assert_allclose(result['mean'].to_numpy(), expected['mean'].to_numpy(), atol=1e-12)
+        np.testing.assert_allclose(result['std'].to_numpy(), expected['std'].to_numpy(), atol=1e-10)
+
+    def test_append_and_persistence(self):
+        cube = SentimentCube.from_frame(self.df.iloc[:1000]).append(self.df.iloc[1000:])
+        self.assertEqual(cube.rows, len(self.df))
+        pd.testing.assert_series_equal(cube.publisher_counts(), self.cube.publisher_counts())
+        pd.testing.assert_series_equal(cube.day_counts(), self.cube.day_counts())
+        with tempfile.TemporaryDirectory() as tmp:
+            loaded = SentimentCube.load(cube.save(os.path.join(tmp, 'cube.parquet')))
+        self.assertEqual(loaded.rows, cube.rows)
+        pd.testing.assert_frame_equal(loaded.cells, cube.cells)
+        subset = loaded.filter(stocks=['AAPL'], start='2020-01-01', end='2020-03-31')
+        dates = self.df['date']
+        expected = ((self.df['stock'] == 'AAPL') & (dates >= '2020-01-01') & (dates < '2020-04-01')).sum()
+        self.assertEqual(subset.rows, expected)
+        self.assertTrue(loaded.has_scores and subset.has_scores)
+
+    def test_analyzer_drops_stale_cubes(self):
+        analyzer = ArticleDataAnalyzer(self.df.drop(columns=['compound', 'sentiment_class']), render='off')
+        cube = analyzer.build_sentiment_cube()
+        # A cube built before the scores exist refuses sentiment queries instead of returning NaN means
+        with self.assertRaises(KeyError):
+            cube.publisher_sentiment()
+        self.assertIs(analyzer.cube, cube)
+        analyzer.df = analyzer.df.iloc[:100]
+        self.assertIsNone(analyzer.cube)
+        self.assertEqual(analyzer.top_publishers_by_articles().sum(), analyzer.df['publisher'].notna().sum())
+        analyzer.build_sentiment_cube()
+        analyzer.format_datetime()
+        self.assertIsNone(analyzer.cube)
+
+
+if __name__ == '__main__':
+    unittest.main()
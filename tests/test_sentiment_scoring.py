@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+import nltk
+from scripts.sentiment_scoring import VaderScoringEngine
+from scripts.sentiment_cache import SentimentScoreCache, score_texts
+
+
+def vader_available():
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+        return True
+    except LookupError:
+        return False
+
+
+@unittest.skipUnless(vader_available(), "vader_lexicon is not installed")
+class TestVaderScoringEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.headlines = [
+            'Apple stock hits new high',
+            'Tesla shares crash after weak guidance',
+            'FDA approval boosts biotech shares',
+            '',
+            'Analyst downgrades Amazon, cites slowing growth',
+        ] * 40
+
+    def test_parallel_matches_serial(self):
+        serial = VaderScoringEngine(n_workers=1).score(self.headlines)
+        parallel = VaderScoringEngine(n_workers=2, chunk_size=17, min_parallel_rows=0).score(self.headlines)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(parallel), len(self.headlines))
+
+    def test_small_input_falls_back_to_serial(self):
+        engine = VaderScoringEngine(n_workers=4, min_parallel_rows=1000)
+        self.assertFalse(engine.use_parallel(len(self.headlines)))
+
+    def test_invalid_worker_count(self):
+        with self.assertRaises(ValueError):
+            VaderScoringEngine(n_workers=0)
+
+
+class TestSentimentScoreCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'scores.sqlite')
+        self.calls = []
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def score_fn(self, texts):
+        # Deterministic stand-in scorer that records what it was asked to score
+        self.calls.append(list(texts))
+        return [len(t) / 100.0 for t in texts]
+
+    def test_duplicates_scored_once(self):
+        texts = ['Apple beats estimates', 'Apple  beats estimates ', 'Tesla misses', 'Apple beats estimates']
+        scores = score_texts(texts, self.score_fn, 'test', '1')
+        self.assertEqual(len(self.calls[0]), 2)
+        self.assertEqual(scores[0], scores[1])
+        self.assertEqual(scores[0], scores[3])
+
+    def test_second_run_scores_only_new_rows(self):
+        with SentimentScoreCache(self.path) as cache:
+            score_texts(['a b', 'c d'], self.score_fn, 'test', '1', cache=cache)
+        with SentimentScoreCache(self.path) as cache:
+            scores = score_texts(['a b', 'c d', 'e f'], self.score_fn, 'test', '1', cache=cache)
+            self.assertEqual(self.calls[-1], ['e f'])
+            self.assertEqual(cache.stats()['hits'], 2)
+            self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(list(scores), [0.03, 0.03, 0.03])
+
+    def test_scorer_version_is_part_of_key(self):
+        with SentimentScoreCache(self.path) as cache:
+            score_texts(['a b'], self.score_fn, 'test', '1', cache=cache)
+            score_texts(['a b'], self.score_fn, 'test', '2', cache=cache)
+            self.assertEqual(cache.misses, 2)
+
+    def test_eviction_bounds_size(self):
+        with SentimentScoreCache(self.path, max_entries=3) as cache:
+            score_texts(['a', 'b', 'c'], self.score_fn, 'test', '1', cache=cache)
+            score_texts(['a'], self.score_fn, 'test', '1', cache=cache)
+            score_texts(['d'], self.score_fn, 'test', '1', cache=cache)
+            self.assertEqual(len(cache), 3)
+            self.assertEqual(cache.evictions, 1)
+            # 'a' was used most recently before 'd' arrived, so 'b' was evicted
+            score_texts(['a', 'b'], self.score_fn, 'test', '1', cache=cache)
+            self.assertEqual(self.calls[-1], ['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
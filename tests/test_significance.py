@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.significance import SignificanceTester, block_bootstrap_batch
+
+
+def make_pair(n=400, strength=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.normal(size=n)
+    x = strength * y + rng.normal(size=n)
+    x[rng.random(n) < 0.2] = np.nan
+    return x, y
+
+
+class TestSignificance(unittest.TestCase):
+    def test_block_sums_match_explicit_resamples(self):
+        x, y = make_pair(strength=0.5)
+        keep = ~np.isnan(x)
+        x, y = x[keep], y[keep]
+        seed = np.random.SeedSequence(3)
+        fast = block_bootstrap_batch(x, y, 20, 7, seed)
+        # Same block starts, resamples gathered element by element
+        n = len(x)
+        blocks = -(-n // 7)
+        starts = np.random.default_rng(seed).integers(0, n - 7 + 1, size=(20, blocks))
+        index = (starts[:, :, None] + np.arange(7)).reshape(20, -1)[:, :n]
+        expected = [np.corrcoef(x[i], y[i])[0, 1] for i in index]
+        np.testing.assert_allclose(fast, expected, atol=1e-12)
+
+    def test_signal_and_noise(self):
+        tester = SignificanceTester(n_permutations=2000, n_bootstrap=500, seed=1)
+        strong = tester.test(*make_pair(strength=0.5))
+        noise = tester.test(*make_pair(strength=0.0, seed=2))
+        self.assertLess(strong['perm_p'], 0.01)
+        self.assertLess(strong['ci_low'], strong['r'])
+        self.assertGreater(strong['ci_low'], 0)
+        self.assertGreater(noise['perm_p'], 0.05)
+        self.assertLess(noise['permutations'], 2000)  # stopped early
+
+    def test_sweep_is_reproducible_and_independent_of_workers(self):
+        series = {('AAPL', f't+{h}'): make_pair(200, 0.2, seed=h) for h in (1, 5)}
+        series[('TSLA', 't+1')] = (np.ones(50), np.arange(50.0))
+        serial = SignificanceTester(n_permutations=500, n_bootstrap=200, seed=7).sweep(series)
+        parallel = SignificanceTester(n_permutations=500, n_bootstrap=200, seed=7, n_workers=2).sweep(series)
+        pd.testing.assert_frame_equal(serial, parallel)
+        self.assertTrue(np.isnan(serial.loc[('TSLA', 't+1'), 'r']))
+        self.assertEqual(serial.loc[('AAPL', 't+1'), 'n'], np.sum(~np.isnan(series[('AAPL', 't+1')][0])))
+
+
+if __name__ == '__main__':
+    unittest.main()
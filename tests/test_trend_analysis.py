@@ -0,0 +1,106 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.financial_analysis import FinancialDataAnalyzer
+from scripts.trend_analysis import TrendEngine, DIRECTION_LABELS
+
+
+def make_panel(lengths, seed=0):
+    # Random-walk OHLC histories (rounded, so flat days occur) for several tickers in long format
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, n in enumerate(lengths):
+        close = np.round(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))), 1)
+        open_ = np.round(np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.01, n)), 1)
+        frames.append(pd.DataFrame({
+            'stock': f"T{i}",
+            'Date': pd.bdate_range('2015-01-01', periods=n),
+            'Open': open_,
+            'High': np.maximum(open_, close) * 1.005,
+            'Low': np.minimum(open_, close) * 0.995,
+            'Close': close,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestTrendEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.panel = make_panel([400, 250, 3]).sample(frac=1, random_state=0)
+        cls.engine = TrendEngine()
+
+    def test_directions_and_drawdowns_match_pandas(self):
+        result = self.engine.compute(self.panel)
+        self.assertTrue(result.index.equals(self.panel.index))
+        self.assertEqual(result['direction'].dtype, np.int8)
+        ordered = self.panel.sort_values(['stock', 'Date'])
+        labels = ordered.groupby('stock')['Close'].diff().apply(
+            lambda x: 'Up' if x > 0 else 'Down' if x < 0 else 'No Change')
+        pd.testing.assert_series_equal(result['direction'].loc[ordered.index].map(DIRECTION_LABELS), labels,
+                                       check_names=False)
+        peak = ordered.groupby('stock')['Close'].cummax()
+        np.testing.assert_allclose(result['drawdown'].loc[ordered.index], ordered['Close'] / peak - 1, atol=1e-6)
+
+    def test_summary_matches_per_ticker_loop(self):
+        summary = self.engine.summary(self.panel)
+        for ticker, group in self.panel.sort_values('Date').groupby('stock'):
+            row = summary.loc[ticker]
+            change = np.sign(group['Close'].diff().fillna(0).to_numpy())
+            self.assertEqual(row['up_days'], (change > 0).sum())
+            self.assertEqual(row['down_days'], (change < 0).sum())
+            longest, current = 0, 0
+            for value in change:
+                current = current + 1 if value > 0 else 0
+                longest = max(longest, current)
+            self.assertEqual(row['longest_up'], longest)
+            gaps = group['Open'] / group['Close'].shift() - 1
+            self.assertEqual(row['gap_ups'], (gaps > 0.01).sum())
+            drawdown = group['Close'] / group['Close'].cummax() - 1
+            self.assertAlmostEqual(row['max_drawdown'], drawdown.min(), places=12)
+            self.assertEqual(row['max_drawdown_date'], group['Date'].iloc[drawdown.argmin()])
+
+    def test_gap_fill_and_missing_closes(self):
+        # AAPL: unfilled gap up, filled gap up, filled gap down, unfilled gap down; TSLA: one unfilled gap up
+        bars = pd.DataFrame({
+            'stock': ['AAPL'] * 5 + ['TSLA'] * 3,
+            'Date': list(pd.date_range('2024-01-01', periods=5)) + list(pd.date_range('2024-01-01', periods=3)),
+            'Open': [100, 110, 115, 100, 95, 100, 110, np.nan],
+            'High': [101, 112, 118, 113, 99, 101, 115, 50],
+            'Low': [99, 105, 107, 98, 90, 99, 105, 40],
+            'Close': [100, 108, 112, 101, 96, 100, 112, np.nan],
+        })
+        summary = self.engine.summary(bars)
+        self.assertEqual(summary.loc['AAPL', 'gap_ups'], 2)
+        self.assertEqual(summary.loc['AAPL', 'gap_downs'], 2)
+        self.assertEqual(summary.loc['AAPL', 'gap_fill_rate'], 0.5)
+        self.assertEqual(summary.loc['TSLA', 'gap_fill_rate'], 0.0)
+        drawdown = self.engine.compute(bars)['drawdown'].to_numpy()
+        np.testing.assert_array_equal(drawdown[[0, 1, 2, 5, 6]], 0.0)
+        self.assertAlmostEqual(drawdown[4], 96 / 112 - 1, places=6)
+        self.assertTrue(np.isnan(drawdown[7]))
+
+    def test_analyzer_trend_column(self):
+        df = make_panel([120]).drop(columns='stock')
+        analyzer = FinancialDataAnalyzer(df, 'T0', render='off')
+        counts = analyzer.analyze_stock_price_trends()
+        self.assertEqual(analyzer.df['Trend'].dtype, np.int8)
+        expected = df['Close'].diff().apply(lambda x: 'Up' if x > 0 else 'Down' if x < 0 else 'No Change')
+        np.testing.assert_array_equal(counts.to_numpy(), expected.value_counts().to_numpy())
+        summary, distribution = analyzer.analyze_trend_statistics()
+        self.assertEqual((distribution['length'] * distribution['count'])[distribution['direction'] == 'Up'].sum(),
+                         summary['up_days'])
+        self.assertNotIn('Trend_State', analyzer.df.columns)
+        # With the moving averages the trend state column is added as well
+        analyzer.df['SMA_20'] = analyzer.df['Close'].rolling(20).mean()
+        analyzer.df['SMA_50'] = analyzer.df['Close'].rolling(50).mean()
+        analyzer.analyze_stock_price_trends()
+        close, sma_20, sma_50 = analyzer.df['Close'], analyzer.df['SMA_20'], analyzer.df['SMA_50']
+        state = np.sign(close - sma_20) + np.sign(sma_20 - sma_50)
+        expected = state.map({-2: 'strong_down', -1: 'down', 0: 'neutral', 1: 'up', 2: 'strong_up'})
+        np.testing.assert_array_equal(analyzer.df['Trend_State'].astype(object).to_numpy()[49:],
+                                      expected.to_numpy()[49:])
+        self.assertTrue(analyzer.df['Trend_State'].iloc[:49].isna().all())
+
+
+if __name__ == '__main__':
+    unittest.main()